@@ -2,13 +2,22 @@
 MongoDB database connection using Motor (async driver).
 
 Provides database instance and connection management with lifespan events.
+Pool sizes and timeouts come from settings (``MONGODB_*``); every client
+reports pool events to ``app.utils.pool_stats`` and command latency per
+collection to ``app.utils.metrics``.
 """
 
 import logging
+import threading
+from typing import Any, Dict
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
 
 from app.config.settings import get_settings
+from app.utils.metrics import get_metrics_registry
+from app.utils.pool_stats import get_mongo_pool_monitor
+from app.utils.profiling import record_timing
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +25,85 @@ logger = logging.getLogger(__name__)
 _client: AsyncIOMotorClient | None = None
 _database: AsyncIOMotorDatabase | None = None
 
+MONGO_COMMAND_SECONDS = get_metrics_registry().histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency by collection", ("collection", "command")
+)
+MONGO_COMMAND_FAILURES = get_metrics_registry().counter(
+    "mongodb_command_failures_total", "Failed MongoDB commands by collection", ("collection", "command")
+)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Records command latency per collection (and in the current request's
+    Server-Timing: Motor runs commands with the caller's context).
+
+    Only the started event carries the command document, so the
+    collection name is kept per thread until the matching succeeded or
+    failed event (a command runs start to finish on one driver thread).
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def started(self, event):
+        name = event.command_name
+        target = event.command.get("collection" if name == "getMore" else name)
+        self._local.collection = target if isinstance(target, str) else ""
+
+    def _collection(self) -> str:
+        return getattr(self._local, "collection", "")
+
+    def succeeded(self, event):
+        seconds = event.duration_micros / 1_000_000
+        MONGO_COMMAND_SECONDS.labels(self._collection(), event.command_name).observe(seconds)
+        record_timing("mongodb", seconds)
+
+    def failed(self, event):
+        seconds = event.duration_micros / 1_000_000
+        collection = self._collection()
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+        MONGO_COMMAND_SECONDS.labels(collection, event.command_name).observe(seconds)
+        record_timing("mongodb", seconds)
+
+
+_command_metrics = MongoCommandMetrics()
+
+
+def mongo_client_options(current_settings=None) -> Dict[str, Any]:
+    """
+    Motor client keyword arguments from settings.
+
+    Args:
+        current_settings: Settings instance (defaults to get_settings())
+
+    Returns:
+        Pool size, connection-rate and timeout options plus the pool listener
+    """
+    current_settings = current_settings or get_settings()
+    return {
+        "maxPoolSize": getattr(current_settings, "MONGODB_MAX_POOL_SIZE", 50),
+        "minPoolSize": getattr(current_settings, "MONGODB_MIN_POOL_SIZE", 1),
+        "maxConnecting": getattr(current_settings, "MONGODB_MAX_CONNECTING", 2),
+        "waitQueueTimeoutMS": getattr(current_settings, "MONGODB_WAIT_QUEUE_TIMEOUT_MS", 5000),
+        "serverSelectionTimeoutMS": getattr(current_settings, "MONGODB_SERVER_SELECTION_TIMEOUT_MS", 5000),
+        "connectTimeoutMS": getattr(current_settings, "MONGODB_CONNECT_TIMEOUT_MS", 5000),
+        "socketTimeoutMS": getattr(current_settings, "MONGODB_SOCKET_TIMEOUT_MS", 30000),
+        "maxIdleTimeMS": getattr(current_settings, "MONGODB_MAX_IDLE_TIME_MS", 300000),
+        "event_listeners": [get_mongo_pool_monitor(), _command_metrics],
+    }
+
+
+def create_mongo_client(current_settings=None) -> AsyncIOMotorClient:
+    """
+    Build a Motor client with the configured pool.
+
+    Used by the API lifespan and the Celery worker runtime so both size
+    their pools the same way. The client connects lazily.
+    """
+    current_settings = current_settings or get_settings()
+    return AsyncIOMotorClient(current_settings.MONGODB_URL, **mongo_client_options(current_settings))
+
 
 async def connect_to_mongodb() -> None:
     """
@@ -40,13 +128,8 @@ async def connect_to_mongodb() -> None:
 
         logger.info("Connecting to MongoDB at %s", current_settings.MONGODB_URL)
         
-        # Create MongoDB client
-        _client = AsyncIOMotorClient(
-            current_settings.MONGODB_URL,
-            serverSelectionTimeoutMS=5000,  # 5 seconds timeout
-            maxPoolSize=10,  # Maximum number of connections in the pool
-            minPoolSize=1,   # Minimum number of connections in the pool
-        )
+        # Create MongoDB client (pool sized from settings)
+        _client = create_mongo_client(current_settings)
         
         # Get database instance
         _database = _client[current_settings.MONGODB_DB_NAME]
@@ -76,6 +76,12 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = Field(default="INFO")
     LOG_FILE_PATH: str = Field(default="logs/app.log")
+    LOG_FORMAT: str = Field(default="text", description="text or json (one orjson object per line)")
+    LOG_QUEUE_ENABLED: bool = Field(default=True, description="Format and write logs on a background thread")
+    LOG_RATE_LIMIT_BURST: int = Field(default=10, description="Max WARNING records per call site per window (0 disables)")
+    LOG_RATE_LIMIT_WINDOW_SECONDS: float = Field(default=60.0)
+    LOG_DEBUG_SAMPLE_EVERY: int = Field(default=1, description="Keep 1 in N DEBUG records per call site")
+    SOCKETIO_LOGGER_ENABLED: bool = Field(default=False, description="python-socketio/engineio per-packet logging")
     
     # CORS
     CORS_ORIGINS: str = Field(default="http://localhost:3000,http://localhost:5173")
@@ -99,6 +105,99 @@ class Settings(BaseSettings):
     # Position monitoring (Socket.IO push)
     POSITION_MONITOR_ENABLED: bool = Field(default=True)
     POSITION_MONITOR_INTERVAL_SECONDS: int = Field(default=5)
+
+    # Monitoring queries (cursor batch size for open positions/orders and running executions)
+    MONITOR_CURSOR_BATCH_SIZE: int = Field(default=200)
+
+    # Index manager (declared index catalog built in the background at startup)
+    INDEX_MANAGER_ENABLED: bool = Field(default=True)
+
+    # Connection pools (shared per process by the API and Celery workers)
+    MONGODB_MAX_POOL_SIZE: int = Field(default=50)
+    MONGODB_MIN_POOL_SIZE: int = Field(default=1)
+    MONGODB_MAX_CONNECTING: int = Field(default=2)
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = Field(default=5000)
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = Field(default=5000)
+    MONGODB_CONNECT_TIMEOUT_MS: int = Field(default=5000)
+    MONGODB_SOCKET_TIMEOUT_MS: int = Field(default=30000)
+    MONGODB_MAX_IDLE_TIME_MS: int = Field(default=300000)
+    REDIS_MAX_CONNECTIONS: int = Field(default=50)
+    REDIS_POOL_TIMEOUT_SECONDS: float = Field(default=5.0)
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = Field(default=10.0)
+    REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS: float = Field(default=5.0)
+
+    # Profiling (Server-Timing headers, admin sampling profiler, Celery task hooks)
+    # Server-Timing exposes backend timings to every client: enable for debugging only
+    SERVER_TIMING_ENABLED: bool = Field(default=False)
+    PROFILER_ENABLED: bool = Field(default=False)
+    PROFILER_MAX_SECONDS: int = Field(default=60)
+    PROFILER_SAMPLE_INTERVAL_MS: int = Field(default=5)
+    PROFILER_OUTPUT_DIR: str = Field(default="logs/profiles")
+    CELERY_PROFILE_TASKS: str = Field(default="", description="Comma-separated task names to profile ('*' for all)")
+    CELERY_SLOW_TASK_MS: int = Field(default=5000)
+
+    # Socket.IO fan-out (Redis message queue shared by API and Celery workers)
+    SOCKETIO_REDIS_ENABLED: bool = Field(default=True)
+    SOCKETIO_CHANNEL: str = Field(default="moniqo-socketio")
+    SOCKETIO_POSITION_THROTTLE_MS: int = Field(default=250)
+    SOCKETIO_POSITION_DELTAS_ENABLED: bool = Field(default=True)
+    SOCKETIO_POSITION_MIN_PRICE_CHANGE_PERCENT: float = Field(default=0.01)
+    SOCKETIO_POSITION_MIN_PNL_CHANGE_USD: float = Field(default=0.01)
+    SOCKETIO_POSITION_KEYFRAME_SECONDS: int = Field(default=30)
+
+    # Market data (shared Binance 24h ticker snapshot)
+    TICKER_SNAPSHOT_TTL_SECONDS: int = Field(default=10)
+    TICKER_SNAPSHOT_STREAM_ENABLED: bool = Field(default=False)
+
+    # Market stream (Binance kline/bookTicker/aggTrade for open positions and active flows)
+    MARKET_STREAM_ENABLED: bool = Field(default=True)
+    MARKET_STREAM_KLINE_INTERVAL: str = Field(default="1m")
+    MARKET_STREAM_SYMBOL_REFRESH_SECONDS: int = Field(default=30)
+    MARKET_STREAM_MAX_PRICE_AGE_SECONDS: int = Field(default=5)
+    MARKET_STREAM_CANDLE_HISTORY: int = Field(default=500)
+
+    # Polymarket market index (odds by asset/direction/timeframe)
+    POLYMARKET_INDEX_ENABLED: bool = Field(default=True)
+    POLYMARKET_INDEX_REFRESH_SECONDS: int = Field(default=30)
+    POLYMARKET_INDEX_FULL_REFRESH_SECONDS: int = Field(default=600)
+    POLYMARKET_INDEX_MAX_MARKETS: int = Field(default=2000)
+
+    # Signal materializer (background AggregatedSignal refresh for active symbols)
+    SIGNAL_MATERIALIZER_ENABLED: bool = Field(default=True)
+    SIGNAL_MATERIALIZER_INTERVAL_SECONDS: int = Field(default=120)
+    SIGNAL_MATERIALIZER_JITTER_SECONDS: int = Field(default=15)
+    SIGNAL_MATERIALIZER_MAX_CONCURRENCY: int = Field(default=4)
+    SIGNAL_MATERIALIZER_DEMAND_TTL_SECONDS: int = Field(default=900)
+
+    # Reddit guerrilla client (shared subreddit listing cache)
+    REDDIT_CACHE_TTL_SECONDS: int = Field(default=120)
+    REDDIT_MAX_CONCURRENCY: int = Field(default=4)
+    REDDIT_REQUESTS_PER_MINUTE: int = Field(default=30)
+    REDDIT_RATE_LIMIT_BURST: int = Field(default=5)
+
+    # Demo wallet engine (in-memory paper trading, write-behind persistence)
+    DEMO_ENGINE_ENABLED: bool = Field(default=True)
+    DEMO_ENGINE_TICK_MS: int = Field(default=250)
+    DEMO_ENGINE_SYNC_SECONDS: int = Field(default=10)
+    DEMO_WALLET_STATE_TTL_SECONDS: int = Field(default=5)
+    DEMO_WALLET_DEPTH_IMPACT_RATE: float = Field(default=0.0005)
+
+    # Backtest parameter sweeps (process pool size and per-request cap; 0 = CPU count)
+    BACKTEST_SWEEP_MAX_WORKERS: int = Field(default=0)
+    BACKTEST_SWEEP_MAX_TRIALS: int = Field(default=1000)
+
+    # Conversation streaming (/conversations/ws per-client send queue bound)
+    CONVERSATION_WS_MAX_QUEUE: int = Field(default=100)
+
+    # Flow statistics (per-flow daily rollup buckets for dashboards)
+    FLOW_STATS_DAILY_ROLLUP_ENABLED: bool = Field(default=True)
+
+    # Flow scheduler (persistent auto-loop queue polled by every API worker)
+    FLOW_SCHEDULER_ENABLED: bool = Field(default=True)
+    FLOW_SCHEDULER_POLL_SECONDS: int = Field(default=2)
+    FLOW_SCHEDULER_MAX_CONCURRENCY: int = Field(default=10)
+    FLOW_SCHEDULER_LEASE_SECONDS: int = Field(default=900)
+    FLOW_SCHEDULER_DRAIN_SECONDS: int = Field(default=30)
     
     # Sentiment API Keys (optional, for signal aggregation)
     TWITTER_BEARER_TOKEN: str = Field(default="", description="X/Twitter API Bearer Token")
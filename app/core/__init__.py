@@ -20,6 +20,8 @@ from app.core.security import (
     verify_password_reset_token,
 )
 from app.core.responses import (
+    ORJSONResponse,
+    model_response,
     StandardResponse,
     ErrorDetail,
     PaginatedResponse,
@@ -75,6 +77,8 @@ __all__ = [
     "create_password_reset_token",
     "verify_password_reset_token",
     # Responses
+    "ORJSONResponse",
+    "model_response",
     "StandardResponse",
     "ErrorDetail",
     "PaginatedResponse",
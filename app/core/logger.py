@@ -4,6 +4,10 @@ Clean, Colored Logging Configuration
 Provides structured, readable log output with colors and timestamps.
 Replaces the default FastAPI/uvicorn logging mess.
 
+``format_type="json"`` writes one orjson-encoded object per line and
+``queued=True`` moves formatting and writes to a background thread; the
+formatter, filters and queue helpers live in ``app.utils.logger``.
+
 Usage:
     from app.core.logger import get_logger
     logger = get_logger(__name__)
@@ -15,8 +19,10 @@ Usage:
 
 import logging
 import sys
-from typing import Optional
 from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.utils.logger import JSONFormatter, build_filters, start_queue_logging, stop_queue_logging
 
 
 class ColoredFormatter(logging.Formatter):
@@ -32,9 +38,22 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m',      # Reset
     }
 
+    def __init__(self):
+        super().__init__()
+        # Timestamps have second resolution: format each second once
+        self._stamp_second = -1
+        self._stamp = ""
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        if second != self._stamp_second:
+            self._stamp = datetime.fromtimestamp(second, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+            self._stamp_second = second
+        return self._stamp
+
     def format(self, record: logging.LogRecord) -> str:
-        # Add timestamp
-        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        # Add timestamp (when the record was created, not when it is written)
+        timestamp = self._timestamp(record.created)
 
         # Add colors
         level_color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
@@ -53,10 +72,32 @@ class ColoredFormatter(logging.Formatter):
         return formatted_message
 
 
+def build_formatter(format_type: str) -> logging.Formatter:
+    """Formatter for ``format_type``: "colored", "simple", "json" or "detailed"."""
+    if format_type == "colored":
+        return ColoredFormatter()
+    if format_type == "json":
+        return JSONFormatter()
+    if format_type == "simple":
+        return logging.Formatter(
+            '[%(asctime)s] %(levelname)s [%(name)s] %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+    # Default structured format
+    return logging.Formatter(
+        '[%(asctime)s] %(levelname)s [%(name)s:%(lineno)d] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+
 def setup_logging(
     level: str = "INFO",
     format_type: str = "colored",
-    log_file: Optional[str] = None
+    log_file: Optional[str] = None,
+    queued: bool = False,
+    rate_limit_burst: int = 0,
+    rate_limit_window_seconds: float = 60.0,
+    debug_sample_every: int = 1,
 ) -> None:
     """
     Setup clean logging configuration.
@@ -65,9 +106,15 @@ def setup_logging(
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         format_type: "colored" for console with colors, "json" for structured
         log_file: Optional file path to also log to file
+        queued: Format and write on a background thread (QueueListener)
+        rate_limit_burst: Max WARNING records per call site per window (0 = off)
+        rate_limit_window_seconds: Rate limit window
+        debug_sample_every: Keep 1 in N DEBUG records per call site (1 = all)
     """
     # Clear ALL existing handlers first to prevent duplicates from Uvicorn
     root_logger = logging.getLogger()
+    for handler in root_logger.handlers:
+        stop_queue_logging(handler)
     root_logger.handlers.clear()
     
     # Convert string level to logging constant
@@ -79,34 +126,25 @@ def setup_logging(
     # Create console handler with colored formatter
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
-
-    if format_type == "colored":
-        formatter = ColoredFormatter()
-    elif format_type == "simple":
-        formatter = logging.Formatter(
-            '[%(asctime)s] %(levelname)s [%(name)s] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-    else:
-        # Default structured format
-        formatter = logging.Formatter(
-            '[%(asctime)s] %(levelname)s [%(name)s:%(lineno)d] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(build_formatter(format_type))
+    handlers: List[logging.Handler] = [console_handler]
 
     # Optional file handler
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(numeric_level)
-        file_formatter = logging.Formatter(
-            '[%(asctime)s] %(levelname)s [%(name)s:%(lineno)d] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+        file_handler.setFormatter(build_formatter("json" if format_type == "json" else "detailed"))
+        handlers.append(file_handler)
+
+    filters = build_filters(rate_limit_burst, rate_limit_window_seconds, debug_sample_every)
+    if queued:
+        console_handler = start_queue_logging(handlers, filters)
+        root_logger.addHandler(console_handler)
+    else:
+        for handler in handlers:
+            for log_filter in filters:
+                handler.addFilter(log_filter)
+            root_logger.addHandler(handler)
 
     # Suppress noisy third-party logs
     logging.getLogger('httpx').setLevel(logging.WARNING)
@@ -141,9 +179,9 @@ def get_logger(name: str) -> logging.Logger:
 
 
 # Convenience function for quick setup
-def setup_development_logging():
+def setup_development_logging(format_type: str = "colored", **options):
     """Setup logging for development with colored output"""
-    setup_logging(level="INFO", format_type="colored")
+    setup_logging(level="INFO", format_type=format_type, **options)
 
 
 def setup_production_logging(log_file: str = "app.log"):
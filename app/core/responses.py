@@ -6,6 +6,34 @@ All API responses follow a consistent format for success and error cases.
 
 from typing import Any, Optional
 from pydantic import BaseModel, ConfigDict, Field
+from starlette.responses import JSONResponse
+
+from app.utils.serialization import dumps_response
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson (the app's default response class).
+
+    Besides what orjson handles natively (datetime, Enum, UUID, NumPy), the
+    content may hold ``ObjectId`` (string), ``Decimal`` (number) and
+    Pydantic models (by alias), so handlers can return raw documents
+    without walking them first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_response(content)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> ORJSONResponse:
+    """
+    Encode a response model directly with orjson.
+
+    Returning a Response skips FastAPI's response_model round trip (dump,
+    re-validate, JSON-mode serialize) for large payloads such as
+    execution lists. The route's ``response_model`` still documents it.
+    """
+    return ORJSONResponse(model.model_dump(by_alias=True), status_code=status_code)
 
 
 class ErrorDetail(BaseModel):
@@ -14,6 +14,16 @@ from decimal import Decimal
 from datetime import datetime
 from enum import Enum
 
+from app.utils.metrics import SLOW_BUCKETS, get_metrics_registry
+
+# Per-provider LLM telemetry
+LLM_REQUEST_SECONDS = get_metrics_registry().histogram(
+    "llm_request_duration_seconds", "LLM request latency by provider", ("provider", "status"), SLOW_BUCKETS
+)
+LLM_TOKENS = get_metrics_registry().counter(
+    "llm_tokens_total", "LLM tokens by provider and direction", ("provider", "direction")
+)
+
 
 class ModelProvider(str, Enum):
     """LLM provider types"""
@@ -202,6 +212,11 @@ class BaseLLM(ABC):
             "config": self.config
         }
     
+    @property
+    def provider_name(self) -> str:
+        """Provider as a plain string (metric label)"""
+        return getattr(self.provider, "value", str(self.provider))
+    
     def track_usage(
         self,
         input_tokens: int,
@@ -216,6 +231,8 @@ class BaseLLM(ABC):
         """
         self.total_input_tokens += input_tokens
         self.total_output_tokens += output_tokens
+        LLM_TOKENS.labels(self.provider_name, "input").inc(input_tokens)
+        LLM_TOKENS.labels(self.provider_name, "output").inc(output_tokens)
         
         cost = self.calculate_cost(input_tokens, output_tokens)
         self.total_cost_usd += cost
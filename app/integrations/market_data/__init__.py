@@ -21,6 +21,15 @@ from app.integrations.market_data.binance_client import (
     TickerStats,
     get_binance_client,
 )
+from app.integrations.market_data.ticker_snapshot import (
+    TickerSnapshot,
+    get_ticker_snapshot,
+)
+from app.integrations.market_data.binance_stream import (
+    BinanceMarketStream,
+    MarketBook,
+    get_market_book,
+)
 from app.integrations.market_data.coinlore_client import (
     CoinloreClient,
     GlobalStats,
@@ -41,6 +50,11 @@ __all__ = [
     "Candle",
     "TickerStats",
     "get_binance_client",
+    "TickerSnapshot",
+    "get_ticker_snapshot",
+    "BinanceMarketStream",
+    "MarketBook",
+    "get_market_book",
     # Coinlore
     "CoinloreClient",
     "GlobalStats",
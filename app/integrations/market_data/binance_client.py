@@ -10,15 +10,38 @@ Last Updated: 2026-01-17
 
 import aiohttp
 import asyncio
+import orjson
+import time
 from typing import List, Dict, Optional, Any
 from decimal import Decimal
 from datetime import datetime, timezone
 from dataclasses import dataclass
 
+from app.config.settings import get_settings
 from app.utils.logger import get_logger
+from app.utils.metrics import get_metrics_registry
+from app.utils.profiling import record_timing
 
 logger = get_logger(__name__)
 
+# REST latency and errors per endpoint
+MARKET_DATA_SECONDS = get_metrics_registry().histogram(
+    "market_data_request_duration_seconds", "Market-data REST latency by client and endpoint", ("client", "endpoint")
+)
+MARKET_DATA_ERRORS = get_metrics_registry().counter(
+    "market_data_request_errors_total", "Market-data REST errors by client and endpoint", ("client", "endpoint")
+)
+_ENDPOINTS = ("klines", "ticker_24hr", "ticker_price", "ticker_24hr_all", "time")
+_SECONDS = {endpoint: MARKET_DATA_SECONDS.labels("binance", endpoint) for endpoint in _ENDPOINTS}
+_ERRORS = {endpoint: MARKET_DATA_ERRORS.labels("binance", endpoint) for endpoint in _ENDPOINTS}
+
+
+def _observe(endpoint: str, started: float) -> None:
+    """Record a REST call's latency (metrics and Server-Timing)."""
+    elapsed = time.perf_counter() - started
+    _SECONDS[endpoint].observe(elapsed)
+    record_timing("binance", elapsed)
+
 
 # Timeframe mapping
 TIMEFRAME_MAP = {
@@ -137,7 +160,9 @@ class BinanceClient:
         self,
         symbol: str,
         interval: str = "1h",
-        limit: int = 100
+        limit: int = 100,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
     ) -> List[Candle]:
         """
         Get OHLCV candlestick data from Binance.
@@ -146,6 +171,8 @@ class BinanceClient:
             symbol: Symbol like "BTC/USDT" or "BTCUSDT"
             interval: Timeframe: "1m", "5m", "15m", "1h", "4h", "1d", etc.
             limit: Number of candles (default: 100, max: 1000)
+            start_time: Optional first candle open time (for paging history)
+            end_time: Optional last candle open time
             
         Returns:
             List of Candle objects
@@ -160,10 +187,16 @@ class BinanceClient:
             "interval": binance_interval,
             "limit": min(limit, 1000)
         }
+        if start_time is not None:
+            params["startTime"] = int(start_time.timestamp() * 1000)
+        if end_time is not None:
+            params["endTime"] = int(end_time.timestamp() * 1000)
         
+        started = time.perf_counter()
         try:
             async with session.get(url, params=params) as response:
                 if response.status != 200:
+                    _ERRORS["klines"].inc()
                     error_text = await response.text()
                     logger.error(f"Binance API error: {response.status} - {error_text}")
                     return []
@@ -187,8 +220,11 @@ class BinanceClient:
         except asyncio.CancelledError:
             raise
         except aiohttp.ClientError as e:
+            _ERRORS["klines"].inc()
             logger.error(f"Binance API fetch error: {str(e)}")
             return []
+        finally:
+            _observe("klines", started)
     
     async def get_24h_ticker(self, symbol: str) -> Optional[TickerStats]:
         """
@@ -206,9 +242,11 @@ class BinanceClient:
         url = f"{self.BASE_URL}/ticker/24hr"
         params = {"symbol": binance_symbol}
         
+        started = time.perf_counter()
         try:
             async with session.get(url, params=params) as response:
                 if response.status != 200:
+                    _ERRORS["ticker_24hr"].inc()
                     logger.error(f"Binance API error: {response.status}")
                     return None
                 
@@ -227,8 +265,11 @@ class BinanceClient:
         except asyncio.CancelledError:
             raise
         except aiohttp.ClientError as e:
+            _ERRORS["ticker_24hr"].inc()
             logger.error(f"Binance API fetch error: {str(e)}")
             return None
+        finally:
+            _observe("ticker_24hr", started)
     
     async def get_price(self, symbol: str) -> Optional[Decimal]:
         """
@@ -237,18 +278,30 @@ class BinanceClient:
         Args:
             symbol: Symbol like "BTC/USDT" or "BTCUSDT"
             
+        Served from the live market book when the symbol is streamed and
+        the last trade is recent; otherwise fetched from REST.
+
         Returns:
             Current price or None
         """
+        from app.integrations.market_data.binance_stream import get_market_book
+
+        max_age = getattr(get_settings(), "MARKET_STREAM_MAX_PRICE_AGE_SECONDS", 5)
+        live_price = get_market_book().get_price(symbol, max_age_seconds=max_age)
+        if live_price is not None:
+            return live_price
+
         binance_symbol = self.to_binance_symbol(symbol)
         
         session = await self._get_session()
         url = f"{self.BASE_URL}/ticker/price"
         params = {"symbol": binance_symbol}
         
+        started = time.perf_counter()
         try:
             async with session.get(url, params=params) as response:
                 if response.status != 200:
+                    _ERRORS["ticker_price"].inc()
                     return None
                 
                 data = await response.json()
@@ -257,49 +310,66 @@ class BinanceClient:
         except asyncio.CancelledError:
             raise
         except aiohttp.ClientError as e:
+            _ERRORS["ticker_price"].inc()
             logger.error(f"Binance price fetch error: {str(e)}")
             return None
+        finally:
+            _observe("ticker_price", started)
     
-    async def get_multiple_tickers(self, symbols: List[str]) -> List[TickerStats]:
+    async def get_all_24h_tickers(self) -> List[Dict[str, Any]]:
         """
-        Get 24h tickers for multiple symbols.
-        
-        Args:
-            symbols: List of symbols
-            
+        Get raw 24h ticker rows for the whole market.
+
+        The payload covers every listed symbol (~1 MB), so it is decoded
+        with orjson. Prefer get_multiple_tickers, which serves subsets from
+        the shared snapshot.
+
         Returns:
-            List of TickerStats
+            List of raw Binance ticker dicts
         """
-        binance_symbols = [self.to_binance_symbol(s) for s in symbols]
-        
         session = await self._get_session()
         url = f"{self.BASE_URL}/ticker/24hr"
         
+        started = time.perf_counter()
         try:
             async with session.get(url) as response:
                 if response.status != 200:
+                    _ERRORS["ticker_24hr_all"].inc()
+                    logger.error(f"Binance API error: {response.status}")
                     return []
                 
-                all_tickers = await response.json()
-                
-                result = []
-                for data in all_tickers:
-                    if data["symbol"] in binance_symbols:
-                        result.append(TickerStats(
-                            symbol=self.from_binance_symbol(data["symbol"]),
-                            price=Decimal(data["lastPrice"]),
-                            change_24h=Decimal(data["priceChange"]),
-                            change_percent_24h=Decimal(data["priceChangePercent"]),
-                            high_24h=Decimal(data["highPrice"]),
-                            low_24h=Decimal(data["lowPrice"]),
-                            volume_24h=Decimal(data["quoteVolume"]),
-                        ))
-                
-                return result
+                return orjson.loads(await response.read())
                 
         except asyncio.CancelledError:
             raise
         except aiohttp.ClientError as e:
+            _ERRORS["ticker_24hr_all"].inc()
+            logger.error(f"Binance tickers fetch error: {str(e)}")
+            return []
+        finally:
+            _observe("ticker_24hr_all", started)
+    
+    async def get_multiple_tickers(self, symbols: List[str]) -> List[TickerStats]:
+        """
+        Get 24h tickers for multiple symbols.
+        
+        Served from the shared full-market ticker snapshot, so only the
+        requested symbols are looked up instead of scanning the whole market.
+        
+        Args:
+            symbols: List of symbols
+            
+        Returns:
+            List of TickerStats (in request order, unknown symbols skipped)
+        """
+        # Import here to avoid circular import
+        from app.integrations.market_data.ticker_snapshot import get_ticker_snapshot
+        
+        try:
+            return await get_ticker_snapshot().get_tickers(symbols)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
             logger.error(f"Binance tickers fetch error: {str(e)}")
             return []
     
@@ -308,11 +378,15 @@ class BinanceClient:
         session = await self._get_session()
         url = f"{self.BASE_URL}/time"
         
+        started = time.perf_counter()
         try:
             async with session.get(url) as response:
                 return response.status == 200
         except:
+            _ERRORS["time"].inc()
             return False
+        finally:
+            _observe("time", started)
 
 
 # Singleton instance
@@ -0,0 +1,278 @@
+"""
+Binance Market Stream
+
+Combined-stream ingestion (aggTrade, bookTicker, kline) into an in-memory
+price, quote and candle book.
+
+The book is the process-local source of truth for live ticks: readers get
+the latest trade price, top-of-book quote or recent candles with a dict
+lookup instead of a REST round-trip. Dirty symbols are mirrored to Redis
+(``price:{symbol}`` / ``quote:{symbol}``, the same keys the Polygon
+manager uses) about once a second so other workers and Celery tasks can
+read them too.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import time
+from collections import deque
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import aiohttp
+import orjson
+
+from app.integrations.market_data.binance_client import BinanceClient
+from app.utils.cache import get_redis_client
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443/stream"
+
+
+class MarketBook:
+    """
+    In-memory book of the latest trade price, quote and candles per symbol.
+
+    Symbols are stored in Binance format (BTCUSDT); lookups accept either
+    format.
+    """
+
+    def __init__(self, candle_history: int = 500):
+        self.candle_history = candle_history
+        self._prices: Dict[str, Tuple[Decimal, float]] = {}
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._candles: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        self._dirty: Set[str] = set()
+
+    def update_trade(self, symbol: str, price: str, received_at: Optional[float] = None) -> None:
+        """Record the latest trade price for a symbol."""
+        self._prices[symbol] = (Decimal(price), received_at or time.time())
+        self._dirty.add(symbol)
+
+    def update_quote(self, symbol: str, bid: str, bid_qty: str, ask: str, ask_qty: str) -> None:
+        """Record the latest top-of-book quote for a symbol."""
+        self._quotes[symbol] = {
+            "bid": Decimal(bid),
+            "bid_qty": Decimal(bid_qty),
+            "ask": Decimal(ask),
+            "ask_qty": Decimal(ask_qty),
+            "updated_at": time.time(),
+        }
+        self._dirty.add(symbol)
+
+    def update_candle(self, symbol: str, interval: str, kline: Dict[str, Any]) -> None:
+        """Upsert the candle for its open time (the live candle updates in place)."""
+        candles = self._candles.get((symbol, interval))
+        if candles is None:
+            candles = deque(maxlen=self.candle_history)
+            self._candles[(symbol, interval)] = candles
+        candle = {
+            "time": int(kline["t"]) // 1000,
+            "open": float(kline["o"]),
+            "high": float(kline["h"]),
+            "low": float(kline["l"]),
+            "close": float(kline["c"]),
+            "volume": float(kline["v"]),
+            "closed": bool(kline["x"]),
+        }
+        if candles and candles[-1]["time"] == candle["time"]:
+            candles[-1] = candle
+        else:
+            candles.append(candle)
+
+    def get_price(self, symbol: str, max_age_seconds: Optional[float] = None) -> Optional[Decimal]:
+        """Latest trade price, or None if unknown or older than max_age_seconds."""
+        entry = self._prices.get(BinanceClient.to_binance_symbol(symbol))
+        if entry is None:
+            return None
+        price, received_at = entry
+        if max_age_seconds is not None and time.time() - received_at > max_age_seconds:
+            return None
+        return price
+
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Latest top-of-book quote."""
+        return self._quotes.get(BinanceClient.to_binance_symbol(symbol))
+
+    def get_candles(self, symbol: str, interval: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Most recent candles (oldest first) seen since the stream connected."""
+        candles = list(self._candles.get((BinanceClient.to_binance_symbol(symbol), interval), ()))
+        return candles[-limit:] if limit else candles
+
+    def drop_symbols(self, symbols: Iterable[str]) -> None:
+        """Forget state for symbols that are no longer streamed."""
+        for symbol in symbols:
+            self._prices.pop(symbol, None)
+            self._quotes.pop(symbol, None)
+            self._dirty.discard(symbol)
+            for key in [k for k in self._candles if k[0] == symbol]:
+                del self._candles[key]
+
+    def pop_dirty(self) -> Set[str]:
+        """Return and clear the symbols updated since the last call."""
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+
+class BinanceMarketStream:
+    """
+    Binance combined-stream consumer feeding a MarketBook.
+
+    The symbol set is re-read from ``symbols_provider`` periodically and
+    applied with SUBSCRIBE/UNSUBSCRIBE on the open connection.
+
+    Usage:
+        stream = BinanceMarketStream(get_market_book(), provider)
+        await stream.run_forever()
+    """
+
+    def __init__(
+        self,
+        book: MarketBook,
+        symbols_provider: Callable[[], Awaitable[Set[str]]],
+        kline_interval: str = "1m",
+        symbol_refresh_seconds: float = 30.0,
+        mirror_interval_seconds: float = 1.0,
+    ):
+        self.book = book
+        self.symbols_provider = symbols_provider
+        self.kline_interval = kline_interval
+        self.symbol_refresh_seconds = symbol_refresh_seconds
+        self.mirror_interval_seconds = mirror_interval_seconds
+        self.symbols: Set[str] = set()
+        self._request_id = 0
+        self.stats = {"messages": 0, "reconnects": 0, "errors": 0}
+
+    def _streams_for(self, symbols: Iterable[str]) -> List[str]:
+        streams = []
+        for symbol in sorted(symbols):
+            lower = symbol.lower()
+            streams.extend([
+                f"{lower}@aggTrade",
+                f"{lower}@bookTicker",
+                f"{lower}@kline_{self.kline_interval}",
+            ])
+        return streams
+
+    async def _load_symbols(self) -> Set[str]:
+        symbols = await self.symbols_provider()
+        return {BinanceClient.to_binance_symbol(s) for s in symbols if s}
+
+    def handle_message(self, raw: Any) -> None:
+        """Apply one combined-stream message to the book."""
+        message = orjson.loads(raw)
+        data = message.get("data")
+        if not data:
+            return
+        event = data.get("e")
+        self.stats["messages"] += 1
+        if event == "aggTrade":
+            self.book.update_trade(data["s"], data["p"])
+        elif event == "kline":
+            self.book.update_candle(data["s"], data["k"]["i"], data["k"])
+        elif "b" in data and "a" in data and "s" in data:
+            # bookTicker payloads carry no event type
+            self.book.update_quote(data["s"], data["b"], data["B"], data["a"], data["A"])
+
+    async def _send_subscription(self, ws: aiohttp.ClientWebSocketResponse, method: str, symbols: Set[str]) -> None:
+        if not symbols:
+            return
+        self._request_id += 1
+        await ws.send_str(orjson.dumps({
+            "method": method,
+            "params": self._streams_for(symbols),
+            "id": self._request_id,
+        }).decode())
+
+    async def _sync_symbols(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        wanted = await self._load_symbols()
+        added, removed = wanted - self.symbols, self.symbols - wanted
+        await self._send_subscription(ws, "UNSUBSCRIBE", removed)
+        await self._send_subscription(ws, "SUBSCRIBE", added)
+        if added or removed:
+            logger.info(f"Market stream symbols: +{sorted(added)} -{sorted(removed)}")
+        self.book.drop_symbols(removed)
+        self.symbols = wanted
+
+    async def mirror_to_redis(self) -> None:
+        """Write the latest price and quote of updated symbols to Redis."""
+        dirty = self.book.pop_dirty()
+        if not dirty:
+            return
+        try:
+            redis_client = await get_redis_client()
+            pipe = redis_client.pipeline(transaction=False)
+            for symbol in dirty:
+                universal = BinanceClient.from_binance_symbol(symbol)
+                price = self.book.get_price(symbol)
+                if price is not None:
+                    pipe.set(f"price:{universal}", str(price), ex=60)
+                quote = self.book.get_quote(symbol)
+                if quote:
+                    pipe.hset(f"quote:{universal}", mapping={"bid": str(quote["bid"]), "ask": str(quote["ask"])})
+                    pipe.expire(f"quote:{universal}", 60)
+            await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Market book Redis mirror failed: {e}")
+
+    async def run_forever(self) -> None:
+        """Consume the combined stream until cancelled, reconnecting with backoff."""
+        backoff = 1.0
+        while True:
+            try:
+                self.symbols = await self._load_symbols()
+                if not self.symbols:
+                    await asyncio.sleep(self.symbol_refresh_seconds)
+                    continue
+
+                url = f"{BINANCE_STREAM_URL}?streams={'/'.join(self._streams_for(self.symbols))}"
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(url, heartbeat=30) as ws:
+                        logger.info(f"Market stream connected for {len(self.symbols)} symbols")
+                        backoff = 1.0
+                        last_sync = last_mirror = time.time()
+                        while True:
+                            try:
+                                msg = await ws.receive(timeout=self.mirror_interval_seconds)
+                            except asyncio.TimeoutError:
+                                # Quiet connection: fall through to mirror / resync
+                                msg = None
+                            if msg is not None:
+                                if msg.type == aiohttp.WSMsgType.TEXT:
+                                    self.handle_message(msg.data)
+                                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.ERROR):
+                                    break
+
+                            now = time.time()
+                            if now - last_mirror >= self.mirror_interval_seconds:
+                                last_mirror = now
+                                await self.mirror_to_redis()
+                            if now - last_sync >= self.symbol_refresh_seconds:
+                                last_sync = now
+                                await self._sync_symbols(ws)
+                                if not self.symbols:
+                                    break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Market stream error: {e}")
+            self.stats["reconnects"] += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+
+# Singleton instance
+_market_book: Optional[MarketBook] = None
+
+
+def get_market_book() -> MarketBook:
+    """Get singleton market book."""
+    global _market_book
+    if _market_book is None:
+        _market_book = MarketBook()
+    return _market_book
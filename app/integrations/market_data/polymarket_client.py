@@ -15,6 +15,7 @@ import httpx
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 
+from app.integrations.sentiment.scoring import compile_keyword_pattern
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -40,6 +41,17 @@ class PolymarketMarketDataClient:
         "1h": [r"1h", r"1\s*hour", r"1-hour", r"60\s*min"],
     }
     
+    # Each timeframe's patterns compiled into one alternation
+    _TIMEFRAME_REGEXES = {
+        timeframe: re.compile("|".join(patterns), re.IGNORECASE)
+        for timeframe, patterns in TIMEFRAME_PATTERNS.items()
+    }
+    _TIME_RANGE_REGEX = re.compile(
+        r"(\d{1,2}):(\d{2})\s*(?:AM|PM)?\s*-\s*(\d{1,2}):(\d{2})\s*(?:AM|PM)?", re.IGNORECASE
+    )
+    _BTC_REGEX = compile_keyword_pattern(["bitcoin", "btc"])
+    _DIRECTION_REGEX = compile_keyword_pattern(["up", "down", "price", "higher", "lower", "rise", "fall"])
+    
     def __init__(self):
         """Initialize Polymarket client."""
         self._client: Optional[httpx.AsyncClient] = None
@@ -71,45 +83,31 @@ class PolymarketMarketDataClient:
         Returns:
             True if market matches target timeframe
         """
-        patterns = self.TIMEFRAME_PATTERNS.get(target_timeframe, [])
-        if not patterns:
+        pattern = self._TIMEFRAME_REGEXES.get(target_timeframe)
+        if pattern is None:
             return False
         
-        # 1. Check slug (most reliable)
-        slug = market.get("slug", "").lower()
-        for pattern in patterns:
-            if re.search(pattern, slug, re.IGNORECASE):
-                return True
-        
-        # 2. Check tags/series metadata
-        tags = market.get("tags", [])
+        # Slug, tags/series metadata and question text are all searched in
+        # one pass; "\x00" keeps a pattern from matching across fields
+        slug = (market.get("slug") or "").lower()
+        fields = [slug]
+        tags = market.get("tags") or []
         if isinstance(tags, list):
-            for tag in tags:
-                tag_str = str(tag).lower() if tag else ""
-                for pattern in patterns:
-                    if re.search(pattern, tag_str, re.IGNORECASE):
-                        return True
-        
+            fields.extend(str(tag).lower() if tag else "" for tag in tags)
         series = market.get("series", "")
         if series:
-            for pattern in patterns:
-                if re.search(pattern, str(series).lower(), re.IGNORECASE):
-                    return True
+            fields.append(str(series).lower())
+        question = (market.get("question") or "").lower()
+        title = (market.get("title") or "").lower()
+        description = (market.get("description") or "").lower()
+        fields.extend((question, title, description))
         
-        # 3. Fallback to question text
-        question = market.get("question", "").lower()
-        title = market.get("title", "").lower()
-        description = market.get("description", "").lower()
-        
-        for text in [question, title, description]:
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return True
+        if pattern.search("\x00".join(fields)):
+            return True
         
         # Check for time range patterns like "3:00AM-3:15AM" (15m) or "3:00AM-4:00AM" (1h)
-        time_range_pattern = r"(\d{1,2}):(\d{2})\s*(?:AM|PM)?\s*-\s*(\d{1,2}):(\d{2})\s*(?:AM|PM)?"
         for text in [question, title]:
-            match = re.search(time_range_pattern, text, re.IGNORECASE)
+            match = self._TIME_RANGE_REGEX.search(text)
             if match:
                 start_hour, start_min = int(match.group(1)), int(match.group(2))
                 end_hour, end_min = int(match.group(3)), int(match.group(4))
@@ -141,17 +139,11 @@ class PolymarketMarketDataClient:
         slug = market.get("slug", "").lower()
         
         # Must contain Bitcoin/BTC
-        btc_keywords = ["bitcoin", "btc"]
-        has_btc = any(kw in question or kw in title or kw in slug for kw in btc_keywords)
-        
-        if not has_btc:
+        if not (self._BTC_REGEX.search(question) or self._BTC_REGEX.search(title) or self._BTC_REGEX.search(slug)):
             return False
         
         # Must be about price direction
-        direction_keywords = ["up", "down", "price", "higher", "lower", "rise", "fall"]
-        has_direction = any(kw in question or kw in title for kw in direction_keywords)
-        
-        return has_direction
+        return bool(self._DIRECTION_REGEX.search(question) or self._DIRECTION_REGEX.search(title))
     
     def _extract_probability(self, market: Dict[str, Any]) -> Optional[Dict[str, float]]:
         """
@@ -262,47 +254,27 @@ class PolymarketMarketDataClient:
             }
         """
         try:
-            # Search for Bitcoin markets
-            markets = await self.search_markets("Bitcoin", limit=200)
+            # Markets are classified once by the background-maintained index;
+            # refresh it here only if the background task isn't running
+            from app.integrations.market_data.polymarket_index import get_polymarket_index
             
-            if not markets:
-                logger.warning("No Bitcoin markets found on Polymarket")
-                return None
-            
-            # Filter for BTC Price Up/Down markets with matching timeframe
-            matching_markets = []
-            for market in markets:
-                if self._is_btc_price_up_market(market) and self._detect_timeframe(market, timeframe):
-                    probs = self._extract_probability(market)
-                    if probs:
-                        matching_markets.append({
-                            "market": market,
-                            "probabilities": probs,
-                        })
+            index = get_polymarket_index()
+            if not index.is_fresh():
+                await index.refresh()
             
-            if not matching_markets:
+            odds = index.get_odds("BTC", "up", timeframe)
+            if not odds:
                 logger.info(f"No BTC Price Up markets found for {timeframe} timeframe")
                 return None
             
-            # Use the first matching market (most recent/active)
-            best_match = matching_markets[0]
-            market = best_match["market"]
-            probs = best_match["probabilities"]
-            
             result = {
-                "probability": probs["yes_price"],
-                "timeframe": timeframe,
-                "market_id": market.get("id") or market.get("condition_id", ""),
-                "yes_price": probs["yes_price"],
-                "no_price": probs["no_price"],
-                "question": market.get("question", ""),
-                "slug": market.get("slug", ""),
+                **odds,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
             
             logger.info(
                 f"Polymarket BTC Price Up odds ({timeframe}): "
-                f"Yes={probs['yes_price']:.1%}, No={probs['no_price']:.1%}"
+                f"Yes={odds['yes_price']:.1%}, No={odds['no_price']:.1%}"
             )
             
             return result
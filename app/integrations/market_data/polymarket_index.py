@@ -0,0 +1,366 @@
+"""
+Polymarket Market Index
+
+In-memory index of Polymarket price-direction markets keyed by
+(asset, direction, timeframe), so odds lookups are dictionary reads.
+
+Each market is classified once, when it first arrives or changes, instead
+of on every odds request. A full refresh pages through the open markets
+in Gamma's default order; between full refreshes the index is refreshed
+incrementally from the markets ordered by ``updatedAt`` (newest first),
+stopping a short overlap before the last ``updatedAt`` already seen (so
+markets sharing that timestamp aren't missed), which also picks up
+markets that closed. Outcome prices are kept per CLOB token id as well.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.config.settings import get_settings
+from app.integrations.market_data.polymarket_client import (
+    PolymarketMarketDataClient,
+    get_polymarket_client,
+)
+from app.integrations.sentiment.scoring import compile_keyword_pattern
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (asset, direction, timeframe), e.g. ("BTC", "up", "1h")
+MarketKey = Tuple[str, str, str]
+
+# Asset name (must appear somewhere in the market) and the keywords that
+# must appear in its question, title or slug
+ASSET_KEYWORDS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "BTC": ("bitcoin", ("bitcoin", "btc")),
+}
+TIMEFRAMES = ("15m", "1h")
+DIRECTIONS = ("up", "down")
+
+# Incremental refreshes re-read markets this close to the watermark
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+# Gamma returns these list fields JSON-encoded
+_JSON_LIST_FIELDS = ("outcomes", "outcomePrices", "clobTokenIds")
+
+_ASSET_PATTERNS = {
+    asset: compile_keyword_pattern(keywords)
+    for asset, (_, keywords) in ASSET_KEYWORDS.items()
+}
+
+
+def _normalize(market: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode JSON-encoded list fields."""
+    if not any(isinstance(market.get(f), str) for f in _JSON_LIST_FIELDS):
+        return market
+    market = dict(market)
+    for f in _JSON_LIST_FIELDS:
+        value = market.get(f)
+        if isinstance(value, str):
+            try:
+                market[f] = orjson.loads(value)
+            except orjson.JSONDecodeError:
+                market[f] = []
+    return market
+
+
+class PolymarketMarketIndex:
+    """
+    Polymarket market index.
+
+    Usage:
+        index = get_polymarket_index()
+        await index.refresh()
+        odds = index.get_odds("BTC", "up", "1h")
+    """
+
+    def __init__(
+        self,
+        client: Optional[PolymarketMarketDataClient] = None,
+        refresh_seconds: Optional[float] = None,
+        full_refresh_seconds: Optional[float] = None,
+        max_markets: Optional[int] = None,
+        page_size: int = 500,
+    ):
+        settings = get_settings()
+        self.client = client
+        self.refresh_seconds = float(refresh_seconds or getattr(settings, "POLYMARKET_INDEX_REFRESH_SECONDS", 30))
+        self.full_refresh_seconds = float(
+            full_refresh_seconds or getattr(settings, "POLYMARKET_INDEX_FULL_REFRESH_SECONDS", 600)
+        )
+        self.max_markets = int(max_markets or getattr(settings, "POLYMARKET_INDEX_MAX_MARKETS", 2000))
+        self.page_size = page_size
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._by_key: Dict[MarketKey, List[str]] = {}
+        self._token_prices: Dict[str, float] = {}
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at = 0.0
+        self._full_refreshed_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the index was last refreshed."""
+        return time.time() - self._refreshed_at
+
+    def is_fresh(self) -> bool:
+        """True if the index was refreshed within twice the refresh cadence."""
+        return self._refreshed_at > 0 and self.age_seconds < self.refresh_seconds * 2
+
+    def _client(self) -> PolymarketMarketDataClient:
+        return self.client or get_polymarket_client()
+
+    # ==================== CLASSIFICATION ====================
+
+    def classify(self, market: Dict[str, Any]) -> List[MarketKey]:
+        """Get the index keys a market belongs to (empty if none)."""
+        client = self._client()
+        # Gamma sends null for missing text fields
+        question = (market.get("question") or "").lower()
+        title = (market.get("title") or "").lower()
+        slug = (market.get("slug") or "").lower()
+        description = (market.get("description") or "").lower()
+
+        if not client._DIRECTION_REGEX.search(question) and not client._DIRECTION_REGEX.search(title):
+            return []
+
+        keys: List[MarketKey] = []
+        for asset, (name, _) in ASSET_KEYWORDS.items():
+            if not any(name in text for text in (question, title, description, slug)):
+                continue
+            pattern = _ASSET_PATTERNS[asset]
+            if not (pattern.search(question) or pattern.search(title) or pattern.search(slug)):
+                continue
+            for timeframe in TIMEFRAMES:
+                if client._detect_timeframe(market, timeframe):
+                    keys.extend((asset, direction, timeframe) for direction in DIRECTIONS)
+        return keys
+
+    # ==================== UPDATES ====================
+
+    def upsert(self, market: Dict[str, Any]) -> bool:
+        """
+        Add or update one market.
+
+        Closed or inactive markets are removed. Markets keep their position
+        among a key's candidates across updates.
+
+        Returns:
+            True if the market is indexed
+        """
+        market_id = str(market.get("id") or market.get("condition_id") or "")
+        if not market_id:
+            return False
+        if market.get("closed") or market.get("active") is False:
+            self.remove(market_id)
+            return False
+
+        market = _normalize(market)
+        keys = self.classify(market)
+        probs = self._client()._extract_probability(market) if keys else None
+        if not keys or not probs:
+            self.remove(market_id)
+            return False
+
+        previous = self._entries.get(market_id)
+        for key in keys:
+            candidates = self._by_key.setdefault(key, [])
+            if market_id not in candidates:
+                candidates.append(market_id)
+        if previous:
+            for key in set(previous["keys"]) - set(keys):
+                self._unlink(key, market_id)
+
+        token_ids = [str(t) for t in market.get("clobTokenIds") or []]
+        prices = market.get("outcomePrices") or []
+        for token_id, price in zip(token_ids, prices):
+            try:
+                self._token_prices[token_id] = float(price)
+            except (TypeError, ValueError):
+                continue
+
+        self._entries[market_id] = {
+            "market_id": market_id,
+            "keys": keys,
+            "question": market.get("question") or "",
+            "slug": market.get("slug") or "",
+            "yes_price": probs["yes_price"],
+            "no_price": probs["no_price"],
+            "token_ids": token_ids,
+            "updated_at": market.get("updatedAt"),
+        }
+        return True
+
+    def _unlink(self, key: MarketKey, market_id: str) -> None:
+        candidates = self._by_key.get(key)
+        if candidates and market_id in candidates:
+            candidates.remove(market_id)
+            if not candidates:
+                del self._by_key[key]
+
+    def remove(self, market_id: str) -> None:
+        """Drop a market from the index."""
+        entry = self._entries.pop(market_id, None)
+        if not entry:
+            return
+        for key in entry["keys"]:
+            self._unlink(key, market_id)
+        for token_id in entry["token_ids"]:
+            self._token_prices.pop(token_id, None)
+
+    def load(self, markets: List[Dict[str, Any]]) -> int:
+        """Replace the index with a full snapshot, in snapshot order."""
+        self._entries.clear()
+        self._by_key.clear()
+        self._token_prices.clear()
+        for market in markets:
+            self.upsert(market)
+        self._watermark = max(filter(None, map(_parse_updated_at, markets)), default=self._watermark)
+        now = time.time()
+        self._refreshed_at = self._full_refreshed_at = now
+        return len(self._entries)
+
+    # ==================== LOOKUPS ====================
+
+    def get_odds(self, asset: str, direction: str, timeframe: str) -> Optional[Dict[str, Any]]:
+        """
+        Get odds for the first indexed market of a key.
+
+        ``probability`` is the chance of ``direction`` (the Yes price for
+        "up", the No price for "down").
+        """
+        candidates = self._by_key.get((asset.upper(), direction, timeframe))
+        if not candidates:
+            return None
+        entry = self._entries[candidates[0]]
+        probability = entry["yes_price"] if direction == "up" else entry["no_price"]
+        return {
+            "probability": probability,
+            "timeframe": timeframe,
+            "market_id": entry["market_id"],
+            "yes_price": entry["yes_price"],
+            "no_price": entry["no_price"],
+            "question": entry["question"],
+            "slug": entry["slug"],
+        }
+
+    def get_token_price(self, token_id: str) -> Optional[float]:
+        """Get the last outcome price of a CLOB token."""
+        return self._token_prices.get(str(token_id))
+
+    # ==================== REFRESH ====================
+
+    async def _fetch_page(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        http = await self._client()._get_client()
+        response = await http.get(f"{PolymarketMarketDataClient.GAMMA_API}/markets", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def _refresh_full(self) -> int:
+        markets: List[Dict[str, Any]] = []
+        offset = 0
+        while offset < self.max_markets:
+            page = await self._fetch_page({"closed": "false", "limit": self.page_size, "offset": offset})
+            markets.extend(page)
+            if len(page) < self.page_size:
+                break
+            offset += self.page_size
+        return self.load(markets)
+
+    async def _refresh_incremental(self) -> int:
+        changed = 0
+        newest = self._watermark
+        cutoff = self._watermark - WATERMARK_OVERLAP if self._watermark is not None else None
+        offset = 0
+        while offset < self.max_markets:
+            page = await self._fetch_page({
+                "order": "updatedAt",
+                "ascending": "false",
+                "limit": self.page_size,
+                "offset": offset,
+            })
+            reached_watermark = False
+            for market in page:
+                updated_at = _parse_updated_at(market)
+                if updated_at is not None and cutoff is not None and updated_at < cutoff:
+                    reached_watermark = True
+                    break
+                if updated_at is not None and (newest is None or updated_at > newest):
+                    newest = updated_at
+                self.upsert(market)
+                # Markets in the overlap were usually applied last time
+                if updated_at is None or self._watermark is None or updated_at > self._watermark:
+                    changed += 1
+            if reached_watermark or len(page) < self.page_size:
+                break
+            offset += self.page_size
+        self._watermark = newest
+        self._refreshed_at = time.time()
+        return changed
+
+    async def refresh(self, full: bool = False) -> int:
+        """
+        Refresh the index (single-flight).
+
+        Runs a full refresh when asked, on first use, or when the last one
+        is older than ``full_refresh_seconds``; otherwise an incremental one.
+
+        Returns:
+            Number of indexed markets (full) or changed markets (incremental)
+        """
+        started = time.time()
+        async with self._refresh_lock:
+            # Another caller refreshed while we waited for the lock
+            if self._refreshed_at >= started:
+                return len(self._entries)
+            if full or self._watermark is None or started - self._full_refreshed_at >= self.full_refresh_seconds:
+                count = await self._refresh_full()
+                logger.debug(f"Polymarket index rebuilt: {count} markets")
+            else:
+                count = await self._refresh_incremental()
+                logger.debug(f"Polymarket index refreshed: {count} markets changed")
+            return count
+
+    async def refresh_forever(self) -> None:
+        """Keep the index refreshed until cancelled."""
+        backoff = self.refresh_seconds
+        while True:
+            try:
+                await self.refresh()
+                backoff = self.refresh_seconds
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Polymarket index refresh failed: {e}")
+                backoff = min(backoff * 2, 300.0)
+            await asyncio.sleep(backoff)
+
+
+def _parse_updated_at(market: Dict[str, Any]) -> Optional[datetime]:
+    value = market.get("updatedAt")
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+# Singleton instance
+_polymarket_index: Optional[PolymarketMarketIndex] = None
+
+
+def get_polymarket_index() -> PolymarketMarketIndex:
+    """Get singleton Polymarket market index."""
+    global _polymarket_index
+    if _polymarket_index is None:
+        _polymarket_index = PolymarketMarketIndex()
+    return _polymarket_index
@@ -4,14 +4,25 @@ Reddit Guerrilla Market Data Client
 Fetches crypto sentiment from Reddit using the .json endpoint hack.
 No API credentials required - bypasses official API rate limits.
 
+Subreddits are fetched concurrently (bounded, behind a shared per-host
+rate limiter) with ETag / If-Modified-Since revalidation, and listings
+are cached per subreddit with posts stored once by id, so subreddits
+shared by several symbols (r/CryptoCurrency) are fetched once per
+cache TTL for all of them.
+
 Author: Moniqo Team
 Last Updated: 2026-01-23
 """
 
+import asyncio
+import time
 import httpx
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 
+from app.config.settings import get_settings
+from app.integrations.sentiment.scoring import KeywordSentimentScorer
+from app.utils.rate_limiter import get_host_rate_limiter
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -69,9 +80,37 @@ class RedditGuerrillaClient:
         "exploit", "rug pull", "liquidation", "capitulation"
     }
     
+    # Multi-word phrases (substring match) with (bullish, bearish) weights
+    PHRASES = {
+        "rug pull": (0, 2),
+        "all time high": (2, 0),
+        "to the moon": (2, 0),
+    }
+    
+    SCORER = KeywordSentimentScorer(BULLISH_WORDS, BEARISH_WORDS, PHRASES)
+    
+    REDDIT_HOST = "www.reddit.com"
+    
+    # Listings are always fetched at the unauthenticated maximum and sliced
+    # per caller, so one fetch serves every limit
+    FETCH_LIMIT = 25
+    
     def __init__(self):
         """Initialize Reddit Guerrilla client."""
+        settings = get_settings()
         self._client: Optional[httpx.AsyncClient] = None
+        self.cache_ttl_seconds = float(getattr(settings, "REDDIT_CACHE_TTL_SECONDS", 120))
+        self._semaphore = asyncio.Semaphore(int(getattr(settings, "REDDIT_MAX_CONCURRENCY", 4)))
+        self._rate_limiter = get_host_rate_limiter(
+            self.REDDIT_HOST,
+            rate_per_minute=float(getattr(settings, "REDDIT_REQUESTS_PER_MINUTE", 30)),
+            burst=int(getattr(settings, "REDDIT_RATE_LIMIT_BURST", 5)),
+        )
+        # Subreddit (lowercase) -> {"post_ids", "etag", "last_modified", "fetched_at"}
+        self._feeds: Dict[str, Dict[str, Any]] = {}
+        # Post id -> post, shared by every subreddit listing that includes it
+        self._posts: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
     
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client with browser User-Agent."""
@@ -103,68 +142,133 @@ class RedditGuerrillaClient:
         # Default fallback for unknown symbols
         return ["CryptoCurrency", "CryptoMarkets"]
     
+    def _feed_is_fresh(self, feed: Optional[Dict[str, Any]]) -> bool:
+        return bool(feed) and time.monotonic() - feed["fetched_at"] < self.cache_ttl_seconds
+    
+    def _cached_posts(self, subreddit: str, limit: int) -> List[Dict[str, Any]]:
+        feed = self._feeds.get(subreddit.lower())
+        if not feed:
+            return []
+        return [self._posts[post_id] for post_id in feed["post_ids"][:limit] if post_id in self._posts]
+    
+    def _store_posts(self, subreddit: str, children: List[Dict[str, Any]]) -> List[str]:
+        """Store a listing's posts by id and return the ids in listing order."""
+        post_ids = []
+        for child in children:
+            post_data = child.get("data", {})
+            
+            # Skip stickied posts (usually mod announcements)
+            if post_data.get("stickied", False):
+                continue
+            
+            post_id = post_data.get("id", "") or post_data.get("name", "")
+            self._posts[post_id] = {
+                "id": post_id,
+                "title": post_data.get("title", ""),
+                "selftext": post_data.get("selftext", ""),
+                "ups": post_data.get("ups", 0),
+                "num_comments": post_data.get("num_comments", 0),
+                "subreddit": post_data.get("subreddit", subreddit),
+                "created_utc": post_data.get("created_utc", 0),
+                "url": post_data.get("url", ""),
+            }
+            if post_id not in post_ids:
+                post_ids.append(post_id)
+        return post_ids
+    
+    def _prune_posts(self) -> None:
+        """Drop posts no cached subreddit listing references."""
+        referenced = set()
+        for feed in self._feeds.values():
+            referenced.update(feed["post_ids"])
+        for post_id in [p for p in self._posts if p not in referenced]:
+            del self._posts[post_id]
+    
+    async def _refresh_subreddit(self, subreddit: str) -> None:
+        """Fetch a subreddit's hot listing, conditionally if it was seen before."""
+        key = subreddit.lower()
+        feed = self._feeds.get(key)
+        headers = {}
+        if feed and feed.get("etag"):
+            headers["If-None-Match"] = feed["etag"]
+        if feed and feed.get("last_modified"):
+            headers["If-Modified-Since"] = feed["last_modified"]
+        
+        client = await self._get_client()
+        
+        # Use the .json endpoint hack
+        url = f"https://{self.REDDIT_HOST}/r/{subreddit}/hot.json"
+        
+        async with self._semaphore:
+            await self._rate_limiter.acquire()
+            response = await client.get(
+                url,
+                params={
+                    "limit": self.FETCH_LIMIT,  # Reddit limits to 25 without auth
+                    "raw_json": 1,  # Get unescaped JSON
+                },
+                headers=headers,
+            )
+        
+        if response.status_code == 304 and feed:
+            feed["fetched_at"] = time.monotonic()
+            return
+        
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            try:
+                self._rate_limiter.pause(float(retry_after) if retry_after else 60.0)
+            except ValueError:
+                self._rate_limiter.pause(60.0)
+            logger.warning(f"Reddit rate limit hit for r/{subreddit}")
+            return
+        
+        if response.status_code != 200:
+            logger.warning(f"Reddit returned {response.status_code} for r/{subreddit}")
+            return
+        
+        data = response.json()
+        post_ids = self._store_posts(subreddit, data.get("data", {}).get("children", []))
+        self._feeds[key] = {
+            "post_ids": post_ids,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.monotonic(),
+        }
+        self._prune_posts()
+    
     async def _fetch_subreddit_hot(self, subreddit: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Fetch hot posts from a subreddit using .json endpoint.
         
+        Listings are cached for ``cache_ttl_seconds`` and shared by every
+        symbol mapped to the subreddit; concurrent callers share one
+        request. On errors the last cached listing is served.
+        
         Args:
             subreddit: Subreddit name (e.g., "Bitcoin")
-            limit: Maximum posts to fetch
+            limit: Maximum posts to return
             
         Returns:
             List of post data dicts
         """
-        try:
-            client = await self._get_client()
-            
-            # Use the .json endpoint hack
-            url = f"https://www.reddit.com/r/{subreddit}/hot.json"
-            
-            response = await client.get(
-                url,
-                params={
-                    "limit": min(limit, 25),  # Reddit limits to 25 without auth
-                    "raw_json": 1,  # Get unescaped JSON
-                },
-            )
-            
-            if response.status_code == 429:
-                logger.warning(f"Reddit rate limit hit for r/{subreddit}")
-                return []
-            
-            if response.status_code != 200:
-                logger.warning(f"Reddit returned {response.status_code} for r/{subreddit}")
-                return []
-            
-            data = response.json()
-            
-            posts = []
-            for child in data.get("data", {}).get("children", []):
-                post_data = child.get("data", {})
-                
-                # Skip stickied posts (usually mod announcements)
-                if post_data.get("stickied", False):
-                    continue
-                
-                posts.append({
-                    "id": post_data.get("id", ""),
-                    "title": post_data.get("title", ""),
-                    "selftext": post_data.get("selftext", ""),
-                    "ups": post_data.get("ups", 0),
-                    "num_comments": post_data.get("num_comments", 0),
-                    "subreddit": post_data.get("subreddit", subreddit),
-                    "created_utc": post_data.get("created_utc", 0),
-                    "url": post_data.get("url", ""),
-                })
-            
-            return posts
-            
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error fetching r/{subreddit}: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Error fetching r/{subreddit}: {e}")
-            return []
+        key = subreddit.lower()
+        if not self._feed_is_fresh(self._feeds.get(key)):
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._refresh_subreddit(subreddit))
+                self._inflight[key] = task
+                task.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+            try:
+                await asyncio.shield(task)
+            except httpx.HTTPError as e:
+                logger.error(f"HTTP error fetching r/{subreddit}: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error fetching r/{subreddit}: {e}")
+        
+        return self._cached_posts(subreddit, min(limit, self.FETCH_LIMIT))
     
     def _analyze_text_sentiment(self, texts: List[str]) -> float:
         """
@@ -176,32 +280,7 @@ class RedditGuerrillaClient:
         Returns:
             Sentiment score from -1.0 (bearish) to 1.0 (bullish)
         """
-        if not texts:
-            return 0.0
-        
-        scores = []
-        for text in texts:
-            text_lower = text.lower()
-            words = set(text_lower.split())
-            
-            bullish_count = len(words & self.BULLISH_WORDS)
-            bearish_count = len(words & self.BEARISH_WORDS)
-            
-            # Also check for multi-word phrases
-            for phrase in ["rug pull", "all time high", "to the moon"]:
-                if phrase in text_lower:
-                    if phrase == "rug pull":
-                        bearish_count += 2
-                    else:
-                        bullish_count += 2
-            
-            if bullish_count + bearish_count == 0:
-                scores.append(0.0)
-            else:
-                score = (bullish_count - bearish_count) / (bullish_count + bearish_count)
-                scores.append(score)
-        
-        return sum(scores) / len(scores) if scores else 0.0
+        return self.SCORER.average(texts)
     
     def _classify_sentiment(self, score: float) -> str:
         """
@@ -248,10 +327,11 @@ class RedditGuerrillaClient:
         try:
             subreddits = self._get_subreddits_for_symbol(symbol)
             
-            all_posts = []
-            for subreddit in subreddits:
-                posts = await self._fetch_subreddit_hot(subreddit, limit=limit)
-                all_posts.extend(posts)
+            # Fetch concurrently; posts are deduplicated by id across subreddits
+            listings = await asyncio.gather(
+                *(self._fetch_subreddit_hot(subreddit, limit=limit) for subreddit in subreddits)
+            )
+            all_posts = list({post["id"]: post for posts in listings for post in posts}.values())
             
             if not all_posts:
                 logger.info(f"No Reddit posts found for {symbol}")
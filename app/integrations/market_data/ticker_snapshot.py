@@ -0,0 +1,236 @@
+"""
+Binance Ticker Snapshot
+
+Shared full-market 24h ticker table for subset lookups.
+
+Binance only returns the multi-symbol 24h ticker as the full market
+(thousands of rows, ~1 MB of JSON). Instead of downloading and scanning it
+per request, the snapshot keeps one symbol-indexed table in memory,
+refreshed on a short cadence (single-flight) or kept live from the
+``!ticker@arr`` websocket stream, and mirrored to a Redis hash so other
+workers can serve subsets with a single ``HMGET`` instead of refetching.
+Any subset of k symbols is then served in O(k).
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+import orjson
+
+from app.config.settings import get_settings
+from app.integrations.market_data.binance_client import BinanceClient, TickerStats, get_binance_client
+from app.utils.cache import get_redis_client
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TICKER_SNAPSHOT_KEY = "market:tickers:24h"
+TICKER_SNAPSHOT_TS_KEY = "market:tickers:24h:refreshed_at"
+TICKER_STREAM_URL = "wss://stream.binance.com:9443/ws/!ticker@arr"
+
+# Compact row: (last price, price change, change %, high, low, quote volume),
+# kept as the raw strings Binance sends so Decimal conversion only happens
+# for the symbols actually served.
+TickerRow = Tuple[str, str, str, str, str, str]
+
+
+def _row_from_rest(data: Dict[str, str]) -> TickerRow:
+    return (
+        data["lastPrice"],
+        data["priceChange"],
+        data["priceChangePercent"],
+        data["highPrice"],
+        data["lowPrice"],
+        data["quoteVolume"],
+    )
+
+
+def _row_from_stream(data: Dict[str, str]) -> TickerRow:
+    return (data["c"], data["p"], data["P"], data["h"], data["l"], data["q"])
+
+
+def _to_ticker_stats(binance_symbol: str, row: TickerRow) -> TickerStats:
+    return TickerStats(
+        symbol=BinanceClient.from_binance_symbol(binance_symbol),
+        price=Decimal(row[0]),
+        change_24h=Decimal(row[1]),
+        change_percent_24h=Decimal(row[2]),
+        high_24h=Decimal(row[3]),
+        low_24h=Decimal(row[4]),
+        volume_24h=Decimal(row[5]),
+    )
+
+
+class TickerSnapshot:
+    """
+    Symbol-indexed 24h ticker table.
+
+    Usage:
+        snapshot = get_ticker_snapshot()
+        tickers = await snapshot.get_tickers(["BTC/USDT", "ETH/USDT"])
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        settings = get_settings()
+        self.ttl_seconds = float(ttl_seconds or getattr(settings, "TICKER_SNAPSHOT_TTL_SECONDS", 10))
+        self._rows: Dict[str, TickerRow] = {}
+        self._refreshed_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the in-memory table was last refreshed."""
+        return time.time() - self._refreshed_at
+
+    def _is_fresh(self) -> bool:
+        return bool(self._rows) and self.age_seconds < self.ttl_seconds
+
+    def load(self, rows: Dict[str, TickerRow]) -> None:
+        """Replace the in-memory table."""
+        self._rows = rows
+        self._refreshed_at = time.time()
+
+    async def _fetch_rows(self) -> Dict[str, TickerRow]:
+        payload = await get_binance_client().get_all_24h_tickers()
+        if not payload:
+            raise RuntimeError("Binance returned no 24h tickers")
+        return {data["symbol"]: _row_from_rest(data) for data in payload}
+
+    async def _mirror_to_redis(self, rows: Dict[str, TickerRow]) -> None:
+        try:
+            redis_client = await get_redis_client()
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hset(TICKER_SNAPSHOT_KEY, mapping={sym: "|".join(row) for sym, row in rows.items()})
+            pipe.expire(TICKER_SNAPSHOT_KEY, max(60, int(self.ttl_seconds * 6)))
+            pipe.set(TICKER_SNAPSHOT_TS_KEY, str(time.time()), ex=max(60, int(self.ttl_seconds * 6)))
+            await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Failed to mirror ticker snapshot to Redis: {e}")
+
+    async def _read_from_redis(self, binance_symbols: List[str]) -> Optional[Dict[str, TickerRow]]:
+        """Read a subset from the Redis mirror if another worker refreshed it recently."""
+        try:
+            redis_client = await get_redis_client()
+            refreshed_at = await redis_client.get(TICKER_SNAPSHOT_TS_KEY)
+            if not refreshed_at or time.time() - float(refreshed_at) >= self.ttl_seconds:
+                return None
+            values = await redis_client.hmget(TICKER_SNAPSHOT_KEY, binance_symbols)
+        except Exception as e:
+            logger.debug(f"Ticker snapshot Redis read failed: {e}")
+            return None
+        return {
+            sym: tuple(value.split("|"))
+            for sym, value in zip(binance_symbols, values)
+            if value
+        }
+
+    async def refresh(self) -> int:
+        """
+        Refresh the full table from Binance REST (single-flight).
+
+        Returns:
+            Number of symbols in the table
+        """
+        started = time.time()
+        async with self._refresh_lock:
+            # Another caller refreshed while we waited for the lock
+            if self._refreshed_at >= started and self._rows:
+                return len(self._rows)
+            rows = await self._fetch_rows()
+            self.load(rows)
+        await self._mirror_to_redis(rows)
+        logger.debug(f"Ticker snapshot refreshed: {len(rows)} symbols")
+        return len(rows)
+
+    async def get_tickers(self, symbols: Iterable[str]) -> List[TickerStats]:
+        """
+        Get 24h tickers for a subset of symbols, in request order.
+
+        Serves from memory when fresh, then from the Redis mirror, and only
+        then refreshes from Binance. A stale table is served if the refresh
+        fails.
+
+        Args:
+            symbols: Symbols like "BTC/USDT" or "BTCUSDT"
+
+        Returns:
+            List of TickerStats (unknown symbols are skipped)
+        """
+        binance_symbols = [BinanceClient.to_binance_symbol(s) for s in symbols]
+
+        rows: Optional[Dict[str, TickerRow]] = None
+        if self._is_fresh():
+            rows = self._rows
+        else:
+            rows = await self._read_from_redis(binance_symbols)
+            if rows is None:
+                try:
+                    await self.refresh()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if not self._rows:
+                        raise
+                    logger.warning(f"Ticker snapshot refresh failed, serving {self.age_seconds:.0f}s old data: {e}")
+                rows = self._rows
+
+        return [
+            _to_ticker_stats(sym, rows[sym])
+            for sym in binance_symbols
+            if sym in rows
+        ]
+
+    async def stream_forever(self) -> None:
+        """
+        Keep the table live from the ``!ticker@arr`` stream until cancelled.
+
+        The stream only carries symbols that changed in the last second, so
+        rows are merged into the table rather than replacing it. A REST
+        refresh seeds the table first.
+        """
+        backoff = 1.0
+        while True:
+            try:
+                if not self._rows:
+                    await self.refresh()
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(TICKER_STREAM_URL, heartbeat=30) as ws:
+                        logger.info("Ticker snapshot stream connected")
+                        backoff = 1.0
+                        mirrored_at = time.time()
+                        async for msg in ws:
+                            if msg.type != aiohttp.WSMsgType.TEXT:
+                                if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                    break
+                                continue
+                            updates = orjson.loads(msg.data)
+                            for data in updates:
+                                self._rows[data["s"]] = _row_from_stream(data)
+                            self._refreshed_at = time.time()
+                            if self._refreshed_at - mirrored_at >= self.ttl_seconds:
+                                mirrored_at = self._refreshed_at
+                                await self._mirror_to_redis(self._rows)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Ticker snapshot stream error: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+
+# Singleton instance
+_ticker_snapshot: Optional[TickerSnapshot] = None
+
+
+def get_ticker_snapshot() -> TickerSnapshot:
+    """Get singleton ticker snapshot."""
+    global _ticker_snapshot
+    if _ticker_snapshot is None:
+        _ticker_snapshot = TickerSnapshot()
+    return _ticker_snapshot
@@ -13,6 +13,8 @@ from datetime import datetime, timezone
 from enum import Enum
 from pydantic import BaseModel, Field
 
+from app.integrations.sentiment.scoring import DEFAULT_SCORER
+
 
 class SentimentScore(str, Enum):
     """Sentiment classification"""
@@ -119,7 +121,8 @@ class BaseSentimentClient(ABC):
         Simple keyword-based sentiment analysis.
         
         This is a basic implementation. For production, use a proper
-        NLP model or sentiment API.
+        NLP model or sentiment API. Keywords live in
+        ``app.integrations.sentiment.scoring``.
         
         Args:
             texts: List of text to analyze
@@ -127,37 +130,4 @@ class BaseSentimentClient(ABC):
         Returns:
             Average sentiment score (-1.0 to 1.0)
         """
-        if not texts:
-            return 0.0
-        
-        # Bullish keywords
-        bullish_words = {
-            "moon", "bullish", "buy", "long", "pump", "breakout", "ath",
-            "rally", "surge", "rocket", "explosion", "gains", "profit",
-            "hodl", "accumulate", "undervalued", "opportunity", "green",
-            "up", "higher", "bull", "lambo", "rich", "winner", "strong"
-        }
-        
-        # Bearish keywords
-        bearish_words = {
-            "dump", "bearish", "sell", "short", "crash", "drop", "dip",
-            "correction", "plunge", "tank", "dead", "scam", "rug",
-            "down", "lower", "bear", "loss", "red", "fear", "panic",
-            "weak", "overvalued", "bubble", "rekt", "loser"
-        }
-        
-        scores = []
-        for text in texts:
-            text_lower = text.lower()
-            words = set(text_lower.split())
-            
-            bullish_count = len(words & bullish_words)
-            bearish_count = len(words & bearish_words)
-            
-            if bullish_count + bearish_count == 0:
-                scores.append(0.0)
-            else:
-                score = (bullish_count - bearish_count) / (bullish_count + bearish_count)
-                scores.append(score)
-        
-        return sum(scores) / len(scores) if scores else 0.0
+        return DEFAULT_SCORER.average(texts)
@@ -14,10 +14,16 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 
 from app.integrations.sentiment.base import BaseSentimentClient, SentimentResult
+from app.integrations.sentiment.scoring import compile_keyword_pattern
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Price prediction markets ("Will BTC reach $100k?")
+PRICE_MARKET_PATTERN = compile_keyword_pattern(["price", "reach", "hit", "above", "below", "ath", "high"])
+# Questions where "Yes" is a bearish outcome
+BEARISH_QUESTION_PATTERN = compile_keyword_pattern(["drop", "fall", "below", "crash", "decline"])
+
 
 class PolymarketClient(BaseSentimentClient):
     """
@@ -175,8 +181,7 @@ class PolymarketClient(BaseSentimentClient):
             question = market.get("question", "").lower()
             
             # Check if it's a price prediction market
-            price_keywords = ["price", "reach", "hit", "above", "below", "ath", "high"]
-            is_price_market = any(kw in question for kw in price_keywords)
+            is_price_market = bool(PRICE_MARKET_PATTERN.search(question))
             
             if not is_price_market:
                 continue
@@ -197,8 +202,7 @@ class PolymarketClient(BaseSentimentClient):
                 # Determine if market is bullish or bearish
                 # "Will X reach $Y" with high yes = bullish
                 # "Will X drop below $Y" with high yes = bearish
-                bearish_words = ["drop", "fall", "below", "crash", "decline"]
-                is_bearish_question = any(w in question for w in bearish_words)
+                is_bearish_question = bool(BEARISH_QUESTION_PATTERN.search(question))
                 
                 if is_bearish_question:
                     # High yes prob on bearish question = bearish signal
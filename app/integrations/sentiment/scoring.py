@@ -0,0 +1,116 @@
+"""
+Keyword Sentiment Scoring
+
+Compiled keyword / phrase matchers shared by the sentiment and market
+data clients.
+
+Keywords are matched against whole whitespace-separated tokens, as
+``set(text.lower().split()) & keywords`` does, but in a single C-level
+``frozenset.intersection`` over the token stream, without building a
+set of every token in the post. Multi-word phrases are matched as
+substrings. Keyword lists that are only ever tested with ``kw in text``
+compile to one alternation regex, so each text is scanned once instead
+of once per keyword.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+# Keywords used by BaseSentimentClient._analyze_text_sentiment
+BULLISH_WORDS = frozenset({
+    "moon", "bullish", "buy", "long", "pump", "breakout", "ath",
+    "rally", "surge", "rocket", "explosion", "gains", "profit",
+    "hodl", "accumulate", "undervalued", "opportunity", "green",
+    "up", "higher", "bull", "lambo", "rich", "winner", "strong"
+})
+
+BEARISH_WORDS = frozenset({
+    "dump", "bearish", "sell", "short", "crash", "drop", "dip",
+    "correction", "plunge", "tank", "dead", "scam", "rug",
+    "down", "lower", "bear", "loss", "red", "fear", "panic",
+    "weak", "overvalued", "bubble", "rekt", "loser"
+})
+
+
+def compile_keyword_pattern(keywords: Iterable[str], flags: int = 0) -> Pattern:
+    """
+    Compile keywords into one alternation regex.
+
+    ``pattern.search(text)`` is true exactly when ``any(kw in text for kw in
+    keywords)`` is. Longer keywords are tried first.
+    """
+    escaped = sorted((re.escape(kw) for kw in set(keywords)), key=len, reverse=True)
+    return re.compile("|".join(escaped), flags)
+
+
+class KeywordSentimentScorer:
+    """
+    Keyword sentiment scorer.
+
+    Each text scores ``(bullish - bearish) / (bullish + bearish)`` where each
+    distinct keyword token counts once and each matched phrase adds its
+    weights; texts without matches score 0.0.
+
+    Usage:
+        scorer = KeywordSentimentScorer(BULLISH_WORDS, BEARISH_WORDS)
+        score = scorer.average(["BTC to the moon", "dump incoming"])
+    """
+
+    def __init__(
+        self,
+        bullish_words: Iterable[str],
+        bearish_words: Iterable[str],
+        phrases: Optional[Dict[str, Tuple[int, int]]] = None,
+    ):
+        """
+        Initialize the scorer.
+
+        Args:
+            bullish_words: Bullish keyword tokens
+            bearish_words: Bearish keyword tokens
+            phrases: Substring phrases mapped to (bullish, bearish) weights
+        """
+        self.bullish_words = frozenset(bullish_words)
+        self.bearish_words = frozenset(bearish_words)
+        self.keywords = self.bullish_words | self.bearish_words
+        self.phrases = tuple((phrase, weights[0], weights[1]) for phrase, weights in (phrases or {}).items())
+
+    def score_text(self, text: str) -> float:
+        """Score one text from -1.0 (bearish) to 1.0 (bullish)."""
+        return self.score_texts([text])[0]
+
+    def score_texts(self, texts: Iterable[str]) -> List[float]:
+        """Score a batch of texts in one loop with locally bound lookups."""
+        match_keywords = self.keywords.intersection
+        bullish_words, bearish_words, phrases = self.bullish_words, self.bearish_words, self.phrases
+        scores = []
+        append = scores.append
+        for text in texts:
+            text_lower = text.lower()
+            hits = match_keywords(text_lower.split())
+            if hits:
+                bullish_count = len(hits & bullish_words)
+                bearish_count = len(hits & bearish_words)
+            else:
+                bullish_count = bearish_count = 0
+            for phrase, bullish_weight, bearish_weight in phrases:
+                if phrase in text_lower:
+                    bullish_count += bullish_weight
+                    bearish_count += bearish_weight
+            total = bullish_count + bearish_count
+            append((bullish_count - bearish_count) / total if total else 0.0)
+        return scores
+
+    def average(self, texts: List[str]) -> float:
+        """Average score of a batch (0.0 for no texts)."""
+        if not texts:
+            return 0.0
+        scores = self.score_texts(texts)
+        return sum(scores) / len(scores)
+
+
+# Shared scorer for the base sentiment client
+DEFAULT_SCORER = KeywordSentimentScorer(BULLISH_WORDS, BEARISH_WORDS)
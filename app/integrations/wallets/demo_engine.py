@@ -0,0 +1,599 @@
+"""
+Demo Trading Engine
+
+In-memory paper-trading state and order matching for DemoWallet.
+
+Each demo wallet's ``demo_wallet_state`` document is loaded once and kept
+in memory, so balance checks need no database round-trips. Every fill is
+persisted as a single atomic update (``$set`` the new balances, ``$inc``
+stats, ``$push`` the transaction with ``$slice``, ``$pull`` the filled open
+order). New balances are computed in Decimal and the update only matches
+while the stored balances still equal the cached ones; on a conflict the
+state is reloaded and the funds check repeated, so a stale cache in another
+worker can't overdraw the wallet. Balance changes are written through;
+placed and cancelled orders are written behind in per-wallet
+``bulk_write`` batches while the engine loop is running.
+
+Open limit, stop-loss and take-profit orders are indexed per symbol in
+two heaps (fire-on-drop / fire-on-rise) and matched against the live
+Binance market book. Triggered orders are claimed with a conditional
+update on the order id, so two workers never fill the same order.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.config.settings import get_settings
+from app.integrations.market_data.binance_stream import get_market_book
+from app.integrations.wallets.base import InsufficientFundsError, OrderStatus, WalletError
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TRANSACTION_HISTORY_LIMIT = 1000
+# Compare-and-set retries before a balance write gives up
+BALANCE_WRITE_ATTEMPTS = 3
+
+
+def depth_slippage_rate(
+    quantity: Decimal,
+    top_quantity: Optional[Decimal],
+    slippage_rate: Decimal,
+    depth_impact_rate: Decimal,
+) -> Decimal:
+    """
+    Slippage for an order of a given size.
+
+    The base rate always applies. When the top-of-book size is known, each
+    multiple of it the order consumes adds ``depth_impact_rate``, which
+    approximates walking deeper levels of the book.
+    """
+    if top_quantity is None or top_quantity <= 0 or depth_impact_rate <= 0:
+        return slippage_rate
+    return slippage_rate + depth_impact_rate * (quantity / top_quantity)
+
+
+def execution_price_for(
+    side: str,
+    reference_price: Decimal,
+    slippage: Decimal,
+    limit_price: Optional[Decimal] = None,
+) -> Decimal:
+    """Apply adverse slippage to a reference price, capped at the limit price if any."""
+    if side == "buy":
+        price = reference_price * (Decimal("1") + slippage)
+        return min(price, limit_price) if limit_price is not None else price
+    price = reference_price * (Decimal("1") - slippage)
+    return max(price, limit_price) if limit_price is not None else price
+
+
+def trigger_for(order: Dict[str, Any]) -> Optional[Tuple[float, bool]]:
+    """
+    Get the trigger price of an open order and whether it fires on a drop.
+
+    Returns:
+        (trigger price, fires when price <= trigger) or None if not matchable
+    """
+    order_type, side = order.get("type"), order.get("side")
+    if order_type == "limit" and order.get("price") is not None:
+        return float(order["price"]), side == "buy"
+    if order.get("stop_price") is None:
+        return None
+    if order_type == "stop_loss":
+        return float(order["stop_price"]), side == "sell"
+    if order_type == "take_profit":
+        return float(order["stop_price"]), side == "buy"
+    return None
+
+
+class DemoAccount:
+    """One demo wallet's cached state and its not-yet-written updates."""
+
+    def __init__(self, db: AsyncIOMotorDatabase, state: Dict[str, Any]):
+        self.db = db
+        self.state = state
+        self.loaded_at = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.pending: List[UpdateOne] = []
+
+    @property
+    def user_wallet_id(self) -> str:
+        return self.state["user_wallet_id"]
+
+    def find_open_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        for order in self.state["open_orders"]:
+            if order.get("order_id") == order_id:
+                return order
+        return None
+
+
+class _SymbolOrders:
+    """Trigger heaps for one symbol (lazy deletion: stale entries are skipped on pop)."""
+
+    def __init__(self):
+        self.on_drop: List[Tuple[float, int, str, str]] = []   # max-heap via negated trigger
+        self.on_rise: List[Tuple[float, int, str, str]] = []   # min-heap
+
+    def __len__(self) -> int:
+        return len(self.on_drop) + len(self.on_rise)
+
+    def add(self, trigger: float, fires_on_drop: bool, seq: int, user_wallet_id: str, order_id: str) -> None:
+        if fires_on_drop:
+            heapq.heappush(self.on_drop, (-trigger, seq, user_wallet_id, order_id))
+        else:
+            heapq.heappush(self.on_rise, (trigger, seq, user_wallet_id, order_id))
+
+    def pop_triggered(self, price: float) -> List[Tuple[str, str]]:
+        triggered = []
+        while self.on_drop and price <= -self.on_drop[0][0]:
+            _, _, user_wallet_id, order_id = heapq.heappop(self.on_drop)
+            triggered.append((user_wallet_id, order_id))
+        while self.on_rise and price >= self.on_rise[0][0]:
+            _, _, user_wallet_id, order_id = heapq.heappop(self.on_rise)
+            triggered.append((user_wallet_id, order_id))
+        return triggered
+
+
+class DemoTradingEngine:
+    """
+    Process-wide demo wallet state cache and matching engine.
+
+    Usage:
+        engine = get_demo_trading_engine()
+        account = await engine.get_account(db, user_wallet_id, create_state)
+        async with account.lock:
+            fill = engine.plan_fill(account, symbol, side, quantity, price, fee_rate)
+            await engine.apply_fill(account, fill, order_id=order_id)
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self.state_ttl_seconds = float(getattr(settings, "DEMO_WALLET_STATE_TTL_SECONDS", 5))
+        self.tick_seconds = getattr(settings, "DEMO_ENGINE_TICK_MS", 250) / 1000
+        self.sync_seconds = float(getattr(settings, "DEMO_ENGINE_SYNC_SECONDS", 10))
+        self.max_price_age = getattr(settings, "MARKET_STREAM_MAX_PRICE_AGE_SECONDS", 5)
+        self.accounts: Dict[str, DemoAccount] = {}
+        self._orders: Dict[str, _SymbolOrders] = {}
+        self._seq = itertools.count()
+        self.running = False
+
+    # ==================== STATE ====================
+
+    async def get_account(
+        self,
+        db: AsyncIOMotorDatabase,
+        user_wallet_id: str,
+        create_state: Callable[[], Dict[str, Any]],
+    ) -> DemoAccount:
+        """
+        Get the cached account, loading (or creating) its state document.
+
+        Cached state is reused while fresh. After ``DEMO_WALLET_STATE_TTL_SECONDS``
+        it is reloaded so fills made by other workers become visible, unless
+        this process still has unwritten updates for it.
+        """
+        account = self.accounts.get(user_wallet_id)
+        if account is not None and account.db is db:
+            if (
+                account.pending
+                or account.lock.locked()
+                or time.monotonic() - account.loaded_at < self.state_ttl_seconds
+            ):
+                return account
+
+        collection = db.demo_wallet_state
+        state = await collection.find_one({"user_wallet_id": user_wallet_id})
+        if state:
+            logger.debug(f"Loaded demo wallet state for {user_wallet_id}")
+        else:
+            logger.info(f"Creating new demo wallet state for {user_wallet_id}")
+            state = create_state()
+            result = await collection.insert_one(state)
+            state["_id"] = result.inserted_id
+
+        if account is not None and account.db is db:
+            account.state = state
+            account.loaded_at = time.monotonic()
+        else:
+            account = DemoAccount(db, state)
+            self.accounts[user_wallet_id] = account
+            self._index_account(account)
+        return account
+
+    async def persist(self, account: DemoAccount, update: Dict[str, Any]) -> None:
+        """Persist one atomic update: written behind while the engine runs, else immediately."""
+        update.setdefault("$set", {})["updated_at"] = datetime.now(timezone.utc)
+        if self.running:
+            account.pending.append(UpdateOne({"user_wallet_id": account.user_wallet_id}, update))
+            return
+        await account.db.demo_wallet_state.update_one(
+            {"user_wallet_id": account.user_wallet_id},
+            update,
+        )
+
+    async def reload(self, account: DemoAccount) -> None:
+        """Replace an account's cached state with the stored document."""
+        state = await account.db.demo_wallet_state.find_one({"user_wallet_id": account.user_wallet_id})
+        if state is None:
+            raise WalletError(f"Demo wallet state for {account.user_wallet_id} not found")
+        account.state = state
+        account.loaded_at = time.monotonic()
+
+    async def flush_account(self, account: DemoAccount) -> None:
+        """Write an account's pending updates in one ordered bulk write."""
+        if not account.pending:
+            return
+        ops, account.pending = account.pending, []
+        try:
+            await account.db.demo_wallet_state.bulk_write(ops, ordered=True)
+        except Exception:
+            # Keep the updates (in order) for the next flush
+            account.pending[:0] = ops
+            raise
+
+    async def flush(self) -> None:
+        """Write pending updates for every account."""
+        for account in list(self.accounts.values()):
+            try:
+                await self.flush_account(account)
+            except Exception as e:
+                logger.error(f"Demo wallet write-behind failed for {account.user_wallet_id}: {e}")
+
+    # ==================== FILLS ====================
+
+    @staticmethod
+    def plan_fill(
+        account: DemoAccount,
+        symbol: str,
+        side: str,
+        quantity: Decimal,
+        execution_price: Decimal,
+        fee_rate: Decimal,
+    ) -> Dict[str, Any]:
+        """
+        Compute the balance changes for a fill without applying them.
+
+        Raises:
+            InsufficientFundsError: If the wallet can't cover the fill
+        """
+        base_asset, quote_asset = symbol.split("/")
+        notional_value = quantity * execution_price
+        fee = notional_value * fee_rate
+
+        if side == "buy":
+            total_cost = notional_value + fee
+            debit = ("cash_balances", quote_asset, total_cost)
+            deltas = [("cash_balances", quote_asset, -total_cost), ("asset_balances", base_asset, quantity)]
+        else:
+            debit = ("asset_balances", base_asset, quantity)
+            deltas = [("asset_balances", base_asset, -quantity), ("cash_balances", quote_asset, notional_value - fee)]
+        DemoTradingEngine.check_funds(account.state, *debit)
+
+        return {
+            "symbol": symbol,
+            "side": side,
+            "quantity": quantity,
+            "price": execution_price,
+            "fee": fee,
+            "fee_currency": quote_asset,
+            "deltas": deltas,
+            "debit": debit,
+        }
+
+    @staticmethod
+    def check_funds(state: Dict[str, Any], bucket: str, asset: str, amount: Decimal) -> None:
+        """
+        Check that a balance covers a debit.
+
+        Raises:
+            InsufficientFundsError: If it doesn't
+        """
+        available = Decimal(str(state[bucket].get(asset, 0)))
+        if available < amount:
+            raise InsufficientFundsError(
+                f"Insufficient {asset} balance. "
+                f"Required: {amount}, Available: {available}"
+            )
+
+    @staticmethod
+    def _balance_writes(
+        state: Dict[str, Any],
+        deltas: List[Tuple[str, str, Decimal]],
+    ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Compare-and-set terms for balance changes: (expected stored values, new values).
+
+        New balances are rounded through Decimal and written with ``$set``;
+        a float ``$inc`` would drift from the cache (0.1 + 0.7 stores
+        0.7999999999999999, and a sell of 0.8 could then never fill).
+        """
+        expected: Dict[str, Any] = {}
+        balances: Dict[str, float] = {}
+        for bucket, asset, amount in deltas:
+            key = f"{bucket}.{asset}"
+            current = state[bucket].get(asset)
+            expected[key] = current  # None also matches a missing field
+            balances[key] = float(Decimal(str(current or 0)) + amount)
+        return expected, balances
+
+    async def _write_balances(
+        self,
+        account: DemoAccount,
+        deltas: List[Tuple[str, str, Decimal]],
+        debit: Optional[Tuple[str, str, Decimal]],
+        update: Dict[str, Any],
+        order_id: Optional[str] = None,
+    ) -> Optional[Dict[str, float]]:
+        """
+        Write balance changes (with ``update``) only if the stored balances are unchanged.
+
+        On a conflict the state is reloaded and the funds check repeated
+        before retrying. With ``order_id`` the update also claims that open
+        order.
+
+        Returns:
+            The new balances, or None if the order is no longer open
+
+        Raises:
+            InsufficientFundsError: If the (reloaded) balance can't cover ``debit``
+            WalletError: If the balances kept changing underneath
+        """
+        # Earlier writes (e.g. an order's $push) must land first
+        await self.flush_account(account)
+        for _ in range(BALANCE_WRITE_ATTEMPTS):
+            if debit is not None:
+                self.check_funds(account.state, *debit)
+            if order_id is not None and account.find_open_order(order_id) is None:
+                return None
+
+            expected, balances = self._balance_writes(account.state, deltas)
+            query = {"user_wallet_id": account.user_wallet_id, **expected}
+            if order_id is not None:
+                query["open_orders.order_id"] = order_id
+            result = await account.db.demo_wallet_state.update_one(
+                query,
+                {**update, "$set": {**balances, "updated_at": datetime.now(timezone.utc)}},
+            )
+            if getattr(result, "modified_count", 1):
+                return balances
+            # Changed by another worker
+            await self.reload(account)
+        raise WalletError(f"Demo wallet {account.user_wallet_id} is busy, try again")
+
+    @staticmethod
+    def _apply_balances(account: DemoAccount, balances: Dict[str, float]) -> None:
+        for key, value in balances.items():
+            bucket, asset = key.split(".", 1)
+            account.state[bucket][asset] = value
+
+    @staticmethod
+    def _fill_update(fill: Dict[str, Any], transaction: Dict[str, Any], order_id: Optional[str]) -> Dict[str, Any]:
+        update: Dict[str, Any] = {
+            "$inc": {"total_trades": 1, "total_fees_paid": float(fill["fee"])},
+            "$push": {"transaction_history": {"$each": [transaction], "$slice": -TRANSACTION_HISTORY_LIMIT}},
+        }
+        if order_id is not None:
+            update["$pull"] = {"open_orders": {"order_id": order_id}}
+        return update
+
+    @staticmethod
+    def _apply_in_memory(
+        account: DemoAccount,
+        balances: Dict[str, float],
+        fill: Dict[str, Any],
+        transaction: Dict[str, Any],
+        order_id: Optional[str],
+    ) -> None:
+        state = account.state
+        DemoTradingEngine._apply_balances(account, balances)
+        state["total_trades"] = state.get("total_trades", 0) + 1
+        state["total_fees_paid"] = state.get("total_fees_paid", 0.0) + float(fill["fee"])
+        history = state["transaction_history"]
+        history.append(transaction)
+        if len(history) > TRANSACTION_HISTORY_LIMIT:
+            del history[:-TRANSACTION_HISTORY_LIMIT]
+        if order_id is not None:
+            state["open_orders"] = [o for o in state["open_orders"] if o.get("order_id") != order_id]
+
+    def _transaction(self, fill: Dict[str, Any], order_id: str) -> Dict[str, Any]:
+        return {
+            "order_id": order_id,
+            "symbol": fill["symbol"],
+            "side": fill["side"],
+            "quantity": float(fill["quantity"]),
+            "price": float(fill["price"]),
+            "fee": float(fill["fee"]),
+            "fee_currency": fill["fee_currency"],
+            "timestamp": datetime.now(timezone.utc),
+        }
+
+    async def apply_fill(self, account: DemoAccount, fill: Dict[str, Any], order_id: str) -> Dict[str, Any]:
+        """
+        Persist a market fill as one atomic update, then apply it in memory.
+
+        Call with ``account.lock`` held, after ``plan_fill``. The write goes
+        through immediately, so a balance spent by another worker is caught
+        here rather than at the next flush.
+
+        Returns:
+            The recorded transaction
+
+        Raises:
+            InsufficientFundsError: If the stored balance no longer covers the fill
+        """
+        transaction = self._transaction(fill, order_id)
+        update = self._fill_update(fill, transaction, None)
+        balances = await self._write_balances(account, fill["deltas"], fill["debit"], update)
+        self._apply_in_memory(account, balances, fill, transaction, None)
+        return transaction
+
+    async def adjust_balance(self, account: DemoAccount, bucket: str, asset: str, amount: Decimal) -> None:
+        """
+        Add ``amount`` (negative to take it away) to one balance.
+
+        Call with ``account.lock`` held. Written through like fills.
+
+        Raises:
+            InsufficientFundsError: If the balance can't cover a negative amount
+        """
+        debit = (bucket, asset, -amount) if amount < 0 else None
+        balances = await self._write_balances(account, [(bucket, asset, amount)], debit, {})
+        self._apply_balances(account, balances)
+
+    # ==================== OPEN ORDERS ====================
+
+    def index_order(self, user_wallet_id: str, order: Dict[str, Any]) -> None:
+        """Register an open order for matching."""
+        trigger = trigger_for(order)
+        if trigger is None:
+            return
+        book = self._orders.setdefault(order["symbol"], _SymbolOrders())
+        book.add(trigger[0], trigger[1], next(self._seq), user_wallet_id, order["order_id"])
+
+    def _index_account(self, account: DemoAccount) -> None:
+        for order in account.state.get("open_orders", []):
+            if order.get("status") in (None, OrderStatus.OPEN.value):
+                self.index_order(account.user_wallet_id, order)
+
+    async def _fill_open_order(self, account: DemoAccount, order_id: str, market_price: Decimal) -> bool:
+        """Fill a triggered open order, claiming it in the database first."""
+        async with account.lock:
+            order = account.find_open_order(order_id)
+            if order is None:
+                return False
+
+            state = account.state
+            side = order["side"]
+            quantity = Decimal(str(order["remaining_quantity"] or order["quantity"]))
+            slippage = depth_slippage_rate(
+                quantity,
+                _top_quantity(order["symbol"], side),
+                Decimal(str(state.get("slippage_rate", 0))),
+                Decimal(str(state.get("depth_impact_rate", 0))),
+            )
+            limit_price = Decimal(str(order["price"])) if order["type"] == "limit" else None
+            execution_price = execution_price_for(side, market_price, slippage, limit_price)
+
+            try:
+                fill = self.plan_fill(account, order["symbol"], side, quantity, execution_price,
+                                      Decimal(str(state.get("fee_rate", 0))))
+                transaction = self._transaction(fill, order_id)
+                balances = await self._write_balances(
+                    account, fill["deltas"], fill["debit"],
+                    self._fill_update(fill, transaction, order_id), order_id=order_id,
+                )
+            except InsufficientFundsError as e:
+                await account.db.demo_wallet_state.update_one(
+                    {"user_wallet_id": account.user_wallet_id, "open_orders.order_id": order_id},
+                    {"$pull": {"open_orders": {"order_id": order_id}}},
+                )
+                account.state["open_orders"] = [
+                    o for o in account.state["open_orders"] if o.get("order_id") != order_id
+                ]
+                logger.warning(f"Rejected demo order {order_id}: {e}")
+                return False
+            if balances is None:
+                # Cancelled or filled elsewhere
+                return False
+
+            self._apply_in_memory(account, balances, fill, transaction, order_id)
+
+        logger.info(
+            f"Filled demo {order['type']} order {order_id}: {side} {quantity} "
+            f"{order['symbol']} @ ${execution_price}"
+        )
+        return True
+
+    async def match_once(self) -> int:
+        """Match open orders against the latest streamed prices."""
+        book = get_market_book()
+        fills = 0
+        for symbol, orders in list(self._orders.items()):
+            if not orders:
+                self._orders.pop(symbol, None)
+                continue
+            price = book.get_price(symbol, max_age_seconds=self.max_price_age)
+            if price is None:
+                continue
+            for user_wallet_id, order_id in orders.pop_triggered(float(price)):
+                account = self.accounts.get(user_wallet_id)
+                if account is None:
+                    continue
+                try:
+                    if await self._fill_open_order(account, order_id, price):
+                        fills += 1
+                except Exception as e:
+                    logger.error(f"Demo order {order_id} fill failed: {e}")
+        return fills
+
+    async def sync_open_orders(self, db: AsyncIOMotorDatabase) -> None:
+        """Load wallets with open orders placed by any worker."""
+        cursor = db.demo_wallet_state.find({"open_orders.0": {"$exists": True}})
+        async for state in cursor:
+            user_wallet_id = state.get("user_wallet_id")
+            account = self.accounts.get(user_wallet_id)
+            if account is not None and account.db is db and (account.pending or account.lock.locked()):
+                continue
+            if account is not None and account.db is db:
+                account.state = state
+                account.loaded_at = time.monotonic()
+            else:
+                account = DemoAccount(db, state)
+                self.accounts[user_wallet_id] = account
+        self._orders.clear()
+        for account in self.accounts.values():
+            self._index_account(account)
+
+    async def run_forever(self, db: AsyncIOMotorDatabase) -> None:
+        """Match open orders and write pending updates behind until cancelled."""
+        self.running = True
+        last_sync = 0.0
+        logger.info("Demo trading engine started")
+        try:
+            while True:
+                try:
+                    if time.monotonic() - last_sync >= self.sync_seconds:
+                        last_sync = time.monotonic()
+                        await self.flush()
+                        await self.sync_open_orders(db)
+                    await self.match_once()
+                    await self.flush()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Demo trading engine error: {e}")
+                await asyncio.sleep(self.tick_seconds)
+        finally:
+            self.running = False
+            await self.flush()
+
+
+def _top_quantity(symbol: str, side: str) -> Optional[Decimal]:
+    """Top-of-book size on the side an order would take (asks for buys, bids for sells)."""
+    quote = get_market_book().get_quote(symbol)
+    if not quote:
+        return None
+    return quote["ask_qty"] if side == "buy" else quote["bid_qty"]
+
+
+# Singleton instance
+_demo_trading_engine: Optional[DemoTradingEngine] = None
+
+
+def get_demo_trading_engine() -> DemoTradingEngine:
+    """Get singleton demo trading engine."""
+    global _demo_trading_engine
+    if _demo_trading_engine is None:
+        _demo_trading_engine = DemoTradingEngine()
+    return _demo_trading_engine
@@ -5,13 +5,13 @@ Paper trading implementation that simulates a real exchange without
 using real money or making actual API calls.
 
 Features:
-- Simulated order execution with market prices
+- Simulated order execution with live market prices
 - Fee simulation (0.1% default)
-- Slippage simulation (0.01% default)
+- Slippage simulation (0.01% default, plus depth impact)
 - Balance tracking (cash + assets)
-- Order book simulation (limit orders)
+- Limit / stop-loss / take-profit orders matched against the live feed
 - Position tracking
-- MongoDB persistence
+- In-memory state with write-behind MongoDB persistence (see demo_engine)
 
 Perfect for testing strategies risk-free!
 
@@ -32,12 +32,20 @@ from app.integrations.wallets.base import (
     OrderStatus,
     TimeInForce,
     WalletError,
-    InsufficientFundsError,
     InvalidOrderError,
     OrderNotFoundError,
     SymbolNotSupportedError
 )
 from app.config.database import get_database
+from app.config.settings import get_settings
+from app.integrations.market_data.binance_stream import get_market_book
+from app.integrations.wallets.demo_engine import (
+    TRANSACTION_HISTORY_LIMIT,
+    DemoAccount,
+    depth_slippage_rate,
+    execution_price_for,
+    get_demo_trading_engine,
+)
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -78,6 +86,7 @@ class DemoWallet(BaseWallet):
         initial_balance: Optional[Dict[str, float]] = None,
         fee_rate: float = 0.001,  # 0.1%
         slippage_rate: float = 0.0001,  # 0.01%
+        depth_impact_rate: Optional[float] = None,
         **kwargs
     ):
         """
@@ -90,12 +99,17 @@ class DemoWallet(BaseWallet):
             initial_balance: Starting balances (default: {"USDT": 10000})
             fee_rate: Fee percentage (default: 0.1%)
             slippage_rate: Slippage percentage (default: 0.01%)
+            depth_impact_rate: Extra slippage per top-of-book size consumed
+                (default: DEMO_WALLET_DEPTH_IMPACT_RATE)
         """
         super().__init__(wallet_id, user_wallet_id, credentials, **kwargs)
         
         # Configuration
         self.fee_rate = Decimal(str(fee_rate))
         self.slippage_rate = Decimal(str(slippage_rate))
+        if depth_impact_rate is None:
+            depth_impact_rate = getattr(get_settings(), "DEMO_WALLET_DEPTH_IMPACT_RATE", 0.0005)
+        self.depth_impact_rate = Decimal(str(depth_impact_rate))
         
         # Initial balance
         self.initial_balance = initial_balance or {"USDT": 10000.0}
@@ -103,34 +117,17 @@ class DemoWallet(BaseWallet):
         # Database
         self.db: Optional[AsyncIOMotorDatabase] = None
         
-        # In-memory state (will be synced with DB)
-        self._state_loaded = False
+        # In-memory state is shared through the demo trading engine
+        self.engine = get_demo_trading_engine()
     
     async def _ensure_db(self):
         """Ensure database connection"""
         if self.db is None:
             self.db = get_database()
     
-    async def _load_state(self) -> Dict[str, Any]:
-        """
-        Load wallet state from MongoDB.
-        
-        Returns state dict or creates new state if doesn't exist.
-        """
-        await self._ensure_db()
-        
-        state = await self.db.demo_wallet_state.find_one({
-            "user_wallet_id": self.user_wallet_id
-        })
-        
-        if state:
-            logger.debug(f"Loaded demo wallet state for {self.user_wallet_id}")
-            return state
-        
-        # Create initial state
-        logger.info(f"Creating new demo wallet state for {self.user_wallet_id}")
-        
-        initial_state = {
+    def _initial_state(self) -> Dict[str, Any]:
+        """Build the state document for a new demo wallet."""
+        return {
             "user_wallet_id": self.user_wallet_id,
             "cash_balances": self.initial_balance.copy(),
             "asset_balances": {},
@@ -143,27 +140,26 @@ class DemoWallet(BaseWallet):
             "total_trades": 0,
             "fee_rate": float(self.fee_rate),
             "slippage_rate": float(self.slippage_rate),
+            "depth_impact_rate": float(self.depth_impact_rate),
             "created_at": datetime.now(timezone.utc),
             "updated_at": datetime.now(timezone.utc)
         }
-        
-        result = await self.db.demo_wallet_state.insert_one(initial_state)
-        initial_state["_id"] = result.inserted_id
-        
-        return initial_state
     
-    async def _save_state(self, state: Dict[str, Any]):
-        """Save wallet state to MongoDB"""
+    async def _get_account(self) -> DemoAccount:
+        """Get this wallet's cached account from the demo trading engine."""
         await self._ensure_db()
+        return await self.engine.get_account(self.db, self.user_wallet_id, self._initial_state)
+    
+    async def _load_state(self) -> Dict[str, Any]:
+        """
+        Load wallet state.
         
-        state["updated_at"] = datetime.now(timezone.utc)
-        
-        await self.db.demo_wallet_state.update_one(
-            {"user_wallet_id": self.user_wallet_id},
-            {"$set": state}
-        )
-        
-        logger.debug(f"Saved demo wallet state for {self.user_wallet_id}")
+        Served from the engine's in-memory cache; the MongoDB document is
+        only read on first use (or after the cache TTL) and created if it
+        doesn't exist.
+        """
+        account = await self._get_account()
+        return account.state
     
     # ==================== BALANCE OPERATIONS ====================
     
@@ -213,22 +209,12 @@ class DemoWallet(BaseWallet):
             amount: Amount to add (negative to subtract)
             is_cash: Is this a cash currency (USDT, USD)
         """
-        state = await self._load_state()
-        
+        account = await self._get_account()
         balance_key = "cash_balances" if is_cash else "asset_balances"
         
-        current = Decimal(str(state[balance_key].get(asset, 0)))
-        new_balance = current + amount
-        
-        if new_balance < 0:
-            raise InsufficientFundsError(
-                f"Insufficient {asset} balance. "
-                f"Available: {current}, Required: {abs(amount)}"
-            )
-        
-        state[balance_key][asset] = float(new_balance)
-        
-        await self._save_state(state)
+        async with account.lock:
+            # Checked against the stored balance too (compare-and-set write)
+            await self.engine.adjust_balance(account, balance_key, asset, amount)
     
     # ==================== ORDER OPERATIONS ====================
     
@@ -323,63 +309,39 @@ class DemoWallet(BaseWallet):
         Execute market order immediately.
         
         Steps:
-        1. Get current market price (from WebSocket manager or Polygon.io)
-        2. Apply slippage
-        3. Calculate total cost (including fees)
-        4. Check balance
-        5. Update balances
-        6. Record transaction
+        1. Get current market price (live market book, see _get_market_price_placeholder)
+        2. Apply size-dependent slippage
+        3. Check balances and calculate the fill (including fees)
+        4. Apply it in memory and persist it as one atomic update
         """
-        # TODO: Get real market price from WebSocket manager
-        # For now, use placeholder price
         market_price = await self._get_market_price_placeholder(order["symbol"])
         
         if market_price is None:
             raise WalletError(f"Cannot get market price for {order['symbol']}")
         
-        # Apply slippage
-        if order["side"] == "buy":
-            # Buying: price goes up (worse for buyer)
-            execution_price = market_price * (Decimal("1") + self.slippage_rate)
-        else:
-            # Selling: price goes down (worse for seller)
-            execution_price = market_price * (Decimal("1") - self.slippage_rate)
-        
         quantity = Decimal(str(order["quantity"]))
         
-        # Calculate costs
-        notional_value = quantity * execution_price
-        fee = notional_value * self.fee_rate
-        
-        if order["side"] == "buy":
-            total_cost = notional_value + fee
-            
-            # Check quote balance (USDT)
-            quote_balance = await self.get_balance(quote_asset)
-            if quote_balance < total_cost:
-                raise InsufficientFundsError(
-                    f"Insufficient {quote_asset} balance. "
-                    f"Required: {total_cost}, Available: {quote_balance}"
-                )
-            
-            # Update balances
-            await self._update_balance(quote_asset, -total_cost, is_cash=True)
-            await self._update_balance(base_asset, quantity, is_cash=False)
-            
-        else:  # sell
-            # Check base balance (BTC)
-            base_balance = await self.get_balance(base_asset)
-            if base_balance < quantity:
-                raise InsufficientFundsError(
-                    f"Insufficient {base_asset} balance. "
-                    f"Required: {quantity}, Available: {base_balance}"
-                )
-            
-            total_received = notional_value - fee
-            
-            # Update balances
-            await self._update_balance(base_asset, -quantity, is_cash=False)
-            await self._update_balance(quote_asset, total_received, is_cash=True)
+        # Buying pushes the price up, selling pushes it down (worse either way)
+        slippage = depth_slippage_rate(
+            quantity,
+            self._top_of_book_quantity(order["symbol"], order["side"]),
+            self.slippage_rate,
+            self.depth_impact_rate,
+        )
+        execution_price = execution_price_for(order["side"], market_price, slippage)
+        
+        account = await self._get_account()
+        async with account.lock:
+            fill = self.engine.plan_fill(
+                account,
+                order["symbol"],
+                order["side"],
+                quantity,
+                execution_price,
+                self.fee_rate,
+            )
+            await self.engine.apply_fill(account, fill, order_id=order["order_id"])
+        fee = fill["fee"]
         
         # Update order status
         order["status"] = OrderStatus.FILLED.value
@@ -388,24 +350,6 @@ class DemoWallet(BaseWallet):
         order["average_price"] = float(execution_price)
         order["updated_at"] = datetime.now(timezone.utc)
         
-        # Record transaction
-        await self._record_transaction({
-            "order_id": order["order_id"],
-            "symbol": order["symbol"],
-            "side": order["side"],
-            "quantity": float(quantity),
-            "price": float(execution_price),
-            "fee": float(fee),
-            "fee_currency": quote_asset,
-            "timestamp": datetime.now(timezone.utc)
-        })
-        
-        # Update statistics
-        state = await self._load_state()
-        state["total_trades"] += 1
-        state["total_fees_paid"] += float(fee)
-        await self._save_state(state)
-        
         logger.info(
             f"Executed market order: {order['side']} {quantity} {base_asset} "
             f"@ ${execution_price} (fee: ${fee})"
@@ -423,14 +367,22 @@ class DemoWallet(BaseWallet):
             "timestamp": datetime.now(timezone.utc)
         }
     
+    def _top_of_book_quantity(self, symbol: str, side: str) -> Optional[Decimal]:
+        """Streamed top-of-book size on the side a market order takes, if known."""
+        quote = get_market_book().get_quote(symbol)
+        if not quote:
+            return None
+        return quote["ask_qty"] if side == "buy" else quote["bid_qty"]
+    
     async def _add_open_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
-        """Add order to open orders list"""
-        state = await self._load_state()
+        """Add order to open orders and register it with the matching engine"""
+        account = await self._get_account()
         
         order["status"] = OrderStatus.OPEN.value
-        state["open_orders"].append(order)
-        
-        await self._save_state(state)
+        async with account.lock:
+            account.state["open_orders"].append(order)
+            await self.engine.persist(account, {"$push": {"open_orders": order}})
+        self.engine.index_order(self.user_wallet_id, order)
         
         logger.info(
             f"Added open order: {order['type']} {order['side']} "
@@ -448,25 +400,28 @@ class DemoWallet(BaseWallet):
     
     async def cancel_order(self, order_id: str, symbol: str) -> Dict[str, Any]:
         """Cancel open order"""
-        state = await self._load_state()
+        account = await self._get_account()
         
-        # Find order
-        order = None
-        for i, o in enumerate(state["open_orders"]):
-            if o["order_id"] == order_id:
-                order = state["open_orders"].pop(i)
-                break
-        
-        if not order:
-            raise OrderNotFoundError(
-                f"Order {order_id} not found in open orders"
-            )
-        
-        # Update status
-        order["status"] = OrderStatus.CANCELLED.value
-        order["updated_at"] = datetime.now(timezone.utc)
-        
-        await self._save_state(state)
+        async with account.lock:
+            state = account.state
+            
+            # Find order
+            order = None
+            for i, o in enumerate(state["open_orders"]):
+                if o["order_id"] == order_id:
+                    order = state["open_orders"].pop(i)
+                    break
+            
+            if not order:
+                raise OrderNotFoundError(
+                    f"Order {order_id} not found in open orders"
+                )
+            
+            # Update status (the matching engine skips orders no longer open)
+            order["status"] = OrderStatus.CANCELLED.value
+            order["updated_at"] = datetime.now(timezone.utc)
+            
+            await self.engine.persist(account, {"$pull": {"open_orders": {"order_id": order_id}}})
         
         logger.info(f"Cancelled order: {order_id}")
         
@@ -534,7 +489,6 @@ class DemoWallet(BaseWallet):
     
     async def get_market_price(self, symbol: str) -> Decimal:
         """Get current market price"""
-        # TODO: Integrate with WebSocket manager / Polygon.io
         price = await self._get_market_price_placeholder(symbol)
         if price is None:
             raise SymbolNotSupportedError(
@@ -544,11 +498,18 @@ class DemoWallet(BaseWallet):
     
     async def _get_market_price_placeholder(self, symbol: str) -> Optional[Decimal]:
         """
-        Placeholder for market price.
+        Market price for simulated fills.
         
-        TODO: Replace with actual Polygon.io integration.
+        Uses the live Binance market book when the symbol is being streamed
+        (any symbol with an open position or active flow). Falls back to
+        fixed prices so the demo wallet keeps working without the stream.
         """
-        # Placeholder prices for testing
+        max_age = getattr(get_settings(), "MARKET_STREAM_MAX_PRICE_AGE_SECONDS", 5)
+        live_price = get_market_book().get_price(symbol, max_age_seconds=max_age)
+        if live_price is not None:
+            return live_price
+        
+        # Fallback prices when the symbol isn't streamed
         placeholder_prices = {
             "BTC/USDT": Decimal("50000.00"),
             "ETH/USDT": Decimal("3000.00"),
@@ -633,14 +594,21 @@ class DemoWallet(BaseWallet):
     
     async def _record_transaction(self, transaction: Dict[str, Any]):
         """Record transaction in history"""
-        state = await self._load_state()
-        state["transaction_history"].append(transaction)
+        account = await self._get_account()
         
-        # Keep only last 1000 transactions (prevent unlimited growth)
-        if len(state["transaction_history"]) > 1000:
-            state["transaction_history"] = state["transaction_history"][-1000:]
-        
-        await self._save_state(state)
+        async with account.lock:
+            history = account.state["transaction_history"]
+            history.append(transaction)
+            
+            # Keep only last 1000 transactions (prevent unlimited growth)
+            if len(history) > TRANSACTION_HISTORY_LIMIT:
+                del history[:-TRANSACTION_HISTORY_LIMIT]
+            
+            await self.engine.persist(account, {
+                "$push": {
+                    "transaction_history": {"$each": [transaction], "$slice": -TRANSACTION_HISTORY_LIMIT}
+                }
+            })
     
     async def get_trade_history(
         self,
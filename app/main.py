@@ -17,16 +17,31 @@ warnings.filterwarnings("ignore", category=DeprecationWarning, module="passlib")
 warnings.filterwarnings("ignore", category=DeprecationWarning, message=".*class-based.*config.*")
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from contextlib import asynccontextmanager
 import asyncio
+import time
 import socketio
 from app.config import settings
 from app.config.database import connect_to_mongodb, close_mongodb_connection, get_database
+from app.core.responses import ORJSONResponse
 from app.utils.cache import get_redis_client, close_redis_client
+from app.utils.metrics import get_metrics_registry
+from app.middleware.server_timing import add_server_timing
+from app.utils.pool_stats import get_pool_stats
 from app.utils.logger import get_logger
-from app.services.position_tracker import get_position_tracker
+from app.services.position_tracker import POSITION_TICK_LAG_SECONDS, get_position_tracker
+from app.services.flow_scheduler import flow_scheduler_loop
+from app.services.market_stream import market_stream_loop
+from app.integrations.wallets.demo_engine import get_demo_trading_engine
+from app.services.socket_publisher import build_client_manager, get_socket_publisher
+from app.services.conversation_events import get_conversation_event_bus
+from app.integrations.market_data import get_ticker_snapshot
+from app.integrations.market_data.polymarket_index import get_polymarket_index
+from app.services.signal_materializer import get_signal_materializer
+from app.services.index_manager import build_indexes_in_background
 
 logger = get_logger(__name__)
 
@@ -34,7 +49,13 @@ logger = get_logger(__name__)
 async def _position_monitor_loop() -> None:
     """Continuously monitor positions and emit Socket.IO updates."""
     interval = max(1, int(getattr(settings, "POSITION_MONITOR_INTERVAL_SECONDS", 5)))
+    last_tick = None
     while True:
+        tick = time.perf_counter()
+        if last_tick is not None:
+            # Time past the interval: the previous tick's work plus event-loop delay
+            POSITION_TICK_LAG_SECONDS.observe(max(0.0, tick - last_tick - interval))
+        last_tick = tick
         try:
             db = get_database()
 
@@ -54,13 +75,15 @@ async def _position_monitor_loop() -> None:
             logger.warning(f"Position monitor loop error: {e}")
         await asyncio.sleep(interval)
 
-# Create Socket.IO server
+# Create Socket.IO server (Redis client manager fans emits out across workers)
 sio = socketio.AsyncServer(
     cors_allowed_origins="*",
     async_mode='asgi',
-    logger=True,
-    engineio_logger=True
+    client_manager=build_client_manager(),
+    logger=getattr(settings, "SOCKETIO_LOGGER_ENABLED", False),
+    engineio_logger=getattr(settings, "SOCKETIO_LOGGER_ENABLED", False)
 )
+get_socket_publisher().register_server(sio)
 
 
 @asynccontextmanager
@@ -72,12 +95,25 @@ async def lifespan(app: FastAPI):
     """
     # Setup clean logging on startup
     from app.core.logger import setup_development_logging
-    setup_development_logging()
+    setup_development_logging(
+        format_type="json" if getattr(settings, "LOG_FORMAT", "text") == "json" else "colored",
+        queued=getattr(settings, "LOG_QUEUE_ENABLED", True),
+        rate_limit_burst=getattr(settings, "LOG_RATE_LIMIT_BURST", 10),
+        rate_limit_window_seconds=getattr(settings, "LOG_RATE_LIMIT_WINDOW_SECONDS", 60),
+        debug_sample_every=getattr(settings, "LOG_DEBUG_SAMPLE_EVERY", 1),
+    )
 
     # Startup
     logger.info("Starting application...")
     
     position_task: asyncio.Task | None = None
+    scheduler_task: asyncio.Task | None = None
+    ticker_task: asyncio.Task | None = None
+    market_task: asyncio.Task | None = None
+    demo_engine_task: asyncio.Task | None = None
+    polymarket_task: asyncio.Task | None = None
+    signal_task: asyncio.Task | None = None
+    index_task: asyncio.Task | None = None
     try:
         # Connect to MongoDB
         await connect_to_mongodb()
@@ -85,9 +121,37 @@ async def lifespan(app: FastAPI):
         # Connect to Redis
         await get_redis_client()
 
+        if getattr(settings, "INDEX_MANAGER_ENABLED", True):
+            index_task = asyncio.create_task(build_indexes_in_background(get_database()))
+            app.state.index_build_task = index_task
+
         if getattr(settings, "POSITION_MONITOR_ENABLED", True):
             position_task = asyncio.create_task(_position_monitor_loop())
             app.state.position_monitor_task = position_task
+
+        if getattr(settings, "FLOW_SCHEDULER_ENABLED", True):
+            scheduler_task = asyncio.create_task(flow_scheduler_loop(get_database()))
+            app.state.flow_scheduler_task = scheduler_task
+
+        if getattr(settings, "TICKER_SNAPSHOT_STREAM_ENABLED", False):
+            ticker_task = asyncio.create_task(get_ticker_snapshot().stream_forever())
+            app.state.ticker_snapshot_task = ticker_task
+
+        if getattr(settings, "MARKET_STREAM_ENABLED", True):
+            market_task = asyncio.create_task(market_stream_loop(get_database()))
+            app.state.market_stream_task = market_task
+
+        if getattr(settings, "DEMO_ENGINE_ENABLED", True):
+            demo_engine_task = asyncio.create_task(get_demo_trading_engine().run_forever(get_database()))
+            app.state.demo_engine_task = demo_engine_task
+
+        if getattr(settings, "POLYMARKET_INDEX_ENABLED", True):
+            polymarket_task = asyncio.create_task(get_polymarket_index().refresh_forever())
+            app.state.polymarket_index_task = polymarket_task
+
+        if getattr(settings, "SIGNAL_MATERIALIZER_ENABLED", True):
+            signal_task = asyncio.create_task(get_signal_materializer().run_forever(get_database()))
+            app.state.signal_materializer_task = signal_task
         
         # Recover stuck executions on startup
         try:
@@ -115,12 +179,24 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down application...")
     
     try:
-        if position_task:
-            position_task.cancel()
-            try:
-                await position_task
-            except asyncio.CancelledError:
-                pass
+        for task in (
+            position_task,
+            scheduler_task,
+            ticker_task,
+            market_task,
+            demo_engine_task,
+            polymarket_task,
+            signal_task,
+            index_task,
+        ):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        await get_conversation_event_bus().close()
 
         # Close MongoDB connection
         await close_mongodb_connection()
@@ -236,6 +312,7 @@ app = FastAPI(
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     redirect_slashes=False,  # Disable automatic redirects to prevent 307 errors
     contact={
         "name": "AI Agent Trading Platform Team",
@@ -259,6 +336,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request I/O breakdown (MongoDB/Redis/Binance/LLM) in a Server-Timing header,
+# and request counting for the diagnostics profiler
+add_server_timing(app, settings)
+
 # Include routers
 from app.modules.auth.router import router as auth_router
 from app.modules.users.router import router as users_router
@@ -277,6 +358,7 @@ from app.modules.market.router import router as market_router
 from app.modules.flows.router import router as flows_router
 from app.modules.risk_rules.router import router as risk_rules_router
 from app.modules.conversations.router import router as conversations_router
+from app.modules.diagnostics.router import router as diagnostics_router
 
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(users_router, prefix="/api/v1")
@@ -301,6 +383,7 @@ app.include_router(market_router, prefix="/api/v1")
 app.include_router(flows_router, prefix="/api/v1")
 app.include_router(risk_rules_router, prefix="/api/v1")
 app.include_router(conversations_router, prefix="/api/v1")
+app.include_router(diagnostics_router, prefix="/api/v1")
 
 # TODO: Add middleware (Sprint 31-33)
 # TODO: Include more routers (Sprint 16, 18, 22, 24, 26)
@@ -325,6 +408,21 @@ async def health_check():
     }
 
 
+@app.get("/health/pools")
+async def pool_stats():
+    """Connection pool telemetry for this process (MongoDB and Redis)."""
+    return get_pool_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of this process's metrics."""
+    return PlainTextResponse(
+        get_metrics_registry().render(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 # Custom OpenAPI schema
 def custom_openapi():
     """
@@ -442,6 +540,8 @@ async def subscribe_positions(sid, data, callback=None):
     user_id = data.get('user_id')
     if user_id:
         sio.enter_room(sid, f'positions:{user_id}')
+        # New subscribers need full state, not deltas against what others already saw
+        get_socket_publisher().reset_position_room(f'positions:{user_id}')
         logger.info(f'Client {sid} subscribed to positions for user {user_id}')
         response = {'success': True, 'room': f'positions:{user_id}'}
         if callback:
@@ -0,0 +1,58 @@
+"""
+Server-Timing Middleware
+
+Adds a ``Server-Timing`` header to every HTTP response with the time the
+request spent in MongoDB, Redis, Binance and LLM calls, the remainder
+(``app``: Python CPU such as validation and Decimal math) and the total.
+Browser devtools show the breakdown in the network timing panel.
+
+The middleware also counts finished requests for request-bounded
+profiling sessions, so it is installed whenever the profiler is enabled;
+the header itself is only sent with ``SERVER_TIMING_ENABLED``.
+
+Pure ASGI (no ``BaseHTTPMiddleware``), so streaming responses and
+background tasks are unaffected. See ``app.utils.profiling``.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from typing import Any
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.profiling import begin_timings, end_timings, note_request_finished
+
+
+class ServerTimingMiddleware:
+    """Collects per-request I/O timings and reports them in ``Server-Timing``."""
+
+    def __init__(self, app: ASGIApp, emit_header: bool = True):
+        self.app = app
+        self.emit_header = emit_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = begin_timings()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.emit_header:
+                MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_timings(token)
+            note_request_finished()
+
+
+def add_server_timing(app: Any, settings: Any) -> None:
+    """Install the middleware if Server-Timing headers or the profiler are enabled."""
+    emit_header = bool(getattr(settings, "SERVER_TIMING_ENABLED", False))
+    if emit_header or getattr(settings, "PROFILER_ENABLED", False):
+        app.add_middleware(ServerTimingMiddleware, emit_header=emit_header)
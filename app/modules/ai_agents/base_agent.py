@@ -13,9 +13,11 @@ from typing import Dict, List, Optional, Any
 from decimal import Decimal
 from datetime import datetime, timezone
 from enum import Enum
+import time
 
-from app.integrations.ai.base import BaseLLM
+from app.integrations.ai.base import BaseLLM, LLM_REQUEST_SECONDS
 from app.integrations.ai.factory import get_model_factory
+from app.utils.profiling import record_timing
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -167,19 +169,9 @@ class BaseAgent(ABC):
             self.cost_tracking["total_requests"] += 1
             
             # Generate response
-            if structured and schema:
-                result = await self.model.generate_structured_output(
-                    prompt=prompt,
-                    schema=schema,
-                    system_prompt=system_prompt,
-                    temperature=temperature
-                )
-            else:
-                result = await self.model.generate_response(
-                    prompt=prompt,
-                    system_prompt=system_prompt,
-                    temperature=temperature
-                )
+            result = await self._generate(
+                self.model, prompt, system_prompt, temperature, structured, schema
+            )
             
             # Track cost
             model_info = self.model.get_model_info()
@@ -217,6 +209,39 @@ class BaseAgent(ABC):
             logger.error(f"{self.role.value} agent analysis failed: {str(e)}")
             raise
     
+    @staticmethod
+    async def _generate(
+        model: BaseLLM,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        structured: bool,
+        schema: Optional[Dict[str, Any]],
+    ) -> Any:
+        """Call the model, recording latency per provider."""
+        started = time.perf_counter()
+        status = "error"
+        try:
+            if structured and schema:
+                result = await model.generate_structured_output(
+                    prompt=prompt,
+                    schema=schema,
+                    system_prompt=system_prompt,
+                    temperature=temperature
+                )
+            else:
+                result = await model.generate_response(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    temperature=temperature
+                )
+            status = "ok"
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            LLM_REQUEST_SECONDS.labels(model.provider_name, status).observe(elapsed)
+            record_timing("llm", elapsed)
+    
     async def _fallback_analyze(
         self,
         prompt: str,
@@ -245,19 +270,9 @@ class BaseAgent(ABC):
         logger.info(f"Using OpenRouter fallback for {self.role.value} agent")
         
         # Generate response with fallback
-        if structured and schema:
-            result = await fallback_model.generate_structured_output(
-                prompt=prompt,
-                schema=schema,
-                system_prompt=system_prompt,
-                temperature=temperature
-            )
-        else:
-            result = await fallback_model.generate_response(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                temperature=temperature
-            )
+        result = await self._generate(
+            fallback_model, prompt, system_prompt, temperature, structured, schema
+        )
         
         # Track cost from fallback
         model_info = fallback_model.get_model_info()
@@ -5,19 +5,22 @@ API endpoints for swarm conversation logs.
 No authentication required for demo.
 """
 
-from typing import Optional, Dict, Set
+import asyncio
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime, timezone
+from pymongo import ReturnDocument
 
 from app.config.database import get_database
+from app.core.responses import ORJSONResponse
+from app.services.conversation_events import encode_conversation_event, get_conversation_event_bus
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/conversations", tags=["Conversations"])
-_subscribers: Dict[str, Set[WebSocket]] = {}
 
 
 def _serialize_conversation(doc: dict) -> dict:
@@ -34,26 +37,53 @@ async def get_conversation(
     doc = await db["ai_conversations"].find_one({"execution_id": execution_id})
     if not doc:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    return _serialize_conversation(doc)
+    return ORJSONResponse(_serialize_conversation(doc))
 
 
 @router.websocket("/ws/{execution_id}")
 async def stream_conversation(websocket: WebSocket, execution_id: str):
-    await websocket.accept()
-    _subscribers.setdefault(execution_id, set()).add(websocket)
-
-    try:
-        db = await get_database()
-        doc = await db["ai_conversations"].find_one({"execution_id": execution_id})
-        if doc:
-            await websocket.send_json(_serialize_conversation(doc))
+    """
+    Stream a conversation live.
 
-        while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        pass
-    finally:
-        _subscribers.get(execution_id, set()).discard(websocket)
+    Sends the current conversation document as a snapshot, then every
+    message, swarm vote and status event published for the execution.
+    """
+    await websocket.accept()
+    bus = get_conversation_event_bus()
+
+    # Subscribe before reading the snapshot so nothing written in between is missed
+    async with bus.subscribe(execution_id) as subscriber:
+
+        async def _send_events() -> None:
+            while True:
+                await websocket.send_text(await subscriber.get())
+
+        async def _receive_until_disconnect() -> None:
+            while True:
+                await websocket.receive_text()
+
+        try:
+            db = get_database()
+            doc = await db["ai_conversations"].find_one({"execution_id": execution_id})
+            if doc:
+                await websocket.send_text(
+                    encode_conversation_event("snapshot", execution_id, _serialize_conversation(doc))
+                )
+
+            tasks = [
+                asyncio.create_task(_send_events()),
+                asyncio.create_task(_receive_until_disconnect()),
+            ]
+            try:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.debug(f"Conversation stream for {execution_id} closed: {e}")
 
 
 @router.get("/{conversation_id}/voting")
@@ -91,20 +121,16 @@ async def add_message(
         "timestamp": datetime.now(timezone.utc),
     }
 
-    result = await db["ai_conversations"].update_one(
+    doc = await db["ai_conversations"].find_one_and_update(
         {"_id": ObjectId(conversation_id)},
         {"$push": {"messages": message}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        projection={"execution_id": 1},
+        return_document=ReturnDocument.AFTER,
     )
-    if result.matched_count == 0:
+    if not doc:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    doc = await db["ai_conversations"].find_one({"_id": ObjectId(conversation_id)})
-    if doc:
-        execution_id = doc.get("execution_id")
-        if execution_id and execution_id in _subscribers:
-            for ws in list(_subscribers[execution_id]):
-                try:
-                    await ws.send_json({"type": "message", "data": message})
-                except Exception:
-                    _subscribers[execution_id].discard(ws)
+    execution_id = doc.get("execution_id")
+    if execution_id:
+        await get_conversation_event_bus().publish(execution_id, "message", message)
     return {"success": True}
@@ -0,0 +1,9 @@
+"""
+Diagnostics Module
+
+Admin-only runtime diagnostics:
+- On-demand sampling profiler for the API process
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
@@ -0,0 +1,69 @@
+"""
+Diagnostics Router
+
+Superuser-only endpoints for profiling the running API process.
+Disabled unless ``PROFILER_ENABLED`` is set.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.config.settings import get_settings
+from app.core.dependencies import get_current_active_superuser
+from app.utils.logger import get_logger
+from app.utils.profiling import profile_api, profiler_busy
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def run_profiler(
+    seconds: float = Query(10, gt=0, description="Maximum profiling duration"),
+    requests: Optional[int] = Query(None, ge=1, description="Stop after this many requests finish"),
+    all_threads: bool = Query(False, description="Sample every thread, not just the event loop"),
+    current_user: dict = Depends(get_current_active_superuser),
+):
+    """
+    Sample the API process for N seconds (or until N requests finish).
+
+    Returns collapsed stacks (``frame;frame;frame count``) that load
+    directly into speedscope or flamegraph.pl.
+
+    Args:
+        seconds: Maximum duration, capped at ``PROFILER_MAX_SECONDS``
+        requests: Optional number of finished requests to stop after
+        all_threads: Include driver/executor threads
+        current_user: Current authenticated superuser
+
+    Returns:
+        Collapsed-stack text file
+    """
+    settings = get_settings()
+    if not getattr(settings, "PROFILER_ENABLED", False):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiler is disabled")
+    if profiler_busy():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profiling session is already running")
+
+    seconds = min(seconds, getattr(settings, "PROFILER_MAX_SECONDS", 60))
+    logger.info(f"Profiling API for up to {seconds}s (requests={requests}) by {current_user.get('email')}")
+    try:
+        collapsed, samples = await profile_api(seconds, requests=requests, all_threads=all_threads)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    return PlainTextResponse(
+        collapsed,
+        headers={
+            "Content-Disposition": f'attachment; filename="api-{stamp}.folded"',
+            "X-Profile-Samples": str(samples),
+        },
+    )
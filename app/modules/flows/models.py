@@ -113,7 +113,9 @@ class Flow(BaseModel):
     total_pnl_usd: Decimal = Decimal("0")
     total_pnl_percent: Decimal = Decimal("0")
     winning_trades: int = 0  # Count of profitable trades (PnL > 0)
+    closed_trades: int = 0  # Count of closed positions folded into the stats
     win_rate: float = 0.0  # Percentage of profitable trades (0.0 to 100.0)
+    avg_pnl_usd: float = 0.0  # Average realized P&L per closed trade
     
     # Timestamps
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,122 @@
+"""
+Execution Repository
+
+Typed read access to the ``executions`` collection over raw Motor,
+decoding projected documents once into ``ExecutionRecord``
+(``__slots__``). Listing reads skip the per-step payloads unless asked
+for. See ``app.modules.positions.repository``.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.modules.flows.models import ExecutionStatus
+from app.utils.records import Record, cursor_batch_size, projection, to_object_id
+
+EXECUTIONS_COLLECTION = "executions"
+
+
+class ExecutionRecord(Record):
+    """Decoded execution document."""
+
+    __slots__ = (
+        "id",
+        "flow_id",
+        "flow_name",
+        "status",
+        "started_at",
+        "completed_at",
+        "duration",
+        "steps",
+        "result",
+    )
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, Any]) -> "ExecutionRecord":
+        """Decode a (possibly projected) raw document."""
+        get = doc.get
+        record = cls.__new__(cls)
+        record.id = get("_id")
+        record.flow_id = get("flow_id")
+        record.flow_name = get("flow_name") or ""
+        record.status = get("status") or ""
+        record.started_at = get("started_at")
+        record.completed_at = get("completed_at")
+        record.duration = get("duration")
+        record.steps = get("steps") or []
+        record.result = get("result")
+        return record
+
+    def is_running(self) -> bool:
+        """Check if execution is still running."""
+        return self.status == ExecutionStatus.RUNNING.value
+
+
+# Fields for execution lists (no step payloads)
+SUMMARY_FIELDS = ("flow_id", "flow_name", "status", "started_at", "completed_at", "duration", "result")
+
+
+class ExecutionRepository:
+    """
+    Executions over raw Motor.
+
+    Usage:
+        executions = ExecutionRepository(db)
+        records, total = await executions.list_for_flow(flow_id, limit=20)
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+
+    @property
+    def collection(self):
+        return self.db[EXECUTIONS_COLLECTION]
+
+    async def get(self, execution_id: Any, fields: Optional[Iterable[str]] = None) -> Optional[ExecutionRecord]:
+        """Get an execution (None if the id is invalid or not found)."""
+        oid = to_object_id(execution_id)
+        if oid is None:
+            return None
+        doc = await self.collection.find_one({"_id": oid}, projection(fields) if fields else None)
+        return ExecutionRecord.from_doc(doc) if doc else None
+
+    async def list_for_flow(
+        self,
+        flow_id: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0,
+        fields: Iterable[str] = SUMMARY_FIELDS,
+    ) -> Tuple[List[ExecutionRecord], int]:
+        """
+        Page through executions, newest first.
+
+        Returns:
+            (records, total matching)
+        """
+        query: Dict[str, Any] = {"flow_id": flow_id} if flow_id else {}
+        total = await self.collection.count_documents(query)
+        cursor = (
+            self.collection.find(query, projection(fields))
+            .sort("started_at", -1)
+            .skip(offset)
+            .limit(limit)
+        )
+        return [ExecutionRecord.from_doc(doc) async for doc in cursor], total
+
+    async def iter_running(
+        self,
+        fields: Iterable[str] = ("flow_id",),
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[ExecutionRecord]:
+        """Stream executions still marked running."""
+        cursor = self.collection.find(
+            {"status": ExecutionStatus.RUNNING.value, "deleted_at": None},
+            projection(fields),
+            batch_size=cursor_batch_size(batch_size),
+        )
+        async for doc in cursor:
+            yield ExecutionRecord.from_doc(doc)
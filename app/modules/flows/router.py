@@ -8,15 +8,14 @@ Author: Moniqo Team
 Last Updated: 2026-01-17
 """
 
-from typing import Optional, Any
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Query, Depends
 from bson import ObjectId
-from decimal import Decimal
-from enum import Enum
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.config.database import get_database
 from app.core.dependencies import get_current_user_optional
+from app.core.responses import ORJSONResponse, model_response
 from app.modules.flows.schemas import (
     FlowCreate,
     FlowUpdate,
@@ -26,6 +25,8 @@ from app.modules.flows.schemas import (
     ExecutionListResponse,
     TriggerFlowRequest,
     AgentDecisionResponse,
+    ParameterSweepRequest,
+    SweepJobResponse,
 )
 from app.modules.flows.models import FlowStatus, ExecutionStatus
 from app.modules.flows import service as flow_service
@@ -36,20 +37,6 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/flows", tags=["Flows"])
 
 
-def _to_response_payload(value: Any) -> Any:
-    if isinstance(value, ObjectId):
-        return str(value)
-    if isinstance(value, Decimal):
-        return float(value)
-    if isinstance(value, Enum):
-        return value.value
-    if isinstance(value, dict):
-        return {key: _to_response_payload(val) for key, val in value.items()}
-    if isinstance(value, (list, tuple)):
-        return [_to_response_payload(item) for item in value]
-    return value
-
-
 def flow_to_response(flow) -> FlowResponse:
     """Convert Flow model to response"""
     return FlowResponse(
@@ -80,7 +67,7 @@ def execution_to_response(execution) -> ExecutionResponse:
             status=s.status,
             started_at=s.started_at,
             completed_at=s.completed_at,
-            data=_to_response_payload(s.data),
+            data=s.data,
             error=s.error,
         )
         for s in execution.steps
@@ -382,12 +369,84 @@ async def trigger_flow(
             db, flow, model_provider, model_name
         )
         
-        return execution_to_response(execution)
+        return model_response(execution_to_response(execution))
     except Exception as e:
         logger.error(f"Failed to execute flow: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Flow execution failed: {str(e)}")
 
 
+def sweep_job_to_response(job: dict) -> SweepJobResponse:
+    """Convert a sweep job document to response"""
+    return SweepJobResponse(
+        job_id=str(job["_id"]),
+        flow_id=job["flow_id"],
+        status=job["status"],
+        total_trials=job["total_trials"],
+        completed=job.get("completed", 0),
+        failed=job.get("failed", 0),
+        metric=job["metric"],
+        top=job.get("top") or [],
+        error=job.get("error"),
+        created_at=job.get("created_at"),
+    )
+
+
+@router.post(
+    "/{flow_id}/sweeps",
+    response_model=SweepJobResponse,
+    status_code=202,
+    summary="Start parameter sweep",
+    description="Backtest every combination of a parameter grid against the flow config in parallel; returns a job id",
+)
+async def start_parameter_sweep(
+    flow_id: str,
+    sweep_request: ParameterSweepRequest,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+):
+    """Start a backtest parameter sweep for a flow"""
+    flow = await flow_service.get_flow_by_id(db, flow_id)
+    if not flow:
+        raise HTTPException(status_code=404, detail=f"Flow not found: {flow_id}")
+
+    try:
+        job = await flow_service.start_parameter_sweep(
+            db,
+            flow,
+            interval=sweep_request.interval,
+            start=sweep_request.start,
+            end=sweep_request.end,
+            grid=sweep_request.grid,
+            metric=sweep_request.metric,
+            llm_stub=sweep_request.llm_stub,
+            max_workers=sweep_request.max_workers,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to start parameter sweep: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to start parameter sweep: {str(e)}")
+
+    return model_response(sweep_job_to_response(job), status_code=202)
+
+
+@router.get(
+    "/{flow_id}/sweeps/{job_id}",
+    response_model=SweepJobResponse,
+    summary="Get parameter sweep",
+    description="Get sweep progress and the best trials so far",
+)
+async def get_parameter_sweep(
+    flow_id: str,
+    job_id: str,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+):
+    """Get a parameter sweep job"""
+    job = await flow_service.get_parameter_sweep(db, flow_id, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Sweep not found: {job_id}")
+    return model_response(sweep_job_to_response(job))
+
+
 @router.get(
     "/{flow_id}/executions",
     response_model=ExecutionListResponse,
@@ -407,13 +466,37 @@ async def get_flow_executions(
     
     executions, total = await flow_service.get_executions(db, flow_id, limit, offset)
     
-    return ExecutionListResponse(
+    return model_response(ExecutionListResponse(
         items=[execution_to_response(e) for e in executions],
         total=total,
         limit=limit,
         offset=offset,
         has_more=offset + len(executions) < total,
-    )
+    ))
+
+
+@router.get(
+    "/{flow_id}/stats/daily",
+    summary="Get daily flow statistics",
+    description="Get per-day execution and P&L rollups for a flow",
+)
+async def get_flow_daily_stats(
+    flow_id: str,
+    days: int = Query(30, ge=1, le=365),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+):
+    """Get daily statistics buckets for a flow"""
+    flow = await flow_service.get_flow_by_id(db, flow_id)
+    if not flow:
+        raise HTTPException(status_code=404, detail=f"Flow not found: {flow_id}")
+    
+    buckets = await flow_service.get_flow_daily_stats(db, flow_id, days)
+    
+    return ORJSONResponse({
+        "flow_id": flow_id,
+        "days": days,
+        "items": buckets,
+    })
 
 
 # ==================== EXECUTIONS ====================
@@ -432,13 +515,13 @@ async def list_all_executions(
     """List all executions"""
     executions, total = await flow_service.get_executions(db, None, limit, offset)
     
-    return ExecutionListResponse(
+    return model_response(ExecutionListResponse(
         items=[execution_to_response(e) for e in executions],
         total=total,
         limit=limit,
         offset=offset,
         has_more=offset + len(executions) < total,
-    )
+    ))
 
 
 @router.delete(
@@ -477,7 +560,7 @@ async def get_execution(
     if not execution:
         raise HTTPException(status_code=404, detail=f"Execution not found: {execution_id}")
     
-    return execution_to_response(execution)
+    return model_response(execution_to_response(execution))
 
 
 @router.delete(
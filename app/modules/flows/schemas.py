@@ -52,6 +52,22 @@ class TriggerFlowRequest(BaseModel):
     model_name: Optional[str] = Field(None, description="Specific model name")
 
 
+class ParameterSweepRequest(BaseModel):
+    """Backtest parameter sweep request"""
+    interval: str = Field(default="1h", description="Candle interval (e.g., 1m, 1h)")
+    start: datetime = Field(..., description="Backtest range start")
+    end: Optional[datetime] = Field(None, description="Backtest range end (default: now)")
+    grid: Dict[str, List[Any]] = Field(
+        ...,
+        description="Values to try per parameter, e.g. {\"swarm_min_agreement\": [50, 70], \"rsi_period\": [7, 14]}",
+    )
+    metric: str = Field(default="total_pnl_usd", description="Stats field to rank trials by")
+    llm_stub: bool = Field(default=True, description="Use deterministic stub swarm votes instead of skipping the swarm")
+    max_workers: Optional[int] = Field(
+        None, ge=1, le=64, description="Worker processes (default and cap: server setting or CPU count)"
+    )
+
+
 # ==================== RESPONSE SCHEMAS ====================
 
 class ExecutionStepResponse(BaseModel):
@@ -143,3 +159,17 @@ class ExecutionListResponse(BaseModel):
     limit: int
     offset: int
     has_more: bool
+
+
+class SweepJobResponse(BaseModel):
+    """Backtest parameter sweep job response"""
+    job_id: str
+    flow_id: str
+    status: str
+    total_trials: int
+    completed: int = 0
+    failed: int = 0
+    metric: str
+    top: List[Dict[str, Any]] = Field(default_factory=list, description="Best trials, ranked by metric")
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
@@ -31,16 +31,24 @@ from app.modules.flows.models import (
 )
 from app.modules.positions.models import PositionStatus, PositionSide
 from app.modules.flows.schemas import FlowCreate, FlowUpdate
+from app.modules.flows.repository import ExecutionRepository
 from app.integrations.market_data import get_binance_client
 from app.integrations.wallets.base import OrderSide, OrderType, TimeInForce, OrderStatus
 from app.integrations.wallets.factory import create_wallet_from_db
 from app.services.indicators import calculate_all_indicators
 from app.services.risk_rules import evaluate_risk_limits
-from app.services.signal_aggregator import get_signal_aggregator
+from app.services.signal_materializer import get_signal_materializer
 from app.modules.ai_agents.market_analyst_agent import MarketAnalystAgent
 from app.modules.ai_agents.risk_manager_agent import RiskManagerAgent
 from app.modules.risk_rules import service as risk_rule_service
+from app.services.flow_scheduler import schedule_flow_run, cancel_flow_run
+from app.services.socket_publisher import get_socket_publisher
+from app.services.conversation_events import get_conversation_event_bus
+from app.config.settings import get_settings
 from app.utils.logger import get_logger
+from app.utils.cache import CACHE_REQUESTS
+from app.utils.metrics import SLOW_BUCKETS, get_metrics_registry
+from app.utils.records import cursor_batch_size
 
 logger = get_logger(__name__)
 
@@ -48,13 +56,10 @@ logger = get_logger(__name__)
 async def _emit_execution_update(execution_id: str, flow_id: str, status: str, current_step: int, step_name: str, progress_percent: int, message: str = "", user_id: str = None):
     """Emit execution update via Socket.IO to notify frontend of progress."""
     try:
-        # Import here to avoid circular imports
-        from app.main import sio
-
         # Emit to user's positions room if user_id is provided, otherwise emit globally
         room = f'positions:{user_id}' if user_id else f'executions:{execution_id}'
 
-        await sio.emit('execution_update', {
+        await get_socket_publisher().emit('execution_update', {
             'execution_id': execution_id,
             'flow_id': flow_id,
             'status': status,
@@ -77,6 +82,7 @@ ORDERS_COLLECTION = "orders"
 POSITIONS_COLLECTION = "positions"
 AI_CONVERSATIONS_COLLECTION = "ai_conversations"
 LEARNING_OUTCOMES_COLLECTION = "learning_outcomes"
+FLOW_STATS_DAILY_COLLECTION = "flow_stats_daily"
 
 
 # ==================== EXTERNAL SENTIMENT CACHE ====================
@@ -86,6 +92,9 @@ LEARNING_OUTCOMES_COLLECTION = "learning_outcomes"
 _external_sentiment_cache: Dict[str, Tuple[Any, float]] = {}
 EXTERNAL_SENTIMENT_CACHE_TTL = 900  # 15 minutes in seconds
 
+_SENTIMENT_CACHE_HIT = CACHE_REQUESTS.labels("sentiment", "hit")
+_SENTIMENT_CACHE_MISS = CACHE_REQUESTS.labels("sentiment", "miss")
+
 
 def _get_cached_sentiment(key: str) -> Optional[Any]:
     """
@@ -100,12 +109,14 @@ def _get_cached_sentiment(key: str) -> Optional[Any]:
     if key in _external_sentiment_cache:
         data, timestamp = _external_sentiment_cache[key]
         if (time.time() - timestamp) < EXTERNAL_SENTIMENT_CACHE_TTL:
-            logger.debug(f"Cache hit for {key}")
+            _SENTIMENT_CACHE_HIT.inc()
+            logger.debug("Cache hit for %s", key)
             return data
         else:
             # Cache expired, remove it
             del _external_sentiment_cache[key]
-            logger.debug(f"Cache expired for {key}")
+            logger.debug("Cache expired for %s", key)
+    _SENTIMENT_CACHE_MISS.inc()
     return None
 
 
@@ -118,7 +129,7 @@ def _set_cached_sentiment(key: str, data: Any) -> None:
         data: Data to cache
     """
     _external_sentiment_cache[key] = (data, time.time())
-    logger.debug(f"Cache set for {key}")
+    logger.debug("Cache set for %s", key)
 
 
 async def _get_or_create_demo_user(db: AsyncIOMotorDatabase) -> Optional[str]:
@@ -208,6 +219,78 @@ def _aggregate_usage(usages: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
+def _flow_stats_pipeline(
+    increments: Dict[str, Any],
+    set_fields: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """
+    Build an aggregation-pipeline update for flow statistics.
+
+    The first stage applies counter increments (the pipeline equivalent of
+    ``$inc``), the second derives ``win_rate`` and average P&L from the
+    freshly updated counters, so the whole update is a single atomic write
+    with no prior read of the flow document.
+    """
+    counters = {
+        field: {"$add": [{"$ifNull": [f"${field}", 0]}, value]}
+        for field, value in increments.items()
+    }
+
+    def _ratio(numerator: str, denominator: str, scale: float = 1.0) -> Dict[str, Any]:
+        denominator_expr = {"$ifNull": [f"${denominator}", 0]}
+        return {
+            "$cond": [
+                {"$gt": [denominator_expr, 0]},
+                {
+                    "$round": [
+                        {
+                            "$multiply": [
+                                {"$divide": [{"$ifNull": [f"${numerator}", 0]}, denominator_expr]},
+                                scale,
+                            ]
+                        },
+                        4,
+                    ]
+                },
+                0.0,
+            ]
+        }
+
+    derived = {
+        "win_rate": {"$round": [_ratio("winning_trades", "successful_executions", 100.0), 2]},
+        "avg_pnl_usd": _ratio("total_pnl_usd", "closed_trades"),
+        "total_pnl_percent": _ratio("pnl_percent_sum", "closed_trades"),
+    }
+
+    return [
+        {"$set": {**counters, **set_fields}},
+        {"$set": derived},
+    ]
+
+
+async def _update_flow_stats_rollup(
+    db: AsyncIOMotorDatabase,
+    flow_obj_id: ObjectId,
+    completed_at: datetime,
+    increments: Dict[str, Any],
+) -> None:
+    """Upsert the per-flow daily rollup bucket with the same counter increments."""
+    settings = get_settings()
+    if settings is not None and not getattr(settings, "FLOW_STATS_DAILY_ROLLUP_ENABLED", True):
+        return
+
+    day = completed_at.astimezone(timezone.utc).strftime("%Y-%m-%d")
+    await db[FLOW_STATS_DAILY_COLLECTION].update_one(
+        {"flow_id": flow_obj_id, "day": day},
+        {
+            "$inc": increments,
+            "$set": {"updated_at": completed_at},
+            "$setOnInsert": {"flow_id": flow_obj_id, "day": day, "created_at": completed_at},
+        },
+        upsert=True,
+    )
+
+
 async def _update_flow_statistics(
     db: AsyncIOMotorDatabase,
     flow_id: str,
@@ -215,17 +298,23 @@ async def _update_flow_statistics(
     execution_completed: bool = True,
     completed_at: Optional[datetime] = None,
     increment_executions: bool = True,
+    realized_pnl_usd: Optional[float] = None,
+    realized_pnl_percent: Optional[float] = None,
 ) -> None:
     """
     Update flow statistics with P&L analytics.
     
     This function implements the UpdateFlowStats step from the flowchart.
-    It atomically updates flow statistics including:
+    It atomically updates flow statistics in a single pipeline update:
     - total_executions count (if increment_executions=True)
     - successful_executions count (if increment_executions=True)
-    - total_pnl_usd (from closed positions)
-    - total_pnl_percent (average P&L percentage)
-    - win_rate (percentage of profitable trades)
+    - total_pnl_usd, closed_trades, winning_trades (from closed positions)
+    - win_rate, avg_pnl_usd and total_pnl_percent (derived server-side)
+    
+    Counters are never read back and recomputed in Python, so concurrent
+    execution completions and position closes for the same flow cannot lose
+    updates. The same increments are mirrored into the daily rollup
+    collection (``flow_stats_daily``) for dashboards.
     
     Args:
         db: Database instance
@@ -234,120 +323,98 @@ async def _update_flow_statistics(
         execution_completed: Whether execution completed successfully
         completed_at: Completion timestamp
         increment_executions: Whether to increment execution counts (False when called from position close)
+        realized_pnl_usd: Realized P&L of a closed position (skips the position lookup when given)
+        realized_pnl_percent: Realized P&L percent of a closed position
     """
     try:
         completed_at = completed_at or datetime.now(timezone.utc)
         flow_obj_id = ObjectId(flow_id)
         
-        # Fetch realized P&L from position if provided
-        realized_pnl_usd = Decimal("0")
-        realized_pnl_percent = Decimal("0")
-        is_profitable = False
-        
-        if position_id:
+        # Fetch realized P&L from position only when the caller doesn't already have it
+        position_closed = realized_pnl_usd is not None
+        if not position_closed and position_id:
             try:
-                position_doc = await db[POSITIONS_COLLECTION].find_one({
-                    "_id": ObjectId(position_id),
-                    "flow_id": flow_obj_id,
-                })
+                position_doc = await db[POSITIONS_COLLECTION].find_one(
+                    {"_id": ObjectId(position_id), "flow_id": flow_obj_id},
+                    {"exit.realized_pnl": 1, "exit.realized_pnl_percent": 1},
+                )
                 
                 if position_doc and position_doc.get("exit"):
                     exit_data = position_doc.get("exit", {})
-                    realized_pnl_usd = Decimal(str(exit_data.get("realized_pnl", 0)))
-                    realized_pnl_percent = Decimal(str(exit_data.get("realized_pnl_percent", 0)))
-                    is_profitable = float(realized_pnl_usd) > 0
-                    logger.debug(f"Fetched P&L from position {position_id}: ${realized_pnl_usd}, {realized_pnl_percent}%")
+                    realized_pnl_usd = exit_data.get("realized_pnl", 0)
+                    realized_pnl_percent = exit_data.get("realized_pnl_percent", 0)
+                    position_closed = True
             except Exception as e:
                 logger.warning(f"Failed to fetch P&L from position {position_id}: {e}")
         
-        # Get current flow stats for win_rate calculation
-        flow_doc = await db[FLOWS_COLLECTION].find_one({"_id": flow_obj_id})
-        if not flow_doc:
-            logger.warning(f"Flow {flow_id} not found for stats update")
-            return
-        
-        current_total_executions = flow_doc.get("total_executions", 0)
-        current_successful_executions = flow_doc.get("successful_executions", 0)
-        current_total_pnl_usd = Decimal(str(flow_doc.get("total_pnl_usd", 0)))
-        current_winning_trades = flow_doc.get("winning_trades", 0)  # Track winning trades separately
-        
-        # Prepare update operations
-        update_ops = {
-            "$set": {
-                "last_run_at": completed_at,
-                "updated_at": completed_at,
-            }
-        }
-        
-        # Only increment execution counts if requested (not when called from position close)
+        increments: Dict[str, Any] = {}
         if increment_executions:
-            update_ops["$inc"] = {
-                "total_executions": 1,
-            }
+            increments["total_executions"] = 1
             if execution_completed:
-                update_ops["$inc"]["successful_executions"] = 1
-        else:
-            update_ops["$inc"] = {}
+                increments["successful_executions"] = 1
         
-        # Add P&L if position was closed
-        if position_id and realized_pnl_usd != 0:
-            update_ops["$inc"]["total_pnl_usd"] = float(realized_pnl_usd)
-            
-            # Track winning trades for win_rate calculation
-            if is_profitable:
-                update_ops["$inc"]["winning_trades"] = 1
-            
-            # Calculate new total P&L percent (weighted average)
-            new_total_pnl_usd = current_total_pnl_usd + realized_pnl_usd
-            new_total_executions = current_total_executions + 1
-            
-            if new_total_executions > 0:
-                # Average P&L percent across all closed positions
-                # This is a simplified calculation - could be enhanced to track per-position
-                avg_pnl_percent = (new_total_pnl_usd / Decimal(str(new_total_executions)) * Decimal("100")) if new_total_executions > 0 else Decimal("0")
-                # For now, use the latest position's P&L percent as a proxy
-                # A more accurate approach would require tracking all position P&L percentages
-                update_ops["$set"]["total_pnl_percent"] = float(realized_pnl_percent)
+        if position_closed:
+            pnl_usd = float(realized_pnl_usd or 0)
+            increments["closed_trades"] = 1
+            increments["total_pnl_usd"] = pnl_usd
+            increments["pnl_percent_sum"] = float(realized_pnl_percent or 0)
+            if pnl_usd > 0:
+                increments["winning_trades"] = 1
         
-        # Calculate win_rate
-        # If incrementing executions, use new counts; otherwise use current counts
-        if increment_executions:
-            new_successful_executions = current_successful_executions + (1 if execution_completed else 0)
-            new_winning_trades = current_winning_trades + (1 if (is_profitable and execution_completed) else 0)
-        else:
-            # Position close: execution was already counted, just update winning trades if profitable
-            new_successful_executions = current_successful_executions
-            new_winning_trades = current_winning_trades + (1 if is_profitable else 0)
-            if is_profitable:
-                update_ops["$inc"]["winning_trades"] = 1
-        
-        if new_successful_executions > 0:
-            win_rate = (new_winning_trades / new_successful_executions) * 100.0
-            update_ops["$set"]["win_rate"] = round(win_rate, 2)
-        else:
-            update_ops["$set"]["win_rate"] = 0.0
-        
-        # Atomic update
-        await db[FLOWS_COLLECTION].update_one(
+        result = await db[FLOWS_COLLECTION].update_one(
             {"_id": flow_obj_id},
-            update_ops
+            _flow_stats_pipeline(
+                increments,
+                {"last_run_at": completed_at, "updated_at": completed_at},
+            ),
         )
+        if result.matched_count == 0:
+            logger.warning(f"Flow {flow_id} not found for stats update")
+            return
         
-        new_total_executions = current_total_executions + (1 if increment_executions else 0)
-        new_total_pnl = current_total_pnl_usd + realized_pnl_usd
+        try:
+            await _update_flow_stats_rollup(db, flow_obj_id, completed_at, increments)
+        except Exception as e:
+            logger.warning(f"Failed to update daily stats rollup for flow {flow_id}: {e}")
         
-        logger.info(
-            f"Updated flow {flow_id} stats: "
-            f"executions={new_total_executions}, "
-            f"successful={new_successful_executions}, "
-            f"PnL=${float(new_total_pnl):.2f}, "
-            f"win_rate={update_ops['$set'].get('win_rate', 0):.2f}%"
-        )
+        logger.debug(f"Updated flow {flow_id} stats: {increments}")
         
     except Exception as e:
         logger.error(f"Failed to update flow statistics for {flow_id}: {e}")
 
 
+async def get_flow_daily_stats(
+    db: AsyncIOMotorDatabase,
+    flow_id: str,
+    days: int = 30,
+) -> List[Dict[str, Any]]:
+    """
+    Get per-day statistics buckets for a flow from the rollup collection.
+    
+    Args:
+        db: Database instance
+        flow_id: Flow ID
+        days: Number of most recent days to return
+        
+    Returns:
+        List of daily buckets ordered by day ascending
+    """
+    since = (datetime.now(timezone.utc) - timedelta(days=max(days - 1, 0))).strftime("%Y-%m-%d")
+    cursor = db[FLOW_STATS_DAILY_COLLECTION].find(
+        {"flow_id": ObjectId(flow_id), "day": {"$gte": since}},
+        {"_id": 0, "flow_id": 0},
+    ).sort("day", 1)
+
+    buckets = []
+    async for doc in cursor:
+        closed_trades = doc.get("closed_trades", 0)
+        successful = doc.get("successful_executions", 0)
+        doc["win_rate"] = round(doc.get("winning_trades", 0) / successful * 100.0, 2) if successful else 0.0
+        doc["avg_pnl_usd"] = round(doc.get("total_pnl_usd", 0) / closed_trades, 4) if closed_trades else 0.0
+        buckets.append(doc)
+    return buckets
+
+
 def _aggregate_swarm_results(
     results: List[Dict[str, Any]],
     role_weights: Optional[Dict[str, float]] = None,
@@ -581,34 +648,6 @@ async def _schedule_auto_loop(
         {"$set": {"config.auto_loop_cycle_count": cycle_count}},
     )
 
-    async def _delayed_run() -> None:
-        """Execute the next cycle with robust error handling."""
-        await asyncio.sleep(delay_seconds)
-        
-        try:
-            refreshed = await get_flow_by_id(db, flow.id)
-            if not refreshed:
-                logger.warning(f"Flow {flow.id} not found, stopping auto-loop")
-                return
-            if refreshed.status != FlowStatus.ACTIVE:
-                logger.info(f"Flow {flow.id} is not active (status: {refreshed.status}), stopping auto-loop")
-                return
-            
-            await execute_flow(db, refreshed, model_provider, model_name)
-        except Exception as e:
-            # Log error but continue the loop - don't let one failure stop trading
-            logger.error(f"Auto-loop execution failed for flow {flow.id}: {e}")
-            
-            # Re-check flow status before scheduling retry
-            try:
-                refreshed = await get_flow_by_id(db, flow.id)
-                if refreshed and refreshed.status == FlowStatus.ACTIVE:
-                    logger.info(f"Scheduling retry for flow {flow.id} after error")
-                    # Schedule next attempt with same delay
-                    await _schedule_auto_loop(db, refreshed, model_provider, model_name)
-            except Exception as retry_error:
-                logger.error(f"Failed to schedule retry for flow {flow.id}: {retry_error}")
-
     try:
         from celery import current_task
         if current_task and current_task.request is not None:
@@ -622,7 +661,9 @@ async def _schedule_auto_loop(
     except Exception:
         pass
 
-    asyncio.create_task(_delayed_run())
+    # Persist the next cycle instead of holding an in-process timer; the
+    # flow scheduler dispatcher claims it when due on whichever worker polls first.
+    await schedule_flow_run(db, str(flow.id), delay_seconds, model_provider, model_name)
 
 
 async def _place_order_with_retry(
@@ -748,6 +789,7 @@ async def update_flow(
 async def delete_flow(db: AsyncIOMotorDatabase, flow_id: str) -> bool:
     """Delete flow"""
     result = await db[FLOWS_COLLECTION].delete_one({"_id": ObjectId(flow_id)})
+    await cancel_flow_run(db, flow_id)
     return result.deleted_count > 0
 
 
@@ -835,6 +877,8 @@ async def stop_flow(db: AsyncIOMotorDatabase, flow_id: str) -> Optional[Flow]:
         }
     )
     
+    await cancel_flow_run(db, flow_id)
+
     logger.info(f"Stopped continuous trading flow: {flow_id} - {flow.name}")
     
     return await get_flow_by_id(db, flow_id)
@@ -1106,23 +1150,24 @@ async def recover_stuck_executions(db: AsyncIOMotorDatabase) -> Dict[str, Any]:
     now = datetime.now(timezone.utc)
     lock_collection = "execution_locks"
     
-    # Find all expired locks
-    expired_locks = await db[lock_collection].find({
-        "expires_at": {"$lt": now}
-    }).to_list(length=None)
-    
     recovered_count = 0
     
-    for lock in expired_locks:
+    # Stream expired locks
+    expired_locks = db[lock_collection].find(
+        {"expires_at": {"$lt": now}},
+        {"flow_id": 1, "execution_id": 1},
+        batch_size=cursor_batch_size(),
+    )
+    async for lock in expired_locks:
         flow_id = lock.get("flow_id")
         execution_id = lock.get("execution_id")
         
         if execution_id:
             # Check if execution is still RUNNING
-            execution = await db[EXECUTIONS_COLLECTION].find_one({
-                "_id": ObjectId(execution_id),
-                "status": ExecutionStatus.RUNNING.value
-            })
+            execution = await db[EXECUTIONS_COLLECTION].find_one(
+                {"_id": ObjectId(execution_id), "status": ExecutionStatus.RUNNING.value},
+                {"_id": 1},
+            )
             
             if execution:
                 # Mark execution as failed
@@ -1143,15 +1188,10 @@ async def recover_stuck_executions(db: AsyncIOMotorDatabase) -> Dict[str, Any]:
                 logger.info(f"Recovered stuck execution {execution_id} for flow {flow_id}")
     
     # Also check for RUNNING executions without locks (orphaned)
-    running_executions = await db[EXECUTIONS_COLLECTION].find({
-        "status": ExecutionStatus.RUNNING.value,
-        "deleted_at": None
-    }).to_list(length=None)
-    
     orphaned_count = 0
-    for exec_doc in running_executions:
-        flow_id = exec_doc.get("flow_id")
-        execution_id = str(exec_doc.get("_id"))
+    async for execution in ExecutionRepository(db).iter_running(fields=("flow_id",)):
+        flow_id = execution.flow_id
+        execution_id = str(execution.id)
         lock_id = f"flow_lock_{flow_id}"
         
         # Check if lock exists
@@ -1181,6 +1221,36 @@ async def recover_stuck_executions(db: AsyncIOMotorDatabase) -> Dict[str, Any]:
 
 # ==================== FLOW EXECUTION ====================
 
+# ==================== EXECUTION METRICS ====================
+
+FLOW_STEP_SECONDS = get_metrics_registry().histogram(
+    "flow_step_duration_seconds", "execute_flow step latency", ("step", "status"), SLOW_BUCKETS
+)
+FLOW_EXECUTION_SECONDS = get_metrics_registry().histogram(
+    "flow_execution_duration_seconds", "execute_flow end-to-end latency", ("status",), SLOW_BUCKETS
+)
+_STEP_NAMES = [step.value for step in StepName]
+
+
+class _StepClock:
+    """Times execute_flow steps (by index) into FLOW_STEP_SECONDS."""
+
+    def __init__(self):
+        self._started: Dict[int, float] = {}
+
+    def start(self, step: int) -> None:
+        self._started[step] = time.perf_counter()
+
+    def stop(self, step: int, status: StepStatus = StepStatus.COMPLETED) -> None:
+        started = self._started.pop(step, None)
+        if started is not None:
+            FLOW_STEP_SECONDS.labels(_STEP_NAMES[step], status.value).observe_since(started)
+
+    def fail_running(self) -> None:
+        for step in list(self._started):
+            self.stop(step, StepStatus.FAILED)
+
+
 async def execute_flow(
     db: AsyncIOMotorDatabase,
     flow: Flow,
@@ -1234,6 +1304,9 @@ async def execute_flow(
     STEP_MARKET_ANALYSIS = 1
     STEP_RISK_VALIDATION = 2
     STEP_DECISION = 3
+    step_clock = _StepClock()
+    execution_started = time.perf_counter()
+    execution_outcome = ExecutionStatus.COMPLETED
     
     try:
         # Mark execution as running + start data fetch step
@@ -1242,6 +1315,7 @@ async def execute_flow(
             f"steps.{STEP_DATA_FETCH}.status": StepStatus.RUNNING.value,
             f"steps.{STEP_DATA_FETCH}.started_at": datetime.now(timezone.utc),
         })
+        step_clock.start(STEP_DATA_FETCH)
         user_id = str((flow.config or {}).get("user_id") or (execution_config or {}).get("user_id"))
         await _emit_execution_update(
             execution.id, flow.id, "RUNNING", STEP_DATA_FETCH,
@@ -1277,9 +1351,7 @@ async def execute_flow(
         # Fetch aggregated sentiment signal (social + prediction markets)
         signal_data = None
         try:
-            base_symbol = flow.symbol.split("/")[0] if "/" in flow.symbol else flow.symbol
-            aggregator = get_signal_aggregator()
-            signal = await aggregator.get_signal(base_symbol.upper())
+            signal = await get_signal_materializer().get_signal(flow.symbol)
             signal_data = signal.to_dict()
         except Exception as e:
             logger.error(f"Failed to fetch sentiment signal for {flow.symbol}: {e}")
@@ -1349,6 +1421,7 @@ async def execute_flow(
             f"steps.{STEP_DATA_FETCH}.completed_at": datetime.now(timezone.utc),
             f"steps.{STEP_DATA_FETCH}.data": {"candles_count": len(candles)},
         })
+        step_clock.stop(STEP_DATA_FETCH)
         await _emit_execution_update(
             execution.id, flow.id, "RUNNING", STEP_MARKET_ANALYSIS,
             "AI Swarm Analyzing", 30, "Running market analysis with AI agents...", user_id
@@ -1362,6 +1435,7 @@ async def execute_flow(
             f"steps.{STEP_MARKET_ANALYSIS}.status": StepStatus.RUNNING.value,
             f"steps.{STEP_MARKET_ANALYSIS}.started_at": datetime.now(timezone.utc),
         })
+        step_clock.start(STEP_MARKET_ANALYSIS)
         
         analysis_context = {
             "symbol": flow.symbol,
@@ -1375,7 +1449,26 @@ async def execute_flow(
             swarm_min_agreement = int(swarm_config.get("swarm_min_agreement", 50))
             role_weights = swarm_config.get("swarm_role_weights", {"market_analyst": 1.0})
 
-            async def run_swarm_member() -> Dict[str, Any]:
+            conversation_events = get_conversation_event_bus()
+            conversation_id = ObjectId()
+            await db[AI_CONVERSATIONS_COLLECTION].insert_one({
+                "_id": conversation_id,
+                "user_id": (flow.config or {}).get("user_id"),
+                "execution_id": execution.id,
+                "flow_id": execution.flow_id,
+                "context": {
+                    "symbol": flow.symbol,
+                    "action": "voting",
+                    "phase": StepName.MARKET_ANALYSIS.value,
+                },
+                "messages": [],
+                "status": "in_progress",
+                "created_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc),
+            })
+            await conversation_events.publish(execution.id, "status", {"status": "in_progress", "total_agents": swarm_runs})
+
+            async def run_swarm_member(idx: int) -> Dict[str, Any]:
                 agent = MarketAnalystAgent(
                     model_provider=model_provider,
                     model_name=model_name,
@@ -1386,6 +1479,39 @@ async def execute_flow(
                 duration_ms = int((time.perf_counter() - start) * 1000)
                 after = agent.model.get_model_info()
                 usage = _usage_delta(before, after)
+
+                # Write and stream each vote as soon as this member finishes
+                confidence = int((result.get("confidence") or 0) * 100)
+                message = {
+                    "agent_name": f"market_analyst_{idx + 1}",
+                    "agent_role": "market_analyst",
+                    "ai_model": usage.get("model_name"),
+                    "message_type": "vote",
+                    "content": {
+                        "text": result.get("reasoning", ""),
+                        "confidence": confidence,
+                        "sentiment": "bullish" if result.get("action") == "buy" else (
+                            "bearish" if result.get("action") == "sell" else "neutral"
+                        ),
+                        "data": result,
+                    },
+                    "vote": {
+                        "action": result.get("action"),
+                        "confidence": confidence,
+                        "weight": int((result.get("confidence") or 0) * 100 * role_weights.get("market_analyst", 1.0)),
+                    },
+                    "timestamp": datetime.now(timezone.utc),
+                    "ui": {
+                        "tone": "neutral",
+                        "icon": "activity",
+                        "color": "blue",
+                    },
+                }
+                await db[AI_CONVERSATIONS_COLLECTION].update_one(
+                    {"_id": conversation_id},
+                    {"$push": {"messages": message}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+                )
+                await conversation_events.publish(execution.id, "message", message)
                 return {
                     "result": result,
                     "role": "market_analyst",
@@ -1393,7 +1519,15 @@ async def execute_flow(
                     "duration_ms": duration_ms,
                 }
 
-            swarm_results = await asyncio.gather(*[run_swarm_member() for _ in range(swarm_runs)])
+            try:
+                swarm_results = await asyncio.gather(*[run_swarm_member(idx) for idx in range(swarm_runs)])
+            except Exception:
+                await db[AI_CONVERSATIONS_COLLECTION].update_one(
+                    {"_id": conversation_id},
+                    {"$set": {"status": "failed", "updated_at": datetime.now(timezone.utc)}},
+                )
+                await conversation_events.publish(execution.id, "status", {"status": "failed"})
+                raise
             swarm_usage = _aggregate_usage([r["usage"] for r in swarm_results])
             swarm_aggregate = _aggregate_swarm_results(
                 [
@@ -1426,65 +1560,37 @@ async def execute_flow(
             }
             analyst_duration_ms = int(sum(r["duration_ms"] for r in swarm_results) / swarm_runs)
             analyst_usage = swarm_usage
-            await db[AI_CONVERSATIONS_COLLECTION].insert_one({
-                "user_id": (flow.config or {}).get("user_id"),
-                "execution_id": execution.id,
-                "flow_id": execution.flow_id,
-                "context": {
-                    "symbol": flow.symbol,
-                    "action": "voting",
-                    "phase": StepName.MARKET_ANALYSIS.value,
+            swarm_vote = {
+                "total_agents": len(swarm_results),
+                "votes": swarm_aggregate["members"],
+                "results": swarm_aggregate["votes"],
+                "consensus": {
+                    "action": swarm_aggregate["action"],
+                    "confidence": int(swarm_aggregate["confidence"] * 100),
+                    "agreement": swarm_aggregate["agreement"],
+                    "is_unanimous": swarm_aggregate["is_unanimous"],
                 },
-                "messages": [
-                    {
-                        "agent_name": f"market_analyst_{idx + 1}",
-                        "agent_role": "market_analyst",
-                        "ai_model": analyst_usage.get("model_name"),
-                        "message_type": "vote",
-                        "content": {
-                            "text": result["result"].get("reasoning", ""),
-                            "confidence": int((result["result"].get("confidence") or 0) * 100),
-                            "sentiment": "bullish" if result["result"].get("action") == "buy" else (
-                                "bearish" if result["result"].get("action") == "sell" else "neutral"
-                            ),
-                            "data": result["result"],
-                        },
-                        "vote": {
-                            "action": result["result"].get("action"),
-                            "confidence": int((result["result"].get("confidence") or 0) * 100),
-                            "weight": int((result["result"].get("confidence") or 0) * 100 * role_weights.get("market_analyst", 1.0)),
-                        },
-                        "timestamp": datetime.now(timezone.utc),
-                        "ui": {
-                            "tone": "neutral",
-                            "icon": "activity",
-                            "color": "blue",
-                        },
+                "voting_completed": datetime.now(timezone.utc),
+            }
+            outcome = {
+                "executed": False,
+                "action": swarm_aggregate["action"],
+                "reasoning": swarm_aggregate["reasoning"],
+                "timestamp": datetime.now(timezone.utc),
+            }
+            await db[AI_CONVERSATIONS_COLLECTION].update_one(
+                {"_id": conversation_id},
+                {
+                    "$set": {
+                        "swarm_vote": swarm_vote,
+                        "outcome": outcome,
+                        "status": "completed",
+                        "updated_at": datetime.now(timezone.utc),
                     }
-                    for idx, result in enumerate(swarm_results)
-                ],
-                "swarm_vote": {
-                    "total_agents": len(swarm_results),
-                    "votes": swarm_aggregate["members"],
-                    "results": swarm_aggregate["votes"],
-                    "consensus": {
-                        "action": swarm_aggregate["action"],
-                        "confidence": int(swarm_aggregate["confidence"] * 100),
-                        "agreement": swarm_aggregate["agreement"],
-                        "is_unanimous": swarm_aggregate["is_unanimous"],
-                    },
-                    "voting_completed": datetime.now(timezone.utc),
                 },
-                "outcome": {
-                    "executed": False,
-                    "action": swarm_aggregate["action"],
-                    "reasoning": swarm_aggregate["reasoning"],
-                    "timestamp": datetime.now(timezone.utc),
-                },
-                "status": "completed",
-                "created_at": datetime.now(timezone.utc),
-                "updated_at": datetime.now(timezone.utc),
-            })
+            )
+            await conversation_events.publish(execution.id, "swarm_vote", swarm_vote)
+            await conversation_events.publish(execution.id, "status", {"status": "completed", "outcome": outcome})
         else:
             # Run Market Analyst
             market_analyst = MarketAnalystAgent(
@@ -1553,6 +1659,7 @@ async def execute_flow(
             f"steps.{STEP_MARKET_ANALYSIS}.completed_at": datetime.now(timezone.utc),
             f"steps.{STEP_MARKET_ANALYSIS}.data": analysis_result,
         })
+        step_clock.stop(STEP_MARKET_ANALYSIS)
         await _emit_execution_update(
             execution.id, flow.id, "RUNNING", STEP_RISK_VALIDATION,
             "Risk Check Gate", 60, "Evaluating risk parameters and constraints...", user_id
@@ -1669,6 +1776,7 @@ async def execute_flow(
                 f"steps.{STEP_DECISION}.status": StepStatus.RUNNING.value,
                 f"steps.{STEP_DECISION}.started_at": completed_at,
             })
+            step_clock.start(STEP_DECISION)
 
             await update_execution(db, execution.id, {
                 "status": ExecutionStatus.COMPLETED.value,
@@ -1683,19 +1791,13 @@ async def execute_flow(
                 },
                 "result": result.model_dump(),
             })
+            step_clock.stop(STEP_DECISION)
 
-            await db[FLOWS_COLLECTION].update_one(
-                {"_id": ObjectId(flow.id)},
-                {
-                    "$inc": {
-                        "total_executions": 1,
-                        "successful_executions": 1,
-                    },
-                    "$set": {
-                        "last_run_at": completed_at,
-                        "updated_at": completed_at,
-                    },
-                }
+            await _update_flow_statistics(
+                db=db,
+                flow_id=flow.id,
+                execution_completed=True,
+                completed_at=completed_at,
             )
 
             await _schedule_auto_loop(db, flow, model_provider, model_name)
@@ -1706,6 +1808,7 @@ async def execute_flow(
             f"steps.{STEP_RISK_VALIDATION}.status": StepStatus.RUNNING.value,
             f"steps.{STEP_RISK_VALIDATION}.started_at": datetime.now(timezone.utc),
         })
+        step_clock.start(STEP_RISK_VALIDATION)
 
         # Phase 3: Risk rules engine (hard limits)
         risk_config = execution_config
@@ -1789,6 +1892,7 @@ async def execute_flow(
                 f"steps.{STEP_RISK_VALIDATION}.completed_at": completed_at,
                 f"steps.{STEP_RISK_VALIDATION}.data": risk_rules_result,
             })
+            step_clock.stop(STEP_RISK_VALIDATION)
             await _emit_execution_update(
                 execution.id, flow.id, "RUNNING", STEP_DECISION,
                 "Placing Order on Exchange", 90, "Executing trade order...", user_id
@@ -1801,6 +1905,7 @@ async def execute_flow(
                 f"steps.{STEP_DECISION}.status": StepStatus.RUNNING.value,
                 f"steps.{STEP_DECISION}.started_at": completed_at,
             })
+            step_clock.start(STEP_DECISION)
 
             await update_execution(db, execution.id, {
                 "status": ExecutionStatus.COMPLETED.value,
@@ -1815,19 +1920,13 @@ async def execute_flow(
                 },
                 "result": result.model_dump(),
             })
+            step_clock.stop(STEP_DECISION)
 
-            await db[FLOWS_COLLECTION].update_one(
-                {"_id": ObjectId(flow.id)},
-                {
-                    "$inc": {
-                        "total_executions": 1,
-                        "successful_executions": 1,
-                    },
-                    "$set": {
-                        "last_run_at": completed_at,
-                        "updated_at": completed_at,
-                    },
-                }
+            await _update_flow_statistics(
+                db=db,
+                flow_id=flow.id,
+                execution_completed=True,
+                completed_at=completed_at,
             )
 
             await _schedule_auto_loop(db, flow, model_provider, model_name)
@@ -2503,6 +2602,7 @@ async def execute_flow(
             f"steps.{STEP_RISK_VALIDATION}.completed_at": datetime.now(timezone.utc),
             f"steps.{STEP_RISK_VALIDATION}.data": risk_result,
         })
+        step_clock.stop(STEP_RISK_VALIDATION)
         
         # Heartbeat: Update lock expiration after risk validation
         await heartbeat_execution_lock(db, flow.id, str(execution.id))
@@ -2512,6 +2612,7 @@ async def execute_flow(
             f"steps.{STEP_DECISION}.status": StepStatus.RUNNING.value,
             f"steps.{STEP_DECISION}.started_at": datetime.now(timezone.utc),
         })
+        step_clock.start(STEP_DECISION)
         
         order_payload = _to_response_payload(order_record) if order_record else None
         position_payload = _to_response_payload(position_record) if position_record else None
@@ -2532,6 +2633,7 @@ async def execute_flow(
             },
             "result": result.model_dump(),
         })
+        step_clock.stop(STEP_DECISION)
         await _emit_execution_update(
             execution.id, flow.id, "COMPLETED", STEP_DECISION,
             "Placing Order on Exchange", 100, f"Trade {final_action.upper()} executed successfully", user_id
@@ -2562,11 +2664,11 @@ async def execute_flow(
         await db[LEARNING_OUTCOMES_COLLECTION].insert_one(_to_serializable(learning_record))
         
         # Update flow statistics with P&L analytics
-        position_id_str = position_record.get("_id") if position_record else None
+        # The position opened by this execution has no realized P&L yet; it is
+        # folded into the stats by the position tracker when the position closes.
         await _update_flow_statistics(
             db=db,
             flow_id=flow.id,
-            position_id=position_id_str,
             execution_completed=True,
             completed_at=completed_at,
         )
@@ -2577,6 +2679,8 @@ async def execute_flow(
 
     except Exception as e:
         logger.error(f"Flow execution failed: {str(e)}")
+        execution_outcome = ExecutionStatus.FAILED
+        step_clock.fail_running()
 
         failed_at = datetime.now(timezone.utc)
         # Safe fallback for execution_config in case exception occurs before it's defined
@@ -2614,6 +2718,8 @@ async def execute_flow(
         raise
 
     finally:
+        FLOW_EXECUTION_SECONDS.labels(execution_outcome.value).observe_since(execution_started)
+
         # EXECUTION SAFEGUARD CLEANUP: Always release the lock
         # Only delete if lock matches this execution_id (prevents deleting wrong lock)
         try:
@@ -2653,3 +2759,79 @@ async def execute_flow(
                 },
             }
         )
+
+
+# ==================== BACKTEST PARAMETER SWEEPS ====================
+
+async def start_parameter_sweep(
+    db: AsyncIOMotorDatabase,
+    flow: Flow,
+    interval: str,
+    start: datetime,
+    end: Optional[datetime],
+    grid: Dict[str, List[Any]],
+    metric: str = "total_pnl_usd",
+    llm_stub: bool = True,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Create a parameter sweep job for a flow and run it in the background.
+
+    Every grid combination is backtested against the flow's config; results
+    stream into the sweep results collection while the job document keeps
+    progress and the top trials.
+
+    Raises:
+        ValueError: On an invalid grid, metric or too many trials
+    """
+    from app.services.backtest import (
+        BACKTEST_SWEEPS_COLLECTION,
+        SWEEP_METRICS,
+        BacktestConfig,
+        ensure_sweep_indexes,
+        expand_grid,
+        start_sweep_task,
+    )
+
+    if metric not in SWEEP_METRICS:
+        raise ValueError(f"Unsupported metric: {metric}. Use one of: {', '.join(sorted(SWEEP_METRICS))}")
+    trials = expand_grid(grid)
+    max_trials = getattr(get_settings(), "BACKTEST_SWEEP_MAX_TRIALS", 1000)
+    if len(trials) > max_trials:
+        raise ValueError(f"Grid has {len(trials)} combinations (max {max_trials})")
+
+    base = BacktestConfig.from_flow_config(flow.config, llm_stub=llm_stub)
+    now = datetime.now(timezone.utc)
+    job = {
+        "_id": ObjectId(),
+        "flow_id": str(flow.id),
+        "symbol": flow.symbol,
+        "interval": interval,
+        "start": start,
+        "end": end,
+        "grid": grid,
+        "metric": metric,
+        "status": "pending",
+        "total_trials": len(trials),
+        "completed": 0,
+        "failed": 0,
+        "top": [],
+        "created_at": now,
+    }
+    await db[BACKTEST_SWEEPS_COLLECTION].insert_one(job)
+    await ensure_sweep_indexes(db)
+    start_sweep_task(
+        db, job["_id"], flow.symbol, interval, start, end, base, trials,
+        metric=metric, max_workers=max_workers,
+    )
+    logger.info(f"Started parameter sweep {job['_id']} for flow {flow.id}: {len(trials)} trials")
+    return job
+
+
+async def get_parameter_sweep(db: AsyncIOMotorDatabase, flow_id: str, job_id: str) -> Optional[Dict[str, Any]]:
+    """Get a flow's parameter sweep job (progress and top trials)"""
+    from app.services.backtest import BACKTEST_SWEEPS_COLLECTION
+
+    if not ObjectId.is_valid(job_id):
+        return None
+    return await db[BACKTEST_SWEEPS_COLLECTION].find_one({"_id": ObjectId(job_id), "flow_id": flow_id})
@@ -31,13 +31,17 @@ from app.modules.market.schemas import (
 )
 from app.services.indicators import calculate_all_indicators
 from app.services.market_health import compute_market_health
-from app.services.signal_aggregator import get_signal_aggregator
+from app.services.signal_materializer import get_signal_materializer
+from app.utils.cache import CacheManager
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/market", tags=["Market Data"])
 
+# Response cache for the public, unauthenticated endpoints (ETag/304 + Cache-Control)
+market_cache = CacheManager(prefix="market")
+
 
 # ==================== OHLCV DATA ====================
 
@@ -47,6 +51,7 @@ router = APIRouter(prefix="/market", tags=["Market Data"])
     summary="Get OHLCV candles",
     description="Get candlestick data from Binance. Symbol format: BTC/USDT or BTCUSDT",
 )
+@market_cache.cached_route(ttl_param="interval", stale_ttl=30)
 async def get_ohlc(
     symbol: str,
     interval: str = Query("1h", description="Timeframe: 1m, 5m, 15m, 1h, 4h, 1d"),
@@ -88,6 +93,7 @@ async def get_ohlc(
     summary="Get combined market data",
     description="Get candles, indicators, market health, and sentiment signal",
 )
+@market_cache.cached_route(ttl_param="interval", stale_ttl=30)
 async def get_market_data(
     symbol: str,
     interval: str = Query("1h", description="Timeframe: 1m, 5m, 15m, 1h, 4h, 1d"),
@@ -97,7 +103,7 @@ async def get_market_data(
 ):
     """Get combined market data with indicators and health"""
     client = get_binance_client()
-    aggregator = get_signal_aggregator()
+    materializer = get_signal_materializer()
 
     try:
         candles = await client.get_klines(symbol, interval, limit)
@@ -120,8 +126,7 @@ async def get_market_data(
 
         signal = None
         if include_signal:
-            base_symbol = symbol.split("/")[0] if "/" in symbol else symbol
-            signal = (await aggregator.get_signal(base_symbol.upper())).to_dict()
+            signal = (await materializer.get_signal(symbol)).to_dict()
 
         return MarketDataResponse(
             symbol=symbol,
@@ -172,6 +177,7 @@ async def get_market_data(
     summary="Get market health",
     description="Get market volatility, trend, and crash detection",
 )
+@market_cache.cached_route(ttl_param="interval", stale_ttl=30)
 async def get_market_health(
     symbol: str,
     interval: str = Query("1h", description="Timeframe: 1m, 5m, 15m, 1h, 4h, 1d"),
@@ -330,6 +336,7 @@ async def get_tickers(
     summary="Get global market stats",
     description="Get global crypto market statistics from Coinlore",
 )
+@market_cache.cached_route(ttl=120, stale_ttl=300)
 async def get_global_stats():
     """Get global market statistics"""
     client = get_coinlore_client()
@@ -367,6 +374,7 @@ async def get_global_stats():
     summary="Get top cryptocurrencies",
     description="Get top coins by market cap from Coinlore",
 )
+@market_cache.cached_route(ttl=60, stale_ttl=120)
 async def get_top_coins(
     start: int = Query(0, ge=0, description="Starting position"),
     limit: int = Query(20, ge=1, le=100, description="Number of coins"),
@@ -454,6 +462,7 @@ async def get_coin_info(symbol: str):
     summary="Get technical indicators",
     description="Calculate technical indicators (RSI, MACD, SMA, EMA, Bollinger Bands) from price data",
 )
+@market_cache.cached_route(ttl_param="interval", stale_ttl=30)
 async def get_indicators(
     symbol: str,
     interval: str = Query("1h", description="Timeframe: 1m, 5m, 15m, 1h, 4h, 1d"),
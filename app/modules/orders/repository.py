@@ -0,0 +1,149 @@
+"""
+Order Repository
+
+Typed read access to the ``orders`` collection over raw Motor, decoding
+projected documents once into ``OrderRecord`` (``__slots__``, amounts
+already Decimal). See ``app.modules.positions.repository``.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.modules.orders.models import OrderStatus
+from app.utils.records import Record, cursor_batch_size, projection, to_decimal, to_object_id
+
+ORDERS_COLLECTION = "orders"
+
+OPEN_STATUSES = (
+    OrderStatus.PENDING.value,
+    OrderStatus.SUBMITTED.value,
+    OrderStatus.OPEN.value,
+    OrderStatus.PARTIALLY_FILLED.value,
+)
+COMPLETE_STATUSES = frozenset({
+    OrderStatus.FILLED.value,
+    OrderStatus.CANCELLED.value,
+    OrderStatus.REJECTED.value,
+    OrderStatus.EXPIRED.value,
+})
+
+
+class OrderRecord(Record):
+    """Decoded order document."""
+
+    __slots__ = (
+        "id",
+        "user_id",
+        "user_wallet_id",
+        "position_id",
+        "flow_id",
+        "execution_id",
+        "symbol",
+        "side",
+        "order_type",
+        "status",
+        "requested_amount",
+        "filled_amount",
+        "remaining_amount",
+        "limit_price",
+        "stop_price",
+        "average_fill_price",
+        "total_fees",
+        "external_order_id",
+        "created_at",
+        "closed_at",
+    )
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, Any]) -> "OrderRecord":
+        """Decode a (possibly projected) raw document."""
+        get = doc.get
+        record = cls.__new__(cls)
+        record.id = get("_id")
+        record.user_id = get("user_id")
+        record.user_wallet_id = get("user_wallet_id")
+        record.position_id = get("position_id")
+        record.flow_id = get("flow_id")
+        record.execution_id = get("execution_id")
+        record.symbol = get("symbol") or ""
+        record.side = get("side") or ""
+        record.order_type = get("order_type") or ""
+        record.status = get("status") or ""
+        record.requested_amount = to_decimal(get("requested_amount"))
+        record.filled_amount = to_decimal(get("filled_amount"))
+        record.remaining_amount = to_decimal(get("remaining_amount"))
+        record.limit_price = to_decimal(get("limit_price"), None)
+        record.stop_price = to_decimal(get("stop_price"), None)
+        record.average_fill_price = to_decimal(get("average_fill_price"), None)
+        record.total_fees = to_decimal(get("total_fees"))
+        record.external_order_id = get("external_order_id")
+        record.created_at = get("created_at")
+        record.closed_at = get("closed_at")
+        return record
+
+    def is_open(self) -> bool:
+        """Check if order is still open (not filled/cancelled/rejected)."""
+        return self.status in OPEN_STATUSES
+
+    def is_complete(self) -> bool:
+        """Check if order is complete (filled/cancelled/rejected/expired)."""
+        return self.status in COMPLETE_STATUSES
+
+
+class OrderRepository:
+    """
+    Orders over raw Motor.
+
+    Usage:
+        orders = OrderRepository(db)
+        async for order in orders.iter_open():
+            ...
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+
+    @property
+    def collection(self):
+        return self.db[ORDERS_COLLECTION]
+
+    async def get(self, order_id: Any, fields: Optional[Iterable[str]] = None) -> Optional[OrderRecord]:
+        """Get a non-deleted order (None if the id is invalid or not found)."""
+        oid = to_object_id(order_id)
+        if oid is None:
+            return None
+        doc = await self.collection.find_one(
+            {"_id": oid, "deleted_at": None},
+            projection(fields) if fields else None,
+        )
+        return OrderRecord.from_doc(doc) if doc else None
+
+    async def iter_open(
+        self,
+        user_id: Optional[Any] = None,
+        fields: Iterable[str] = ("symbol", "status"),
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[OrderRecord]:
+        """Stream open, non-deleted orders, optionally for one user."""
+        query: Dict[str, Any] = {"status": {"$in": list(OPEN_STATUSES)}, "deleted_at": None}
+        if user_id is not None:
+            query["user_id"] = to_object_id(user_id)
+        cursor = self.collection.find(query, projection(fields), batch_size=cursor_batch_size(batch_size))
+        async for doc in cursor:
+            yield OrderRecord.from_doc(doc)
+
+    async def list_for_position(
+        self,
+        position_id: Any,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[OrderRecord]:
+        """Orders of a position, oldest first."""
+        cursor = self.collection.find(
+            {"position_id": to_object_id(position_id), "deleted_at": None},
+            projection(fields) if fields else None,
+        ).sort("created_at", 1)
+        return [OrderRecord.from_doc(doc) async for doc in cursor]
@@ -0,0 +1,205 @@
+"""
+Position Repository
+
+Typed read/write access to the ``positions`` collection over raw Motor.
+
+Documents are fetched with a projection and decoded once into
+``PositionRecord`` (``__slots__``, entry numbers already Decimal). This
+replaces the Beanie-then-raw-Mongo double query: ``init_beanie`` is never
+called by the API, so every ``Position.get`` / ``Position.find`` raised
+before the raw fallback ran.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.modules.positions.models import PositionStatus
+from app.utils.records import Record, cursor_batch_size, projection, to_decimal, to_object_id, to_utc
+
+POSITIONS_COLLECTION = "positions"
+
+# Statuses the tracker keeps updating
+MONITORED_STATUSES = frozenset({PositionStatus.OPEN.value, PositionStatus.OPENING.value})
+
+
+class PositionRecord(Record):
+    """Decoded position document."""
+
+    __slots__ = (
+        "id",
+        "user_id",
+        "user_wallet_id",
+        "flow_id",
+        "symbol",
+        "side",
+        "status",
+        "entry",
+        "entry_price",
+        "entry_amount",
+        "entry_value",
+        "entry_fees",
+        "current",
+        "risk_management",
+        "ai_monitoring",
+        "exit",
+        "statistics",
+        "created_at",
+        "opened_at",
+        "closed_at",
+        "updated_at",
+    )
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, Any]) -> "PositionRecord":
+        """Decode a (possibly projected) raw document."""
+        get = doc.get
+        entry = get("entry") or {}
+        record = cls.__new__(cls)
+        record.id = get("_id")
+        record.user_id = get("user_id")
+        record.user_wallet_id = get("user_wallet_id")
+        record.flow_id = get("flow_id")
+        record.symbol = get("symbol") or ""
+        record.side = get("side") or ""
+        record.status = get("status") or ""
+        record.entry = entry
+        record.entry_price = to_decimal(entry.get("price"))
+        record.entry_amount = to_decimal(entry.get("amount"))
+        record.entry_value = to_decimal(entry.get("value"))
+        record.entry_fees = to_decimal(entry.get("fees"))
+        record.current = get("current") or {}
+        record.risk_management = get("risk_management") or {}
+        record.ai_monitoring = get("ai_monitoring") or {}
+        record.exit = get("exit")
+        record.statistics = get("statistics") or {}
+        record.created_at = get("created_at")
+        record.opened_at = to_utc(get("opened_at"))
+        record.closed_at = get("closed_at")
+        record.updated_at = get("updated_at")
+        return record
+
+    def is_open(self) -> bool:
+        """Check if position is open."""
+        return self.status == PositionStatus.OPEN.value
+
+    def is_monitored(self) -> bool:
+        """Check if the tracker should update this position (open or opening)."""
+        return self.status in MONITORED_STATUSES
+
+
+# Fields the tracker needs to recompute P&L and emit updates
+MONITOR_FIELDS = (
+    "user_id",
+    "user_wallet_id",
+    "flow_id",
+    "symbol",
+    "side",
+    "status",
+    "entry",
+    "current",
+    "opened_at",
+)
+
+
+class PositionRepository:
+    """
+    Positions over raw Motor.
+
+    Usage:
+        positions = PositionRepository(db)
+        position = await positions.get(position_id, fields=MONITOR_FIELDS)
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+
+    @property
+    def collection(self):
+        return self.db[POSITIONS_COLLECTION]
+
+    async def get(self, position_id: Any, fields: Optional[Iterable[str]] = None) -> Optional[PositionRecord]:
+        """
+        Get a non-deleted position.
+
+        Args:
+            position_id: Position ObjectId or hex string
+            fields: Fields to load (all if None)
+
+        Returns:
+            Decoded record, or None if the id is invalid or not found
+        """
+        oid = to_object_id(position_id)
+        if oid is None:
+            return None
+        doc = await self.collection.find_one(
+            {"_id": oid, "deleted_at": None},
+            projection(fields) if fields else None,
+        )
+        return PositionRecord.from_doc(doc) if doc else None
+
+    async def iter_open(
+        self,
+        fields: Iterable[str] = MONITOR_FIELDS,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[PositionRecord]:
+        """
+        Stream open, non-deleted positions.
+
+        Documents arrive ``batch_size`` at a time from the server, so memory
+        stays flat as the number of open positions grows.
+        """
+        cursor = self.collection.find(
+            {"status": PositionStatus.OPEN.value, "deleted_at": None},
+            projection(fields),
+            batch_size=cursor_batch_size(batch_size),
+        )
+        async for doc in cursor:
+            yield PositionRecord.from_doc(doc)
+
+    async def list_for_user(
+        self,
+        user_id: Any,
+        status: Optional[str] = None,
+        symbol: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Tuple[List[PositionRecord], int]:
+        """
+        Page through a user's positions, newest first.
+
+        Returns:
+            (records, total matching)
+        """
+        query: Dict[str, Any] = {"user_id": to_object_id(user_id), "deleted_at": None}
+        if status:
+            query["status"] = status
+        if symbol:
+            query["symbol"] = symbol
+        total = await self.collection.count_documents(query)
+        cursor = (
+            self.collection.find(query, projection(fields) if fields else None)
+            .sort("opened_at", -1)
+            .skip(skip)
+            .limit(limit)
+        )
+        return [PositionRecord.from_doc(doc) async for doc in cursor], total
+
+    async def set_current(self, position_id: Any, current: Dict[str, Any], updated_at: datetime) -> None:
+        """Store the latest price snapshot."""
+        await self.collection.update_one(
+            {"_id": to_object_id(position_id)},
+            {"$set": {"current": current, "updated_at": updated_at}},
+        )
+
+    async def set_user_id(self, position_id: Any, user_id: Any) -> None:
+        """Backfill a missing owner."""
+        await self.collection.update_one(
+            {"_id": to_object_id(position_id)},
+            {"$set": {"user_id": to_object_id(user_id)}},
+        )
@@ -16,6 +16,7 @@ from bson import ObjectId
 from app.core.dependencies import get_current_user, get_current_user_optional
 from app.config.database import get_database
 from app.modules.positions.models import Position, PositionStatus, PositionSide
+from app.modules.positions.repository import PositionRecord, PositionRepository
 from app.modules.positions.schemas import (
     ClosePositionRequest,
     UpdatePositionRequest,
@@ -30,6 +31,7 @@ from app.modules.positions.schemas import (
 from app.services.position_tracker import get_position_tracker
 from app.integrations.market_data.binance_client import BinanceClient
 from app.utils.logger import get_logger
+from app.utils.records import to_utc
 
 logger = get_logger(__name__)
 
@@ -75,6 +77,43 @@ def _coerce_risk_management(risk_management: Optional[Dict[str, Any]]) -> Dict[s
     return payload
 
 
+def _needs_refresh(position: PositionRecord) -> bool:
+    """Open positions whose price snapshot is missing or older than 30s."""
+    if not position.is_open():
+        return False
+    current = position.current
+    if not current or not current.get("price"):
+        return True
+    last_updated = to_utc(current.get("last_updated"))
+    if last_updated is None:
+        return True
+    return (datetime.now(timezone.utc) - last_updated).total_seconds() > 30
+
+
+def _position_response(position: PositionRecord) -> PositionResponse:
+    entry_payload = _coerce_entry_payload(position.entry)
+    risk_payload = _coerce_risk_management(position.risk_management)
+    exit_payload = _coerce_exit_payload(position.exit)
+    return PositionResponse(
+        id=str(position.id),
+        user_id=str(position.user_id),
+        user_wallet_id=str(position.user_wallet_id) if position.user_wallet_id else "",
+        flow_id=str(position.flow_id) if position.flow_id else None,
+        symbol=position.symbol,
+        side=position.side,
+        status=position.status,
+        entry=EntryDataResponse(**entry_payload),
+        current=CurrentDataResponse(**position.current) if position.current else None,
+        risk_management=RiskManagementResponse(**risk_payload) if position.risk_management else RiskManagementResponse(),
+        exit=ExitDataResponse(**exit_payload) if exit_payload else None,
+        statistics=position.statistics,
+        created_at=position.created_at,
+        opened_at=position.opened_at,
+        closed_at=position.closed_at,
+        updated_at=position.updated_at
+    )
+
+
 # ==================== GET POSITION ====================
 
 @router.get("/{position_id}", response_model=PositionResponse)
@@ -93,99 +132,24 @@ async def get_position(
                 raise HTTPException(status_code=401, detail="Not authenticated")
             user_id = demo_user_id
         
-        doc = None
-        try:
-            position = await Position.get(position_id)
-        except Exception as beanie_error:
-            # Use debug level - fallback to raw MongoDB works fine
-            logger.debug(f"Beanie get failed, using raw MongoDB fallback: {beanie_error}")
-            position = None
-        
+        positions = PositionRepository(db)
+        position = await positions.get(position_id)
         if not position:
-            doc = await db.positions.find_one({"_id": ObjectId(position_id), "deleted_at": None})
-            if not doc:
-                raise HTTPException(status_code=404, detail="Position not found")
+            raise HTTPException(status_code=404, detail="Position not found")
         
         # Verify position belongs to user
-        if position:
-            if str(position.user_id) != str(user_id):
-                raise HTTPException(status_code=403, detail="Access denied")
-        else:
-            if str(doc.get("user_id")) != str(user_id):
-                raise HTTPException(status_code=403, detail="Access denied")
+        if str(position.user_id) != str(user_id):
+            raise HTTPException(status_code=403, detail="Access denied")
         
-        if position:
-            if position.is_open():
-                # Always update if current is missing or doesn't have price
-                if not position.current or not position.current.get("price"):
-                    needs_update = True
-                else:
-                    last_updated = position.current.get("last_updated")
-                    needs_update = False
-                    
-                    if not last_updated:
-                        needs_update = True
-                    elif isinstance(last_updated, datetime):
-                        if last_updated.tzinfo is None:
-                            last_updated = last_updated.replace(tzinfo=timezone.utc)
-                        time_since_update = (datetime.now(timezone.utc) - last_updated).total_seconds()
-                        if time_since_update > 30:
-                            needs_update = True
-                    else:
-                        needs_update = True
-                
-                if needs_update:
-                    try:
-                        tracker_service = await get_position_tracker(db)
-                        await tracker_service.monitor_position(str(position.id))
-                        await position.reload()
-                    except Exception as e:
-                        logger.warning(f"Failed to update position {position.id} during get: {e}")
-            
-            entry_payload = _coerce_entry_payload(position.entry or {})
-            risk_payload = _coerce_risk_management(position.risk_management)
-            exit_payload = _coerce_exit_payload(position.exit)
-            return PositionResponse(
-                id=str(position.id),
-                user_id=str(position.user_id),
-                user_wallet_id=str(position.user_wallet_id),
-                flow_id=str(position.flow_id) if position.flow_id else None,
-                symbol=position.symbol,
-                side=position.side.value,
-                status=position.status.value,
-                entry=EntryDataResponse(**entry_payload),
-                current=CurrentDataResponse(**position.current) if position.current else None,
-                risk_management=RiskManagementResponse(**risk_payload) if position.risk_management else RiskManagementResponse(),
-                exit=ExitDataResponse(**exit_payload) if exit_payload else None,
-                statistics=position.statistics,
-                created_at=position.created_at,
-                opened_at=position.opened_at,
-                closed_at=position.closed_at,
-                updated_at=position.updated_at
-            )
-
-        entry_payload = _coerce_entry_payload(doc.get("entry") or {})
-        risk_payload = _coerce_risk_management(doc.get("risk_management"))
-        exit_payload = _coerce_exit_payload(doc.get("exit"))
-        user_wallet_id = doc.get("user_wallet_id")
-        return PositionResponse(
-            id=str(doc.get("_id")),
-            user_id=str(doc.get("user_id")),
-            user_wallet_id=str(user_wallet_id) if user_wallet_id else "",
-            flow_id=str(doc.get("flow_id")) if doc.get("flow_id") else None,
-            symbol=doc.get("symbol", ""),
-            side=doc.get("side", ""),
-            status=doc.get("status", ""),
-            entry=EntryDataResponse(**entry_payload),
-            current=CurrentDataResponse(**doc.get("current", {})) if doc.get("current") else None,
-            risk_management=RiskManagementResponse(**risk_payload) if doc.get("risk_management") else RiskManagementResponse(),
-            exit=ExitDataResponse(**exit_payload) if exit_payload else None,
-            statistics=doc.get("statistics", {}),
-            created_at=doc.get("created_at"),
-            opened_at=doc.get("opened_at"),
-            closed_at=doc.get("closed_at"),
-            updated_at=doc.get("updated_at")
-        )
+        if _needs_refresh(position):
+            try:
+                tracker_service = await get_position_tracker(db)
+                await tracker_service.monitor_position(position_id)
+                position = await positions.get(position_id) or position
+            except Exception as e:
+                logger.warning(f"Failed to update position {position_id} during get: {e}")
+        
+        return _position_response(position)
     
     except HTTPException:
         raise
@@ -220,159 +184,31 @@ async def list_positions(
         
         user_id_obj = ObjectId(user_id) if isinstance(user_id, str) else user_id
         
-        try:
-            query = Position.find(
-                Position.user_id == user_id_obj,
-                Position.deleted_at == None
-            )
-            
-            if status:
-                query = query.find(Position.status == status)
-            if symbol:
-                query = query.find(Position.symbol == symbol)
-            
-            total = await query.count()
-            skip = (page - 1) * page_size
-            positions = await query.skip(skip).limit(page_size).sort(-Position.opened_at if Position.opened_at else -Position.created_at).to_list()
-        except Exception as beanie_error:
-            # Use debug level - fallback to raw MongoDB works fine
-            logger.debug(f"Beanie query failed, using raw MongoDB fallback: {beanie_error}")
-            query_dict = {"user_id": user_id_obj, "deleted_at": None}
-            if status:
-                query_dict["status"] = status.value if hasattr(status, 'value') else str(status)
-            if symbol:
-                query_dict["symbol"] = symbol
-            
-            total = await db.positions.count_documents(query_dict)
-            skip = (page - 1) * page_size
-            cursor = db.positions.find(query_dict).skip(skip).limit(page_size).sort("opened_at", -1)
-            raw_positions = await cursor.to_list(length=page_size)
-            
-            position_responses = []
-            tracker_service = await get_position_tracker(db)
-            
-            for doc in raw_positions:
-                try:
-                    position_status = doc.get("status")
-                    is_open = position_status == PositionStatus.OPEN.value
-                    
-                    if is_open:
-                        current_data = doc.get("current", {})
-                        # Always update if current is missing or doesn't have price
-                        if not current_data or not current_data.get("price"):
-                            needs_update = True
-                        else:
-                            last_updated = current_data.get("last_updated")
-                            needs_update = False
-                            
-                            if not last_updated:
-                                needs_update = True
-                            elif isinstance(last_updated, datetime):
-                                if last_updated.tzinfo is None:
-                                    last_updated = last_updated.replace(tzinfo=timezone.utc)
-                                time_since_update = (datetime.now(timezone.utc) - last_updated).total_seconds()
-                                if time_since_update > 30:
-                                    needs_update = True
-                            else:
-                                needs_update = True
-                        
-                        if needs_update:
-                            try:
-                                await tracker_service.monitor_position(str(doc.get("_id")))
-                                doc = await db.positions.find_one({"_id": doc.get("_id")})
-                            except Exception as e:
-                                logger.warning(f"Failed to update position {doc.get('_id')} during list: {e}")
-                    
-                    entry_payload = _coerce_entry_payload(doc.get("entry") or {})
-                    risk_payload = _coerce_risk_management(doc.get("risk_management"))
-                    exit_payload = _coerce_exit_payload(doc.get("exit"))
-                    user_wallet_id = doc.get("user_wallet_id")
-                    
-                    position_responses.append(
-                        PositionResponse(
-                            id=str(doc.get("_id")),
-                            user_id=str(doc.get("user_id")),
-                            user_wallet_id=str(user_wallet_id) if user_wallet_id else "",
-                            flow_id=str(doc.get("flow_id")) if doc.get("flow_id") else None,
-                            symbol=doc.get("symbol", ""),
-                            side=doc.get("side", ""),
-                            status=doc.get("status", ""),
-                            entry=EntryDataResponse(**entry_payload),
-                            current=CurrentDataResponse(**doc.get("current", {})) if doc.get("current") else None,
-                            risk_management=RiskManagementResponse(**risk_payload) if doc.get("risk_management") else RiskManagementResponse(),
-                            exit=ExitDataResponse(**exit_payload) if exit_payload else None,
-                            statistics=doc.get("statistics", {}),
-                            created_at=doc.get("created_at"),   
-                            opened_at=doc.get("opened_at"),
-                            closed_at=doc.get("closed_at"),
-                            updated_at=doc.get("updated_at")
-                        )
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to convert position doc {doc.get('_id')}: {e}")
-                    continue
-            
-            return PositionListResponse(
-                positions=position_responses,
-                total=total,
-                page=page,
-                page_size=page_size
-            )
+        positions = PositionRepository(db)
+        records, total = await positions.list_for_user(
+            user_id_obj,
+            status=status.value if status else None,
+            symbol=symbol,
+            skip=(page - 1) * page_size,
+            limit=page_size,
+        )
         
         position_responses = []
         tracker_service = await get_position_tracker(db)
         
-        for position in positions:
-            if position.is_open():
-                # Always update if current is missing or doesn't have price
-                if not position.current or not position.current.get("price"):
-                    needs_update = True
-                else:
-                    last_updated = position.current.get("last_updated")
-                    needs_update = False
-                    
-                    if not last_updated:
-                        needs_update = True
-                    else:
-                        if isinstance(last_updated, datetime):
-                            if last_updated.tzinfo is None:
-                                last_updated = last_updated.replace(tzinfo=timezone.utc)
-                            time_since_update = (datetime.now(timezone.utc) - last_updated).total_seconds()
-                            if time_since_update > 30:
-                                needs_update = True
-                        else:
-                            needs_update = True
-                
-                if needs_update:
+        for position in records:
+            try:
+                if _needs_refresh(position):
                     try:
                         await tracker_service.monitor_position(str(position.id))
-                        await position.reload()
+                        position = await positions.get(position.id) or position
                     except Exception as e:
                         logger.warning(f"Failed to update position {position.id} during list: {e}")
-            
-            entry_payload = _coerce_entry_payload(position.entry or {})
-            risk_payload = _coerce_risk_management(position.risk_management)
-            exit_payload = _coerce_exit_payload(position.exit)
-            position_responses.append(
-                PositionResponse(
-                    id=str(position.id),
-                    user_id=str(position.user_id),
-                    user_wallet_id=str(position.user_wallet_id) if position.user_wallet_id else "",
-                    flow_id=str(position.flow_id) if position.flow_id else None,
-                    symbol=position.symbol,
-                    side=position.side.value if hasattr(position.side, 'value') else str(position.side),
-                    status=position.status.value if hasattr(position.status, 'value') else str(position.status),
-                    entry=EntryDataResponse(**entry_payload),
-                    current=CurrentDataResponse(**position.current) if position.current else None,
-                    risk_management=RiskManagementResponse(**risk_payload) if position.risk_management else RiskManagementResponse(),
-                    exit=ExitDataResponse(**exit_payload) if exit_payload else None,
-                    statistics=position.statistics,
-                    created_at=position.created_at,
-                    opened_at=position.opened_at,
-                    closed_at=position.closed_at,
-                    updated_at=position.updated_at
-                )
-            )
+                
+                position_responses.append(_position_response(position))
+            except Exception as e:
+                logger.warning(f"Failed to convert position doc {position.id}: {e}")
+                continue
         
         return PositionListResponse(
             positions=position_responses,
@@ -0,0 +1,63 @@
+"""
+Backtesting Service
+
+Vectorized flow backtests over historical candles:
+- Candle loading (Binance klines, CSV / Parquet cache)
+- Per-bar indicator signals matching calculate_all_indicators
+- Trade simulation with risk limits and the DemoWallet fee model
+- Parallel parameter sweeps over shared-memory candles
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from app.services.backtest.data import (
+    CandleArrays,
+    fetch_candles,
+    load_candles_csv,
+    load_candles_file,
+    load_candles_parquet,
+    save_candles_csv,
+)
+from app.services.backtest.signals import DEFAULT_INDICATOR_PARAMS, indicator_signals
+from app.services.backtest.engine import (
+    BacktestConfig,
+    BacktestResult,
+    run_backtest,
+    stub_swarm_agreement,
+)
+from app.services.backtest.sweep import (
+    BACKTEST_SWEEPS_COLLECTION,
+    BACKTEST_SWEEP_RESULTS_COLLECTION,
+    SWEEP_METRICS,
+    ensure_sweep_indexes,
+    expand_grid,
+    run_parameter_sweep,
+    start_sweep_task,
+    sweep_worker_limit,
+    trial_config,
+)
+
+__all__ = [
+    "CandleArrays",
+    "fetch_candles",
+    "load_candles_csv",
+    "load_candles_file",
+    "load_candles_parquet",
+    "save_candles_csv",
+    "DEFAULT_INDICATOR_PARAMS",
+    "indicator_signals",
+    "BacktestConfig",
+    "BacktestResult",
+    "run_backtest",
+    "stub_swarm_agreement",
+    "BACKTEST_SWEEPS_COLLECTION",
+    "BACKTEST_SWEEP_RESULTS_COLLECTION",
+    "SWEEP_METRICS",
+    "ensure_sweep_indexes",
+    "expand_grid",
+    "run_parameter_sweep",
+    "start_sweep_task",
+    "sweep_worker_limit",
+    "trial_config",
+]
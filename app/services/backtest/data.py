@@ -0,0 +1,137 @@
+"""
+Backtest Candle Data
+
+Columnar OHLCV arrays for the backtester, loaded from Binance klines or a
+local CSV / Parquet cache.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import csv
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.integrations.market_data.binance_client import BinanceClient, Candle
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CANDLE_COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+INTERVAL_SECONDS = {
+    "1m": 60, "3m": 180, "5m": 300, "15m": 900, "30m": 1800,
+    "1h": 3600, "2h": 7200, "4h": 14400, "6h": 21600, "8h": 28800, "12h": 43200,
+    "1d": 86400, "3d": 259200, "1w": 604800,
+}
+
+
+@dataclass
+class CandleArrays:
+    """OHLCV columns as float64 arrays (time is epoch seconds)."""
+    time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray]) -> "CandleArrays":
+        return cls(**{name: np.ascontiguousarray(columns[name], dtype=np.float64) for name in CANDLE_COLUMNS})
+
+    @classmethod
+    def from_candles(cls, candles: List[Candle]) -> "CandleArrays":
+        """Convert BinanceClient candles (Decimal fields) to arrays."""
+        return cls.from_columns({
+            "time": np.fromiter((c.timestamp.timestamp() for c in candles), dtype=np.float64, count=len(candles)),
+            "open": np.fromiter((float(c.open) for c in candles), dtype=np.float64, count=len(candles)),
+            "high": np.fromiter((float(c.high) for c in candles), dtype=np.float64, count=len(candles)),
+            "low": np.fromiter((float(c.low) for c in candles), dtype=np.float64, count=len(candles)),
+            "close": np.fromiter((float(c.close) for c in candles), dtype=np.float64, count=len(candles)),
+            "volume": np.fromiter((float(c.volume) for c in candles), dtype=np.float64, count=len(candles)),
+        })
+
+    def as_matrix(self) -> np.ndarray:
+        """Stack the columns into one (6, n) array (for sharing between processes)."""
+        return np.vstack([getattr(self, name) for name in CANDLE_COLUMNS])
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray) -> "CandleArrays":
+        """Wrap a (6, n) array without copying."""
+        return cls(*(matrix[i] for i in range(len(CANDLE_COLUMNS))))
+
+
+def load_candles_csv(path: str) -> CandleArrays:
+    """Load a CSV with a header of time,open,high,low,close,volume."""
+    data = np.genfromtxt(path, delimiter=",", names=True, dtype=np.float64)
+    return CandleArrays.from_columns({name: data[name] for name in CANDLE_COLUMNS})
+
+
+def save_candles_csv(candles: CandleArrays, path: str) -> None:
+    """Write candles as CSV (the format load_candles_csv reads)."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CANDLE_COLUMNS)
+        writer.writerows(candles.as_matrix().T.tolist())
+
+
+def load_candles_parquet(path: str) -> CandleArrays:
+    """Load a Parquet file with time/open/high/low/close/volume columns (needs pyarrow)."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Reading Parquet candle caches requires pyarrow") from e
+    table = pq.read_table(path, columns=list(CANDLE_COLUMNS))
+    return CandleArrays.from_columns({name: table.column(name).to_numpy() for name in CANDLE_COLUMNS})
+
+
+def load_candles_file(path: str) -> CandleArrays:
+    """Load a local candle cache by extension (.csv or .parquet)."""
+    if path.endswith(".parquet"):
+        return load_candles_parquet(path)
+    return load_candles_csv(path)
+
+
+async def fetch_candles(
+    symbol: str,
+    interval: str,
+    start: datetime,
+    end: Optional[datetime] = None,
+    cache_path: Optional[str] = None,
+) -> CandleArrays:
+    """
+    Fetch a historical range from Binance, paging 1000 klines per request.
+
+    When ``cache_path`` exists it is read instead; otherwise the fetched
+    range is written there as CSV for the next run.
+    """
+    if cache_path and os.path.exists(cache_path):
+        return load_candles_file(cache_path)
+
+    end = end or datetime.now(timezone.utc)
+    step = INTERVAL_SECONDS.get(interval, 3600)
+    candles: List[Candle] = []
+    cursor = start
+    async with BinanceClient() as client:
+        while cursor < end:
+            page = await client.get_klines(symbol, interval, limit=1000, start_time=cursor, end_time=end)
+            if not page:
+                break
+            candles.extend(page)
+            cursor = datetime.fromtimestamp(page[-1].timestamp.timestamp() + step, tz=timezone.utc)
+            if len(page) < 1000:
+                break
+
+    arrays = CandleArrays.from_candles(candles)
+    logger.info(f"Fetched {len(arrays)} {interval} candles for {symbol}")
+    if cache_path:
+        save_candles_csv(arrays, cache_path)
+    return arrays
@@ -0,0 +1,276 @@
+"""
+Backtest Engine
+
+Replays historical candles through the flow decision pipeline:
+indicator signals (``calculate_all_indicators`` votes, vectorized),
+optional deterministic stub swarm votes in place of the LLM agents,
+``evaluate_risk_limits`` on every entry, and the DemoWallet fee and
+slippage model on every fill.
+
+Signals and the equity curve are computed for all bars at once. Only the
+trades themselves are walked in Python, and each trade's stop-loss /
+take-profit search is a NumPy scan over its own bars, so a year of 1m
+candles runs in seconds.
+
+Results use the same fields ``_update_flow_statistics`` keeps on a flow
+(total_executions, winning_trades, win_rate, total_pnl_usd, ...), plus the
+equity curve and maximum drawdown.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.integrations.wallets.demo_engine import execution_price_for
+from app.services.backtest.data import CandleArrays
+from app.services.backtest.signals import BEARISH, BULLISH, indicator_signals
+from app.services.risk_rules import evaluate_risk_limits
+
+# Flows fetch 100 candles per cycle, so every indicator is available live
+DEFAULT_WARMUP_BARS = 50
+
+
+@dataclass
+class BacktestConfig:
+    """Flow parameters that affect a backtest."""
+    initial_balance: float = 10000.0
+    order_size_percent: float = 10.0
+    order_size_usd: Optional[float] = None
+    stop_loss_percent: float = 1.5
+    take_profit_percent: float = 3.0
+    risk_limits: Dict[str, Any] = field(default_factory=dict)
+    fee_rate: float = 0.001
+    slippage_rate: float = 0.0001
+    llm_stub: bool = False
+    llm_stub_seed: int = 0
+    swarm_runs: int = 3
+    swarm_min_agreement: int = 50
+    warmup_bars: int = DEFAULT_WARMUP_BARS
+    indicator_params: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_flow_config(cls, config: Optional[Dict[str, Any]], wallet: Any = None, **overrides) -> "BacktestConfig":
+        """
+        Build a config from a flow's ``config`` dict.
+
+        Args:
+            config: Flow config (execution, risk and swarm settings)
+            wallet: Optional DemoWallet whose fee and slippage rates to use
+            **overrides: Explicit field values (e.g. from a parameter sweep)
+        """
+        config = config or {}
+        values: Dict[str, Any] = {
+            "initial_balance": float(config.get("portfolio_value_usd", 10000)),
+            "stop_loss_percent": float(config.get("default_stop_loss_percent", 1.5)),
+            "take_profit_percent": float(config.get("default_take_profit_percent", 3)),
+            "risk_limits": config.get("risk_limits") or {},
+            "swarm_runs": int(config.get("swarm_runs", 3)),
+            "swarm_min_agreement": int(config.get("swarm_min_agreement", 50)),
+        }
+        if config.get("order_size_percent") is not None:
+            values["order_size_percent"] = float(config["order_size_percent"])
+        if config.get("order_size_usd") is not None:
+            values["order_size_usd"] = float(config["order_size_usd"])
+        if wallet is not None:
+            values["fee_rate"] = float(wallet.fee_rate)
+            values["slippage_rate"] = float(wallet.slippage_rate)
+        values.update(overrides)
+        return cls(**values)
+
+
+@dataclass
+class BacktestResult:
+    """Backtest statistics, trades and equity curve."""
+    stats: Dict[str, Any]
+    trades: List[Dict[str, Any]]
+    time: np.ndarray
+    equity: np.ndarray
+
+    def to_dict(self, curve_points: int = 500) -> Dict[str, Any]:
+        """JSON-friendly result with the equity curve downsampled to ``curve_points``."""
+        step = max(1, len(self.equity) // curve_points) if curve_points else 1
+        idx = np.arange(0, len(self.equity), step)
+        if len(self.equity) and idx[-1] != len(self.equity) - 1:
+            idx = np.append(idx, len(self.equity) - 1)
+        return {
+            **self.stats,
+            "trades": self.trades,
+            "equity_curve": [
+                {"time": int(t), "equity": round(float(e), 2)}
+                for t, e in zip(self.time[idx], self.equity[idx])
+            ],
+        }
+
+
+def stub_swarm_agreement(signals: Dict[str, np.ndarray], swarm_runs: int, seed: int) -> np.ndarray:
+    """
+    Deterministic stand-in for the LLM swarm.
+
+    Each of ``swarm_runs`` agents follows the indicator summary with a
+    probability that grows with how one-sided the votes are, and holds
+    otherwise. The same seed always gives the same votes.
+
+    Returns:
+        Percent of agents agreeing with the summary, per bar
+    """
+    rng = np.random.default_rng(seed)
+    voted = np.maximum(signals["voted"], 1)
+    strength = np.abs(signals["buy"] - signals["sell"]) / voted
+    confidence = 0.5 + 0.5 * strength
+    follows = rng.random((len(voted), max(1, swarm_runs))) < confidence[:, None]
+    return follows.mean(axis=1) * 100
+
+
+def _decisions(candles: CandleArrays, config: BacktestConfig) -> Dict[str, np.ndarray]:
+    signals = indicator_signals(candles.close, **config.indicator_params)
+    summary = signals["summary"]
+    enter = summary == BULLISH
+    leave = summary == BEARISH
+    if config.llm_stub:
+        agreement = stub_swarm_agreement(signals, config.swarm_runs, config.llm_stub_seed)
+        agreed = agreement >= config.swarm_min_agreement
+        enter &= agreed
+        leave &= agreed
+    enter[: config.warmup_bars] = False
+    return {"enter": enter, "leave": leave}
+
+
+def _next_true(mask: np.ndarray) -> np.ndarray:
+    """For each bar, the index of the next bar (inclusive) where ``mask`` is set, else len."""
+    n = len(mask)
+    idx = np.where(mask, np.arange(n), n)
+    return np.minimum.accumulate(idx[::-1])[::-1]
+
+
+def run_backtest(candles: CandleArrays, config: Optional[BacktestConfig] = None) -> BacktestResult:
+    """
+    Backtest a long-only flow over candle arrays.
+
+    Entries fill at the decision bar's close, like a live market order.
+    Exits happen at the stop-loss or take-profit (at the bar open if it
+    gapped through), or at the close of the next bearish decision. A bar
+    that touches both levels is treated as a stop-loss.
+    """
+    config = config or BacktestConfig()
+    n = len(candles)
+    close, high, low, open_ = candles.close, candles.high, candles.low, candles.open
+    decisions = _decisions(candles, config)
+    entries = np.flatnonzero(decisions["enter"])
+    next_leave = _next_true(decisions["leave"])
+
+    fee_rate = config.fee_rate
+    slippage = Decimal(str(config.slippage_rate))
+    days = (candles.time // 86400).astype(np.int64)
+    daily_loss: Dict[int, float] = {}
+
+    cash = config.initial_balance
+    realized = np.zeros(n)
+    unrealized = np.zeros(n)
+    trades: List[Dict[str, Any]] = []
+    total_executions = successful_executions = winning_trades = 0
+    pnl_percent_sum = 0.0
+
+    cursor = 0
+    while True:
+        k = int(np.searchsorted(entries, cursor))
+        if k >= len(entries):
+            break
+        entry_idx = int(entries[k])
+        if entry_idx >= n - 1:
+            break
+        total_executions += 1
+
+        size_usd = config.order_size_usd or cash * config.order_size_percent / 100
+        size_usd = min(size_usd, cash)
+        risk = evaluate_risk_limits(
+            {"size_usd": size_usd},
+            config.risk_limits,
+            {
+                "portfolio_value_usd": cash,
+                "open_positions": 0,
+                "daily_loss_usd": daily_loss.get(int(days[entry_idx]), 0.0),
+            },
+        )
+        if not risk["approved"] or size_usd <= 0:
+            cursor = entry_idx + 1
+            continue
+        successful_executions += 1
+
+        entry_price = float(execution_price_for("buy", Decimal(str(close[entry_idx])), slippage))
+        quantity = size_usd / (entry_price * (1 + fee_rate))
+        cost = quantity * entry_price * (1 + fee_rate)
+        stop = entry_price * (1 - config.stop_loss_percent / 100)
+        target = entry_price * (1 + config.take_profit_percent / 100)
+
+        # Scan only this trade's bars for the first stop / target touch
+        last = min(int(next_leave[entry_idx + 1]), n - 1)
+        window = slice(entry_idx + 1, last + 1)
+        stop_hits = np.flatnonzero(low[window] <= stop)
+        target_hits = np.flatnonzero(high[window] >= target)
+        first_stop = int(stop_hits[0]) if len(stop_hits) else None
+        first_target = int(target_hits[0]) if len(target_hits) else None
+
+        if first_stop is not None and (first_target is None or first_stop <= first_target):
+            exit_idx = entry_idx + 1 + first_stop
+            raw_exit, reason = min(stop, open_[exit_idx]), "stop_loss"
+        elif first_target is not None:
+            exit_idx = entry_idx + 1 + first_target
+            raw_exit, reason = max(target, open_[exit_idx]), "take_profit"
+        else:
+            exit_idx = last
+            raw_exit, reason = close[exit_idx], "signal" if decisions["leave"][exit_idx] else "end_of_data"
+
+        exit_price = float(execution_price_for("sell", Decimal(str(raw_exit)), slippage))
+        proceeds = quantity * exit_price * (1 - fee_rate)
+        pnl = proceeds - cost
+        pnl_percent = pnl / cost * 100
+
+        cash += pnl
+        realized[exit_idx] += pnl
+        unrealized[entry_idx:exit_idx] += quantity * close[entry_idx:exit_idx] - cost
+        if pnl > 0:
+            winning_trades += 1
+        else:
+            day = int(days[exit_idx])
+            daily_loss[day] = daily_loss.get(day, 0.0) - pnl
+        pnl_percent_sum += pnl_percent
+
+        trades.append({
+            "entry_time": int(candles.time[entry_idx]),
+            "exit_time": int(candles.time[exit_idx]),
+            "entry_price": round(entry_price, 8),
+            "exit_price": round(exit_price, 8),
+            "quantity": quantity,
+            "pnl_usd": round(pnl, 4),
+            "pnl_percent": round(pnl_percent, 4),
+            "exit_reason": reason,
+        })
+        cursor = exit_idx + 1
+
+    equity = config.initial_balance + np.cumsum(realized) + unrealized
+    peaks = np.maximum.accumulate(equity) if n else equity
+    drawdown = (equity / peaks - 1) if n else equity
+    closed_trades = len(trades)
+    total_pnl_usd = float(realized.sum())
+
+    stats = {
+        "total_executions": total_executions,
+        "successful_executions": successful_executions,
+        "closed_trades": closed_trades,
+        "winning_trades": winning_trades,
+        "total_pnl_usd": round(total_pnl_usd, 4),
+        "pnl_percent_sum": round(pnl_percent_sum, 4),
+        "win_rate": round(winning_trades / successful_executions * 100, 2) if successful_executions else 0.0,
+        "avg_pnl_usd": round(total_pnl_usd / closed_trades, 4) if closed_trades else 0.0,
+        "total_pnl_percent": round(pnl_percent_sum / closed_trades, 4) if closed_trades else 0.0,
+        "max_drawdown_percent": round(float(-drawdown.min()) * 100, 4) if n else 0.0,
+        "final_equity": round(float(equity[-1]), 2) if n else config.initial_balance,
+        "return_percent": round((float(equity[-1]) / config.initial_balance - 1) * 100, 4) if n else 0.0,
+        "bars": n,
+    }
+    return BacktestResult(stats=stats, trades=trades, time=candles.time, equity=equity)
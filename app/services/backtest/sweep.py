@@ -0,0 +1,266 @@
+"""
+Parameter Sweep Runner
+
+Backtests every combination of a parameter grid across a process pool.
+
+The candle arrays are copied once into a shared-memory block; each worker
+process attaches to it in its initializer and wraps it as NumPy views, so
+trials never pickle or reload candles. Each trial's stats are written to
+``backtest_sweep_results`` as it finishes. The job document in
+``backtest_sweeps`` tracks progress and keeps a ranked top-N leaderboard
+(``$push`` with ``$sort`` / ``$slice``).
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from datetime import datetime, timezone
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
+
+from app.config.settings import get_settings
+from app.services.backtest.data import CandleArrays, fetch_candles
+from app.services.backtest.engine import BacktestConfig, run_backtest
+from app.services.backtest.signals import DEFAULT_INDICATOR_PARAMS
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BACKTEST_SWEEPS_COLLECTION = "backtest_sweeps"
+BACKTEST_SWEEP_RESULTS_COLLECTION = "backtest_sweep_results"
+
+SWEEP_METRICS = {
+    "total_pnl_usd", "return_percent", "win_rate", "avg_pnl_usd",
+    "total_pnl_percent", "max_drawdown_percent",
+}
+# Lower is better for these metrics
+_ASCENDING_METRICS = {"max_drawdown_percent"}
+LEADERBOARD_SIZE = 10
+
+_CONFIG_FIELDS = {f.name for f in fields(BacktestConfig)} - {"indicator_params"}
+
+# Running sweep tasks (kept referenced until done)
+_sweep_tasks: Set[asyncio.Task] = set()
+
+# Worker-process globals set by _init_worker
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_candles: Optional[CandleArrays] = None
+
+
+def sweep_worker_limit() -> int:
+    """Most worker processes a sweep may use (BACKTEST_SWEEP_MAX_WORKERS, else CPU count)."""
+    return getattr(get_settings(), "BACKTEST_SWEEP_MAX_WORKERS", 0) or os.cpu_count() or 1
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into trial parameter dicts.
+
+    Keys are BacktestConfig fields (e.g. ``swarm_min_agreement``,
+    ``stop_loss_percent``, ``risk_limits``) or indicator periods
+    (e.g. ``rsi_period``, ``sma_fast``).
+
+    Raises:
+        ValueError: On unknown parameter names or empty value lists
+    """
+    unknown = [key for key in grid if key not in _CONFIG_FIELDS and key not in DEFAULT_INDICATOR_PARAMS]
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+    empty = [key for key, values in grid.items() if not values]
+    if empty:
+        raise ValueError(f"Sweep parameters without values: {', '.join(sorted(empty))}")
+    keys = list(grid)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[key] for key in keys))]
+
+
+def trial_config(base: BacktestConfig, params: Dict[str, Any]) -> BacktestConfig:
+    """Apply one trial's parameters to the base config."""
+    config_values = {k: v for k, v in params.items() if k in _CONFIG_FIELDS}
+    indicator_values = {k: v for k, v in params.items() if k in DEFAULT_INDICATOR_PARAMS}
+    return replace(
+        base,
+        **config_values,
+        indicator_params={**base.indicator_params, **indicator_values},
+    )
+
+
+def _init_worker(shm_name: str, shape: Tuple[int, int]) -> None:
+    """Attach the worker to the shared candle block."""
+    global _worker_shm, _worker_candles
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    # Only the parent owns (and unlinks) the block; don't let this
+    # process's resource tracker clean it up on exit
+    try:
+        resource_tracker.unregister(_worker_shm._name, "shared_memory")
+    except Exception:
+        pass
+    matrix = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+    _worker_candles = CandleArrays.from_matrix(matrix)
+
+
+def _run_trial(base: BacktestConfig, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Run one trial in a worker process."""
+    result = run_backtest(_worker_candles, trial_config(base, params))
+    return params, result.stats
+
+
+def _score(stats: Dict[str, Any], metric: str) -> float:
+    value = float(stats.get(metric, 0.0))
+    return -value if metric in _ASCENDING_METRICS else value
+
+
+async def ensure_sweep_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Index results for ranked reads per job."""
+    await db[BACKTEST_SWEEP_RESULTS_COLLECTION].create_index(
+        [("job_id", ASCENDING), ("score", DESCENDING)],
+        name="job_score",
+    )
+
+
+async def run_parameter_sweep(
+    db: AsyncIOMotorDatabase,
+    job_id: Any,
+    candles: CandleArrays,
+    base: BacktestConfig,
+    trials: List[Dict[str, Any]],
+    metric: str = "total_pnl_usd",
+    max_workers: Optional[int] = None,
+) -> None:
+    """
+    Run all trials over a process pool, streaming results to MongoDB.
+
+    Args:
+        db: Database instance
+        job_id: Sweep job id (``backtest_sweeps._id``)
+        candles: Candle arrays shared with every trial
+        base: Base config the trial parameters are applied to
+        trials: Parameter dicts from expand_grid
+        metric: Stats field to rank by
+        max_workers: Process count (default and cap: sweep_worker_limit())
+    """
+    limit = sweep_worker_limit()
+    max_workers = min(max_workers or limit, limit)
+    jobs = db[BACKTEST_SWEEPS_COLLECTION]
+    results = db[BACKTEST_SWEEP_RESULTS_COLLECTION]
+
+    matrix = candles.as_matrix()
+    shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    pool: Optional[ProcessPoolExecutor] = None
+    try:
+        np.ndarray(matrix.shape, dtype=np.float64, buffer=shm.buf)[:] = matrix
+        await jobs.update_one(
+            {"_id": job_id},
+            {"$set": {"status": "running", "started_at": datetime.now(timezone.utc)}},
+        )
+
+        loop = asyncio.get_running_loop()
+        pool = ProcessPoolExecutor(
+            max_workers=min(max_workers, len(trials)) or 1,
+            initializer=_init_worker,
+            initargs=(shm.name, matrix.shape),
+        )
+        pending = [loop.run_in_executor(pool, _run_trial, base, params) for params in trials]
+        for future in asyncio.as_completed(pending):
+            try:
+                params, stats = await future
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Sweep {job_id} trial failed: {e}")
+                await jobs.update_one({"_id": job_id}, {"$inc": {"failed": 1}})
+                continue
+
+            entry = {"params": params, "score": _score(stats, metric), metric: stats.get(metric)}
+            await results.insert_one({
+                "job_id": job_id,
+                "params": params,
+                "stats": stats,
+                "score": entry["score"],
+                "created_at": datetime.now(timezone.utc),
+            })
+            await jobs.update_one(
+                {"_id": job_id},
+                {
+                    "$inc": {"completed": 1},
+                    "$push": {"top": {"$each": [entry], "$sort": {"score": -1}, "$slice": LEADERBOARD_SIZE}},
+                },
+            )
+
+        await jobs.update_one(
+            {"_id": job_id},
+            {"$set": {"status": "completed", "completed_at": datetime.now(timezone.utc)}},
+        )
+        logger.info(f"Sweep {job_id} completed: {len(trials)} trials")
+    except asyncio.CancelledError:
+        await jobs.update_one({"_id": job_id}, {"$set": {"status": "cancelled"}})
+        raise
+    except Exception as e:
+        logger.error(f"Sweep {job_id} failed: {e}")
+        await jobs.update_one({"_id": job_id}, {"$set": {"status": "failed", "error": str(e)}})
+    finally:
+        if pool is not None:
+            # Don't block the event loop on a cancelled sweep: drop queued trials
+            pool.shutdown(wait=False, cancel_futures=True)
+        shm.close()
+        shm.unlink()
+
+
+async def run_sweep_job(
+    db: AsyncIOMotorDatabase,
+    job_id: Any,
+    symbol: str,
+    interval: str,
+    start: datetime,
+    end: Optional[datetime],
+    base: BacktestConfig,
+    trials: List[Dict[str, Any]],
+    metric: str = "total_pnl_usd",
+    max_workers: Optional[int] = None,
+) -> None:
+    """Fetch the candle range, then run the sweep (see run_parameter_sweep)."""
+    try:
+        candles = await fetch_candles(symbol, interval, start, end)
+    except Exception as e:
+        logger.error(f"Sweep {job_id} candle fetch failed: {e}")
+        await db[BACKTEST_SWEEPS_COLLECTION].update_one(
+            {"_id": job_id},
+            {"$set": {"status": "failed", "error": f"Candle fetch failed: {e}"}},
+        )
+        return
+    if not len(candles):
+        await db[BACKTEST_SWEEPS_COLLECTION].update_one(
+            {"_id": job_id},
+            {"$set": {"status": "failed", "error": "No candles in range"}},
+        )
+        return
+    await run_parameter_sweep(db, job_id, candles, base, trials, metric, max_workers)
+
+
+def start_sweep_task(*args, **kwargs) -> asyncio.Task:
+    """Run a sweep job in the background (arguments as run_sweep_job)."""
+    task = asyncio.create_task(run_sweep_job(*args, **kwargs))
+    _sweep_tasks.add(task)
+    task.add_done_callback(_sweep_tasks.discard)
+    return task
+
+
+__all__ = [
+    "BACKTEST_SWEEPS_COLLECTION",
+    "BACKTEST_SWEEP_RESULTS_COLLECTION",
+    "SWEEP_METRICS",
+    "ensure_sweep_indexes",
+    "expand_grid",
+    "run_parameter_sweep",
+    "run_sweep_job",
+    "start_sweep_task",
+    "trial_config",
+]
@@ -0,0 +1,213 @@
+"""
+Conversation Event Bus
+
+Redis pub/sub fan-out of swarm conversation events to websocket viewers.
+
+Writers (``execute_flow`` and the conversations router) publish each agent
+message, swarm vote and status change on ``conversations:{execution_id}``
+as it is written. Every API worker keeps a single pub/sub connection,
+subscribes to an execution's channel while it has local viewers, and
+hands events to each viewer's bounded send queue. A slow client never
+blocks the reader: when its queue is full the oldest event is dropped and
+the client is told how many it missed so it can re-sync from
+``GET /conversations/{id}``.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+
+import orjson
+
+from app.config.settings import get_settings
+from app.utils.cache import get_redis_client
+from app.utils.logger import get_logger
+from app.utils.serialization import JSON_OPTIONS, response_default
+
+logger = get_logger(__name__)
+
+CONVERSATION_CHANNEL_PREFIX = "conversations:"
+
+
+def _json_default(value: Any) -> Any:
+    try:
+        return response_default(value)
+    except TypeError:
+        return str(value)
+
+
+def encode_conversation_event(event_type: str, execution_id: str, data: Any) -> str:
+    """Serialize a conversation event to the JSON text sent over Redis and websockets."""
+    return orjson.dumps(
+        {"type": event_type, "execution_id": execution_id, "data": data},
+        default=_json_default,
+        option=JSON_OPTIONS,
+    ).decode()
+
+
+class ConversationSubscriber:
+    """
+    One websocket viewer with a bounded send queue.
+
+    ``offer`` never blocks: when the queue is full the oldest event is
+    dropped and counted, and the next ``get`` first yields a ``lagged``
+    notice with the number of missed events.
+    """
+
+    def __init__(self, execution_id: str, max_queue: int):
+        self.execution_id = execution_id
+        self.max_queue = max(1, max_queue)
+        self._queue: Deque[str] = deque()
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def offer(self, payload: str) -> None:
+        """Queue an encoded event, evicting the oldest one if the client is behind."""
+        if len(self._queue) >= self.max_queue:
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append(payload)
+        self._ready.set()
+
+    async def get(self) -> str:
+        """Wait for the next encoded event to send."""
+        while not self._queue and not self.dropped:
+            self._ready.clear()
+            await self._ready.wait()
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            return encode_conversation_event("lagged", self.execution_id, {"dropped": dropped})
+        return self._queue.popleft()
+
+
+class ConversationEventBus:
+    """
+    Per-process conversation event bus.
+
+    Usage:
+        bus = get_conversation_event_bus()
+        await bus.publish(execution_id, "message", message)
+
+        async with bus.subscribe(execution_id) as subscriber:
+            payload = await subscriber.get()
+    """
+
+    def __init__(self, max_queue: Optional[int] = None):
+        settings = get_settings()
+        self.max_queue = int(max_queue or getattr(settings, "CONVERSATION_WS_MAX_QUEUE", 100))
+        self._subscribers: Dict[str, Set[ConversationSubscriber]] = {}
+        self._pubsub = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def _dispatch(self, execution_id: str, payload: str) -> None:
+        for subscriber in list(self._subscribers.get(execution_id, ())):
+            subscriber.offer(payload)
+
+    async def publish(self, execution_id: str, event_type: str, data: Any) -> bool:
+        """
+        Publish a conversation event to viewers on every worker.
+
+        Falls back to local delivery when Redis is unavailable, so a single
+        worker still streams live.
+
+        Returns:
+            True if the event was published to Redis
+        """
+        execution_id = str(execution_id)
+        payload = encode_conversation_event(event_type, execution_id, data)
+        try:
+            redis_client = await get_redis_client()
+            await redis_client.publish(f"{CONVERSATION_CHANNEL_PREFIX}{execution_id}", payload)
+            return True
+        except Exception as e:
+            logger.debug(f"Conversation event publish failed, delivering locally: {e}")
+            self._dispatch(execution_id, payload)
+            return False
+
+    async def _ensure_channel(self, execution_id: str) -> None:
+        async with self._lock:
+            if self._pubsub is None:
+                redis_client = await get_redis_client()
+                self._pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(f"{CONVERSATION_CHANNEL_PREFIX}{execution_id}")
+            if self._reader_task is None or self._reader_task.done():
+                self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _release_channel(self, execution_id: str) -> None:
+        async with self._lock:
+            if self._pubsub is not None:
+                await self._pubsub.unsubscribe(f"{CONVERSATION_CHANNEL_PREFIX}{execution_id}")
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                if not self._pubsub.subscribed:
+                    await asyncio.sleep(0.5)
+                    continue
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if not message or message.get("type") != "message":
+                    continue
+                channel = message.get("channel") or ""
+                self._dispatch(channel[len(CONVERSATION_CHANNEL_PREFIX):], message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Conversation event reader error: {e}")
+                await asyncio.sleep(1.0)
+
+    @asynccontextmanager
+    async def subscribe(self, execution_id: str) -> AsyncIterator[ConversationSubscriber]:
+        """Register a viewer for an execution for the duration of the context."""
+        execution_id = str(execution_id)
+        subscriber = ConversationSubscriber(execution_id, self.max_queue)
+        viewers = self._subscribers.setdefault(execution_id, set())
+        first = not viewers
+        viewers.add(subscriber)
+        if first:
+            try:
+                await self._ensure_channel(execution_id)
+            except Exception as e:
+                logger.warning(f"Conversation events for {execution_id} are local-only: {e}")
+        try:
+            yield subscriber
+        finally:
+            viewers.discard(subscriber)
+            if not viewers:
+                self._subscribers.pop(execution_id, None)
+                try:
+                    await self._release_channel(execution_id)
+                except Exception as e:
+                    logger.debug(f"Failed to unsubscribe conversation channel {execution_id}: {e}")
+
+    async def close(self) -> None:
+        """Stop the reader and close the pub/sub connection."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+
+
+# Singleton instance
+_conversation_event_bus: Optional[ConversationEventBus] = None
+
+
+def get_conversation_event_bus() -> ConversationEventBus:
+    """Get singleton conversation event bus."""
+    global _conversation_event_bus
+    if _conversation_event_bus is None:
+        _conversation_event_bus = ConversationEventBus()
+    return _conversation_event_bus
@@ -0,0 +1,276 @@
+"""
+Flow Scheduler Service
+
+Persistent delayed-job queue for the continuous trading auto-loop.
+
+Each looping flow owns at most one document in the ``flow_schedule``
+collection holding the time its next cycle is due. A lightweight
+dispatcher polls the ``due_at`` index and claims due jobs atomically with
+a lease, so pending cycles survive restarts, are spread across every
+running worker, and no coroutine is held in memory while a flow waits.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import os
+import socket
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, Optional, Set
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, ReturnDocument
+
+from app.config.settings import get_settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FLOW_SCHEDULE_COLLECTION = "flow_schedule"
+
+
+def _job_key(flow_id: str) -> str:
+    """Build the schedule document id for a flow (one pending job per flow)."""
+    return f"flow_loop_{flow_id}"
+
+
+async def ensure_flow_schedule_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Create the ``due_at`` index the dispatcher polls on."""
+    await db[FLOW_SCHEDULE_COLLECTION].create_index(
+        [("due_at", ASCENDING)],
+        name="due_at_1",
+    )
+
+
+async def schedule_flow_run(
+    db: AsyncIOMotorDatabase,
+    flow_id: str,
+    delay_seconds: float,
+    model_provider: str,
+    model_name: Optional[str],
+) -> str:
+    """
+    Schedule the next auto-loop cycle for a flow.
+
+    Upserts the flow's single schedule document, so rescheduling replaces
+    any earlier pending cycle instead of stacking a second one.
+
+    Args:
+        db: Database instance
+        flow_id: Flow ID to run
+        delay_seconds: Seconds from now until the cycle is due
+        model_provider: AI model provider for the cycle
+        model_name: Specific model name (optional)
+
+    Returns:
+        Job ID of the scheduled cycle
+    """
+    now = datetime.now(timezone.utc)
+    job_id = str(ObjectId())
+    await db[FLOW_SCHEDULE_COLLECTION].update_one(
+        {"_id": _job_key(flow_id)},
+        {
+            "$set": {
+                "flow_id": str(flow_id),
+                "job_id": job_id,
+                "model_provider": model_provider,
+                "model_name": model_name,
+                "due_at": now + timedelta(seconds=max(0.0, float(delay_seconds))),
+                "lease_until": None,
+                "claimed_by": None,
+                "attempts": 0,
+                "updated_at": now,
+            },
+            "$setOnInsert": {"created_at": now},
+        },
+        upsert=True,
+    )
+    logger.debug(f"Scheduled auto-loop cycle for flow {flow_id} in {delay_seconds}s (job {job_id})")
+    return job_id
+
+
+async def cancel_flow_run(db: AsyncIOMotorDatabase, flow_id: str) -> bool:
+    """
+    Remove a flow's pending auto-loop cycle, if any.
+
+    Returns:
+        True if a pending cycle was removed
+    """
+    result = await db[FLOW_SCHEDULE_COLLECTION].delete_one({"_id": _job_key(flow_id)})
+    return result.deleted_count > 0
+
+
+class FlowSchedulerDispatcher:
+    """
+    Dispatcher for due auto-loop cycles.
+
+    Claims due jobs with ``find_one_and_update`` and a lease. A job whose
+    worker dies mid-cycle becomes claimable again once its lease expires.
+    Completing a job only deletes it when its ``job_id`` still matches, so
+    a cycle that rescheduled itself while running keeps its next slot.
+
+    Usage:
+        dispatcher = FlowSchedulerDispatcher(db)
+        await dispatcher.dispatch_due_jobs()
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        worker_id: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            db: MongoDB database instance
+            worker_id: Identifier recorded on claimed jobs (default: host:pid)
+            max_concurrency: Maximum cycles this worker runs at once
+            lease_seconds: How long a claim is held before another worker may retry it
+        """
+        settings = get_settings()
+        self.db = db
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.max_concurrency = max(1, int(max_concurrency or getattr(settings, "FLOW_SCHEDULER_MAX_CONCURRENCY", 10)))
+        self.lease_seconds = max(1, int(lease_seconds or getattr(settings, "FLOW_SCHEDULER_LEASE_SECONDS", 900)))
+        self._in_flight: Set[asyncio.Task] = set()
+
+    async def claim_due_job(self) -> Optional[Dict[str, Any]]:
+        """Atomically claim the oldest due job that is not leased by another worker."""
+        now = datetime.now(timezone.utc)
+        return await self.db[FLOW_SCHEDULE_COLLECTION].find_one_and_update(
+            {
+                "due_at": {"$lte": now},
+                "$or": [
+                    {"lease_until": None},
+                    {"lease_until": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "lease_until": now + timedelta(seconds=self.lease_seconds),
+                    "claimed_by": self.worker_id,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("due_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def complete_job(self, job: Dict[str, Any]) -> None:
+        """Delete a finished job unless it was rescheduled while running."""
+        await self.db[FLOW_SCHEDULE_COLLECTION].delete_one(
+            {"_id": job["_id"], "job_id": job.get("job_id")}
+        )
+
+    async def run_job(self, job: Dict[str, Any]) -> None:
+        """
+        Run one claimed auto-loop cycle.
+
+        Mirrors the former in-process timer: skip flows that are gone or no
+        longer active, and on failure schedule the next attempt so one bad
+        cycle does not stop trading.
+        """
+        from app.modules.flows import service as flow_service
+        from app.modules.flows.models import FlowStatus
+
+        flow_id = job.get("flow_id")
+        model_provider = job.get("model_provider") or "groq"
+        model_name = job.get("model_name")
+
+        try:
+            flow = await flow_service.get_flow_by_id(self.db, flow_id)
+            if not flow:
+                logger.warning(f"Flow {flow_id} not found, stopping auto-loop")
+                return
+            if flow.status != FlowStatus.ACTIVE:
+                logger.info(f"Flow {flow_id} is not active (status: {flow.status}), stopping auto-loop")
+                return
+
+            await flow_service.execute_flow(self.db, flow, model_provider, model_name)
+        except Exception as e:
+            # Log error but continue the loop - don't let one failure stop trading
+            logger.error(f"Auto-loop execution failed for flow {flow_id}: {e}")
+
+            try:
+                refreshed = await flow_service.get_flow_by_id(self.db, flow_id)
+                if refreshed and refreshed.status == FlowStatus.ACTIVE:
+                    logger.info(f"Scheduling retry for flow {flow_id} after error")
+                    await flow_service._schedule_auto_loop(self.db, refreshed, model_provider, model_name)
+            except Exception as retry_error:
+                logger.error(f"Failed to schedule retry for flow {flow_id}: {retry_error}")
+        finally:
+            try:
+                await self.complete_job(job)
+            except Exception as e:
+                logger.warning(f"Failed to complete auto-loop job for flow {flow_id}: {e}")
+
+    async def dispatch_due_jobs(self) -> int:
+        """
+        Claim due jobs up to the free concurrency and start them.
+
+        Cycles run as background tasks so a slow LLM call does not hold back
+        other due flows; at most ``max_concurrency`` run on this worker.
+
+        Returns:
+            Number of jobs dispatched
+        """
+        dispatched = 0
+        while len(self._in_flight) < self.max_concurrency:
+            job = await self.claim_due_job()
+            if not job:
+                break
+            task = asyncio.create_task(self.run_job(job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+            dispatched += 1
+
+        if dispatched:
+            logger.info(f"Dispatched {dispatched} due auto-loop cycle(s) on {self.worker_id}")
+        return dispatched
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for all in-flight cycles started by this dispatcher.
+
+        Cycles still running after ``timeout`` seconds are cancelled; their
+        jobs are retried by another worker once the lease expires.
+        """
+        if not self._in_flight:
+            return
+        _, pending = await asyncio.wait(list(self._in_flight), timeout=timeout)
+        if pending:
+            logger.warning(f"Cancelling {len(pending)} auto-loop cycle(s) still running on {self.worker_id}")
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def flow_scheduler_loop(db: AsyncIOMotorDatabase) -> None:
+    """Poll the flow schedule and dispatch due auto-loop cycles until cancelled."""
+    settings = get_settings()
+    interval = max(1, int(getattr(settings, "FLOW_SCHEDULER_POLL_SECONDS", 2)))
+    drain_seconds = float(getattr(settings, "FLOW_SCHEDULER_DRAIN_SECONDS", 30))
+    dispatcher = FlowSchedulerDispatcher(db)
+
+    try:
+        await ensure_flow_schedule_indexes(db)
+    except Exception as e:
+        logger.warning(f"Failed to ensure flow schedule indexes: {e}")
+
+    try:
+        while True:
+            try:
+                await dispatcher.dispatch_due_jobs()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Flow scheduler loop error: {e}")
+            await asyncio.sleep(interval)
+    finally:
+        # Let running cycles finish (and complete their jobs) before shutdown
+        await dispatcher.drain(timeout=drain_seconds)
@@ -0,0 +1,228 @@
+"""
+Index Manager
+
+Declared MongoDB index catalog for the hot collections, built in the
+background at startup, plus an ``explain()`` self-check that reports the
+winning plan of each hot query and fails on a collection scan.
+
+Beanie ``Settings.indexes`` are never applied because ``init_beanie`` is
+not called, so this catalog is the source of truth for indexes. Building
+an index that already exists with the same keys and name is a no-op.
+
+Self-check:
+    python scripts/check_indexes.py [--build]
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """One declared index."""
+
+    collection: str
+    keys: Tuple[Tuple[str, int], ...]
+    name: str
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    def model(self) -> IndexModel:
+        return IndexModel(list(self.keys), name=self.name, **self.options)
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """A query shape the self-check explains."""
+
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[Tuple[Tuple[str, int], ...]] = None
+
+
+INDEX_CATALOG: Tuple[IndexSpec, ...] = (
+    # Positions: tracker scans, per-user lists, single-position mode
+    IndexSpec("positions", (("status", ASCENDING), ("symbol", ASCENDING)), "status_symbol"),
+    IndexSpec("positions", (("user_id", ASCENDING), ("opened_at", DESCENDING)), "user_opened_at"),
+    IndexSpec(
+        "positions",
+        (("user_id", ASCENDING), ("status", ASCENDING), ("opened_at", DESCENDING)),
+        "user_status_opened_at",
+    ),
+    IndexSpec(
+        "positions",
+        (("flow_id", ASCENDING), ("status", ASCENDING), ("opened_at", DESCENDING)),
+        "flow_status_opened_at",
+    ),
+    IndexSpec("positions", (("user_wallet_id", ASCENDING), ("status", ASCENDING)), "wallet_status"),
+    IndexSpec("position_updates", (("position_id", ASCENDING), ("timestamp", DESCENDING)), "position_timestamp"),
+    IndexSpec(
+        "position_updates",
+        (("timestamp", ASCENDING),),
+        "timestamp_ttl",
+        {"expireAfterSeconds": 7 * 24 * 3600},
+    ),
+    # Orders: open-order monitoring, wallet and position lookups
+    IndexSpec("orders", (("status", ASCENDING), ("user_id", ASCENDING)), "status_user"),
+    IndexSpec("orders", (("user_wallet_id", ASCENDING), ("status", ASCENDING)), "wallet_status"),
+    IndexSpec("orders", (("position_id", ASCENDING), ("created_at", ASCENDING)), "position_created_at"),
+    # Executions, locks and per-execution logs
+    IndexSpec("executions", (("status", ASCENDING), ("flow_id", ASCENDING)), "status_flow"),
+    IndexSpec("executions", (("flow_id", ASCENDING), ("started_at", DESCENDING)), "flow_started_at"),
+    IndexSpec("execution_locks", (("expires_at", ASCENDING),), "expires_at"),
+    IndexSpec("ai_conversations", (("execution_id", ASCENDING),), "execution_id"),
+    IndexSpec("agent_decisions", (("execution_id", ASCENDING), ("timestamp", DESCENDING)), "execution_timestamp"),
+    # Flows and the auto-loop schedule
+    IndexSpec("flows", (("status", ASCENDING), ("trigger", ASCENDING)), "status_trigger"),
+    IndexSpec("flow_schedule", (("due_at", ASCENDING),), "due_at_1"),
+    # Wallets
+    IndexSpec("demo_wallet_state", (("user_wallet_id", ASCENDING),), "user_wallet_id"),
+    IndexSpec(
+        "user_wallets",
+        (("user_id", ASCENDING), ("deleted_at", ASCENDING), ("created_at", DESCENDING)),
+        "user_deleted_created_at",
+    ),
+    # Backtest sweeps: ranked results per job
+    IndexSpec("backtest_sweep_results", (("job_id", ASCENDING), ("score", DESCENDING)), "job_score"),
+)
+
+
+def hot_queries() -> Tuple[HotQuery, ...]:
+    """Representative hot query shapes (placeholder ids and times)."""
+    oid = ObjectId()
+    now = datetime.now(timezone.utc)
+    return (
+        HotQuery("open_positions", "positions", {"status": "open", "deleted_at": None}),
+        HotQuery(
+            "user_positions", "positions",
+            {"user_id": oid, "deleted_at": None}, (("opened_at", DESCENDING),),
+        ),
+        HotQuery(
+            "flow_open_position", "positions",
+            {"flow_id": oid, "status": {"$in": ["open", "opening"]}, "deleted_at": None},
+            (("opened_at", DESCENDING),),
+        ),
+        HotQuery(
+            "open_orders", "orders",
+            {"status": {"$in": ["pending", "submitted", "open", "partially_filled"]}, "deleted_at": None},
+        ),
+        HotQuery("running_executions", "executions", {"status": "running", "deleted_at": None}),
+        HotQuery("flow_executions", "executions", {"flow_id": str(oid)}, (("started_at", DESCENDING),)),
+        HotQuery("expired_locks", "execution_locks", {"expires_at": {"$lt": now}}),
+        HotQuery("execution_conversation", "ai_conversations", {"execution_id": str(oid)}),
+        HotQuery(
+            "execution_decisions", "agent_decisions",
+            {"execution_id": str(oid)}, (("timestamp", DESCENDING),),
+        ),
+        HotQuery("scheduled_flows", "flows", {"status": "active", "trigger": "schedule"}),
+        HotQuery("due_flow_runs", "flow_schedule", {"due_at": {"$lte": now}}, (("due_at", ASCENDING),)),
+        HotQuery("demo_wallet_state", "demo_wallet_state", {"user_wallet_id": str(oid)}),
+        HotQuery(
+            "user_wallets", "user_wallets",
+            {"user_id": oid, "deleted_at": None}, (("created_at", DESCENDING),),
+        ),
+        HotQuery(
+            "sweep_leaderboard", "backtest_sweep_results",
+            {"job_id": str(oid)}, (("score", DESCENDING),),
+        ),
+    )
+
+
+# ==================== BUILD ====================
+
+async def ensure_indexes(
+    db: AsyncIOMotorDatabase,
+    catalog: Iterable[IndexSpec] = INDEX_CATALOG,
+) -> Dict[str, List[str]]:
+    """
+    Create every declared index.
+
+    Indexes are created one at a time so a conflict on one (for example an
+    existing index with the same keys under another name) doesn't stop the
+    rest.
+
+    Returns:
+        {"created": [...], "failed": [...]} as ``collection.name`` strings
+    """
+    report: Dict[str, List[str]] = {"created": [], "failed": []}
+    for spec in catalog:
+        label = f"{spec.collection}.{spec.name}"
+        try:
+            await db[spec.collection].create_indexes([spec.model()])
+            report["created"].append(label)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Index {label} not built: {e}")
+            report["failed"].append(label)
+    return report
+
+
+async def build_indexes_in_background(db: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """Startup task: build the catalog and log a summary."""
+    report = await ensure_indexes(db)
+    logger.info(
+        f"Index catalog ensured: {len(report['created'])} ok, {len(report['failed'])} failed"
+    )
+    return report
+
+
+# ==================== SELF-CHECK ====================
+
+def plan_stages(plan: Dict[str, Any]) -> Set[str]:
+    """All stage names in an explain plan tree (classic and SBE formats)."""
+    stages: Set[str] = set()
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            stages.add(node["stage"])
+        for key in ("inputStage", "queryPlan", "outerStage", "innerStage"):
+            if key in node:
+                pending.append(node[key])
+        pending.extend(node.get("inputStages", []))
+    return stages
+
+
+async def explain_query(db: AsyncIOMotorDatabase, query: HotQuery) -> Dict[str, Any]:
+    """Explain one hot query and summarize its winning plan."""
+    cursor = db[query.collection].find(query.filter)
+    if query.sort:
+        cursor = cursor.sort(list(query.sort))
+    explain = await cursor.explain()
+    winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+    stages = plan_stages(winning_plan)
+    return {
+        "name": query.name,
+        "collection": query.collection,
+        "stages": sorted(stages),
+        "collscan": "COLLSCAN" in stages,
+    }
+
+
+async def verify_query_plans(
+    db: AsyncIOMotorDatabase,
+    queries: Optional[Iterable[HotQuery]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Explain every hot query.
+
+    Returns:
+        One summary per query; ``collscan`` is True for a collection scan
+    """
+    return [await explain_query(db, query) for query in (queries or hot_queries())]
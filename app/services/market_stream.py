@@ -0,0 +1,71 @@
+"""
+Market Stream Service
+
+Runs the Binance combined-stream ingestion for the symbols the platform
+actually needs: those with open positions or active flows.
+
+The position tracker, wallets, flows and market routes then read prices
+from the in-memory market book instead of calling Binance REST per tick.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from typing import Set
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.config.settings import get_settings
+from app.integrations.market_data.binance_stream import BinanceMarketStream, get_market_book
+from app.modules.flows.models import FlowStatus
+from app.modules.positions.models import PositionStatus
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+POSITIONS_COLLECTION = "positions"
+FLOWS_COLLECTION = "flows"
+
+
+async def resolve_active_symbols(db: AsyncIOMotorDatabase) -> Set[str]:
+    """
+    Get the symbols to stream: open positions plus active flows.
+
+    Returns:
+        Set of symbols in universal format (BTC/USDT)
+    """
+    symbols: Set[str] = set()
+    try:
+        symbols.update(await db[POSITIONS_COLLECTION].distinct(
+            "symbol",
+            {
+                "status": {"$in": [PositionStatus.OPEN.value, PositionStatus.OPENING.value]},
+                "deleted_at": None,
+            },
+        ))
+        symbols.update(await db[FLOWS_COLLECTION].distinct(
+            "symbol",
+            {"status": FlowStatus.ACTIVE.value},
+        ))
+    except Exception as e:
+        logger.warning(f"Failed to resolve active market symbols: {e}")
+    return {s for s in symbols if isinstance(s, str) and s}
+
+
+async def market_stream_loop(db: AsyncIOMotorDatabase) -> None:
+    """Stream market data for the active symbol set until cancelled."""
+    settings = get_settings()
+    book = get_market_book()
+    book.candle_history = int(getattr(settings, "MARKET_STREAM_CANDLE_HISTORY", 500))
+
+    async def _symbols() -> Set[str]:
+        return await resolve_active_symbols(db)
+
+    stream = BinanceMarketStream(
+        book,
+        _symbols,
+        kline_interval=getattr(settings, "MARKET_STREAM_KLINE_INTERVAL", "1m"),
+        symbol_refresh_seconds=float(getattr(settings, "MARKET_STREAM_SYMBOL_REFRESH_SECONDS", 30)),
+    )
+    logger.info("Market stream started")
+    await stream.run_forever()
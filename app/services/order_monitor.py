@@ -7,13 +7,14 @@ Author: Moniqo Team
 Last Updated: 2025-11-22
 """
 
+import asyncio
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timezone
 from decimal import Decimal
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from bson import ObjectId
 
 from app.modules.orders.models import Order, OrderStatus, OrderSide, OrderType
+from app.modules.orders.repository import OrderRepository
 from app.modules.positions.models import Position, PositionStatus, PositionSide
 from app.integrations.wallets.factory import WalletFactory
 from app.utils.logger import get_logger
@@ -55,6 +56,7 @@ class OrderMonitorService:
             db: MongoDB database instance
         """
         self.db = db
+        self.orders = OrderRepository(db)
         self.wallet_factory = WalletFactory()
         
         logger.info("Order monitor service initialized")
@@ -326,28 +328,17 @@ class OrderMonitorService:
             Dict with monitoring results
         """
         try:
-            # Get all open orders for user
-            orders = await Order.find(
-                Order.user_id == ObjectId(user_id),
-                Order.status.in_([
-                    OrderStatus.PENDING,
-                    OrderStatus.SUBMITTED,
-                    OrderStatus.OPEN,
-                    OrderStatus.PARTIALLY_FILLED
-                ]),
-                Order.deleted_at == None
-            ).to_list()
-            
             results = {
                 "success": True,
-                "total_orders": len(orders),
+                "total_orders": 0,
                 "updated": 0,
                 "errors": 0,
                 "details": []
             }
             
-            # Monitor each order
-            for order in orders:
+            # Stream the user's open orders (symbol and status only)
+            async for order in self.orders.iter_open(user_id=user_id):
+                results["total_orders"] += 1
                 try:
                     result = await self.monitor_order(str(order.id))
                     
@@ -359,7 +350,7 @@ class OrderMonitorService:
                     results["details"].append({
                         "order_id": str(order.id),
                         "symbol": order.symbol,
-                        "status": order.status.value,
+                        "status": order.status,
                         "result": result
                     })
                 
@@ -387,45 +378,31 @@ class OrderMonitorService:
             Dict with monitoring results
         """
         try:
-            # Get all open orders
-            orders = await Order.find(
-                Order.status.in_([
-                    OrderStatus.PENDING,
-                    OrderStatus.SUBMITTED,
-                    OrderStatus.OPEN,
-                    OrderStatus.PARTIALLY_FILLED
-                ]),
-                Order.deleted_at == None
-            ).to_list()
-            
             results = {
                 "success": True,
-                "total_orders": len(orders),
+                "total_orders": 0,
                 "updated": 0,
                 "errors": 0
             }
             
-            # Monitor each order (with batching to avoid overload)
+            # Stream open order ids; pause briefly every batch to avoid overload
             batch_size = 10
-            for i in range(0, len(orders), batch_size):
-                batch = orders[i:i + batch_size]
-                
-                for order in batch:
-                    try:
-                        result = await self.monitor_order(str(order.id))
-                        
-                        if result["success"]:
-                            results["updated"] += 1
-                        else:
-                            results["errors"] += 1
+            async for order in self.orders.iter_open(fields=("_id",)):
+                results["total_orders"] += 1
+                try:
+                    result = await self.monitor_order(str(order.id))
                     
-                    except Exception as e:
+                    if result["success"]:
+                        results["updated"] += 1
+                    else:
                         results["errors"] += 1
-                        logger.error(f"Error monitoring order {order.id}: {str(e)}")
                 
-                # Small delay between batches
-                import asyncio
-                await asyncio.sleep(0.1)
+                except Exception as e:
+                    results["errors"] += 1
+                    logger.error(f"Error monitoring order {order.id}: {str(e)}")
+                
+                if results["total_orders"] % batch_size == 0:
+                    await asyncio.sleep(0.1)
             
             return results
         
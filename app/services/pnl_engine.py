@@ -0,0 +1,172 @@
+"""
+Vectorized P&L Engine
+
+Float64 fast path for position monitoring. A ``PositionBook`` holds a batch
+of open positions as parallel NumPy arrays (entry price, amount, entry
+value, fees, side, water marks) and ``evaluate`` prices every position of
+every symbol in one vectorized pass: value, unrealized P&L and percent,
+high/low water marks, max drawdown and risk level.
+
+Monitoring snapshots are stored as floats, so the per-tick math doesn't
+need ``Decimal``. Decimal stays where precision matters: order sizing,
+fills and settlement (closing a position, realized P&L).
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from app.modules.positions.models import PositionSide
+from app.modules.positions.repository import PositionRecord
+from app.utils.records import to_float
+
+# Indexed by the number of loss thresholds crossed
+RISK_LEVELS = ("low", "medium", "high", "critical")
+# Unrealized P&L percent below which each level starts (medium, high, critical)
+RISK_THRESHOLDS = (-2.0, -5.0, -10.0)
+
+NAN = float("nan")
+
+
+def risk_levels(pnl_percent: np.ndarray) -> np.ndarray:
+    """Risk level index (into ``RISK_LEVELS``) per position."""
+    levels = np.zeros(pnl_percent.shape, dtype=np.intp)
+    for threshold in RISK_THRESHOLDS:
+        levels += pnl_percent < threshold
+    return levels
+
+
+class PnLSnapshot:
+    """Per-position results of one ``PositionBook.evaluate`` call."""
+
+    __slots__ = (
+        "priced",
+        "price",
+        "value",
+        "unrealized_pnl",
+        "unrealized_pnl_percent",
+        "high_water_mark",
+        "low_water_mark",
+        "max_drawdown_percent",
+        "risk_level",
+    )
+
+    def __init__(self, price: np.ndarray, **columns: np.ndarray):
+        self.priced = (~np.isnan(price)).tolist()
+        # Python lists once per batch: row() then only indexes
+        self.price = price.tolist()
+        for name, column in columns.items():
+            setattr(self, name, column.tolist())
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def row(self, index: int) -> Optional[Dict[str, Any]]:
+        """Metrics for one position as floats, None if its symbol had no price."""
+        if not self.priced[index]:
+            return None
+        return {
+            "price": self.price[index],
+            "value": self.value[index],
+            "unrealized_pnl": self.unrealized_pnl[index],
+            "unrealized_pnl_percent": self.unrealized_pnl_percent[index],
+            "risk_level": RISK_LEVELS[self.risk_level[index]],
+            "high_water_mark": self.high_water_mark[index],
+            "low_water_mark": self.low_water_mark[index],
+            "max_drawdown_percent": self.max_drawdown_percent[index],
+        }
+
+
+class PositionBook:
+    """
+    A batch of positions as parallel float64 arrays.
+
+    Usage:
+        book = PositionBook(records)
+        snapshot = book.evaluate({"BTC/USDT": 97250.5, "ETH/USDT": 3120.0})
+        metrics = snapshot.row(0)
+    """
+
+    __slots__ = (
+        "records",
+        "entry_price",
+        "amount",
+        "entry_value",
+        "fees",
+        "side",
+        "high_water_mark",
+        "low_water_mark",
+        "by_symbol",
+    )
+
+    def __init__(self, records: Iterable[PositionRecord]):
+        self.records: List[PositionRecord] = list(records)
+        count = len(self.records)
+        self.entry_price = np.empty(count)
+        self.amount = np.empty(count)
+        self.entry_value = np.empty(count)
+        self.fees = np.empty(count)
+        # +1 long, -1 short: P&L is (price - entry) * amount * side
+        self.side = np.empty(count)
+        # NaN where no water mark is stored yet (the first price becomes both)
+        self.high_water_mark = np.empty(count)
+        self.low_water_mark = np.empty(count)
+
+        by_symbol: Dict[str, List[int]] = {}
+        for index, record in enumerate(self.records):
+            entry = record.entry
+            current = record.current
+            self.entry_price[index] = to_float(entry.get("price"), 0.0)
+            self.amount[index] = to_float(entry.get("amount"), 0.0)
+            self.entry_value[index] = to_float(entry.get("value"), 0.0)
+            self.fees[index] = to_float(entry.get("fees"), 0.0)
+            self.side[index] = 1.0 if record.side == PositionSide.LONG.value else -1.0
+            self.high_water_mark[index] = to_float(current.get("high_water_mark"), NAN)
+            self.low_water_mark[index] = to_float(current.get("low_water_mark"), NAN)
+            by_symbol.setdefault(record.symbol, []).append(index)
+        self.by_symbol = {symbol: np.array(indexes, dtype=np.intp) for symbol, indexes in by_symbol.items()}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def evaluate(self, prices: Mapping[str, Optional[float]]) -> PnLSnapshot:
+        """
+        Recompute every position at its symbol's price.
+
+        Args:
+            prices: Current price per symbol (missing/None: not priced)
+
+        Returns:
+            Snapshot aligned with ``records``
+        """
+        price = np.full(len(self.records), NAN)
+        for symbol, indexes in self.by_symbol.items():
+            symbol_price = prices.get(symbol)
+            if symbol_price is not None:
+                price[indexes] = symbol_price
+
+        unrealized_pnl = (price - self.entry_price) * self.amount * self.side - self.fees
+        unrealized_pnl_percent = np.divide(
+            unrealized_pnl * 100, self.entry_value,
+            out=np.zeros_like(price), where=self.entry_value > 0,
+        )
+        # fmax/fmin ignore NaN, so a missing water mark starts at the price
+        high_water_mark = np.fmax(self.high_water_mark, price)
+        low_water_mark = np.fmin(self.low_water_mark, price)
+        max_drawdown_percent = np.divide(
+            (high_water_mark - low_water_mark) * 100, high_water_mark,
+            out=np.zeros_like(price), where=high_water_mark > 0,
+        )
+        return PnLSnapshot(
+            price,
+            value=self.amount * price,
+            unrealized_pnl=unrealized_pnl,
+            unrealized_pnl_percent=unrealized_pnl_percent,
+            high_water_mark=high_water_mark,
+            low_water_mark=low_water_mark,
+            max_drawdown_percent=max_drawdown_percent,
+            risk_level=risk_levels(unrealized_pnl_percent),
+        )
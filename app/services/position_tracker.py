@@ -7,23 +7,42 @@ Author: Moniqo Team
 Last Updated: 2025-11-22
 """
 
+import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timezone
 from decimal import Decimal, ROUND_DOWN
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 
-from app.modules.positions.models import Position, PositionStatus, PositionSide, PositionUpdate
+from app.modules.positions.models import Position, PositionSide, PositionUpdate
+from app.modules.positions.repository import MONITOR_FIELDS, PositionRecord, PositionRepository
 from app.modules.flows.models import FlowStatus
 from app.integrations.wallets.base import OrderSide, OrderType, TimeInForce
 from app.integrations.wallets.factory import create_wallet_from_db
 from app.modules.ai_agents.monitor_agent import MonitorAgent
-from app.services.signal_aggregator import get_signal_aggregator
+from app.services.signal_materializer import get_signal_materializer
+from app.services.socket_publisher import get_socket_publisher
 from app.integrations.market_data.binance_client import BinanceClient
+from app.integrations.market_data.binance_stream import get_market_book
+from app.config.settings import get_settings
 from app.utils.logger import get_logger
+from app.utils.metrics import get_metrics_registry
+from app.utils.records import cursor_batch_size, documents_initialized
+from app.services.pnl_engine import PositionBook
 
 logger = get_logger(__name__)
 
+# Monitor tick telemetry (lag is observed by the loop that schedules ticks)
+POSITION_TICK_SECONDS = get_metrics_registry().histogram(
+    "position_monitor_tick_seconds", "monitor_all_positions duration"
+)
+POSITION_TICK_LAG_SECONDS = get_metrics_registry().histogram(
+    "position_monitor_tick_lag_seconds", "Delay of a monitor tick past its configured interval"
+)
+POSITIONS_MONITORED = get_metrics_registry().gauge(
+    "position_monitor_positions", "Open positions seen by the last monitor tick"
+)
+
 
 class PositionTrackerService:
     """
@@ -60,10 +79,19 @@ class PositionTrackerService:
             db: MongoDB database instance
         """
         self.db = db
-        self.signal_aggregator = get_signal_aggregator()
+        self.positions = PositionRepository(db)
+        # Precomputed signals (same get_signal interface as SignalAggregator)
+        self.signal_aggregator = get_signal_materializer()
         
         logger.info("Position tracker service initialized")
     
+    def _get_live_price(self, symbol: Optional[str]) -> Optional[Decimal]:
+        """Latest streamed price for a symbol, or None if it isn't fresh in the market book."""
+        if not symbol:
+            return None
+        max_age = getattr(get_settings(), "MARKET_STREAM_MAX_PRICE_AGE_SECONDS", 5)
+        return get_market_book().get_price(symbol, max_age_seconds=max_age)
+    
     async def update_position_price(
         self,
         position_id: str,
@@ -113,22 +141,18 @@ class PositionTrackerService:
             # Emit Socket.IO update (only if position has user_id)
             if position.user_id:
                 try:
-                    # Import here to avoid circular import
-                    import sys
-                    if 'app.main' in sys.modules:
-                        from app.main import sio
-                        await sio.emit('position_update', {
-                            'position_id': str(position.id),
-                            'user_id': str(position.user_id),
-                            'symbol': position.symbol,
-                            'side': position.side.value,
-                            'current_price': float(current_price),
-                            'current_value': float(position.current["value"]),
-                            'unrealized_pnl': float(position.current["unrealized_pnl"]),
-                            'unrealized_pnl_percent': float(position.current["unrealized_pnl_percent"]),
-                            'risk_level': position.current.get("risk_level", "medium"),
-                            'last_updated': position.current["last_updated"].isoformat() if isinstance(position.current.get("last_updated"), datetime) else None
-                        }, room=f'positions:{position.user_id}')
+                    await get_socket_publisher().emit_position_update(f'positions:{position.user_id}', {
+                        'position_id': str(position.id),
+                        'user_id': str(position.user_id),
+                        'symbol': position.symbol,
+                        'side': position.side.value,
+                        'current_price': float(current_price),
+                        'current_value': float(position.current["value"]),
+                        'unrealized_pnl': float(position.current["unrealized_pnl"]),
+                        'unrealized_pnl_percent': float(position.current["unrealized_pnl_percent"]),
+                        'risk_level': position.current.get("risk_level", "medium"),
+                        'last_updated': position.current["last_updated"].isoformat() if isinstance(position.current.get("last_updated"), datetime) else None
+                    })
                 except Exception as e:
                     logger.warning(f"Failed to emit position update via Socket.IO: {e}")
             
@@ -148,10 +172,108 @@ class PositionTrackerService:
                 "error": str(e)
             }
     
+    async def _resolve_price(
+        self,
+        symbol: str,
+        user_wallet_id: Optional[Any],
+        position_id: str,
+    ) -> Optional[float]:
+        """Current price from the market stream, else the position's wallet, else Binance."""
+        current_price = self._get_live_price(symbol)
+
+        if current_price is None and user_wallet_id:
+            try:
+                wallet_instance = await create_wallet_from_db(self.db, str(user_wallet_id))
+                current_price = await wallet_instance.get_market_price(symbol)
+            except Exception as e:
+                logger.warning(f"Failed to get price from wallet for position {position_id}: {e}")
+
+        if current_price is None:
+            async with BinanceClient() as binance_client:
+                current_price = await binance_client.get_price(symbol)
+
+        return float(current_price) if current_price is not None else None
+
+    async def _resolve_user_id(self, position: PositionRecord) -> Optional[Any]:
+        """Position owner, backfilled from its flow when missing."""
+        if position.user_id or not position.flow_id:
+            return position.user_id
+        try:
+            flow_doc = await self.db["flows"].find_one(
+                {"_id": ObjectId(str(position.flow_id))},
+                {"config.user_id": 1, "user_id": 1},
+            )
+        except Exception as e:
+            logger.debug(f"Failed to get user_id from flow {position.flow_id}: {e}")
+            return None
+        if not flow_doc:
+            return None
+        user_id = flow_doc.get("config", {}).get("user_id") or flow_doc.get("user_id")
+        if user_id:
+            logger.debug("Retrieved user_id %s from flow %s for position %s", user_id, position.flow_id, position.id)
+            # Fix the position document for future queries
+            try:
+                await self.positions.set_user_id(position.id, user_id)
+                logger.info(f"Fixed missing user_id for position {position.id}")
+            except Exception as fix_error:
+                logger.debug(f"Could not fix user_id for position {position.id}: {fix_error}")
+        return user_id
+
+    async def _apply_price(self, position: PositionRecord, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a position's priced metrics (see ``PositionBook``) and emit them to the owner."""
+        now = datetime.now(timezone.utc)
+        time_held_minutes = position.current.get("time_held_minutes", 0)
+        if position.opened_at is not None:
+            time_held_minutes = int((now - position.opened_at).total_seconds() / 60)
+        current_update = {
+            **metrics,
+            "time_held_minutes": time_held_minutes,
+            "last_updated": now,
+        }
+        await self.positions.set_current(position.id, current_update, now)
+
+        try:
+            user_id = await self._resolve_user_id(position)
+            # Skip socket emission if no user_id - use debug level since migration script will fix these
+            if not user_id:
+                logger.debug("Position %s has no user_id - skipping socket emission (run migration script to fix)", position.id)
+            else:
+                room = f"positions:{user_id}"
+                update_data = {
+                    "position_id": str(position.id),
+                    "user_id": str(user_id),
+                    "symbol": position.symbol,
+                    "side": position.side,
+                    "current_price": metrics["price"],
+                    "current_value": metrics["value"],
+                    "unrealized_pnl": metrics["unrealized_pnl"],
+                    "unrealized_pnl_percent": metrics["unrealized_pnl_percent"],
+                    "risk_level": metrics["risk_level"],
+                    "last_updated": now.isoformat(),
+                }
+                logger.debug("Emitting position_update to room %s for position %s", room, position.id)
+                await get_socket_publisher().emit_position_update(room, update_data)
+                logger.debug("Position update emitted: %s", update_data)
+        except Exception as e:
+            logger.error(f"Failed to emit position update via Socket.IO: {e}", exc_info=True)
+
+        return {
+            "success": True,
+            "position_id": str(position.id),
+            "current_price": metrics["price"],
+            "unrealized_pnl": metrics["unrealized_pnl"],
+            "unrealized_pnl_percent": metrics["unrealized_pnl_percent"],
+            "risk_level": metrics["risk_level"],
+        }
+
     async def monitor_position(self, position_id: str) -> Dict[str, Any]:
         """
         Monitor a single position (get current price and update).
         
+        Reads the position once through the repository. Stop loss/take
+        profit checks and AI review need the Beanie document, so they run
+        only when Beanie is initialized.
+        
         Args:
             position_id: Position ID
             
@@ -159,282 +281,187 @@ class PositionTrackerService:
             Dict with monitoring result
         """
         try:
-            try:
-                position = await Position.get(position_id)
-            except Exception as e:
-                error_str = str(e).lower()
-                # Don't log warnings for expected errors:
-                # - "not found" / "does not exist" - positions get deleted regularly
-                # - Schema validation errors (e.g., missing user_id) - handled via raw MongoDB fallback
-                if "not found" not in error_str and "does not exist" not in error_str:
-                    # Check if position exists but has schema mismatch (e.g., None user_id)
-                    doc_check = await self.db["positions"].find_one({"_id": ObjectId(position_id)})
-                    if doc_check:
-                        # Position exists but Beanie can't load it - schema mismatch, use debug level
-                        logger.debug(f"Beanie schema mismatch for position {position_id}, using raw MongoDB fallback")
-                    else:
-                        # Position truly doesn't exist
-                        logger.debug(f"Position {position_id} not found in database")
-                position = None
+            position = await self.positions.get(position_id, fields=MONITOR_FIELDS)
+            if position is None:
+                # Don't log warnings for missing positions - this is normal
+                return {
+                    "success": False,
+                    "error": "Position not found"
+                }
 
-            if not position:
-                doc = await self.db["positions"].find_one({"_id": ObjectId(position_id), "deleted_at": None})
-                if not doc:
-                    # Don't log warnings for missing positions - this is normal
-                    return {
-                        "success": False,
-                        "error": "Position not found"
-                    }
+            return await self._monitor_record(position)
+        
+        except Exception as e:
+            logger.error(f"Error monitoring position {position_id}: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
 
-                status = doc.get("status")
-                if status not in {PositionStatus.OPEN.value, PositionStatus.OPENING.value}:
-                    return {
-                        "success": True,
-                        "message": "Position is not open",
-                        "status": status
-                    }
+    async def _monitor_record(
+        self,
+        position: PositionRecord,
+        metrics: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Price, store and (with Beanie) review an already loaded position.
 
-                symbol = doc.get("symbol")
-                current_price = None
+        ``metrics`` comes from a batch ``PositionBook`` evaluation; without
+        it the position is priced on its own.
+        """
+        if not position.is_monitored():
+            return {
+                "success": True,
+                "message": "Position is not open",
+                "status": position.status
+            }
 
-                user_wallet_id = doc.get("user_wallet_id")
-                if user_wallet_id:
-                    try:
-                        wallet_instance = await create_wallet_from_db(self.db, str(user_wallet_id))
-                        current_price = await wallet_instance.get_market_price(symbol)
-                    except Exception as e:
-                        logger.warning(f"Failed to get price from wallet for position {position_id}: {e}")
+        position_id = str(position.id)
+        if metrics is None:
+            current_price = await self._resolve_price(position.symbol, position.user_wallet_id, position_id)
+            if current_price is not None:
+                metrics = PositionBook([position]).evaluate({position.symbol: current_price}).row(0)
+        if metrics is None:
+            return {
+                "success": False,
+                "error": "Failed to get market price"
+            }
 
-                if current_price is None:
-                    async with BinanceClient() as binance_client:
-                        current_price = await binance_client.get_price(symbol)
-                        if current_price is None:
-                            return {
-                                "success": False,
-                                "error": "Failed to get market price"
-                            }
+        result = await self._apply_price(position, metrics)
 
-                entry = doc.get("entry", {})
-                entry_price = Decimal(str(entry.get("price", 0)))
-                entry_amount = Decimal(str(entry.get("amount", 0)))
-                entry_value = Decimal(str(entry.get("value", 0)))
-                entry_fees = Decimal(str(entry.get("fees", 0)))
+        if documents_initialized(Position):
+            await self._review_position(position_id, metrics["price"])
 
-                current_price = Decimal(str(current_price))
-                current_value = entry_amount * current_price
-                if doc.get("side") == PositionSide.LONG.value:
-                    unrealized_pnl = (current_price - entry_price) * entry_amount
-                else:
-                    unrealized_pnl = (entry_price - current_price) * entry_amount
-                unrealized_pnl -= entry_fees
-                unrealized_pnl_percent = (unrealized_pnl / entry_value * 100) if entry_value > 0 else Decimal("0")
+        return result
 
-                current = doc.get("current") or {}
-                high_water_mark = Decimal(str(current.get("high_water_mark", current_price)))
-                low_water_mark = Decimal(str(current.get("low_water_mark", current_price)))
-                high_water_mark = max(high_water_mark, current_price)
-                low_water_mark = min(low_water_mark, current_price)
-                max_drawdown_percent = Decimal("0")
-                if high_water_mark > 0:
-                    max_drawdown_percent = (high_water_mark - low_water_mark) / high_water_mark * Decimal("100")
+    async def _review_position(self, position_id: str, current_price: float) -> None:
+        """Log the tick, check stop loss/take profit and run the AI monitor on a position document."""
+        position = await Position.get(position_id)
+        if not position or not position.is_open():
+            return
 
-                def _risk_level(pnl_percent: Decimal) -> str:
-                    if pnl_percent < Decimal("-10"):
-                        return "critical"
-                    if pnl_percent < Decimal("-5"):
-                        return "high"
-                    if pnl_percent < Decimal("-2"):
-                        return "medium"
-                    if pnl_percent < Decimal("0"):
-                        return "low"
-                    return "low"
+        # Price history row (position_updates, 7-day TTL)
+        update = PositionUpdate(
+            position_id=position.id,
+            price=Decimal(str(current_price)),
+            unrealized_pnl=Decimal(str(position.current.get("unrealized_pnl", 0))),
+            unrealized_pnl_percent=Decimal(str(position.current.get("unrealized_pnl_percent", 0))),
+        )
+        await update.insert()
 
-                now = datetime.now(timezone.utc)
-                opened_at = doc.get("opened_at")
-                time_held_minutes = current.get("time_held_minutes", 0)
-                if isinstance(opened_at, datetime):
-                    if opened_at.tzinfo is None:
-                        opened_at = opened_at.replace(tzinfo=timezone.utc)
-                    time_held_minutes = int((now - opened_at).total_seconds() / 60)
-                current_update = {
-                    "price": float(current_price),
-                    "value": float(current_value),
-                    "unrealized_pnl": float(unrealized_pnl),
-                    "unrealized_pnl_percent": float(unrealized_pnl_percent),
-                    "risk_level": _risk_level(unrealized_pnl_percent),
-                    "time_held_minutes": time_held_minutes,
-                    "high_water_mark": float(high_water_mark),
-                    "low_water_mark": float(low_water_mark),
-                    "max_drawdown_percent": float(max_drawdown_percent),
-                    "last_updated": now,
-                }
+        await self.check_stop_loss_take_profit(position)
 
-                await self.db["positions"].update_one(
-                    {"_id": doc.get("_id")},
-                    {
-                        "$set": {
-                            "current": current_update,
-                            "updated_at": now,
-                        }
-                    },
-                )
+        try:
+            base_symbol = position.symbol.split("/")[0] if "/" in position.symbol else position.symbol
+            signal_data = (await self.signal_aggregator.get_signal(base_symbol.upper())).to_dict()
 
-                try:
-                    import sys
-                    if "app.main" in sys.modules:
-                        from app.main import sio
-                        # Fix: Get user_id from position, or fallback to flow's user_id, or use 'system'
-                        user_id = doc.get("user_id")
+            monitor_agent = MonitorAgent(
+                model_provider=position.ai_monitoring.get("model_provider", "groq")
+                if position.ai_monitoring else "groq"
+            )
+            monitor_result = await monitor_agent.process({
+                "positions": [
+                    {
+                        "id": str(position.id),
+                        "symbol": position.symbol,
+                        "side": position.side.value,
+                        "entry_price": position.entry.get("price"),
+                        "current_price": float(current_price),
+                        "unrealized_pnl": float(position.current.get("unrealized_pnl", 0)),
+                        "unrealized_pnl_percent": float(position.current.get("unrealized_pnl_percent", 0)),
+                        "risk_level": position.current.get("risk_level"),
+                        "stop_loss": position.risk_management.get("current_stop_loss"),
+                        "take_profit": position.risk_management.get("current_take_profit"),
+                    }
+                ],
+                "market_data": {
+                    "summary": signal_data.get("classification"),
+                    "signal": signal_data,
+                },
+            })
 
-                        # If position doesn't have user_id, try to get it from the flow
-                        # and also fix the position document for future queries
-                        if not user_id:
-                            flow_id = doc.get("flow_id")
-                            if flow_id:
-                                try:
-                                    flow_doc = await self.db["flows"].find_one({"_id": ObjectId(flow_id)})
-                                    if flow_doc:
-                                        user_id = flow_doc.get("config", {}).get("user_id") or flow_doc.get("user_id")
-                                        if user_id:
-                                            logger.debug(f"Retrieved user_id {user_id} from flow {flow_id} for position {doc.get('_id')}")
-                                            # Fix the position document for future queries
-                                            try:
-                                                await self.db["positions"].update_one(
-                                                    {"_id": doc.get("_id")},
-                                                    {"$set": {"user_id": ObjectId(str(user_id))}}
-                                                )
-                                                logger.info(f"Fixed missing user_id for position {doc.get('_id')}")
-                                            except Exception as fix_error:
-                                                logger.debug(f"Could not fix user_id for position {doc.get('_id')}: {fix_error}")
-                                except Exception as e:
-                                    logger.debug(f"Failed to get user_id from flow {flow_id}: {e}")
+            position.ai_monitoring = position.ai_monitoring or {}
+            position.ai_monitoring["last_signal"] = signal_data
+            position.ai_monitoring["last_ai_review"] = {
+                "timestamp": datetime.now(timezone.utc),
+                "result": monitor_result,
+            }
+            await position.save()
 
-                        # Skip socket emission if no user_id - use debug level since migration script will fix these
-                        if not user_id:
-                            logger.debug(f"Position {doc.get('_id')} has no user_id - skipping socket emission (run migration script to fix)")
-                        else:
-                            user_id_str = str(user_id)
-                            room = f"positions:{user_id_str}"
+            await self._apply_ai_recommendations(position, monitor_result)
 
-                            update_data = {
-                                "position_id": str(doc.get("_id")),
-                                "user_id": user_id_str,
-                                "symbol": symbol,
-                                "side": doc.get("side"),
-                                "current_price": float(current_price),
-                                "current_value": float(current_value),
-                                "unrealized_pnl": float(unrealized_pnl),
-                                "unrealized_pnl_percent": float(unrealized_pnl_percent),
-                                "risk_level": current_update["risk_level"],
-                                "last_updated": now.isoformat(),
-                            }
-                            logger.info(f"Emitting position_update to room {room} for position {doc.get('_id')}")
-                            await sio.emit("position_update", update_data, room=room)
-                            logger.debug(f"Position update emitted: {update_data}")
-                except Exception as e:
-                    logger.error(f"Failed to emit position update via Socket.IO: {e}", exc_info=True)
+            for rec in monitor_result.get("recommendations", []):
+                if rec.get("position_id") == str(position.id) and rec.get("action") in ["close", "exit"]:
+                    if position.user_wallet_id:
+                        try:
+                            wallet_instance = await create_wallet_from_db(self.db, str(position.user_wallet_id))
+                            await self._close_position_with_order(
+                                position=position,
+                                wallet=wallet_instance,
+                                reason=rec.get("reason", "ai_signal"),
+                            )
+                        except Exception as e:
+                            logger.warning(f"Failed to close position via wallet: {e}")
+                    break
+        except Exception as e:
+            logger.error(f"AI monitoring failed for position {position_id}: {str(e)}")
+    
+    async def _monitor_batch(
+        self,
+        batch: List[PositionRecord],
+        prices: Dict[str, Optional[float]],
+        results: Dict[str, Any],
+    ) -> None:
+        """
+        Monitor a batch of positions with one vectorized P&L evaluation.
 
-                return {
-                    "success": True,
-                    "position_id": str(doc.get("_id")),
-                    "current_price": float(current_price),
-                    "unrealized_pnl": float(unrealized_pnl),
-                    "unrealized_pnl_percent": float(unrealized_pnl_percent),
-                    "risk_level": current_update["risk_level"],
-                }
-            
-            if not position.is_open():
-                return {
-                    "success": True,
-                    "message": "Position is not open",
-                    "status": position.status.value
-                }
-            
-            current_price = None
-            
-            if position.user_wallet_id:
+        Each symbol is priced once per tick (``prices`` is shared across the
+        tick's batches); the first position of a symbol provides the wallet
+        fallback when the market stream has no fresh price.
+        """
+        for position in batch:
+            if position.symbol not in prices:
                 try:
-                    wallet_instance = await create_wallet_from_db(self.db, str(position.user_wallet_id))
-                    current_price = await wallet_instance.get_market_price(position.symbol)
+                    prices[position.symbol] = await self._resolve_price(
+                        position.symbol, position.user_wallet_id, str(position.id)
+                    )
                 except Exception as e:
-                    logger.warning(f"Failed to get price from wallet for position {position_id}: {e}")
-            
-            if current_price is None:
-                async with BinanceClient() as binance_client:
-                    current_price = await binance_client.get_price(position.symbol)
-                    if current_price is None:
-                        return {
-                            "success": False,
-                            "error": "Failed to get market price"
-                        }
-            
-            # Update position
-            result = await self.update_position_price(str(position.id), current_price)
+                    logger.warning(f"Failed to get price for {position.symbol}: {e}")
+                    prices[position.symbol] = None
 
+        snapshot = PositionBook(batch).evaluate(prices)
+        for index, position in enumerate(batch):
+            position_id = str(position.id)
+            results["total_positions"] += 1
             try:
-                base_symbol = position.symbol.split("/")[0] if "/" in position.symbol else position.symbol
-                signal_data = (await self.signal_aggregator.get_signal(base_symbol.upper())).to_dict()
-
-                monitor_agent = MonitorAgent(
-                    model_provider=position.ai_monitoring.get("model_provider", "groq")
-                    if position.ai_monitoring else "groq"
-                )
-                monitor_result = await monitor_agent.process({
-                    "positions": [
-                        {
-                            "id": str(position.id),
-                            "symbol": position.symbol,
-                            "side": position.side.value,
-                            "entry_price": position.entry.get("price"),
-                            "current_price": float(current_price),
-                            "unrealized_pnl": float(position.current.get("unrealized_pnl", 0)),
-                            "unrealized_pnl_percent": float(position.current.get("unrealized_pnl_percent", 0)),
-                            "risk_level": position.current.get("risk_level"),
-                            "stop_loss": position.risk_management.get("current_stop_loss"),
-                            "take_profit": position.risk_management.get("current_take_profit"),
-                        }
-                    ],
-                    "market_data": {
-                        "summary": signal_data.get("classification"),
-                        "signal": signal_data,
-                    },
-                })
+                metrics = snapshot.row(index)
+                if metrics is None and position.is_monitored():
+                    # Symbol price already failed this tick; don't retry per position
+                    result = {"success": False, "error": "Failed to get market price"}
+                else:
+                    result = await self._monitor_record(position, metrics)
 
-                position.ai_monitoring = position.ai_monitoring or {}
-                position.ai_monitoring["last_signal"] = signal_data
-                position.ai_monitoring["last_ai_review"] = {
-                    "timestamp": datetime.now(timezone.utc),
-                    "result": monitor_result,
-                }
-                await position.save()
+                if result["success"]:
+                    results["updated"] += 1
+                elif result.get("message") == "Position is not open":
+                    results["closed"] += 1
+                    logger.debug("Position %s is closed - skipping", position_id)
+                else:
+                    results["errors"] += 1
 
-                await self._apply_ai_recommendations(position, monitor_result)
+                results["details"].append({
+                    "position_id": position_id,
+                    "result": result
+                })
 
-                for rec in monitor_result.get("recommendations", []):
-                    if rec.get("position_id") == str(position.id) and rec.get("action") in ["close", "exit"]:
-                        if position.user_wallet_id:
-                            try:
-                                wallet_instance = await create_wallet_from_db(self.db, str(position.user_wallet_id))
-                                await self._close_position_with_order(
-                                    position=position,
-                                    wallet=wallet_instance,
-                                    reason=rec.get("reason", "ai_signal"),
-                                )
-                            except Exception as e:
-                                logger.warning(f"Failed to close position via wallet: {e}")
-                        break
             except Exception as e:
-                logger.error(f"AI monitoring failed for position {position_id}: {str(e)}")
-            
-            return result
-        
-        except Exception as e:
-            logger.error(f"Error monitoring position {position_id}: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
-    
+                logger.error(f"Error monitoring position {position_id}: {str(e)}")
+                results["errors"] += 1
+                results["details"].append({
+                    "position_id": position_id,
+                    "error": str(e)
+                })
+
     async def monitor_all_positions(self) -> Dict[str, Any]:
         """
         Monitor all open positions in the system.
@@ -442,27 +469,11 @@ class PositionTrackerService:
         Returns:
             Dict with monitoring results
         """
+        started = time.perf_counter()
         try:
-            position_ids: List[str] = []
-            try:
-                positions = await Position.find(
-                    Position.status == PositionStatus.OPEN,
-                    Position.deleted_at == None
-                ).to_list()
-                position_ids = [str(position.id) for position in positions]
-            except Exception as e:
-                # Use debug level - fallback to raw MongoDB works fine
-                logger.debug(f"Beanie query failed, using raw MongoDB fallback: {e}")
-                cursor = self.db["positions"].find({
-                    "status": PositionStatus.OPEN.value,
-                    "deleted_at": None,
-                })
-                docs = await cursor.to_list(length=None)
-                position_ids = [str(doc.get("_id")) for doc in docs if doc.get("_id")]
-            
             results = {
                 "success": True,
-                "total_positions": len(position_ids),
+                "total_positions": 0,
                 "updated": 0,
                 "errors": 0,
                 "not_found": 0,
@@ -470,36 +481,20 @@ class PositionTrackerService:
                 "details": []
             }
 
-            # Monitor each position
-            for position_id in position_ids:
-                try:
-                    result = await self.monitor_position(position_id)
-
-                    if result["success"]:
-                        results["updated"] += 1
-                    else:
-                        error_msg = result.get("error", "")
-                        if error_msg == "Position not found":
-                            results["not_found"] += 1
-                            logger.info(f"Position {position_id} not found in DB - removing from monitoring")
-                        elif result.get("message") == "Position is not open":
-                            results["closed"] += 1
-                            logger.debug(f"Position {position_id} is closed - skipping")
-                        else:
-                            results["errors"] += 1
-
-                    results["details"].append({
-                        "position_id": position_id,
-                        "result": result
-                    })
-
-                except Exception as e:
-                    results["errors"] += 1
-                    results["details"].append({
-                        "position_id": position_id,
-                        "error": str(e)
-                    })
+            # Stream open positions with only the fields monitoring reads and
+            # price each cursor batch in one PositionBook pass
+            prices: Dict[str, Optional[float]] = {}
+            batch: List[PositionRecord] = []
+            batch_size = cursor_batch_size()
+            async for position in self.positions.iter_open(fields=MONITOR_FIELDS):
+                batch.append(position)
+                if len(batch) >= batch_size:
+                    await self._monitor_batch(batch, prices, results)
+                    batch = []
+            if batch:
+                await self._monitor_batch(batch, prices, results)
             
+            POSITIONS_MONITORED.set(results["total_positions"])
             return results
         
         except Exception as e:
@@ -508,6 +503,8 @@ class PositionTrackerService:
                 "success": False,
                 "error": str(e)
             }
+        finally:
+            POSITION_TICK_SECONDS.observe_since(started)
     
     async def check_stop_loss_take_profit(self, position: Position) -> Dict[str, Any]:
         """
@@ -847,6 +844,8 @@ class PositionTrackerService:
                         execution_completed=True,
                         completed_at=datetime.now(timezone.utc),
                         increment_executions=False,  # Don't double-count executions
+                        realized_pnl_usd=float((position.exit or {}).get("realized_pnl", 0)),
+                        realized_pnl_percent=float((position.exit or {}).get("realized_pnl_percent", 0)),
                     )
                 except Exception as e:
                     logger.error(f"Failed to update flow statistics after dust close: {e}")
@@ -906,6 +905,8 @@ class PositionTrackerService:
                     execution_completed=True,
                     completed_at=datetime.now(timezone.utc),
                     increment_executions=False,  # Don't double-count executions
+                    realized_pnl_usd=float((position.exit or {}).get("realized_pnl", 0)),
+                    realized_pnl_percent=float((position.exit or {}).get("realized_pnl_percent", 0)),
                 )
             except Exception as e:
                 logger.error(f"Failed to update flow statistics after position close: {e}")
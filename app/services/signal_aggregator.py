@@ -39,6 +39,9 @@ class AggregatedSignal(BaseModel):
     
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
+    # Seconds since a materialized signal was computed (None when fresh/pending)
+    age_seconds: Optional[float] = None
+    
     @property
     def is_bullish(self) -> bool:
         return self.score > 0.2
@@ -69,6 +72,7 @@ class AggregatedSignal(BaseModel):
                 for s in self.sources
             ],
             "timestamp": self.timestamp.isoformat(),
+            "age_seconds": self.age_seconds,
         }
 
 
@@ -0,0 +1,231 @@
+"""
+Signal Materializer
+
+Keeps a precomputed ``AggregatedSignal`` for every symbol the platform
+needs (active flows, open positions, and symbols recently requested), so
+request paths read a stored signal and its age instead of fanning out to
+Twitter, Reddit and Polymarket.
+
+Signals are refreshed on a fixed cadence plus random jitter and stored in
+Redis (``signal:{SYMBOL}``) and in process memory. A short Redis lock per
+symbol keeps several API workers from refreshing the same symbol in the
+same cycle. A symbol requested before it was ever materialized gets a
+neutral placeholder and is computed in the background.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import random
+import time
+from typing import Dict, Optional, Set, Tuple
+
+import orjson
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.config.settings import get_settings
+from app.integrations.sentiment.base import SentimentScore
+from app.services.market_stream import resolve_active_symbols
+from app.services.signal_aggregator import AggregatedSignal, get_signal_aggregator
+from app.utils.cache import get_redis_client
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SIGNAL_KEY_PREFIX = "signal:"
+
+
+def base_symbol(symbol: str) -> str:
+    """BTC/USDT -> BTC."""
+    return (symbol.split("/")[0] if "/" in symbol else symbol).upper()
+
+
+class SignalMaterializer:
+    """
+    Background-refreshed aggregated signals.
+
+    Usage:
+        signal = await get_signal_materializer().get_signal("BTC")
+        signal.age_seconds  # seconds since it was computed (None if pending)
+    """
+
+    def __init__(
+        self,
+        interval_seconds: Optional[float] = None,
+        jitter_seconds: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self.interval_seconds = float(
+            interval_seconds or getattr(settings, "SIGNAL_MATERIALIZER_INTERVAL_SECONDS", 120)
+        )
+        self.jitter_seconds = float(
+            jitter_seconds if jitter_seconds is not None
+            else getattr(settings, "SIGNAL_MATERIALIZER_JITTER_SECONDS", 15)
+        )
+        self.max_concurrency = int(max_concurrency or getattr(settings, "SIGNAL_MATERIALIZER_MAX_CONCURRENCY", 4))
+        self.demand_ttl_seconds = float(getattr(settings, "SIGNAL_MATERIALIZER_DEMAND_TTL_SECONDS", 900))
+        # Stored signals outlive a few missed cycles, then expire
+        self.signal_ttl_seconds = int(self.interval_seconds * 5)
+        self._local: Dict[str, Tuple[AggregatedSignal, float]] = {}
+        self._requested: Dict[str, float] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    # ==================== READS ====================
+
+    def _with_age(self, signal: AggregatedSignal, materialized_at: float) -> AggregatedSignal:
+        return signal.model_copy(update={"age_seconds": round(max(0.0, time.time() - materialized_at), 1)})
+
+    async def _read_redis(self, symbol: str) -> Optional[Tuple[AggregatedSignal, float]]:
+        try:
+            redis_client = await get_redis_client()
+            raw = await redis_client.get(f"{SIGNAL_KEY_PREFIX}{symbol}")
+        except Exception as e:
+            logger.debug(f"Signal Redis read failed for {symbol}: {e}")
+            return None
+        if not raw:
+            return None
+        payload = orjson.loads(raw)
+        return AggregatedSignal.model_validate(payload["signal"]), float(payload["materialized_at"])
+
+    async def get_signal(self, symbol: str) -> AggregatedSignal:
+        """
+        Get the latest materialized signal for a symbol without calling
+        any sentiment source.
+
+        Args:
+            symbol: Base symbol ("BTC") or pair ("BTC/USDT")
+
+        Returns:
+            The stored signal with ``age_seconds`` set, or a neutral
+            zero-confidence placeholder (``age_seconds`` None) while the
+            first computation runs in the background
+        """
+        symbol = base_symbol(symbol)
+        self._requested[symbol] = time.time()
+
+        latest = self._local.get(symbol)
+        if latest is None or time.time() - latest[1] > self.interval_seconds:
+            # Another worker may have refreshed it more recently
+            stored = await self._read_redis(symbol)
+            if stored and (latest is None or stored[1] > latest[1]):
+                latest = stored
+                self._local[symbol] = stored
+
+        if latest is None:
+            self._schedule(symbol)
+            return AggregatedSignal(
+                symbol=symbol,
+                score=0.0,
+                classification=SentimentScore.NEUTRAL,
+                confidence=0.0,
+                sources=[],
+            )
+        if time.time() - latest[1] > self.signal_ttl_seconds:
+            self._schedule(symbol)
+        return self._with_age(*latest)
+
+    # ==================== REFRESH ====================
+
+    def _schedule(self, symbol: str) -> None:
+        """Materialize a symbol in the background (once at a time)."""
+        if symbol in self._pending:
+            return
+        task = asyncio.create_task(self.materialize(symbol))
+        self._pending[symbol] = task
+        task.add_done_callback(lambda _: self._pending.pop(symbol, None))
+
+    async def _claim(self, symbol: str) -> bool:
+        """Claim this cycle's refresh of a symbol across workers."""
+        try:
+            redis_client = await get_redis_client()
+            lock_ttl = max(1, int(self.interval_seconds * 0.8))
+            return bool(await redis_client.set(f"{SIGNAL_KEY_PREFIX}{symbol}:lock", "1", nx=True, ex=lock_ttl))
+        except Exception:
+            # Without Redis every worker keeps its own signals
+            return True
+
+    async def materialize(self, symbol: str, force: bool = False) -> Optional[AggregatedSignal]:
+        """
+        Compute and store one symbol's signal.
+
+        Returns:
+            The new signal, or None if another worker holds this cycle's claim
+        """
+        symbol = base_symbol(symbol)
+        if not force and not await self._claim(symbol):
+            return None
+
+        signal = await get_signal_aggregator().get_signal(symbol)
+        materialized_at = time.time()
+        self._local[symbol] = (signal, materialized_at)
+        try:
+            redis_client = await get_redis_client()
+            await redis_client.set(
+                f"{SIGNAL_KEY_PREFIX}{symbol}",
+                orjson.dumps({"signal": signal.model_dump(mode="json"), "materialized_at": materialized_at}),
+                ex=self.signal_ttl_seconds,
+            )
+        except Exception as e:
+            logger.debug(f"Signal Redis write failed for {symbol}: {e}")
+        return signal
+
+    async def resolve_symbols(self, db: AsyncIOMotorDatabase) -> Set[str]:
+        """Symbols of active flows and open positions, plus recently requested ones."""
+        symbols = {base_symbol(s) for s in await resolve_active_symbols(db)}
+        cutoff = time.time() - self.demand_ttl_seconds
+        for symbol, requested_at in list(self._requested.items()):
+            if requested_at < cutoff:
+                del self._requested[symbol]
+            else:
+                symbols.add(symbol)
+        return symbols
+
+    async def refresh(self, symbols: Set[str]) -> int:
+        """
+        Materialize a set of symbols with bounded concurrency.
+
+        Returns:
+            Number of symbols refreshed by this worker
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _one(symbol: str) -> bool:
+            async with semaphore:
+                try:
+                    return await self.materialize(symbol) is not None
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Signal materialization failed for {symbol}: {e}")
+                    return False
+
+        results = await asyncio.gather(*(_one(symbol) for symbol in sorted(symbols)))
+        return sum(results)
+
+    async def run_forever(self, db: AsyncIOMotorDatabase) -> None:
+        """Refresh signals for active symbols until cancelled."""
+        logger.info("Signal materializer started")
+        while True:
+            try:
+                symbols = await self.resolve_symbols(db)
+                refreshed = await self.refresh(symbols)
+                logger.debug(f"Materialized signals: {refreshed}/{len(symbols)} symbols")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Signal materializer cycle failed: {e}")
+            await asyncio.sleep(self.interval_seconds + random.uniform(0, self.jitter_seconds))
+
+
+# Singleton instance
+_signal_materializer: Optional[SignalMaterializer] = None
+
+
+def get_signal_materializer() -> SignalMaterializer:
+    """Get singleton signal materializer."""
+    global _signal_materializer
+    if _signal_materializer is None:
+        _signal_materializer = SignalMaterializer()
+    return _signal_materializer
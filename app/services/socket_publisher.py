@@ -0,0 +1,292 @@
+"""
+Socket.IO Publisher
+
+Process-agnostic Socket.IO emitter for the realtime channels.
+
+Inside the API process events go through the registered ``AsyncServer``.
+With ``SOCKETIO_REDIS_ENABLED`` the server uses an ``AsyncRedisManager``
+so every emit is fanned out to clients connected to any worker. Outside the
+API process (Celery tasks, scripts) the publisher falls back to a
+write-only Redis manager that publishes on the same channel, so emits from
+background workers still reach connected clients.
+
+Rapid position updates are coalesced per room and flushed on a short
+interval as one ``position_updates`` message carrying only changed fields,
+so a tight monitor loop costs each client one small message per window.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import socketio
+
+from app.config.settings import get_settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+POSITION_UPDATE_EVENT = "position_update"
+POSITION_UPDATES_EVENT = "position_updates"
+
+
+def build_client_manager(write_only: bool = False) -> Optional[socketio.AsyncRedisManager]:
+    """
+    Build the Redis client manager shared by all Socket.IO workers.
+
+    Args:
+        write_only: Only publish (no subscription), for non-server processes
+
+    Returns:
+        AsyncRedisManager, or None when Redis fan-out is disabled
+    """
+    settings = get_settings()
+    if not getattr(settings, "SOCKETIO_REDIS_ENABLED", True):
+        return None
+    return socketio.AsyncRedisManager(
+        getattr(settings, "REDIS_URL", "redis://localhost:6379/0"),
+        channel=getattr(settings, "SOCKETIO_CHANNEL", "moniqo-socketio"),
+        write_only=write_only,
+    )
+
+
+# Fields whose change is always forwarded, regardless of thresholds
+_POSITION_STATE_FIELDS = ("symbol", "side", "risk_level", "status")
+# Fields that change every tick and never make an update significant on their own
+_POSITION_VOLATILE_FIELDS = ("last_updated",)
+
+
+class PositionUpdateCoalescer:
+    """
+    Per-room coalescer for position updates.
+
+    Pending updates keep only the latest payload per position. Once per
+    interval every room with pending changes receives a single
+    ``position_updates`` message listing just the fields that changed since
+    the state last sent to that room. Updates whose price and P&L moved
+    less than the configured thresholds (and whose state fields are
+    unchanged) are dropped. A full keyframe is sent periodically so clients
+    that joined on another worker converge on the complete state.
+
+    With ``deltas_enabled=False`` the coalescer only de-duplicates and
+    emits one full ``position_update`` per position.
+    """
+
+    def __init__(
+        self,
+        publisher: "SocketPublisher",
+        interval_seconds: float,
+        deltas_enabled: bool = True,
+        min_price_change_percent: float = 0.0,
+        min_pnl_change_usd: float = 0.0,
+        keyframe_seconds: float = 30.0,
+        state_ttl_seconds: float = 600.0,
+    ):
+        self.publisher = publisher
+        self.interval_seconds = interval_seconds
+        self.deltas_enabled = deltas_enabled
+        self.min_price_change_percent = min_price_change_percent
+        self.min_pnl_change_usd = min_pnl_change_usd
+        self.keyframe_seconds = keyframe_seconds
+        self.state_ttl_seconds = state_ttl_seconds
+        self._pending: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # room -> position_id -> (last sent payload, monotonic time sent)
+        self._sent: Dict[str, Dict[str, Tuple[Dict[str, Any], float]]] = {}
+        self._keyframe_at: Dict[str, float] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def add(self, room: str, payload: Dict[str, Any]) -> None:
+        """Queue a position update, replacing any pending one for the same position."""
+        self._pending.setdefault(room, {})[str(payload.get("position_id"))] = payload
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def reset_room(self, room: str) -> None:
+        """Forget what was sent to a room so the next flush carries full state."""
+        self._sent.pop(room, None)
+        self._keyframe_at.pop(room, None)
+
+    def _is_significant(self, previous: Dict[str, Any], payload: Dict[str, Any]) -> bool:
+        for field in _POSITION_STATE_FIELDS:
+            if payload.get(field) != previous.get(field):
+                return True
+
+        old_price = float(previous.get("current_price") or 0)
+        new_price = float(payload.get("current_price") or 0)
+        if old_price:
+            price_change = abs(new_price - old_price) / abs(old_price) * 100
+        else:
+            price_change = float("inf") if new_price else 0.0
+        pnl_change = abs(float(payload.get("unrealized_pnl") or 0) - float(previous.get("unrealized_pnl") or 0))
+
+        if price_change == 0 and pnl_change == 0:
+            return False
+        return price_change >= self.min_price_change_percent or pnl_change >= self.min_pnl_change_usd
+
+    def _build_room_updates(self, room: str, updates: Dict[str, Dict[str, Any]], now: float) -> Tuple[List[Dict[str, Any]], bool]:
+        sent = self._sent.setdefault(room, {})
+        keyframe = now - self._keyframe_at.get(room, float("-inf")) >= self.keyframe_seconds
+        if keyframe:
+            self._keyframe_at[room] = now
+
+        deltas: List[Dict[str, Any]] = []
+        for position_id, payload in updates.items():
+            previous = sent.get(position_id, (None, 0.0))[0]
+            if previous is None or keyframe:
+                deltas.append(dict(payload))
+            elif self._is_significant(previous, payload):
+                delta = {
+                    key: value
+                    for key, value in payload.items()
+                    if key in _POSITION_VOLATILE_FIELDS or previous.get(key) != value
+                }
+                delta["position_id"] = payload.get("position_id")
+                deltas.append(delta)
+            else:
+                continue
+            sent[position_id] = (payload, now)
+
+        # Positions that stopped updating (closed) age out of the room state
+        for position_id in [pid for pid, (_, sent_at) in sent.items() if now - sent_at > self.state_ttl_seconds]:
+            del sent[position_id]
+        if not sent:
+            self._sent.pop(room, None)
+        return deltas, keyframe
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.interval_seconds)
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Emit all pending updates now.
+
+        Returns:
+            Number of events emitted
+        """
+        task = self._flush_task
+        if task is not None and task is not asyncio.current_task() and not task.done():
+            task.cancel()
+        # Updates added while this flush awaits emit() schedule the next one
+        self._flush_task = None
+        pending, self._pending = self._pending, {}
+
+        emitted = 0
+        if not self.deltas_enabled:
+            for room, updates in pending.items():
+                for payload in updates.values():
+                    await self.publisher.emit(POSITION_UPDATE_EVENT, payload, room=room)
+                    emitted += 1
+            return emitted
+
+        now = time.monotonic()
+        for room, updates in pending.items():
+            deltas, keyframe = self._build_room_updates(room, updates, now)
+            if not deltas:
+                continue
+            await self.publisher.emit(
+                POSITION_UPDATES_EVENT,
+                {"positions": deltas, "keyframe": keyframe},
+                room=room,
+            )
+            emitted += 1
+        return emitted
+
+
+class SocketPublisher:
+    """
+    Thin Socket.IO publisher usable from the API and from Celery workers.
+
+    Usage:
+        publisher = get_socket_publisher()
+        await publisher.emit("execution_update", data, room=room)
+        await publisher.emit_position_update(room, data)
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self._server: Optional[socketio.AsyncServer] = None
+        self._external: Optional[socketio.AsyncRedisManager] = None
+        self._external_loop: Optional[asyncio.AbstractEventLoop] = None
+        throttle_ms = int(getattr(settings, "SOCKETIO_POSITION_THROTTLE_MS", 250))
+        self._position_coalescer = (
+            PositionUpdateCoalescer(
+                self,
+                throttle_ms / 1000.0,
+                deltas_enabled=bool(getattr(settings, "SOCKETIO_POSITION_DELTAS_ENABLED", True)),
+                min_price_change_percent=float(getattr(settings, "SOCKETIO_POSITION_MIN_PRICE_CHANGE_PERCENT", 0.01)),
+                min_pnl_change_usd=float(getattr(settings, "SOCKETIO_POSITION_MIN_PNL_CHANGE_USD", 0.01)),
+                keyframe_seconds=float(getattr(settings, "SOCKETIO_POSITION_KEYFRAME_SECONDS", 30)),
+            )
+            if throttle_ms > 0
+            else None
+        )
+
+    def register_server(self, server: socketio.AsyncServer) -> None:
+        """Attach the API process Socket.IO server."""
+        self._server = server
+
+    def _external_manager(self) -> Optional[socketio.AsyncRedisManager]:
+        # Redis connections are bound to the running loop and Celery tasks run
+        # each call under a fresh asyncio.run(), so rebuild per loop.
+        loop = asyncio.get_running_loop()
+        if self._external is None or self._external_loop is not loop:
+            self._external = build_client_manager(write_only=True)
+            self._external_loop = loop
+        return self._external
+
+    async def emit(self, event: str, data: Dict[str, Any], room: Optional[str] = None) -> bool:
+        """
+        Emit an event to a room on every worker.
+
+        Returns:
+            True if the event was handed to a server or the Redis channel
+        """
+        try:
+            if self._server is not None:
+                await self._server.emit(event, data, room=room)
+                return True
+
+            manager = self._external_manager()
+            if manager is None:
+                logger.debug(f"No Socket.IO server or Redis channel available, dropping {event}")
+                return False
+            await manager.emit(event, data, namespace="/", room=room)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to emit {event} via Socket.IO: {e}")
+            return False
+
+    async def emit_position_update(self, room: str, data: Dict[str, Any]) -> None:
+        """Emit a position update, coalesced per room when throttling is enabled."""
+        # Batching needs a long-lived loop; Celery tasks publish immediately.
+        if self._position_coalescer is None or self._server is None:
+            await self.emit(POSITION_UPDATE_EVENT, data, room=room)
+            return
+        self._position_coalescer.add(room, data)
+
+    def reset_position_room(self, room: str) -> None:
+        """Send full position state to a room on the next flush (e.g. after a client subscribes)."""
+        if self._position_coalescer is not None:
+            self._position_coalescer.reset_room(room)
+
+    async def flush(self) -> int:
+        """Emit any coalesced position updates immediately."""
+        if self._position_coalescer is None:
+            return 0
+        return await self._position_coalescer.flush()
+
+
+# Singleton instance
+_socket_publisher: Optional[SocketPublisher] = None
+
+
+def get_socket_publisher() -> SocketPublisher:
+    """Get singleton Socket.IO publisher."""
+    global _socket_publisher
+    if _socket_publisher is None:
+        _socket_publisher = SocketPublisher()
+    return _socket_publisher
@@ -318,7 +318,7 @@ class WebSocketManager:
             key = f"price:{universal_symbol}"
             await self.redis.set(key, str(price), ex=60)  # Expire in 60s
             
-            logger.debug(f"Cached price: {universal_symbol} = {price}")
+            logger.debug("Cached price: %s = %s", universal_symbol, price)
         
         except Exception as e:
             logger.error(f"Failed to cache price: {str(e)}")
@@ -354,7 +354,7 @@ class WebSocketManager:
             )
             await self.redis.expire(f"quote:{universal_symbol}", 60)
             
-            logger.debug(f"Cached quote: {universal_symbol} bid={bid} ask={ask}")
+            logger.debug("Cached quote: %s bid=%s ask=%s", universal_symbol, bid, ask)
         
         except Exception as e:
             logger.error(f"Failed to cache quote: {str(e)}")
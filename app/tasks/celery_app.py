@@ -19,10 +19,22 @@ Last Updated: 2025-11-22
 
 from celery import Celery
 from celery.schedules import crontab, timedelta
+from celery.signals import task_postrun, task_prerun, worker_process_shutdown
+from kombu.serialization import register
 from app.config.settings import get_settings
+from app.utils.serialization import dumps_message, loads
 
 settings = get_settings()
 
+# orjson for task/result bodies (ObjectId, Decimal, datetime handled natively)
+register(
+    "orjson",
+    dumps_message,
+    loads,
+    content_type="application/x-orjson",
+    content_encoding="utf-8",
+)
+
 # Initialize Celery
 celery_app = Celery(
     "moniqo",
@@ -38,9 +50,10 @@ celery_app = Celery(
 # Celery configuration
 celery_app.conf.update(
     # Task settings
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer="orjson",
+    accept_content=["orjson", "json"],  # json: messages queued before the switch
+    result_serializer="orjson",
+    result_accept_content=["orjson", "json"],
     timezone="UTC",
     enable_utc=True,
     
@@ -121,6 +134,27 @@ def debug_task(self):
     return "Celery is working!"
 
 
+@worker_process_shutdown.connect
+def close_worker_pools_on_shutdown(**kwargs):
+    """Close the worker process's shared MongoDB/Redis pools."""
+    from app.utils.worker_runtime import close_worker_pools
+    close_worker_pools()
+
+
+@task_prerun.connect
+def start_task_timings(task_id=None, task=None, **kwargs):
+    """Start the task's I/O timings (and profiler, if selected)."""
+    from app.utils.profiling import task_started
+    task_started(task_id, task.name)
+
+
+@task_postrun.connect
+def finish_task_timings(task_id=None, task=None, **kwargs):
+    """Log slow tasks with their I/O breakdown and write any profile."""
+    from app.utils.profiling import task_finished
+    task_finished(task_id, task.name)
+
+
 if __name__ == "__main__":
     celery_app.start()
 
@@ -7,7 +7,6 @@ Author: Moniqo Team
 Last Updated: 2026-01-17
 """
 
-import asyncio
 from datetime import datetime, timezone
 from typing import List, Dict, Any
 
@@ -15,6 +14,7 @@ from celery import shared_task, Task
 from croniter import croniter
 
 from app.utils.logger import get_logger
+from app.utils.worker_runtime import get_worker_database, run_async
 
 logger = get_logger(__name__)
 
@@ -44,10 +44,9 @@ def _should_run_now(cron_expression: str) -> bool:
 
 async def _get_scheduled_flows():
     """Get all active flows with schedule trigger type."""
-    from app.config.database import get_database
     from app.modules.flows.models import FlowStatus, FlowTrigger
     
-    db = get_database()
+    db = get_worker_database()
     
     cursor = db["flows"].find({
         "status": FlowStatus.ACTIVE.value,
@@ -65,10 +64,9 @@ async def _get_scheduled_flows():
 
 async def _trigger_flow(flow_id: str, model_provider: str = "groq"):
     """Trigger a single flow execution."""
-    from app.config.database import get_database
     from app.modules.flows import service as flow_service
     
-    db = get_database()
+    db = get_worker_database()
     
     flow = await flow_service.get_flow_by_id(db, flow_id)
     if not flow:
@@ -115,12 +113,7 @@ def trigger_scheduled_flows_task():
         return triggered_count
     
     # Run async code in sync context
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(run())
-    finally:
-        loop.close()
+    return run_async(run())
 
 
 @shared_task(name="app.tasks.flow_tasks.execute_flow_task")
@@ -136,10 +129,9 @@ def execute_flow_task(flow_id: str, model_provider: str = "groq", model_name: st
     logger.info(f"Executing flow task: {flow_id}")
     
     async def run():
-        from app.config.database import get_database
         from app.modules.flows import service as flow_service
         
-        db = get_database()
+        db = get_worker_database()
         flow = await flow_service.get_flow_by_id(db, flow_id)
         
         if not flow:
@@ -149,12 +141,7 @@ def execute_flow_task(flow_id: str, model_provider: str = "groq", model_name: st
         execution = await flow_service.execute_flow(db, flow, model_provider, model_name)
         return str(execution.id) if execution else None
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(run())
-    finally:
-        loop.close()
+    return run_async(run())
 
 
 @shared_task(name="app.tasks.flow_tasks.heartbeat_running_executions_task", bind=True)
@@ -166,24 +153,20 @@ def heartbeat_running_executions_task(self: Task) -> Dict[str, Any]:
     Updates lock expiration for active executions.
     """
     async def heartbeat_all():
-        from app.config.database import get_database
-        from app.modules.flows.models import ExecutionStatus
+        from app.modules.flows.repository import ExecutionRepository
         from app.modules.flows.service import heartbeat_execution_lock
         
-        db = get_database()
-        
-        # Find all running executions
-        running_executions = await db["executions"].find({
-            "status": ExecutionStatus.RUNNING.value,
-            "deleted_at": None
-        }).to_list(length=None)
+        db = get_worker_database()
         
         heartbeat_count = 0
         failed_count = 0
+        total_running = 0
         
-        for exec_doc in running_executions:
-            flow_id = exec_doc.get("flow_id")
-            execution_id = str(exec_doc.get("_id"))
+        # Stream running executions (flow_id only)
+        async for execution in ExecutionRepository(db).iter_running(fields=("flow_id",)):
+            total_running += 1
+            flow_id = execution.flow_id
+            execution_id = str(execution.id)
             
             if flow_id:
                 success = await heartbeat_execution_lock(db, str(flow_id), execution_id)
@@ -196,13 +179,8 @@ def heartbeat_running_executions_task(self: Task) -> Dict[str, Any]:
             "success": True,
             "heartbeat_count": heartbeat_count,
             "failed_count": failed_count,
-            "total_running": len(running_executions)
+            "total_running": total_running
         }
     
     # Run async code
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(heartbeat_all())
-    finally:
-        loop.close()
+    return run_async(heartbeat_all())
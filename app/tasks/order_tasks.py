@@ -12,10 +12,10 @@ from datetime import datetime, timezone
 from typing import Dict, Any
 
 from app.tasks.celery_app import celery_app
-from app.config.database import get_database
 from app.services.order_monitor import get_order_monitor
 from app.services.position_tracker import get_position_tracker, PositionTrackerService
 from app.utils.logger import get_logger
+from app.utils.worker_runtime import get_worker_database, run_async
 
 logger = get_logger(__name__)
 
@@ -32,17 +32,15 @@ def monitor_order_task(self: Task, order_id: str) -> Dict[str, Any]:
         Dict with monitoring result
     """
     try:
-        import asyncio
-        
         # Get database
-        db = asyncio.run(get_database())
+        db = get_worker_database()
         
         # Get order monitor
         async def monitor():
             monitor_service = await get_order_monitor(db)
             return await monitor_service.monitor_order(order_id)
         
-        result = asyncio.run(monitor())
+        result = run_async(monitor())
         
         logger.info(f"Order {order_id} monitored: {result.get('status')}")
         
@@ -74,17 +72,15 @@ def monitor_user_orders_task(self: Task, user_id: str) -> Dict[str, Any]:
         Dict with monitoring results
     """
     try:
-        import asyncio
-        
         # Get database
-        db = asyncio.run(get_database())
+        db = get_worker_database()
         
         # Get order monitor
         async def monitor():
             monitor_service = await get_order_monitor(db)
             return await monitor_service.monitor_user_orders(user_id)
         
-        result = asyncio.run(monitor())
+        result = run_async(monitor())
         
         logger.info(f"User {user_id} orders monitored: {result.get('total_orders')} orders")
         
@@ -114,17 +110,15 @@ def monitor_all_orders_task(self: Task) -> Dict[str, Any]:
         Dict with monitoring results
     """
     try:
-        import asyncio
-        
         # Get database
-        db = asyncio.run(get_database())
+        db = get_worker_database()
         
         # Get order monitor
         async def monitor():
             monitor_service = await get_order_monitor(db)
             return await monitor_service.monitor_all_open_orders()
         
-        result = asyncio.run(monitor())
+        result = run_async(monitor())
         
         logger.info(
             f"All orders monitored: {result.get('total_orders')} orders, "
@@ -153,17 +147,15 @@ def monitor_position_task(self: Task, position_id: str) -> Dict[str, Any]:
         Dict with monitoring result
     """
     try:
-        import asyncio
-        
         # Get database
-        db = asyncio.run(get_database())
+        db = get_worker_database()
         
         # Get position tracker
         async def monitor():
             tracker_service = await get_position_tracker(db)
             return await tracker_service.monitor_position(position_id)
         
-        result = asyncio.run(monitor())
+        result = run_async(monitor())
         
         logger.info(f"Position {position_id} monitored: {result.get('unrealized_pnl')}")
         
@@ -193,17 +185,15 @@ def monitor_all_positions_task(self: Task) -> Dict[str, Any]:
         Dict with monitoring results
     """
     try:
-        import asyncio
-        
         # Get database
-        db = asyncio.run(get_database())
+        db = get_worker_database()
         
         # Get position tracker
         async def monitor():
             tracker_service = await get_position_tracker(db)
             return await tracker_service.monitor_all_positions()
         
-        result = asyncio.run(monitor())
+        result = run_async(monitor())
         
         logger.info(
             f"All positions monitored: {result.get('total_positions')} positions, "
@@ -238,10 +228,8 @@ def update_position_price_task(
     """
     try:
         from decimal import Decimal
-        import asyncio
-        
         # Get database
-        db = asyncio.run(get_database())
+        db = get_worker_database()
         
         # Get position tracker
         async def update():
@@ -251,7 +239,7 @@ def update_position_price_task(
                 Decimal(str(current_price))
             )
         
-        result = asyncio.run(update())
+        result = run_async(update())
         
         return result
     
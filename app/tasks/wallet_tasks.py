@@ -10,17 +10,16 @@ Author: Moniqo Team
 Last Updated: 2025-11-22
 """
 
-import asyncio
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any
 from celery import Task
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.tasks.celery_app import celery_app
 from app.config.settings import get_settings
-from app.config.database import get_database
 from app.modules.user_wallets import service
 from app.utils.logger import get_logger
+from app.utils.worker_runtime import get_worker_database, run_async
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -32,31 +31,10 @@ def get_async_db() -> AsyncIOMotorDatabase:
     """
     Get async database connection for Celery tasks.
     
-    Note: Can't use FastAPI's Depends in Celery tasks,
-    so we create connection directly.
+    Note: Can't use FastAPI's Depends in Celery tasks, so this returns
+    the worker process's shared database (one pool per process).
     """
-    client = AsyncIOMotorClient(settings.MONGODB_URL)
-    db = client[settings.MONGODB_DB_NAME]
-    return db
-
-
-def run_async(coro):
-    """
-    Run async function in sync context (Celery tasks are sync).
-    
-    Args:
-        coro: Async coroutine to run
-        
-    Returns:
-        Result of coroutine
-    """
-    loop = asyncio.get_event_loop()
-    if loop.is_running():
-        # Create new loop if current one is running
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    
-    return loop.run_until_complete(coro)
+    return get_worker_database()
 
 
 # ==================== TASKS ====================
@@ -7,17 +7,72 @@ Author: Moniqo Team
 Last Updated: 2025-11-22
 """
 
+import asyncio
+import functools
+import hashlib
+import inspect
+import time
+import orjson
 import redis.asyncio as redis
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Set
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
 from app.config.settings import get_settings
 from app.utils.logger import get_logger
+from app.utils.metrics import get_metrics_registry
+from app.utils.pool_stats import InstrumentedConnectionPool
+from app.utils.profiling import record_timing
 
 logger = get_logger(__name__)
 
+# Candle interval lengths in seconds (for interval-derived cache TTLs)
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "3m": 180,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "2h": 7200,
+    "4h": 14400,
+    "6h": 21600,
+    "8h": 28800,
+    "12h": 43200,
+    "1d": 86400,
+    "3d": 259200,
+    "1w": 604800,
+    "1M": 2592000,
+}
+
+# Cache lookups by cache and result (hit rate = hit / all)
+CACHE_REQUESTS = get_metrics_registry().counter(
+    "cache_requests_total", "Cache lookups by cache and result", ("cache", "result")
+)
+_REDIS_HIT = CACHE_REQUESTS.labels("redis", "hit")
+_REDIS_MISS = CACHE_REQUESTS.labels("redis", "miss")
+_REDIS_ERROR = CACHE_REQUESTS.labels("redis", "error")
+_ROUTE_RESULTS = {status: CACHE_REQUESTS.labels("route", status.lower()) for status in ("HIT", "STALE", "MISS")}
+
+# Route cache keys currently being revalidated in the background
+_revalidating: Set[str] = set()
+# Background revalidation tasks (kept referenced until done)
+_revalidation_tasks: Set[asyncio.Task] = set()
+
 # Global Redis client instance
 _redis_client: Optional[redis.Redis] = None
 
 
+class _TimedRedis(redis.Redis):
+    """Redis client that reports command time to the request's Server-Timing."""
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            record_timing("redis", time.perf_counter() - started)
+
+
 async def get_redis_client() -> redis.Redis:
     """
     Get or create Redis client instance.
@@ -36,12 +91,17 @@ async def get_redis_client() -> redis.Redis:
         settings = get_settings()
         
         try:
-            _redis_client = redis.from_url(
+            # Bounded pool sized from settings; the client owns and closes it
+            pool = InstrumentedConnectionPool.from_url(
                 settings.REDIS_URL,
+                max_connections=getattr(settings, "REDIS_MAX_CONNECTIONS", 50),
+                timeout=getattr(settings, "REDIS_POOL_TIMEOUT_SECONDS", 5.0),
+                socket_timeout=getattr(settings, "REDIS_SOCKET_TIMEOUT_SECONDS", 10.0),
+                socket_connect_timeout=getattr(settings, "REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS", 5.0),
                 decode_responses=True,
-                socket_connect_timeout=5,
                 socket_keepalive=True
             )
+            _redis_client = _TimedRedis.from_pool(pool)
             
             # Test connection
             await _redis_client.ping()
@@ -55,6 +115,11 @@ async def get_redis_client() -> redis.Redis:
     return _redis_client
 
 
+def get_redis_pool() -> Optional[redis.ConnectionPool]:
+    """Connection pool of the shared Redis client (None if not created yet)."""
+    return _redis_client.connection_pool if _redis_client is not None else None
+
+
 async def close_redis_client():
     """Close Redis client connection"""
     global _redis_client
@@ -108,8 +173,13 @@ async def get_cache(key: str, default=None):
     try:
         redis_client = await get_redis_client()
         value = await redis_client.get(key)
-        return value if value is not None else default
+        if value is None:
+            _REDIS_MISS.inc()
+            return default
+        _REDIS_HIT.inc()
+        return value
     except Exception as e:
+        _REDIS_ERROR.inc()
         logger.error(f"Failed to get cache key {key}: {str(e)}")
         return default
 
@@ -197,6 +267,25 @@ async def get_cache_ttl(key: str) -> Optional[int]:
         return None
 
 
+def interval_ttl(interval: Optional[str], min_ttl: int = 2, max_ttl: int = 300) -> int:
+    """
+    Derive a cache TTL from a candle interval.
+    
+    The last candle keeps changing until it closes, so data is cached for
+    1/60th of the interval (a 1h chart for 60s), clamped to [min_ttl, max_ttl].
+    
+    Args:
+        interval: Candle interval like "1m", "1h", "1d"
+        min_ttl: Lower bound in seconds
+        max_ttl: Upper bound in seconds
+        
+    Returns:
+        TTL in seconds
+    """
+    seconds = INTERVAL_SECONDS.get(interval or "", 3600)
+    return max(min_ttl, min(max_ttl, seconds // 60))
+
+
 class CacheManager:
     """
     Simple cache manager for common caching patterns.
@@ -205,6 +294,12 @@ class CacheManager:
         cache = CacheManager(prefix="user")
         await cache.set("123", {"name": "Alice"}, ttl=3600)
         user = await cache.get("123")
+        
+        # Route-level response cache with ETag/304 support
+        @router.get("/ohlc/{symbol}")
+        @cache.cached_route(ttl_param="interval", stale_ttl=30)
+        async def get_ohlc(symbol: str, interval: str = "1h"):
+            ...
     """
     
     def __init__(self, prefix: str = ""):
@@ -239,3 +334,111 @@ class CacheManager:
     async def ttl(self, key: str) -> Optional[int]:
         """Get remaining TTL"""
         return await get_cache_ttl(self._make_key(key))
+    
+    async def _store_route(self, key: str, result: Any, ttl: int, stale_ttl: int) -> Dict[str, Any]:
+        """Serialize a route result and store it with its ETag."""
+        body = orjson.dumps(jsonable_encoder(result)).decode()
+        entry = {
+            "body": body,
+            "etag": f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"',
+            "stored_at": time.time(),
+            "ttl": ttl,
+        }
+        await self.set(key, orjson.dumps(entry).decode(), ttl=ttl + stale_ttl)
+        return entry
+    
+    async def _revalidate_route(self, key: str, func: Callable, kwargs: Dict[str, Any], ttl: int, stale_ttl: int):
+        """Recompute a stale route entry in the background (single-flight per key)."""
+        try:
+            await self._store_route(key, await func(**kwargs), ttl, stale_ttl)
+        except Exception as e:
+            logger.warning(f"Background revalidation failed for {key}: {str(e)}")
+        finally:
+            _revalidating.discard(key)
+    
+    def cached_route(
+        self,
+        ttl: int = 60,
+        ttl_param: Optional[str] = None,
+        stale_ttl: int = 0,
+    ) -> Callable:
+        """
+        Cache a public GET endpoint's response in Redis.
+        
+        - Fresh entries are served directly; entries within ``stale_ttl``
+          past expiry are served immediately while one background task
+          recomputes them (stale-while-revalidate).
+        - Responses carry a strong ETag; a matching ``If-None-Match``
+          returns ``304 Not Modified`` with no body.
+        - ``Cache-Control: public, max-age, stale-while-revalidate`` lets a
+          CDN or browser absorb polling.
+        
+        Errors (HTTPException) are never cached. Place the decorator below
+        ``@router.get`` so FastAPI sees the wrapped signature.
+        
+        Args:
+            ttl: Fresh lifetime in seconds when no interval is given
+            ttl_param: Endpoint parameter holding a candle interval to derive the TTL from
+            stale_ttl: Extra seconds a stale entry may be served while revalidating
+        """
+        def decorator(func: Callable) -> Callable:
+            signature = inspect.signature(func)
+            params = list(signature.parameters.values())
+            params.append(inspect.Parameter(
+                "_cache_request",
+                inspect.Parameter.KEYWORD_ONLY,
+                annotation=Request,
+            ))
+            
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request: Request = kwargs.pop("_cache_request")
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                call_kwargs = dict(bound.arguments)
+                
+                fresh_ttl = interval_ttl(call_kwargs.get(ttl_param)) if ttl_param else ttl
+                key = generate_cache_key(f"route:{func.__name__}", **call_kwargs)
+                
+                entry = None
+                status = "MISS"
+                cached = await self.get(key)
+                if cached:
+                    try:
+                        entry = orjson.loads(cached)
+                    except orjson.JSONDecodeError:
+                        entry = None
+                
+                if entry is not None:
+                    age = time.time() - entry["stored_at"]
+                    if age < entry["ttl"]:
+                        status = "HIT"
+                    else:
+                        status = "STALE"
+                        if key not in _revalidating:
+                            _revalidating.add(key)
+                            task = asyncio.create_task(
+                                self._revalidate_route(key, func, call_kwargs, fresh_ttl, stale_ttl)
+                            )
+                            _revalidation_tasks.add(task)
+                            task.add_done_callback(_revalidation_tasks.discard)
+                else:
+                    entry = await self._store_route(key, await func(**call_kwargs), fresh_ttl, stale_ttl)
+                    age = 0.0
+                _ROUTE_RESULTS[status].inc()
+                
+                max_age = max(0, int(entry["ttl"] - age))
+                headers = {
+                    "ETag": entry["etag"],
+                    "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate={stale_ttl}",
+                    "X-Cache": status,
+                }
+                if_none_match = request.headers.get("if-none-match", "")
+                if entry["etag"] in [tag.strip() for tag in if_none_match.split(",")]:
+                    return Response(status_code=304, headers=headers)
+                return Response(content=entry["body"], media_type="application/json", headers=headers)
+            
+            wrapper.__signature__ = signature.replace(parameters=params)
+            return wrapper
+        
+        return decorator
@@ -2,15 +2,219 @@
 Logging configuration for the application.
 
 Sets up logging with file rotation and appropriate levels for different environments.
+
+Keeps logging off the event loop's critical path:
+- ``LOG_QUEUE_ENABLED``: handlers run on a ``QueueListener`` thread behind a
+  ``QueueHandler``; the caller only merges the message and enqueues it.
+- ``LOG_FORMAT=json``: ``JSONFormatter`` writes one orjson object per line.
+- ``LOG_RATE_LIMIT_BURST``: ``RateLimitFilter`` caps repeated warnings per
+  call site and reports how many were suppressed.
+- ``LOG_DEBUG_SAMPLE_EVERY``: ``DebugSamplingFilter`` keeps one in N debug
+  records per call site (debug lines inside per-position/per-price loops).
 """
 
+import atexit
 import logging
+import os
+import queue
 import sys
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import orjson
+
 from app.config.settings import settings
 
 
+# Standard LogRecord attributes (anything else was passed via ``extra=``)
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, encoded with orjson."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "func": record.funcName,
+            "line": record.lineno,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most ``burst`` WARNING records per call site through every
+    ``window`` seconds. ERROR and CRITICAL records are never dropped.
+
+    Call sites are keyed by logger and line, so a warning built with an
+    f-string still counts as one repeated message. The first record after a
+    window with suppressions gets a "(suppressed N similar)" suffix.
+    """
+
+    def __init__(self, burst: int = 10, window_seconds: float = 60.0, level: int = logging.WARNING):
+        super().__init__()
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self.level = level
+        # (logger, line) -> [window start, passed, suppressed]
+        self._sites: Dict[Tuple[str, int], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != self.level or self.burst <= 0:
+            return True
+        key = (record.name, record.lineno)
+        now = record.created
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window_seconds:
+                suppressed = int(site[2]) if site is not None else 0
+                self._sites[key] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.getMessage()} (suppressed {suppressed} similar in the last {self.window_seconds:g}s)"
+                    record.args = None
+                return True
+            if site[1] < self.burst:
+                site[1] += 1
+                return True
+            site[2] += 1
+            return False
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Keeps the first of every ``every`` DEBUG records per call site."""
+
+    def __init__(self, every: int = 1):
+        super().__init__()
+        self.every = max(1, int(every))
+        self._counts: Dict[Tuple[str, int], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.DEBUG or self.every == 1:
+            return True
+        key = (record.name, record.lineno)
+        # A lost increment under a race only shifts which record is kept
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+class _OffloadingQueueHandler(QueueHandler):
+    """
+    ``QueueHandler`` that leaves formatting to the listener thread.
+
+    The stock ``prepare`` formats the whole record (including tracebacks)
+    in the caller. Here the caller only merges ``msg % args`` so mutable
+    arguments are captured as they were; the handlers behind the listener
+    format and write.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Queue handlers whose listener threads are running (stopped at shutdown to flush)
+_queue_handlers: List[QueueHandler] = []
+
+
+def start_queue_logging(
+    handlers: Iterable[logging.Handler],
+    filters: Iterable[logging.Filter] = (),
+) -> QueueHandler:
+    """
+    Run ``handlers`` on a background listener thread.
+
+    Args:
+        handlers: Handlers that format and write (console, file, ...)
+        filters: Filters applied in the caller before a record is queued
+
+    Returns:
+        The handler to attach to loggers in place of ``handlers``
+    """
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _OffloadingQueueHandler(log_queue)
+    for log_filter in filters:
+        queue_handler.addFilter(log_filter)
+    queue_handler.listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    queue_handler.listener.start()
+    _queue_handlers.append(queue_handler)
+    return queue_handler
+
+
+def stop_queue_logging(handler: Optional[logging.Handler] = None) -> None:
+    """
+    Flush and stop the listener behind ``handler`` (all listeners if None).
+
+    Registered with ``atexit`` so queued records are written on shutdown.
+    """
+    if handler is not None:
+        handlers = [handler] if handler in _queue_handlers else []
+    else:
+        handlers = list(_queue_handlers)
+    for queue_handler in handlers:
+        _queue_handlers.remove(queue_handler)
+        try:
+            queue_handler.listener.stop()
+        except Exception:
+            pass
+
+
+def _restart_queue_logging_in_child() -> None:
+    """
+    Give a forked child (Celery prefork worker, sweep process pool) its own
+    listener threads.
+
+    Threads don't survive ``fork``: without this the child keeps enqueueing
+    into a copy of the parent's queue that nothing reads. Records the parent
+    had queued but not written yet are dropped rather than written twice.
+    """
+    for queue_handler in _queue_handlers:
+        listener = queue_handler.listener
+        queue_handler.queue = listener.queue = queue.SimpleQueue()
+        listener._thread = None
+        listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_queue_logging_in_child)
+atexit.register(stop_queue_logging)
+
+
+def build_filters(
+    rate_limit_burst: int = 0,
+    rate_limit_window_seconds: float = 60.0,
+    debug_sample_every: int = 1,
+) -> List[logging.Filter]:
+    """Rate limiting / debug sampling filters (empty when both are off)."""
+    filters: List[logging.Filter] = []
+    if rate_limit_burst > 0:
+        filters.append(RateLimitFilter(rate_limit_burst, rate_limit_window_seconds))
+    if debug_sample_every > 1:
+        filters.append(DebugSamplingFilter(debug_sample_every))
+    return filters
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default) if settings else default
+
+
 def setup_logging() -> logging.Logger:
     """
     Configure application logging.
@@ -47,11 +251,14 @@ def setup_logging() -> logging.Logger:
         datefmt="%Y-%m-%d %H:%M:%S"
     )
     
+    if _setting("LOG_FORMAT", "text") == "json":
+        detailed_formatter = simple_formatter = JSONFormatter()
+
     # Console handler (stdout)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(simple_formatter)
-    logger.addHandler(console_handler)
+    handlers: List[logging.Handler] = [console_handler]
     
     # File handler with rotation
     if settings:
@@ -68,10 +275,26 @@ def setup_logging() -> logging.Logger:
             )
             file_handler.setLevel(log_level)
             file_handler.setFormatter(detailed_formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
             
         except Exception as e:
             logger.warning(f"Failed to setup file logging: {str(e)}")
+
+    filters = build_filters(
+        _setting("LOG_RATE_LIMIT_BURST", 10),
+        _setting("LOG_RATE_LIMIT_WINDOW_SECONDS", 60),
+        _setting("LOG_DEBUG_SAMPLE_EVERY", 1),
+    )
+
+    # Filters sit on the handlers: logger-level filters don't apply to
+    # records propagated from the "moniqo.<module>" child loggers
+    if _setting("LOG_QUEUE_ENABLED", True):
+        logger.addHandler(start_queue_logging(handlers, filters))
+    else:
+        for handler in handlers:
+            for log_filter in filters:
+                handler.addFilter(log_filter)
+            logger.addHandler(handler)
     
     # Set third-party loggers to WARNING to reduce noise
     logging.getLogger("motor").setLevel(logging.WARNING)
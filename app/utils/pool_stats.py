@@ -0,0 +1,261 @@
+"""
+Connection Pool Telemetry
+
+Counters for the MongoDB (Motor/PyMongo) and Redis connection pools, so
+pool sizes and timeouts can be tuned from data rather than guessed.
+
+- MongoDB: a PyMongo ``ConnectionPoolListener`` registered on every client
+  built by ``app.config.database.create_mongo_client`` counts connections
+  created/closed, current check-outs, check-out failures and the time spent
+  waiting for a connection.
+- Redis: ``InstrumentedConnectionPool`` is a bounded ``ConnectionPool`` that
+  counts connections created and the time callers waited for one.
+
+``get_pool_stats()`` returns a snapshot of both for the process it runs in
+(API or Celery worker); the same numbers are exported at ``/metrics``.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from pymongo import monitoring
+from redis.asyncio import ConnectionPool
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.utils.metrics import get_metrics_registry
+
+
+class MongoPoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Aggregates PyMongo connection pool events.
+
+    Events fire on the driver's worker threads, so counters are guarded by
+    a lock. Check-out start times are kept per thread: a check-out starts
+    and completes on the same thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all counters."""
+        with self._lock:
+            self.pools = 0
+            self.created = 0
+            self.closed = 0
+            self.checked_out = 0
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.checkout_timeouts = 0
+            self.pool_cleared = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+    def _wait_started(self) -> None:
+        self._local.started = time.perf_counter()
+
+    def _wait_finished(self) -> float:
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return time.perf_counter() - started if started is not None else 0.0
+
+    # Pool events
+
+    def pool_created(self, event):
+        with self._lock:
+            self.pools += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_cleared += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self.pools = max(self.pools - 1, 0)
+
+    # Connection events
+
+    def connection_created(self, event):
+        with self._lock:
+            self.created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.closed += 1
+
+    def connection_check_out_started(self, event):
+        self._wait_started()
+
+    def connection_check_out_failed(self, event):
+        waited = self._wait_finished()
+        with self._lock:
+            self.checkout_failures += 1
+            if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+                self.checkout_timeouts += 1
+            self.wait_seconds_total += waited
+
+    def connection_checked_out(self, event):
+        waited = self._wait_finished()
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current counters as a plain dict."""
+        with self._lock:
+            return {
+                "pools": self.pools,
+                "connections_open": self.created - self.closed,
+                "connections_created": self.created,
+                "connections_closed": self.closed,
+                "checked_out": self.checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checkout_timeouts": self.checkout_timeouts,
+                "pool_cleared": self.pool_cleared,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+class InstrumentedConnectionPool(ConnectionPool):
+    """
+    Bounded Redis pool that records connection waits.
+
+    When all ``max_connections`` are in use, callers wait up to ``timeout``
+    seconds for one to be released instead of failing immediately with
+    "Too many connections". Unlike redis-py's ``BlockingConnectionPool``
+    the wait lock is not held while a new connection is being opened.
+    """
+
+    def __init__(self, *args, timeout: Optional[float] = 5.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timeout = timeout
+        self._released = asyncio.Condition()
+        self.created = 0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def make_connection(self):
+        self.created += 1
+        return super().make_connection()
+
+    async def get_connection(self, command_name, *keys, **options):
+        if not self.can_get_connection():
+            started = time.perf_counter()
+            try:
+                async with self._released:
+                    # Re-check after every wake-up: another task may have
+                    # taken the released connection first
+                    while not self.can_get_connection():
+                        remaining = None
+                        if self.timeout is not None:
+                            remaining = self.timeout - (time.perf_counter() - started)
+                            if remaining <= 0:
+                                raise asyncio.TimeoutError()
+                        await asyncio.wait_for(self._released.wait(), remaining)
+            except asyncio.TimeoutError as e:
+                self.checkout_timeouts += 1
+                raise RedisConnectionError("No connection available.") from e
+            finally:
+                waited = time.perf_counter() - started
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        # Claims a connection before its first await, so the slot found
+        # above can't be taken in between
+        connection = await super().get_connection(command_name, *keys, **options)
+        self.checkouts += 1
+        return connection
+
+    async def release(self, connection):
+        await super().release(connection)
+        async with self._released:
+            self._released.notify()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current counters as a plain dict."""
+        return {
+            "max_connections": self.max_connections,
+            "connections_created": self.created,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+
+
+# Singleton instance
+_mongo_pool_monitor: Optional[MongoPoolMonitor] = None
+
+
+def get_mongo_pool_monitor() -> MongoPoolMonitor:
+    """Get the process-wide MongoDB pool listener."""
+    global _mongo_pool_monitor
+    if _mongo_pool_monitor is None:
+        _mongo_pool_monitor = MongoPoolMonitor()
+    return _mongo_pool_monitor
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Snapshot of this process's connection pools.
+
+    Returns:
+        {"mongodb": {...}, "redis": {...} or None if Redis isn't connected}
+    """
+    from app.utils.cache import get_redis_pool
+
+    redis_pool = get_redis_pool()
+    return {
+        "mongodb": get_mongo_pool_monitor().snapshot(),
+        "redis": redis_pool.snapshot() if isinstance(redis_pool, InstrumentedConnectionPool) else None,
+    }
+
+
+# Counters in the snapshots (exported as Prometheus counters, the rest as gauges)
+_CUMULATIVE_KEYS = {
+    "connections_created",
+    "connections_closed",
+    "checkouts",
+    "checkout_failures",
+    "checkout_timeouts",
+    "pool_cleared",
+    "wait_seconds_total",
+}
+
+
+def collect_pool_metrics():
+    """``/metrics`` collector: one family per pool stat."""
+    for pool, stats in get_pool_stats().items():
+        for key, value in (stats or {}).items():
+            if key in _CUMULATIVE_KEYS:
+                name = f"{pool}_pool_{key}" if key.endswith("_total") else f"{pool}_pool_{key}_total"
+                yield name, f"{pool} pool {key.replace('_', ' ')}", "counter", [({}, value)]
+            else:
+                yield f"{pool}_pool_{key}", f"{pool} pool {key.replace('_', ' ')}", "gauge", [({}, value)]
+
+
+get_metrics_registry().register_collector(collect_pool_metrics)
@@ -0,0 +1,297 @@
+"""
+Profiling Hooks
+
+Answers "where did the time go?" for a slow API call or Celery task:
+
+- Per-request I/O timing: ``record_timing(category, seconds)`` adds to the
+  current request's (or task's) ``RequestTimings`` through a context
+  variable. MongoDB (command listener), Redis (client), Binance REST and
+  LLM calls report here; ``ServerTimingMiddleware`` turns the totals into
+  a ``Server-Timing`` header. Time not spent in those categories is
+  reported as ``app`` (Python CPU: validation, Decimal math, ...). Overlapping
+  calls (``asyncio.gather``) are summed, so categories can exceed ``total``.
+- Sampling profiler: ``SamplingProfiler`` samples thread stacks from a
+  background thread and renders collapsed stacks (``a;b;c count``), the
+  input format of flamegraph.pl and speedscope. The admin endpoint in
+  ``app.modules.diagnostics`` runs it for N seconds or N requests.
+- Celery: ``task_started``/``task_finished`` (wired to Celery signals) log
+  an I/O breakdown for slow tasks and optionally profile selected tasks to
+  ``PROFILER_OUTPUT_DIR``.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config.settings import get_settings
+
+# Same logger get_logger() returns; app.config.database imports this module
+# while app.utils.logger can still be initializing
+logger = logging.getLogger(f"moniqo.{__name__}")
+
+# I/O categories reported in Server-Timing (in header order)
+TIMING_CATEGORIES = ("mongodb", "redis", "binance", "llm")
+
+
+class RequestTimings:
+    """Accumulated I/O time per category for one request or task."""
+
+    __slots__ = ("started", "durations", "counts", "_lock")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        # MongoDB events arrive on driver threads
+        self._lock = threading.Lock()
+
+    def add(self, category: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[category] = self.durations.get(category, 0.0) + seconds
+            self.counts[category] = self.counts.get(category, 0) + 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def breakdown(self) -> Dict[str, float]:
+        """Milliseconds per category plus ``app`` (remainder) and ``total``."""
+        total = self.elapsed()
+        with self._lock:
+            durations = dict(self.durations)
+        result = {category: round(seconds * 1000, 2) for category, seconds in durations.items()}
+        result["app"] = round(max(0.0, total - sum(durations.values())) * 1000, 2)
+        result["total"] = round(total * 1000, 2)
+        return result
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value."""
+        breakdown = self.breakdown()
+        parts = []
+        for category in (*TIMING_CATEGORIES, *sorted(set(self.durations) - set(TIMING_CATEGORIES))):
+            if category in breakdown:
+                parts.append(f'{category};dur={breakdown[category]};desc="{self.counts[category]} calls"')
+        parts.append(f"app;dur={breakdown['app']}")
+        parts.append(f"total;dur={breakdown['total']}")
+        return ", ".join(parts)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record_timing(category: str, seconds: float) -> None:
+    """Add I/O time to the current request/task (no-op outside one)."""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(category, seconds)
+
+
+def begin_timings() -> Tuple[RequestTimings, Token]:
+    """Start collecting timings in the current context."""
+    timings = RequestTimings()
+    return timings, _current_timings.set(timings)
+
+
+def end_timings(token: Token) -> None:
+    """Stop collecting timings (restores the previous context value)."""
+    _current_timings.reset(token)
+
+
+# ==================== SAMPLING PROFILER ====================
+
+class SamplingProfiler:
+    """
+    Wall-clock stack sampler.
+
+    A daemon thread snapshots ``sys._current_frames()`` every ``interval``
+    seconds and counts collapsed stacks for the target threads (all other
+    threads if none are given). Sampling costs only the sampler thread's
+    time and a brief GIL hold per sample.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_ids: Optional[Iterable[int]] = None):
+        self.interval = interval
+        self.thread_ids = set(thread_ids) if thread_ids else None
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._labels: Dict[object, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            for marker in (f"{os.sep}app{os.sep}", f"site-packages{os.sep}", f"lib{os.sep}python"):
+                index = filename.rfind(marker)
+                if index >= 0:
+                    filename = filename[index + 1:]
+                    break
+            label = self._labels[code] = f"{code.co_name} ({filename})"
+        return label
+
+    def _collapse(self, frame) -> str:
+        stack: List[str] = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        return ";".join(stack)
+
+    def sample(self) -> None:
+        """Take one sample of the target threads."""
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                continue
+            self.samples[self._collapse(frame)] += 1
+        self.sample_count += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> str:
+        """Stop sampling and return the collapsed stacks."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text, one ``frame;frame;frame count`` per line."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+# One API profiling session at a time
+_active_session: Optional["ProfileSession"] = None
+
+
+class ProfileSession:
+    """A profiler run bounded by time and/or a number of finished requests."""
+
+    def __init__(self, profiler: SamplingProfiler, requests: Optional[int]):
+        self.profiler = profiler
+        self.requests_remaining = requests
+        self.done = asyncio.Event()
+
+    def request_finished(self) -> None:
+        if self.requests_remaining is not None:
+            self.requests_remaining -= 1
+            if self.requests_remaining <= 0:
+                self.done.set()
+
+
+def profiler_busy() -> bool:
+    return _active_session is not None
+
+
+def note_request_finished() -> None:
+    """Called by the middleware after each HTTP request."""
+    if _active_session is not None:
+        _active_session.request_finished()
+
+
+async def profile_api(
+    seconds: float,
+    requests: Optional[int] = None,
+    all_threads: bool = False,
+    interval: Optional[float] = None,
+) -> Tuple[str, int]:
+    """
+    Profile the running API process.
+
+    Samples the event loop thread (or every thread, including the Motor
+    executor) until ``seconds`` pass or ``requests`` requests finish.
+
+    Returns:
+        (collapsed stacks, number of samples)
+    """
+    global _active_session
+    if _active_session is not None:
+        raise RuntimeError("A profiling session is already running")
+
+    if interval is None:
+        interval = getattr(get_settings(), "PROFILER_SAMPLE_INTERVAL_MS", 5) / 1000
+    thread_ids = None if all_threads else [threading.get_ident()]
+    session = _active_session = ProfileSession(SamplingProfiler(interval, thread_ids), requests)
+    session.profiler.start()
+    try:
+        if requests is None:
+            await asyncio.sleep(seconds)
+        else:
+            try:
+                await asyncio.wait_for(session.done.wait(), seconds)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        _active_session = None
+        collapsed = session.profiler.stop()
+    return collapsed, session.profiler.sample_count
+
+
+# ==================== CELERY HOOKS ====================
+
+# task_id -> (timings, context token, profiler)
+_task_state: Dict[str, Tuple[RequestTimings, Token, Optional[SamplingProfiler]]] = {}
+
+
+def _profiled_tasks() -> set:
+    value = getattr(get_settings(), "CELERY_PROFILE_TASKS", "") or ""
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def task_started(task_id: str, task_name: str) -> None:
+    """Celery ``task_prerun``: start timings (and the profiler if selected)."""
+    timings, token = begin_timings()
+    profiler = None
+    selected = _profiled_tasks()
+    if "*" in selected or task_name in selected:
+        interval = getattr(get_settings(), "PROFILER_SAMPLE_INTERVAL_MS", 5) / 1000
+        profiler = SamplingProfiler(interval, [threading.get_ident()]).start()
+    _task_state[task_id] = (timings, token, profiler)
+
+
+def task_finished(task_id: str, task_name: str) -> Optional[Dict[str, float]]:
+    """
+    Celery ``task_postrun``: log slow tasks and write the profile, if any.
+
+    Returns:
+        The task's timing breakdown in milliseconds
+    """
+    state = _task_state.pop(task_id, None)
+    if state is None:
+        return None
+    timings, token, profiler = state
+    end_timings(token)
+    breakdown = timings.breakdown()
+
+    slow_ms = getattr(get_settings(), "CELERY_SLOW_TASK_MS", 5000)
+    if breakdown["total"] >= slow_ms:
+        detail = ", ".join(f"{key}={value}ms" for key, value in breakdown.items() if key != "total")
+        logger.warning(f"Slow task {task_name} took {breakdown['total']}ms ({detail})")
+
+    if profiler is not None:
+        collapsed = profiler.stop()
+        output_dir = getattr(get_settings(), "PROFILER_OUTPUT_DIR", "logs/profiles")
+        os.makedirs(output_dir, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(output_dir, f"{task_name}-{stamp}-{task_id[:8]}.folded")
+        with open(path, "w") as f:
+            f.write(collapsed)
+        logger.info(f"Profile for {task_name} written to {path} ({profiler.sample_count} samples)")
+    return breakdown
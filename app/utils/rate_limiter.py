@@ -0,0 +1,75 @@
+"""
+Async Rate Limiter
+
+Token-bucket rate limiting for outbound HTTP calls, shared per host so
+every client instance and concurrent task in the process draws from the
+same budget.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket limiter.
+
+    Usage:
+        limiter = get_host_rate_limiter("www.reddit.com", rate_per_minute=30)
+        await limiter.acquire()
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        """
+        Initialize limiter.
+
+        Args:
+            rate_per_minute: Sustained request rate
+            burst: Requests allowed back to back before throttling
+        """
+        self.rate_per_second = max(rate_per_minute, 0.001) / 60.0
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+
+    def pause(self, seconds: float) -> None:
+        """Block all requests for ``seconds`` (e.g. after a 429 Retry-After)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+# Shared limiters by host
+_host_limiters: Dict[str, AsyncRateLimiter] = {}
+
+
+def get_host_rate_limiter(host: str, rate_per_minute: float, burst: int = 1) -> AsyncRateLimiter:
+    """Get the process-wide limiter for a host (created on first use)."""
+    limiter: Optional[AsyncRateLimiter] = _host_limiters.get(host)
+    if limiter is None:
+        limiter = AsyncRateLimiter(rate_per_minute, burst)
+        _host_limiters[host] = limiter
+    return limiter
@@ -0,0 +1,98 @@
+"""
+Record Decoding Helpers
+
+Shared pieces of the typed repository layer. Repositories read raw Motor
+documents with a projection and decode each one once into a ``__slots__``
+record, instead of validating a full Beanie/Pydantic model (or trying
+Beanie first and falling back to a raw query).
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from app.config.settings import get_settings
+
+ZERO = Decimal("0")
+
+
+def projection(fields: Iterable[str]) -> Dict[str, int]:
+    """Build a Mongo inclusion projection (``_id`` is always returned)."""
+    return {field: 1 for field in fields}
+
+
+def to_object_id(value: Any) -> Optional[ObjectId]:
+    """ObjectId from an ObjectId or hex string, None if it isn't one."""
+    if isinstance(value, ObjectId):
+        return value
+    try:
+        return ObjectId(str(value))
+    except (InvalidId, TypeError):
+        return None
+
+
+def to_decimal(value: Any, default: Decimal = ZERO) -> Decimal:
+    """Decimal from a stored number (float, int, str, Decimal128)."""
+    if value is None:
+        return default
+    if isinstance(value, Decimal):
+        return value
+    if hasattr(value, "to_decimal"):
+        return value.to_decimal()
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return default
+
+
+def to_float(value: Any, default: float = 0.0) -> float:
+    """float from a stored number (float, int, str, Decimal, Decimal128)."""
+    if value is None:
+        return default
+    if hasattr(value, "to_decimal"):
+        value = value.to_decimal()
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def to_utc(value: Any) -> Optional[datetime]:
+    """Timezone-aware datetime (Mongo returns naive UTC), None otherwise."""
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def cursor_batch_size(batch_size: Optional[int] = None) -> int:
+    """Documents per cursor round trip for streamed monitoring reads."""
+    return int(batch_size or getattr(get_settings(), "MONITOR_CURSOR_BATCH_SIZE", 200))
+
+
+def documents_initialized(document_cls: Any) -> bool:
+    """True once ``init_beanie`` has registered a Beanie document class."""
+    return getattr(document_cls, "_document_settings", None) is not None
+
+
+class Record:
+    """
+    Base for ``__slots__`` records.
+
+    Subclasses declare ``__slots__`` and a ``from_doc`` classmethod that
+    decodes a raw document in one pass.
+    """
+
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Field values by slot name."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
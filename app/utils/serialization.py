@@ -0,0 +1,68 @@
+"""
+Fast JSON Serialization
+
+orjson-based encoding shared by API responses (``ORJSONResponse``) and
+Celery messages (the ``orjson`` kombu serializer).
+
+orjson handles ``datetime``, ``date``, ``UUID``, ``Enum``, dataclasses and
+NumPy arrays natively; ``default`` hooks cover the rest of what our
+documents carry (``ObjectId``, ``Decimal``, Pydantic models, sets). That
+replaces walking large execution documents in Python before encoding.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from pydantic import BaseModel
+
+# Options for every dumps(): non-str dict keys (int buckets, Enum keys) and NumPy values
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Responses: "Z" suffix for UTC datetimes, matching Pydantic's JSON output
+RESPONSE_OPTIONS = JSON_OPTIONS | orjson.OPT_UTC_Z
+
+
+def _common_default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def response_default(value: Any) -> Any:
+    """orjson ``default`` for API responses: ``Decimal`` becomes a number."""
+    if isinstance(value, Decimal):
+        return float(value)
+    return _common_default(value)
+
+
+def message_default(value: Any) -> Any:
+    """orjson ``default`` for Celery messages: ``Decimal`` keeps its digits as a string."""
+    if isinstance(value, Decimal):
+        return str(value)
+    return _common_default(value)
+
+
+def dumps_response(content: Any) -> bytes:
+    """Encode an API response body."""
+    return orjson.dumps(content, default=response_default, option=RESPONSE_OPTIONS)
+
+
+def dumps_message(body: Any) -> str:
+    """Encode a Celery task or result body (text, like kombu's json serializer)."""
+    return orjson.dumps(body, default=message_default, option=JSON_OPTIONS).decode()
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from ``bytes``/``str`` (kombu may pass either)."""
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return orjson.loads(data)
@@ -0,0 +1,104 @@
+"""
+Worker Runtime
+
+Shared event loop and connection pools for Celery worker processes.
+
+Celery tasks are synchronous, and each used to start a fresh event loop
+and often a fresh ``AsyncIOMotorClient``, so every task paid for a new
+connection pool. Motor and redis.asyncio clients are bound to the loop
+they first run on, so workers keep one loop per process and reuse one
+MongoDB client (``create_mongo_client``, same settings as the API) and
+the shared Redis client (``get_redis_client``) across tasks.
+
+Usage:
+    from app.utils.worker_runtime import get_worker_database, run_async
+
+    db = get_worker_database()
+    result = run_async(service.do_work(db))
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+import asyncio
+import os
+from typing import Any, Coroutine, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from app.config import database
+from app.config.settings import get_settings
+from app.utils.cache import close_redis_client
+from app.utils.logger import get_logger
+from app.utils.pool_stats import get_pool_stats
+
+logger = get_logger(__name__)
+
+# Per-process loop and MongoDB client (pid-checked: pools don't survive fork)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_client: Optional[AsyncIOMotorClient] = None
+_pid: Optional[int] = None
+
+
+def _reset_after_fork() -> None:
+    global _loop, _client, _pid
+    if _pid != os.getpid():
+        _loop = None
+        _client = None
+        _pid = os.getpid()
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Get this process's long-lived event loop."""
+    global _loop
+    _reset_after_fork()
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def run_async(coro: Coroutine) -> Any:
+    """
+    Run a coroutine to completion on the worker loop.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        Result of the coroutine
+    """
+    return get_worker_loop().run_until_complete(coro)
+
+
+def get_worker_database() -> AsyncIOMotorDatabase:
+    """
+    Get the database for worker tasks.
+
+    Reuses the API's database if this process has connected one (e.g.
+    eager tasks), otherwise a per-process client built with the same
+    pool settings. The client connects lazily on first use.
+    """
+    global _client
+    if database._database is not None:
+        return database._database
+    _reset_after_fork()
+    settings = get_settings()
+    if _client is None:
+        _client = database.create_mongo_client(settings)
+        logger.info(f"Worker MongoDB pool created (pid {os.getpid()})")
+    return _client[settings.MONGODB_DB_NAME]
+
+
+def close_worker_pools() -> None:
+    """Log final pool stats and close this process's pools and loop."""
+    global _loop, _client
+    logger.info(f"Worker pool stats (pid {os.getpid()}): {get_pool_stats()}")
+    if _client is not None:
+        _client.close()
+        _client = None
+    if _loop is not None and not _loop.is_closed():
+        _loop.run_until_complete(close_redis_client())
+        _loop.close()
+        asyncio.set_event_loop(None)
+    _loop = None
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Repository decode benchmark.
+
+Encodes synthetic position, order and execution documents to BSON, then
+measures documents decoded per second the way the repositories read
+them: BSON decode plus ``Record.from_doc``, for full documents and for
+the projected fields the hot paths load. Executions are also decoded
+with the Pydantic ``Execution`` model the flow service builds, for
+comparison.
+
+Usage:
+    python -m benchmarks.repository_decode [--docs 50000]
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+import bson
+from bson import ObjectId
+
+from app.modules.flows.models import Execution
+from app.modules.flows.repository import SUMMARY_FIELDS, ExecutionRecord
+from app.modules.orders.repository import OrderRecord
+from app.modules.positions.repository import MONITOR_FIELDS, PositionRecord
+
+
+def _position(rng: random.Random, now: datetime) -> dict:
+    price = rng.uniform(20_000, 100_000)
+    amount = rng.uniform(0.001, 2)
+    return {
+        "_id": ObjectId(),
+        "user_id": ObjectId(),
+        "user_wallet_id": ObjectId(),
+        "flow_id": ObjectId(),
+        "symbol": "BTC/USDT",
+        "side": rng.choice(["long", "short"]),
+        "status": "open",
+        "entry": {
+            "order_id": ObjectId(),
+            "timestamp": now,
+            "price": price,
+            "amount": amount,
+            "value": price * amount,
+            "leverage": 1,
+            "margin_used": price * amount,
+            "fees": price * amount * 0.001,
+            "fee_currency": "USDT",
+            "ai_reasoning": "Momentum and funding align with the higher timeframe trend. " * 4,
+            "ai_confidence": rng.randint(50, 95),
+        },
+        "current": {
+            "price": price * 1.01,
+            "unrealized_pnl": price * amount * 0.01,
+            "unrealized_pnl_percent": 1.0,
+            "risk_level": "low",
+            "last_updated": now,
+        },
+        "risk_management": {"current_stop_loss": price * 0.97, "current_take_profit": price * 1.05},
+        "ai_monitoring": {
+            "last_signal": {"score": rng.uniform(-1, 1), "sources": [{"source": "reddit", "score": 0.2}] * 3},
+            "last_ai_review": {"timestamp": now, "result": {"recommendations": []}},
+        },
+        "statistics": {"max_profit": 1.2, "max_drawdown": 0.4},
+        "created_at": now,
+        "opened_at": now - timedelta(minutes=rng.randint(1, 600)),
+        "updated_at": now,
+        "deleted_at": None,
+    }
+
+
+def _order(rng: random.Random, now: datetime) -> dict:
+    amount = rng.uniform(0.001, 2)
+    return {
+        "_id": ObjectId(),
+        "user_id": ObjectId(),
+        "user_wallet_id": ObjectId(),
+        "position_id": ObjectId(),
+        "flow_id": ObjectId(),
+        "symbol": "BTC/USDT",
+        "side": "buy",
+        "order_type": "market",
+        "status": rng.choice(["open", "filled", "partially_filled"]),
+        "requested_amount": amount,
+        "filled_amount": amount / 2,
+        "remaining_amount": amount / 2,
+        "average_fill_price": rng.uniform(20_000, 100_000),
+        "status_history": [{"status": "pending", "timestamp": now}, {"status": "open", "timestamp": now}],
+        "fills": [{"price": 50_000.0, "amount": amount / 4, "fee": 0.1, "timestamp": now}] * 2,
+        "total_fees": 0.2,
+        "external_order_id": str(rng.randint(10**9, 10**10)),
+        "exchange_response": {"raw": "x" * 200},
+        "created_at": now,
+        "deleted_at": None,
+    }
+
+
+def _execution(rng: random.Random, now: datetime) -> dict:
+    return {
+        "_id": ObjectId(),
+        "flow_id": str(ObjectId()),
+        "flow_name": "BTC momentum",
+        "status": "completed",
+        "started_at": now,
+        "completed_at": now,
+        "duration": rng.randint(1_000, 60_000),
+        "steps": [
+            {"name": name, "status": "completed", "started_at": now, "completed_at": now,
+             "data": {"analysis": "Trend is up on the 4h with rising volume. " * 10}}
+            for name in ("data_fetch", "market_analysis", "risk_validation", "decision")
+        ],
+        "result": {"action": "buy", "confidence": 0.7, "reasoning": "Breakout confirmed."},
+        "market_data": {"price": 50_000.0, "volume": 1_234.5},
+        "indicators": {"rsi": 55.0, "macd": 12.3},
+    }
+
+
+def _project(docs: List[dict], fields) -> List[dict]:
+    keep = {"_id", *fields}
+    return [{k: v for k, v in doc.items() if k in keep} for doc in docs]
+
+
+def _measure(payloads: List[bytes], decode: Callable[[dict], object]) -> Dict[str, float]:
+    start = time.perf_counter()
+    for payload in payloads:
+        decode(bson.decode(payload))
+    seconds = time.perf_counter() - start
+    return {"seconds": round(seconds, 4), "docs_per_second": round(len(payloads) / seconds, 1)}
+
+
+def _encode(docs: List[dict]) -> List[bytes]:
+    return [bson.encode(doc) for doc in docs]
+
+
+def _execution_model(doc: dict) -> Execution:
+    doc["_id"] = str(doc["_id"])
+    return Execution(**doc)
+
+
+def run(count: int, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    positions = [_position(rng, now) for _ in range(count)]
+    orders = [_order(rng, now) for _ in range(count)]
+    executions = [_execution(rng, now) for _ in range(count)]
+
+    return {
+        "docs": count,
+        "positions": {
+            "full": _measure(_encode(positions), PositionRecord.from_doc),
+            "monitor_projection": _measure(_encode(_project(positions, MONITOR_FIELDS)), PositionRecord.from_doc),
+        },
+        "orders": {
+            "full": _measure(_encode(orders), OrderRecord.from_doc),
+        },
+        "executions": {
+            "pydantic_model": _measure(_encode(executions), _execution_model),
+            "full": _measure(_encode(executions), ExecutionRecord.from_doc),
+            "summary_projection": _measure(_encode(_project(executions, SUMMARY_FIELDS)), ExecutionRecord.from_doc),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    print(json.dumps(run(args.docs, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Sentiment scoring benchmark.
+
+Scores 100k synthetic Reddit-style posts with the per-text set-building
+keyword matcher the sentiment clients used before, and with the
+compiled ``KeywordSentimentScorer``, then classifies Polymarket markets
+by timeframe with per-pattern ``re.search`` loops and with the compiled
+alternations. Scores and classifications must match exactly.
+
+Usage:
+    python -m benchmarks.sentiment_scoring [--posts 100000] [--markets 20000]
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from typing import List
+
+from app.integrations.market_data.polymarket_client import PolymarketMarketDataClient
+from app.integrations.market_data.reddit_client import RedditGuerrillaClient
+
+FILLER = (
+    "the of and a to in is you that it was for on are as with they at be this have from or "
+    "one had by but not what all were we when your can said there an each which do how their "
+    "if will other about out many then them these so some would make like into time has look "
+    "more go see no way could people my than first been who now find long day did get may"
+).split()
+
+
+def _posts(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    keywords = sorted(RedditGuerrillaClient.BULLISH_WORDS | RedditGuerrillaClient.BEARISH_WORDS)
+    keywords += ["Moon!", "UP", "to the moon", "rug pull", "all time high"]
+    return [
+        " ".join(
+            rng.choice(keywords) if rng.random() < 0.04 else rng.choice(FILLER)
+            for _ in range(rng.randint(10, 200))
+        )
+        for _ in range(count)
+    ]
+
+
+def _markets(count: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    slugs = ["btc-up-or-down-15m", "bitcoin-up-or-down-1-hour", "btc-above-100k", "eth-price-today"]
+    questions = [
+        "Bitcoin Up or Down - 3:00AM-3:15AM ET",
+        "Bitcoin Up or Down - 3:00AM-4:00AM ET",
+        "Will BTC reach $100k in 2026?",
+        "Ethereum price on Friday?",
+    ]
+    return [
+        {
+            "slug": rng.choice(slugs),
+            "tags": [rng.choice(["crypto", "hourly", "15 min", None])],
+            "question": rng.choice(questions),
+            "title": "",
+            "description": "Resolves using the Binance BTC/USDT candle." * rng.randint(1, 5),
+        }
+        for _ in range(count)
+    ]
+
+
+def _legacy_score(texts: List[str]) -> float:
+    bullish_words = RedditGuerrillaClient.BULLISH_WORDS
+    bearish_words = RedditGuerrillaClient.BEARISH_WORDS
+    scores = []
+    for text in texts:
+        text_lower = text.lower()
+        words = set(text_lower.split())
+        bullish_count = len(words & bullish_words)
+        bearish_count = len(words & bearish_words)
+        for phrase in ["rug pull", "all time high", "to the moon"]:
+            if phrase in text_lower:
+                if phrase == "rug pull":
+                    bearish_count += 2
+                else:
+                    bullish_count += 2
+        if bullish_count + bearish_count == 0:
+            scores.append(0.0)
+        else:
+            scores.append((bullish_count - bearish_count) / (bullish_count + bearish_count))
+    return sum(scores) / len(scores) if scores else 0.0
+
+
+def _legacy_detect(market: dict, target_timeframe: str) -> bool:
+    patterns = PolymarketMarketDataClient.TIMEFRAME_PATTERNS[target_timeframe]
+    fields = [market.get("slug", "").lower()]
+    fields += [str(tag).lower() if tag else "" for tag in market.get("tags", [])]
+    fields += [market.get(key, "").lower() for key in ("question", "title", "description")]
+    for text in fields:
+        for pattern in patterns:
+            if re.search(pattern, text, re.IGNORECASE):
+                return True
+    time_range_pattern = r"(\d{1,2}):(\d{2})\s*(?:AM|PM)?\s*-\s*(\d{1,2}):(\d{2})\s*(?:AM|PM)?"
+    for text in fields[-3:-1]:
+        match = re.search(time_range_pattern, text, re.IGNORECASE)
+        if match:
+            duration = (int(match.group(3)) * 60 + int(match.group(4))) - (int(match.group(1)) * 60 + int(match.group(2)))
+            if duration < 0:
+                duration += 24 * 60
+            if target_timeframe == "15m" and 10 <= duration <= 20:
+                return True
+            if target_timeframe == "1h" and 50 <= duration <= 70:
+                return True
+    return False
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(posts: int, markets: int, seed: int = 1) -> dict:
+    texts = _posts(posts, seed)
+    legacy_score, legacy_seconds = _timed(_legacy_score, texts)
+    compiled_score, compiled_seconds = _timed(RedditGuerrillaClient.SCORER.average, texts)
+    assert compiled_score == legacy_score, (compiled_score, legacy_score)
+
+    items = _markets(markets, seed)
+    client = PolymarketMarketDataClient()
+    legacy_matches, legacy_detect_seconds = _timed(
+        lambda: [_legacy_detect(m, tf) for m in items for tf in ("15m", "1h")]
+    )
+    compiled_matches, compiled_detect_seconds = _timed(
+        lambda: [client._detect_timeframe(m, tf) for m in items for tf in ("15m", "1h")]
+    )
+    assert compiled_matches == legacy_matches
+
+    return {
+        "posts": posts,
+        "sentiment": {
+            "score": round(compiled_score, 6),
+            "legacy_seconds": round(legacy_seconds, 4),
+            "compiled_seconds": round(compiled_seconds, 4),
+            "speedup": round(legacy_seconds / compiled_seconds, 2),
+            "posts_per_second": round(posts / compiled_seconds, 1),
+        },
+        "markets": markets,
+        "timeframe_detection": {
+            "matches": sum(compiled_matches),
+            "legacy_seconds": round(legacy_detect_seconds, 4),
+            "compiled_seconds": round(compiled_detect_seconds, 4),
+            "speedup": round(legacy_detect_seconds / compiled_detect_seconds, 2),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--markets", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    print(json.dumps(run(args.posts, args.markets, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
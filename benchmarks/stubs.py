@@ -0,0 +1,233 @@
+"""
+Local stand-ins for the benchmark suite's external services.
+
+- MongoDB: ``mongomock_motor`` (in-process) or an ephemeral local
+  ``mongod`` when ``--mongo-url`` is given.
+- Redis: ``fakeredis``.
+- Binance REST: an aiohttp server answering ``/klines``, ``/ticker/24hr``
+  (single symbol and full market), ``/ticker/price`` and ``/time`` with
+  deterministic data.
+- LLM: an aiohttp server speaking the OpenAI chat completions protocol that
+  ``OpenRouterModel`` uses, so agents run their real prompt building and
+  response parsing against a fixed latency.
+
+``bench_services()`` wires all of them into the app's singletons for the
+duration of a run and restores the originals afterwards.
+"""
+
+import asyncio
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import orjson
+import socketio
+from aiohttp import web
+
+from app.config import database
+from app.integrations.ai.openrouter_model import OpenRouterModel
+from app.integrations.market_data.binance_client import BinanceClient
+from app.services.socket_publisher import get_socket_publisher
+from app.utils import cache
+
+# Symbols listed by the stub exchange (plus generated filler for the full-market ticker)
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT", "ADAUSDT", "DOGEUSDT", "AVAXUSDT"]
+BASE_PRICES = {symbol: 10.0 ** (4 - i % 5) * (1 + i / 10) for i, symbol in enumerate(SYMBOLS)}
+MARKET_SIZE = 2000
+
+# Analyst reply: hold at low confidence, so execute_flow takes the gate-blocked path
+ANALYST_REPLY = {
+    "action": "hold",
+    "confidence": 0.42,
+    "reasoning": "Momentum is flat on the 1h with RSI near 50; no edge versus fees.",
+    "risk_level": "medium",
+}
+
+
+def _ticker_row(symbol: str, price: float) -> Dict[str, str]:
+    return {
+        "symbol": symbol,
+        "priceChange": f"{price * 0.012:.8f}",
+        "priceChangePercent": "1.200",
+        "lastPrice": f"{price:.8f}",
+        "highPrice": f"{price * 1.03:.8f}",
+        "lowPrice": f"{price * 0.97:.8f}",
+        "volume": "12345.678",
+        "quoteVolume": f"{price * 12345.678:.2f}",
+    }
+
+
+def kline_rows(symbol: str, limit: int, seed: int = 7) -> List[List[Any]]:
+    rng = random.Random(f"{symbol}:{seed}")
+    price = BASE_PRICES.get(symbol, 1.0)
+    start = int(time.time() // 3600 - limit) * 3600 * 1000
+    rows = []
+    for i in range(limit):
+        open_price = price
+        price *= 1 + rng.gauss(0, 0.004)
+        high = max(open_price, price) * (1 + abs(rng.gauss(0, 0.002)))
+        low = min(open_price, price) * (1 - abs(rng.gauss(0, 0.002)))
+        open_time = start + i * 3_600_000
+        rows.append([
+            open_time, f"{open_price:.8f}", f"{high:.8f}", f"{low:.8f}", f"{price:.8f}",
+            f"{rng.uniform(100, 1000):.4f}", open_time + 3_599_999,
+        ])
+    return rows
+
+
+def build_binance_app(latency: float = 0.0) -> web.Application:
+    """Stub Binance REST API (``/api/v3`` paths without the prefix)."""
+    market = [_ticker_row(symbol, price) for symbol, price in BASE_PRICES.items()]
+    market += [_ticker_row(f"COIN{i}USDT", 1 + i / 100) for i in range(MARKET_SIZE - len(market))]
+    market_payload = orjson.dumps(market)
+    by_symbol = {row["symbol"]: row for row in market}
+
+    async def _delay() -> None:
+        if latency:
+            await asyncio.sleep(latency)
+
+    async def klines(request: web.Request) -> web.Response:
+        await _delay()
+        symbol = request.query["symbol"]
+        limit = int(request.query.get("limit", 500))
+        return web.Response(body=orjson.dumps(kline_rows(symbol, limit)), content_type="application/json")
+
+    async def ticker_24hr(request: web.Request) -> web.Response:
+        await _delay()
+        symbol = request.query.get("symbol")
+        if symbol is None:
+            return web.Response(body=market_payload, content_type="application/json")
+        if symbol not in by_symbol:
+            return web.json_response({"code": -1121, "msg": "Invalid symbol."}, status=400)
+        return web.Response(body=orjson.dumps(by_symbol[symbol]), content_type="application/json")
+
+    async def ticker_price(request: web.Request) -> web.Response:
+        await _delay()
+        row = by_symbol.get(request.query.get("symbol", ""))
+        if row is None:
+            return web.json_response({"code": -1121, "msg": "Invalid symbol."}, status=400)
+        return web.json_response({"symbol": row["symbol"], "price": row["lastPrice"]})
+
+    async def server_time(request: web.Request) -> web.Response:
+        return web.json_response({"serverTime": int(time.time() * 1000)})
+
+    app = web.Application()
+    app.router.add_get("/klines", klines)
+    app.router.add_get("/ticker/24hr", ticker_24hr)
+    app.router.add_get("/ticker/price", ticker_price)
+    app.router.add_get("/time", server_time)
+    return app
+
+
+def build_llm_app(latency: float = 0.05, reply: Optional[Dict[str, Any]] = None) -> web.Application:
+    """Stub OpenAI-compatible ``/chat/completions`` endpoint."""
+    content = orjson.dumps(reply or ANALYST_REPLY).decode()
+
+    async def chat_completions(request: web.Request) -> web.Response:
+        payload = await request.json()
+        if latency:
+            await asyncio.sleep(latency)
+        prompt_chars = sum(len(m.get("content", "")) for m in payload.get("messages", []))
+        return web.json_response({
+            "id": "stub",
+            "object": "chat.completion",
+            "model": payload.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": len(content) // 4},
+        })
+
+    app = web.Application()
+    app.router.add_post("/chat/completions", chat_completions)
+    return app
+
+
+@asynccontextmanager
+async def serve(app: web.Application) -> AsyncIterator[str]:
+    """Run an aiohttp app on an ephemeral localhost port; yields its base URL."""
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
+
+
+def _mongo_database(mongo_url: Optional[str]):
+    if mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(mongo_url)
+        return client, client[f"moniqo_bench_{os.getpid()}"]
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError as e:
+        raise RuntimeError("The benchmark suite needs mongomock-motor (or --mongo-url)") from e
+    client = AsyncMongoMockClient()
+    return client, client["moniqo_bench"]
+
+
+def _redis_client():
+    try:
+        from fakeredis import aioredis
+    except ImportError as e:
+        raise RuntimeError("The benchmark suite needs fakeredis") from e
+    return aioredis.FakeRedis(decode_responses=True)
+
+
+@asynccontextmanager
+async def bench_services(
+    mongo_url: Optional[str] = None,
+    binance_latency: float = 0.0,
+    llm_latency: float = 0.05,
+) -> AsyncIterator[Any]:
+    """
+    Point the app's database, Redis, Binance and LLM clients at local stubs.
+
+    Yields:
+        The benchmark database
+    """
+    client, db = _mongo_database(mongo_url)
+    saved = (
+        database._database,
+        cache._redis_client,
+        BinanceClient.BASE_URL,
+        OpenRouterModel.BASE_URL,
+        os.environ.get("OPENROUTER_API_KEY"),
+        get_socket_publisher()._server,
+    )
+    database._database = db
+    cache._redis_client = _redis_client()
+    # In-process Socket.IO server with no clients: emits are routed, not sent
+    get_socket_publisher().register_server(socketio.AsyncServer(async_mode="asgi"))
+    os.environ["OPENROUTER_API_KEY"] = "bench"
+
+    async with serve(build_binance_app(binance_latency)) as binance_url, serve(build_llm_app(llm_latency)) as llm_url:
+        BinanceClient.BASE_URL = binance_url
+        OpenRouterModel.BASE_URL = llm_url
+        try:
+            yield db
+        finally:
+            from app.integrations.market_data import get_binance_client
+
+            await get_binance_client().close()
+            await cache._redis_client.aclose()
+            if mongo_url:
+                await client.drop_database(db.name)
+            client.close()
+            (
+                database._database,
+                cache._redis_client,
+                BinanceClient.BASE_URL,
+                OpenRouterModel.BASE_URL,
+                api_key,
+                get_socket_publisher()._server,
+            ) = saved
+            if api_key is None:
+                os.environ.pop("OPENROUTER_API_KEY", None)
+            else:
+                os.environ["OPENROUTER_API_KEY"] = api_key
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite with a stored baseline.
+
+Runs the hot paths locally against in-process stand-ins (see
+``benchmarks.stubs``): indicator and market-health math, swarm vote
+aggregation, position monitoring at 1k/10k open positions (plus the
+vectorized P&L pass alone over 10k), open-order
+monitoring, a full swarm ``execute_flow`` with agents on a stub LLM,
+``require_permission``, ``GET /market/tickers`` and a page of 100 large
+swarm executions (through ``GET /flows/{id}/executions`` and encoding alone).
+
+Cases marked ``needs_mongo`` (10k positions) only run with ``--mongo-url``:
+mongomock has no indexes, so per-position updates turn quadratic. mongomock
+also lacks ``$round``, so the flow statistics update inside ``execute_flow``
+is skipped there (it logs an error and the execution still completes).
+
+Each case reports min/median/p95 wall time in milliseconds. Results are
+printed (or written) as JSON and compared with the stored baseline; the run
+exits non-zero when a case's median is slower than its baseline by more
+than ``--threshold``. Baselines are machine specific: regenerate them with
+``--update-baseline`` on the machine that runs the comparison.
+
+Usage:
+    python -m benchmarks.suite [--only monitor_positions_1k ...]
+    python -m benchmarks.suite --output results.json --threshold 0.25
+    python -m benchmarks.suite --update-baseline
+    python -m benchmarks.suite --mongo-url mongodb://localhost:27017
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import orjson
+from bson import ObjectId
+
+from benchmarks.stubs import ANALYST_REPLY, BASE_PRICES, SYMBOLS, kline_rows, bench_services
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass
+class Case:
+    """A benchmark: ``setup(db)`` returns the coroutine function that is timed."""
+
+    name: str
+    setup: Callable[[Any], Awaitable[Callable[[], Awaitable[Any]]]]
+    repeat: int = 5
+    # Operations per timed call, for ops/s (e.g. positions per tick)
+    ops: int = 1
+    # mongomock scans the collection for every update, so large cases need a real mongod
+    needs_mongo: bool = False
+
+
+# ==================== DATA ====================
+
+def _closes(count: int = 500) -> Dict[str, List[float]]:
+    rows = kline_rows("BTCUSDT", count)
+    return {
+        "closes": [float(r[4]) for r in rows],
+        "highs": [float(r[2]) for r in rows],
+        "lows": [float(r[3]) for r in rows],
+    }
+
+
+def _position_doc(rng: random.Random, now: datetime, users: List[ObjectId]) -> Dict[str, Any]:
+    binance_symbol = rng.choice(SYMBOLS)
+    price = BASE_PRICES[binance_symbol] * rng.uniform(0.95, 1.05)
+    amount = rng.uniform(0.01, 2)
+    return {
+        "user_id": rng.choice(users),
+        "user_wallet_id": ObjectId(),
+        "flow_id": ObjectId(),
+        "symbol": f"{binance_symbol[:-4]}/USDT",
+        "side": rng.choice(["long", "short"]),
+        "status": "open",
+        "entry": {
+            "order_id": ObjectId(),
+            "timestamp": now,
+            "price": price,
+            "amount": amount,
+            "value": price * amount,
+            "leverage": 1,
+            "fees": price * amount * 0.001,
+            "fee_currency": "USDT",
+        },
+        "current": {"price": price, "high_water_mark": price * 1.01, "low_water_mark": price * 0.99},
+        "risk_management": {"current_stop_loss": price * 0.9, "current_take_profit": price * 1.2},
+        "opened_at": now - timedelta(minutes=rng.randint(1, 600)),
+        "created_at": now,
+        "deleted_at": None,
+    }
+
+
+def _order_doc(rng: random.Random, now: datetime) -> Dict[str, Any]:
+    binance_symbol = rng.choice(SYMBOLS)
+    return {
+        "user_id": ObjectId(),
+        "user_wallet_id": ObjectId(),
+        "symbol": f"{binance_symbol[:-4]}/USDT",
+        "side": "buy",
+        "order_type": "limit",
+        "status": "open",
+        "requested_amount": 1.0,
+        "filled_amount": 0.0,
+        "remaining_amount": 1.0,
+        "limit_price": BASE_PRICES[binance_symbol],
+        "external_order_id": str(rng.randint(10**9, 10**10)),
+        "created_at": now,
+        "deleted_at": None,
+    }
+
+
+def _execution_doc(rng: random.Random, now: datetime, flow_id: str) -> Dict[str, Any]:
+    """A completed swarm execution as execute_flow stores it (~20 KB of step data)."""
+    started = now - timedelta(minutes=rng.randint(1, 10_000))
+    closes = [float(r[4]) for r in kline_rows("ETHUSDT", 50, seed=rng.randint(0, 1000))]
+    indicators = {
+        "rsi": rng.uniform(20, 80),
+        "macd": {"macd": rng.gauss(0, 5), "signal": rng.gauss(0, 5), "histogram": rng.gauss(0, 1)},
+        "bollinger": {"upper": closes[-1] * 1.02, "middle": closes[-1], "lower": closes[-1] * 0.98},
+        "sma_20": sum(closes[-20:]) / 20,
+        "closes": closes,
+    }
+    members = [
+        {
+            "run": i,
+            "agent": "market_analyst",
+            "action": rng.choice(["buy", "sell", "hold"]),
+            "confidence": rng.random(),
+            "reasoning": ANALYST_REPLY["reasoning"] * 4,
+            "decision_id": ObjectId(),
+            "cost_usd": 0.000412,
+            "completed_at": started + timedelta(seconds=i),
+        }
+        for i in range(10)
+    ]
+    step = lambda name, data: {  # noqa: E731
+        "name": name,
+        "status": "completed",
+        "started_at": started,
+        "completed_at": started + timedelta(seconds=2),
+        "data": data,
+        "error": None,
+    }
+    return {
+        "flow_id": flow_id,
+        "flow_name": "Bench swarm",
+        "status": "completed",
+        "started_at": started,
+        "completed_at": started + timedelta(seconds=30),
+        "duration": 30_000,
+        "steps": [
+            step("market_data", {"symbol": "ETH/USDT", "price": closes[-1], "ticker": {"volume": 12345.6, "change_24h": 1.2}}),
+            step("indicators", indicators),
+            step("ai_analysis", {"swarm": {"members": members, "votes": {"buy": 3, "sell": 2, "hold": 5}}}),
+            step("risk_validation", {"approved": False, "checks": [{"name": f"check_{i}", "passed": i % 3 != 0} for i in range(12)]}),
+            step("decision", {"final_action": "hold", "confidence": 0.42, "order": None, "position": None}),
+        ],
+        "result": {"action": "hold", "confidence": 0.42, "reasoning": ANALYST_REPLY["reasoning"], "position_id": None},
+        "market_data": {"price": closes[-1], "closes": closes},
+        "indicators": indicators,
+    }
+
+
+# ==================== CASES ====================
+
+async def _indicators(db):
+    from app.services.indicators import calculate_all_indicators
+
+    data = _closes()
+
+    async def run():
+        for _ in range(5):
+            calculate_all_indicators(data["closes"], data["highs"], data["lows"])
+    return run
+
+
+async def _market_health(db):
+    from app.services.indicators import calculate_all_indicators
+    from app.services.market_health import compute_market_health
+
+    data = _closes()
+    indicators = calculate_all_indicators(data["closes"], data["highs"], data["lows"])
+
+    async def run():
+        for _ in range(200):
+            compute_market_health(data["closes"], indicators, 1.2, -5.0)
+    return run
+
+
+async def _swarm_aggregate(db):
+    from app.modules.flows.service import _aggregate_swarm_results
+
+    rng = random.Random(3)
+    results = [
+        {
+            "action": rng.choice(["buy", "sell", "hold"]),
+            "confidence": rng.uniform(0.3, 0.9),
+            "reasoning": "Trend and volume agree on the 4h. " * 5,
+            "role": rng.choice(["market_analyst", "risk_manager", "sentiment_analyst"]),
+        }
+        for _ in range(9)
+    ]
+    weights = {"market_analyst": 1.0, "risk_manager": 1.2, "sentiment_analyst": 0.8}
+
+    async def run():
+        for _ in range(1000):
+            _aggregate_swarm_results(results, role_weights=weights)
+    return run
+
+
+def _monitor_positions(count: int):
+    async def setup(db):
+        from app.integrations.market_data.binance_stream import get_market_book
+        from app.services.position_tracker import PositionTrackerService
+
+        rng = random.Random(count)
+        now = datetime.now(timezone.utc)
+        users = [ObjectId() for _ in range(max(1, count // 10))]
+        await db["positions"].delete_many({})
+        await db["positions"].insert_many([_position_doc(rng, now, users) for _ in range(count)])
+        tracker = PositionTrackerService(db)
+        book = get_market_book()
+
+        async def run():
+            # Fresh streamed prices, so no position falls back to REST
+            for symbol, price in BASE_PRICES.items():
+                book.update_trade(symbol, f"{price * rng.uniform(0.98, 1.02):.8f}")
+            result = await tracker.monitor_all_positions()
+            assert result["updated"] == count, result.get("error") or result["errors"]
+        return run
+    return setup
+
+
+async def _evaluate_pnl(db):
+    from app.modules.positions.repository import PositionRecord
+    from app.services.pnl_engine import PositionBook
+
+    rng = random.Random(5)
+    now = datetime.now(timezone.utc)
+    users = [ObjectId()]
+    records = [PositionRecord.from_doc({"_id": ObjectId(), **_position_doc(rng, now, users)}) for _ in range(PNL_BOOK_SIZE)]
+
+    async def run():
+        prices = {f"{s[:-4]}/USDT": p * rng.uniform(0.98, 1.02) for s, p in BASE_PRICES.items()}
+        snapshot = PositionBook(records).evaluate(prices)
+        assert snapshot.row(PNL_BOOK_SIZE - 1) is not None
+    return run
+
+
+class _StubExchangeWallet:
+    """Exchange wallet whose open orders are still resting, unfilled."""
+
+    async def get_order_status(self, order_id: str, symbol: str) -> Dict[str, Any]:
+        return {"status": "NEW", "filled_quantity": Decimal("0"), "average_price": None}
+
+
+class _StubWalletFactory:
+    async def create_wallet(self, wallet_id: str, user_wallet_id: str) -> _StubExchangeWallet:
+        return _StubExchangeWallet()
+
+
+async def _monitor_orders(db):
+    from beanie import init_beanie
+
+    from app.modules.orders.models import Order
+    from app.services.order_monitor import OrderMonitorService
+
+    rng = random.Random(11)
+    now = datetime.now(timezone.utc)
+    await db["orders"].delete_many({})
+    await db["orders"].insert_many([_order_doc(rng, now) for _ in range(ORDER_COUNT)])
+    # monitor_order loads each order as a Beanie document
+    await init_beanie(database=db, document_models=[Order])
+    monitor = OrderMonitorService(db)
+    monitor.wallet_factory = _StubWalletFactory()
+
+    async def run():
+        result = await monitor.monitor_all_open_orders()
+        assert result["updated"] == ORDER_COUNT, result
+    return run
+
+
+# Cached Reddit sentiment in the shape RedditClient.get_symbol_sentiment returns
+REDDIT_SENTIMENT = {
+    "symbol": "ETH",
+    "mention_volume": 10,
+    "total_upvotes": 1500,
+    "sentiment_score": 0.1,
+    "sentiment": "neutral",
+    "posts": [
+        {"title": f"ETH daily discussion #{i}", "selftext_preview": "Range-bound until the next macro print. " * 3, "upvotes": 150 - i}
+        for i in range(10)
+    ],
+}
+
+
+async def _execute_flow(db):
+    from app.modules.flows.models import Flow, FlowMode
+    from app.modules.flows.service import _set_cached_sentiment, execute_flow
+    from app.services.signal_aggregator import AggregatedSignal
+    from app.services.signal_materializer import SIGNAL_KEY_PREFIX
+    from app.utils.cache import get_redis_client
+
+    flow = Flow(
+        name="Bench swarm",
+        symbol="ETH/USDT",
+        mode=FlowMode.SWARM,
+        agents=["market_analyst"],
+        config={
+            "swarm_runs": 5,
+            "demo_force_position": False,
+            "auto_loop_enabled": False,
+            "user_id": str(ObjectId()),
+        },
+    )
+    doc = flow.model_dump(by_alias=True, exclude={"id"})
+    doc.update(total_pnl_usd=0.0, total_pnl_percent=0.0)
+    insert = await db["flows"].insert_one(doc)
+    flow.id = str(insert.inserted_id)
+
+    # Sentiment as another worker would have materialized it
+    signal = AggregatedSignal(symbol="ETH", score=0.05, classification="neutral", confidence=0.6)
+    redis_client = await get_redis_client()
+
+    async def run():
+        await redis_client.set(
+            f"{SIGNAL_KEY_PREFIX}ETH",
+            orjson.dumps({"signal": signal.model_dump(mode="json"), "materialized_at": time.time()}),
+        )
+        _set_cached_sentiment("reddit:ETH", REDDIT_SENTIMENT)
+        execution = await execute_flow(db, flow, model_provider="openrouter", model_name="stub/analyst")
+        assert execution.status.value == "completed", execution.error
+        assert execution.result.action == ANALYST_REPLY["action"]
+    return run
+
+
+async def _require_permission(db):
+    from app.core.dependencies import require_permission
+
+    permissions = [
+        {"_id": ObjectId(), "resource": resource, "action": action, "is_deleted": False}
+        for resource in ("users", "roles", "flows", "orders", "positions", "wallets")
+        for action in ("read", "write", "delete")
+    ]
+    await db["permissions"].insert_many(permissions)
+    role_id = ObjectId()
+    await db["roles"].insert_one({
+        "_id": role_id,
+        "name": "trader",
+        "permissions": [p["_id"] for p in permissions],
+        "is_deleted": False,
+    })
+    user = {"_id": ObjectId(), "email": "bench@example.com", "user_role": role_id}
+    checker = require_permission("positions", "write")
+
+    async def run():
+        for _ in range(50):
+            await checker(current_user=user, db=db)
+    return run
+
+
+async def _market_tickers(db):
+    import httpx
+    from fastapi import FastAPI
+
+    from app.modules.market.router import router as market_router
+
+    app = FastAPI()
+    app.include_router(market_router, prefix="/api/v1")
+    client = httpx.AsyncClient(app=app, base_url="http://bench")
+    symbols = ",".join(f"{s[:-4]}/USDT" for s in SYMBOLS)
+
+    async def run():
+        for _ in range(20):
+            response = await client.get("/api/v1/market/tickers", params={"symbols": symbols})
+            assert response.status_code == 200 and len(response.json()) == len(SYMBOLS), response.text
+    return run
+
+
+EXECUTION_PAGE = 100
+PNL_BOOK_SIZE = 10_000
+
+
+async def _list_executions(db):
+    import httpx
+    from fastapi import FastAPI
+
+    from app.core.responses import ORJSONResponse
+    from app.modules.flows.router import router as flows_router
+
+    rng = random.Random(11)
+    now = datetime.now(timezone.utc)
+    insert = await db["flows"].insert_one({"name": "Bench executions", "symbol": "ETH/USDT", "mode": "swarm", "status": "active"})
+    flow_id = str(insert.inserted_id)
+    await db["executions"].insert_many([_execution_doc(rng, now, flow_id) for _ in range(EXECUTION_PAGE)])
+
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.include_router(flows_router, prefix="/api/v1")
+    client = httpx.AsyncClient(app=app, base_url="http://bench")
+
+    async def run():
+        response = await client.get(f"/api/v1/flows/{flow_id}/executions", params={"limit": EXECUTION_PAGE})
+        assert response.status_code == 200 and len(response.json()["items"]) == EXECUTION_PAGE, response.text
+    return run
+
+
+async def _encode_executions(db):
+    from app.core.responses import model_response
+    from app.modules.flows.models import Execution
+    from app.modules.flows.router import execution_to_response
+    from app.modules.flows.schemas import ExecutionListResponse
+
+    rng = random.Random(11)
+    now = datetime.now(timezone.utc)
+    executions = [Execution(**_execution_doc(rng, now, "bench")) for _ in range(EXECUTION_PAGE)]
+
+    async def run():
+        page = ExecutionListResponse(
+            items=[execution_to_response(e) for e in executions],
+            total=EXECUTION_PAGE,
+            limit=EXECUTION_PAGE,
+            offset=0,
+            has_more=False,
+        )
+        assert model_response(page).body
+    return run
+
+
+# monitor_all_open_orders pauses 0.1s every 10 orders, which dominates larger runs
+ORDER_COUNT = 100
+
+CASES = [
+    Case("calculate_all_indicators", _indicators, repeat=10, ops=5),
+    Case("compute_market_health", _market_health, repeat=10, ops=200),
+    Case("aggregate_swarm_results", _swarm_aggregate, repeat=20, ops=1000),
+    Case("monitor_positions_1k", _monitor_positions(1_000), repeat=3, ops=1_000),
+    Case("monitor_positions_10k", _monitor_positions(10_000), repeat=1, ops=10_000, needs_mongo=True),
+    Case("evaluate_pnl_10k", _evaluate_pnl, repeat=10, ops=PNL_BOOK_SIZE),
+    Case("monitor_open_orders", _monitor_orders, repeat=3, ops=ORDER_COUNT),
+    Case("execute_flow_swarm", _execute_flow, repeat=5),
+    Case("require_permission", _require_permission, repeat=20, ops=50),
+    Case("market_tickers", _market_tickers, repeat=10, ops=20),
+    Case("list_executions_api", _list_executions, repeat=10, ops=EXECUTION_PAGE),
+    Case("encode_execution_list", _encode_executions, repeat=20, ops=EXECUTION_PAGE),
+]
+
+
+# ==================== RUNNER ====================
+
+async def _measure(case: Case, db) -> Dict[str, Any]:
+    run = await case.setup(db)
+    await run()  # warm-up (connections, caches, first-call imports)
+    samples = []
+    for _ in range(case.repeat):
+        started = time.perf_counter()
+        await run()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    median = statistics.median(samples)
+    return {
+        "repeat": case.repeat,
+        "ops": case.ops,
+        "min_ms": round(samples[0] * 1000, 3),
+        "median_ms": round(median * 1000, 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 3),
+        "ops_per_second": round(case.ops / median, 1),
+    }
+
+
+async def run(names: Optional[List[str]] = None, mongo_url: Optional[str] = None) -> Dict[str, Any]:
+    cases = [c for c in CASES if not names or c.name in names]
+    results = {}
+    async with bench_services(mongo_url=mongo_url) as db:
+        for case in cases:
+            if case.needs_mongo and not mongo_url:
+                print(f"skipping {case.name} (needs --mongo-url)", file=sys.stderr)
+                continue
+            print(f"running {case.name} ...", file=sys.stderr)
+            results[case.name] = await _measure(case, db)
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Cases whose median is slower than the baseline's by more than ``threshold``."""
+    regressions = []
+    for name, current in results["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base.get("median_ms"):
+            continue
+        change = current["median_ms"] / base["median_ms"] - 1
+        current["baseline_median_ms"] = base["median_ms"]
+        current["change"] = round(change, 4)
+        if change > threshold:
+            regressions.append({"case": name, "baseline_ms": base["median_ms"], "median_ms": current["median_ms"], "change": round(change, 4)})
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", nargs="*", choices=[c.name for c in CASES], help="Cases to run")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed median slowdown (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    parser.add_argument("--mongo-url", help="Use a local MongoDB instead of mongomock (a throwaway database is created)")
+    parser.add_argument("--log-level", default="WARNING", help="App log level during the run")
+    args = parser.parse_args()
+
+    logging.getLogger("moniqo").setLevel(args.log_level.upper())
+    results = asyncio.run(run(args.only, args.mongo_url))
+
+    regressions: List[Dict[str, Any]] = []
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update({k: v for k, v in results.items() if k != "results"})
+        baseline.setdefault("results", {}).update(results["results"])
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    results["threshold"] = args.threshold
+    results["regressions"] = regressions
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    if regressions:
+        for r in regressions:
+            print(f"REGRESSION {r['case']}: {r['baseline_ms']}ms -> {r['median_ms']}ms (+{r['change']:.0%})", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
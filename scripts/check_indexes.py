@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Query-plan self-check.
+
+Explains every hot query in app.services.index_manager and exits non-zero
+if any winning plan is a collection scan (COLLSCAN).
+
+Usage:
+    python scripts/check_indexes.py
+
+    # Build the declared index catalog first:
+    python scripts/check_indexes.py --build
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend directory to Python path for imports
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.config.settings import settings
+from app.services.index_manager import ensure_indexes, verify_query_plans
+
+
+async def check_indexes(build: bool) -> bool:
+    """Explain hot queries; True if none scans a whole collection."""
+    client = AsyncIOMotorClient(settings.MONGODB_URL, serverSelectionTimeoutMS=5000)
+    db = client[settings.MONGODB_DB_NAME]
+    try:
+        if build:
+            report = await ensure_indexes(db)
+            print(f"Indexes ensured: {len(report['created'])} ok, {len(report['failed'])} failed")
+            for label in report["failed"]:
+                print(f"  ❌ {label}")
+            print()
+
+        results = await verify_query_plans(db)
+        for result in results:
+            marker = "❌" if result["collscan"] else "✅"
+            print(f"{marker} {result['name']:<24} {result['collection']:<24} {', '.join(result['stages'])}")
+
+        scans = [r["name"] for r in results if r["collscan"]]
+        print()
+        if scans:
+            print(f"❌ {len(scans)} hot queries do a COLLSCAN: {', '.join(scans)}")
+            return False
+        print(f"✅ All {len(results)} hot queries use an index")
+        return True
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if a hot query does a COLLSCAN")
+    parser.add_argument("--build", action="store_true", help="Build the index catalog before checking")
+    args = parser.parse_args()
+    success = asyncio.run(check_indexes(args.build))
+    sys.exit(0 if success else 1)
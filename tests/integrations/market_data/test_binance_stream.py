@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+import orjson
+import pytest
+
+from app.integrations.market_data.binance_client import BinanceClient
+from app.integrations.market_data import binance_stream
+from app.integrations.market_data.binance_stream import BinanceMarketStream, MarketBook
+
+
+def _message(data):
+    return orjson.dumps({"stream": "x", "data": data})
+
+
+def _stream(book):
+    async def _symbols():
+        return {"BTC/USDT"}
+
+    return BinanceMarketStream(book, _symbols)
+
+
+def test_stream_messages_update_book():
+    book = MarketBook(candle_history=2)
+    stream = _stream(book)
+
+    stream.handle_message(_message({"e": "aggTrade", "s": "BTCUSDT", "p": "50123.45"}))
+    stream.handle_message(_message({"u": 1, "s": "BTCUSDT", "b": "50123.00", "B": "1.5", "a": "50124.00", "A": "2"}))
+    for open_time, close in ((60_000, "1"), (60_000, "2"), (120_000, "3"), (180_000, "4")):
+        stream.handle_message(_message({
+            "e": "kline",
+            "s": "BTCUSDT",
+            "k": {"t": open_time, "i": "1m", "o": "1", "h": "5", "l": "0.5", "c": close, "v": "10", "x": False},
+        }))
+
+    assert book.get_price("BTC/USDT") == Decimal("50123.45")
+    assert book.get_quote("BTC/USDT")["ask"] == Decimal("50124.00")
+    candles = book.get_candles("BTC/USDT", "1m")
+    assert [(c["time"], c["close"]) for c in candles] == [(120, 3.0), (180, 4.0)]
+    assert book.pop_dirty() == {"BTCUSDT"}
+    assert book.pop_dirty() == set()
+
+
+def test_stale_price_is_ignored():
+    book = MarketBook()
+    book.update_trade("BTCUSDT", "100", received_at=1.0)
+
+    assert book.get_price("BTCUSDT") == Decimal("100")
+    assert book.get_price("BTCUSDT", max_age_seconds=5) is None
+
+
+@pytest.mark.asyncio
+async def test_binance_client_get_price_prefers_live_book(monkeypatch):
+    book = MarketBook()
+    book.update_trade("ETHUSDT", "3100.5")
+    monkeypatch.setattr(binance_stream, "_market_book", book)
+
+    client = BinanceClient()
+
+    async def _no_rest():
+        raise AssertionError("REST should not be called")
+
+    monkeypatch.setattr(client, "_get_session", _no_rest)
+
+    assert await client.get_price("ETH/USDT") == Decimal("3100.5")
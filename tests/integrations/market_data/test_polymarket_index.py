@@ -0,0 +1,100 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.integrations.market_data.polymarket_client import PolymarketMarketDataClient
+from app.integrations.market_data.polymarket_index import PolymarketMarketIndex
+
+
+def _market(market_id, question, yes="0.6", updated_at="2026-01-17T10:00:00Z", **extra):
+    return {
+        "id": market_id,
+        "question": question,
+        "slug": question.lower().replace(" ", "-"),
+        "description": "",
+        "outcomes": '["Up", "Down"]',
+        "outcomePrices": f'["{yes}", "{1 - float(yes):.2f}"]',
+        "clobTokenIds": f'["{market_id}-up", "{market_id}-down"]',
+        "updatedAt": updated_at,
+        **extra,
+    }
+
+
+def _index():
+    return PolymarketMarketIndex(
+        client=PolymarketMarketDataClient(),
+        refresh_seconds=30,
+        full_refresh_seconds=600,
+        max_markets=1000,
+    )
+
+
+def test_load_classifies_markets_once_per_key():
+    index = _index()
+    index.load([
+        _market("1", "Bitcoin Up or Down 15m", yes="0.55"),
+        _market("2", "Bitcoin Up or Down 1 hour", yes="0.7"),
+        _market("3", "Ethereum Up or Down 1 hour"),
+        _market("4", "Will Bitcoin hit 200k?"),
+    ])
+
+    hourly = index.get_odds("BTC", "up", "1h")
+    assert hourly["market_id"] == "2"
+    assert hourly["probability"] == 0.7
+    assert index.get_odds("BTC", "down", "1h")["probability"] == pytest.approx(0.3)
+    assert index.get_odds("BTC", "up", "15m")["market_id"] == "1"
+    assert index.get_token_price("2-up") == 0.7
+
+
+@pytest.mark.asyncio
+async def test_incremental_refresh_applies_changes_until_watermark():
+    index = _index()
+    index.load([
+        _market("1", "Bitcoin Up or Down 1 hour", yes="0.6", updated_at="2026-01-17T10:00:00Z"),
+        _market("2", "Bitcoin Up or Down 1h", yes="0.4", updated_at="2026-01-17T10:00:00Z"),
+    ])
+    index._fetch_page = AsyncMock(return_value=[
+        _market("1", "Bitcoin Up or Down 1 hour", updated_at="2026-01-17T10:05:00Z", closed=True),
+        _market("2", "Bitcoin Up or Down 1h", yes="0.8", updated_at="2026-01-17T10:04:00Z"),
+        # Same updatedAt as the watermark but not seen before
+        _market("3", "Bitcoin Up or Down 1 hour", yes="0.3", updated_at="2026-01-17T10:00:00Z"),
+        _market("9", "Bitcoin Up or Down 1h", yes="0.1", updated_at="2026-01-17T09:00:00Z"),
+    ])
+
+    await index.refresh()
+
+    odds = index.get_odds("BTC", "up", "1h")
+    assert odds["market_id"] == "2"
+    assert odds["yes_price"] == 0.8
+    assert "3" in index._entries
+    # Markets older than the watermark (minus the overlap) were already seen and are skipped
+    assert "9" not in index._entries
+    params = index._fetch_page.await_args.args[0]
+    assert params["order"] == "updatedAt"
+
+
+def test_null_text_fields_do_not_abort_classification():
+    index = _index()
+    market = _market("1", "Bitcoin Up or Down 1 hour", description=None, title=None, tags=None)
+    broken = {**_market("2", "x"), "question": None, "slug": None}
+
+    assert index.load([broken, market]) == 1
+    assert index.get_odds("BTC", "up", "1h")["market_id"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_get_btc_price_up_odds_reads_index(monkeypatch):
+    index = _index()
+    index.load([_market("2", "Bitcoin Up or Down 1 hour", yes="0.65")])
+    monkeypatch.setattr(
+        "app.integrations.market_data.polymarket_index.get_polymarket_index", lambda: index
+    )
+    client = PolymarketMarketDataClient()
+    client.search_markets = AsyncMock()
+
+    odds = await client.get_btc_price_up_odds("1h")
+
+    assert odds["probability"] == 0.65
+    assert odds["market_id"] == "2"
+    client.search_markets.assert_not_awaited()
+    assert await client.get_btc_price_up_odds("15m") is None
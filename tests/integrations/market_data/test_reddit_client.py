@@ -0,0 +1,59 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.integrations.market_data.reddit_client import RedditGuerrillaClient
+
+
+def _listing(*posts):
+    return {"data": {"children": [{"data": post} for post in posts]}}
+
+
+def _response(status_code=200, payload=None, headers=None):
+    return SimpleNamespace(status_code=status_code, headers=headers or {}, json=lambda: payload)
+
+
+def _client(responses):
+    client = RedditGuerrillaClient()
+    http = SimpleNamespace(get=AsyncMock(side_effect=responses))
+    client._get_client = AsyncMock(return_value=http)
+    return client, http
+
+
+@pytest.mark.asyncio
+async def test_shared_subreddits_are_fetched_once_for_all_symbols():
+    def respond(url, params=None, headers=None):
+        sub = url.split("/r/")[1].split("/")[0]
+        return _response(payload=_listing(
+            {"id": f"{sub}-1", "title": "BTC to the moon", "ups": 10, "subreddit": sub},
+            {"id": "shared", "title": "market dump", "ups": 5, "subreddit": sub},
+            {"id": "mod", "title": "rules", "stickied": True},
+        ))
+
+    client, http = _client(respond)
+
+    results = await asyncio.gather(*(client.get_symbol_sentiment(symbol, limit=10) for symbol in ("FOO", "BAR")))
+
+    # Both unknown symbols map to r/CryptoCurrency + r/CryptoMarkets
+    assert http.get.await_count == 2
+    for result in results:
+        assert result["mention_volume"] == 3  # the cross-posted id is counted once
+        assert result["sentiment"] == "positive"
+
+
+@pytest.mark.asyncio
+async def test_expired_listing_is_revalidated_with_conditional_headers():
+    client, http = _client([
+        _response(payload=_listing({"id": "a", "title": "pump", "ups": 1}), headers={"ETag": '"v1"', "Last-Modified": "Sat, 17 Jan 2026 10:00:00 GMT"}),
+        _response(status_code=304),
+    ])
+
+    first = await client._fetch_subreddit_hot("Bitcoin")
+    client._feeds["bitcoin"]["fetched_at"] -= client.cache_ttl_seconds + 1
+    second = await client._fetch_subreddit_hot("Bitcoin")
+
+    assert [p["id"] for p in first] == [p["id"] for p in second] == ["a"]
+    headers = http.get.await_args_list[1].kwargs["headers"]
+    assert headers == {"If-None-Match": '"v1"', "If-Modified-Since": "Sat, 17 Jan 2026 10:00:00 GMT"}
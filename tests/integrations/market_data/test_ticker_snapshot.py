@@ -0,0 +1,77 @@
+"""
+Ticker Snapshot Tests
+
+Subset lookups and single-flight refresh for the shared 24h ticker table.
+All responses are mocked - no real API calls.
+"""
+
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.integrations.market_data import ticker_snapshot
+from app.integrations.market_data.ticker_snapshot import TickerSnapshot
+
+
+def _rest_row(symbol: str, price: str) -> dict:
+    return {
+        "symbol": symbol,
+        "lastPrice": price,
+        "priceChange": "1.5",
+        "priceChangePercent": "0.5",
+        "highPrice": price,
+        "lowPrice": price,
+        "quoteVolume": "1000",
+    }
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    async def _unavailable():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(ticker_snapshot, "get_redis_client", _unavailable)
+
+
+@pytest.mark.asyncio
+async def test_get_tickers_serves_subset_in_request_order(monkeypatch, no_redis):
+    client = AsyncMock()
+    client.get_all_24h_tickers = AsyncMock(return_value=[
+        _rest_row("BTCUSDT", "42000.10"),
+        _rest_row("ETHUSDT", "2500.00"),
+        _rest_row("SOLUSDT", "100.00"),
+    ])
+    monkeypatch.setattr(ticker_snapshot, "get_binance_client", lambda: client)
+    snapshot = TickerSnapshot(ttl_seconds=60)
+
+    tickers = await snapshot.get_tickers(["SOL/USDT", "BTC/USDT", "DOGE/USDT"])
+
+    assert [t.symbol for t in tickers] == ["SOL/USDT", "BTC/USDT"]
+    assert tickers[1].price == Decimal("42000.10")
+
+    # Fresh table: second lookup does not hit Binance again
+    await snapshot.get_tickers(["ETHUSDT"])
+    client.get_all_24h_tickers.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_are_single_flight(monkeypatch, no_redis):
+    calls = 0
+
+    async def _fetch_all():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [_rest_row("BTCUSDT", "1")]
+
+    client = AsyncMock()
+    client.get_all_24h_tickers = _fetch_all
+    monkeypatch.setattr(ticker_snapshot, "get_binance_client", lambda: client)
+    snapshot = TickerSnapshot(ttl_seconds=60)
+
+    results = await asyncio.gather(*[snapshot.get_tickers(["BTC/USDT"]) for _ in range(5)])
+
+    assert calls == 1
+    assert all(len(r) == 1 for r in results)
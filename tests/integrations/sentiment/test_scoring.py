@@ -0,0 +1,70 @@
+import random
+
+from app.integrations.market_data.polymarket_client import PolymarketMarketDataClient
+from app.integrations.market_data.reddit_client import RedditGuerrillaClient
+from app.integrations.sentiment.scoring import (
+    BEARISH_WORDS,
+    BULLISH_WORDS,
+    DEFAULT_SCORER,
+    compile_keyword_pattern,
+)
+
+
+def _reference_score(text, bullish_words, bearish_words, phrases=()):
+    text_lower = text.lower()
+    words = set(text_lower.split())
+    bullish_count = len(words & bullish_words)
+    bearish_count = len(words & bearish_words)
+    for phrase in phrases:
+        if phrase in text_lower:
+            if phrase == "rug pull":
+                bearish_count += 2
+            else:
+                bullish_count += 2
+    if bullish_count + bearish_count == 0:
+        return 0.0
+    return (bullish_count - bearish_count) / (bullish_count + bearish_count)
+
+
+def _texts(count=500, seed=3):
+    rng = random.Random(seed)
+    vocab = sorted(RedditGuerrillaClient.BULLISH_WORDS | RedditGuerrillaClient.BEARISH_WORDS)
+    vocab += ["the", "btc", "Moon!", "UP", "to the moon", "rug pull", "drug pulls", "all time high", "\t", "\n"]
+    return [" ".join(rng.choice(vocab) for _ in range(rng.randint(0, 30))) for _ in range(count)]
+
+
+def test_scores_match_keyword_set_intersection():
+    texts = _texts()
+    reddit_phrases = ["rug pull", "all time high", "to the moon"]
+
+    for text in texts:
+        assert DEFAULT_SCORER.score_text(text) == _reference_score(text, BULLISH_WORDS, BEARISH_WORDS)
+        assert RedditGuerrillaClient.SCORER.score_text(text) == _reference_score(
+            text,
+            RedditGuerrillaClient.BULLISH_WORDS,
+            RedditGuerrillaClient.BEARISH_WORDS,
+            reddit_phrases,
+        )
+
+    expected = [_reference_score(t, BULLISH_WORDS, BEARISH_WORDS) for t in texts]
+    assert DEFAULT_SCORER.average(texts) == sum(expected) / len(expected)
+    assert DEFAULT_SCORER.average([]) == 0.0
+
+
+def test_keyword_pattern_matches_substring_any():
+    keywords = ["up", "down", "price", "higher"]
+    pattern = compile_keyword_pattern(keywords)
+
+    for text in ["bitcoin up or down", "supper", "no match", "pricey", "", "high"]:
+        assert bool(pattern.search(text)) == any(kw in text for kw in keywords)
+
+
+def test_timeframe_detection_uses_every_field():
+    client = PolymarketMarketDataClient()
+
+    assert client._detect_timeframe({"slug": "btc-updown-15m"}, "15m")
+    assert client._detect_timeframe({"slug": "x", "tags": ["1 hour"]}, "1h")
+    assert client._detect_timeframe({"slug": "x", "question": "Bitcoin Up or Down 3:00AM-3:15AM"}, "15m")
+    assert not client._detect_timeframe({"slug": "x", "question": "Bitcoin Up or Down 3:00AM-3:15AM"}, "1h")
+    # Patterns never match across field boundaries
+    assert not client._detect_timeframe({"slug": "btc-15", "tags": ["min"]}, "15m")
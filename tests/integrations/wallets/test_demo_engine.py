@@ -0,0 +1,163 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.integrations.market_data import binance_stream
+from app.integrations.market_data.binance_stream import MarketBook
+from app.integrations.wallets.base import InsufficientFundsError, OrderSide, OrderType
+from app.integrations.wallets.demo_engine import DemoTradingEngine, depth_slippage_rate
+from app.integrations.wallets.demo_wallet import DemoWallet
+
+
+def _state():
+    return {
+        "_id": "state_1",
+        "user_wallet_id": "uw_1",
+        "cash_balances": {"USDT": 10000.0},
+        "asset_balances": {},
+        "locked_balances": {},
+        "open_orders": [],
+        "transaction_history": [],
+        "total_fees_paid": 0.0,
+        "total_trades": 0,
+        "fee_rate": 0.001,
+        "slippage_rate": 0.0,
+        "depth_impact_rate": 0.0,
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc),
+    }
+
+
+def _wallet(engine, db):
+    wallet = DemoWallet(
+        wallet_id="demo",
+        user_wallet_id="uw_1",
+        credentials={},
+        slippage_rate=0.0,
+        depth_impact_rate=0.0,
+    )
+    wallet.engine = engine
+    wallet.db = db
+    return wallet
+
+
+def _db():
+    db = MagicMock()
+    db.demo_wallet_state = AsyncMock()
+    db.demo_wallet_state.find_one.return_value = _state()
+    db.demo_wallet_state.update_one.return_value = SimpleNamespace(modified_count=1)
+    return db
+
+
+def test_depth_slippage_scales_with_top_of_book_size():
+    base = Decimal("0.0001")
+    assert depth_slippage_rate(Decimal("1"), None, base, Decimal("0.001")) == base
+    assert depth_slippage_rate(Decimal("2"), Decimal("1"), base, Decimal("0.001")) == Decimal("0.0021")
+
+
+@pytest.mark.asyncio
+async def test_market_fills_are_one_guarded_update_each():
+    engine = DemoTradingEngine()
+    engine.running = True
+    db = _db()
+    wallet = _wallet(engine, db)
+
+    for _ in range(3):
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(wallet, "_get_market_price_placeholder", AsyncMock(return_value=Decimal("100")))
+            await wallet.place_order("BTC/USDT", OrderSide.BUY, OrderType.MARKET, Decimal("1"))
+
+    assert await wallet.get_balance("BTC") == Decimal("3")
+    db.demo_wallet_state.find_one.assert_awaited_once()
+    assert db.demo_wallet_state.update_one.await_count == 3
+
+    # Exact new balances, only written while the stored ones are unchanged
+    fill_filter, update = db.demo_wallet_state.update_one.await_args_list[0].args
+    assert fill_filter == {"user_wallet_id": "uw_1", "cash_balances.USDT": 10000.0, "asset_balances.BTC": None}
+    assert update["$set"]["asset_balances.BTC"] == 1.0
+    assert update["$set"]["cash_balances.USDT"] == 9899.9
+    assert update["$inc"] == {"total_trades": 1, "total_fees_paid": pytest.approx(0.1)}
+
+
+@pytest.mark.asyncio
+async def test_market_fill_rejected_when_balance_was_spent_elsewhere():
+    engine = DemoTradingEngine()
+    db = _db()
+    spent = {**_state(), "cash_balances": {"USDT": 50.0}}
+    db.demo_wallet_state.find_one.side_effect = [_state(), spent]
+    db.demo_wallet_state.update_one.return_value = SimpleNamespace(modified_count=0)
+    wallet = _wallet(engine, db)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(wallet, "_get_market_price_placeholder", AsyncMock(return_value=Decimal("100")))
+        with pytest.raises(InsufficientFundsError):
+            await wallet.place_order("BTC/USDT", OrderSide.BUY, OrderType.MARKET, Decimal("1"))
+
+    # The conflict reloaded the stored state, which no longer covers the fill
+    db.demo_wallet_state.update_one.assert_awaited_once()
+    assert await wallet.get_balance("USDT") == Decimal("50.0")
+    assert await wallet.get_balance("BTC") == Decimal("0")
+
+
+@pytest.mark.asyncio
+async def test_stored_balances_match_the_cache_so_a_full_sell_fills():
+    engine = DemoTradingEngine()
+    db = AsyncMongoMockClient()["moniqo_test"]
+    wallet = _wallet(engine, db)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(wallet, "_get_market_price_placeholder", AsyncMock(return_value=Decimal("100")))
+        for quantity, side in (("0.1", OrderSide.BUY), ("0.7", OrderSide.BUY), ("0.8", OrderSide.SELL)):
+            await wallet.place_order("BTC/USDT", side, OrderType.MARKET, Decimal(quantity))
+
+    stored = await db.demo_wallet_state.find_one({"user_wallet_id": "uw_1"})
+    # A float $inc would store 0.1 + 0.7 = 0.7999999999999999 and reject the sell
+    assert stored["asset_balances"]["BTC"] == 0.0
+    assert stored["asset_balances"] == engine.accounts["uw_1"].state["asset_balances"]
+    assert stored["cash_balances"] == engine.accounts["uw_1"].state["cash_balances"]
+    assert stored["total_trades"] == 3
+
+
+@pytest.mark.asyncio
+async def test_balance_adjustments_are_checked_against_the_stored_balance():
+    engine = DemoTradingEngine()
+    db = _db()
+    db.demo_wallet_state.find_one.side_effect = [_state(), {**_state(), "cash_balances": {"USDT": 10.0}}]
+    db.demo_wallet_state.update_one.return_value = SimpleNamespace(modified_count=0)
+    wallet = _wallet(engine, db)
+
+    with pytest.raises(InsufficientFundsError):
+        await wallet._update_balance("USDT", Decimal("-100"), is_cash=True)
+
+    update_filter, update = db.demo_wallet_state.update_one.await_args.args
+    assert update_filter == {"user_wallet_id": "uw_1", "cash_balances.USDT": 10000.0}
+    assert update["$set"]["cash_balances.USDT"] == 9900.0
+
+
+@pytest.mark.asyncio
+async def test_open_orders_fill_when_live_price_crosses(monkeypatch):
+    book = MarketBook()
+    monkeypatch.setattr(binance_stream, "_market_book", book)
+    engine = DemoTradingEngine()
+    db = _db()
+    wallet = _wallet(engine, db)
+
+    await wallet.place_order("BTC/USDT", OrderSide.BUY, OrderType.LIMIT, Decimal("1"), price=Decimal("95"))
+    book.update_trade("BTCUSDT", "96")
+    assert await engine.match_once() == 0
+
+    book.update_trade("BTCUSDT", "94")
+    assert await engine.match_once() == 1
+
+    state = await wallet._load_state()
+    assert state["open_orders"] == []
+    assert state["asset_balances"]["BTC"] == 1.0
+    assert state["transaction_history"][-1]["price"] == 94.0
+    claim_filter, update = db.demo_wallet_state.update_one.await_args.args
+    assert "open_orders.order_id" in claim_filter
+    assert claim_filter["cash_balances.USDT"] == 10000.0
+    assert "$pull" in update and "$inc" in update
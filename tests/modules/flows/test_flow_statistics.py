@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+
+from app.modules.flows import service as flow_service
+
+
+def _make_db():
+    flows = MagicMock()
+    flows.find_one = AsyncMock()
+    flows.update_one = AsyncMock(return_value=SimpleNamespace(matched_count=1))
+    rollup = MagicMock()
+    rollup.update_one = AsyncMock()
+    positions = MagicMock()
+    positions.find_one = AsyncMock(return_value=None)
+    collections = {
+        flow_service.FLOWS_COLLECTION: flows,
+        flow_service.FLOW_STATS_DAILY_COLLECTION: rollup,
+        flow_service.POSITIONS_COLLECTION: positions,
+    }
+    return collections, MagicMock(__getitem__=lambda self, name: collections[name])
+
+
+@pytest.mark.asyncio
+async def test_update_flow_statistics_is_single_pipeline_write():
+    collections, db = _make_db()
+    flow_id = str(ObjectId())
+    completed_at = datetime(2026, 1, 17, 12, 0, tzinfo=timezone.utc)
+
+    await flow_service._update_flow_statistics(
+        db=db,
+        flow_id=flow_id,
+        position_id=str(ObjectId()),
+        completed_at=completed_at,
+        increment_executions=False,
+        realized_pnl_usd=12.5,
+        realized_pnl_percent=2.5,
+    )
+
+    flows = collections[flow_service.FLOWS_COLLECTION]
+    flows.find_one.assert_not_called()
+    collections[flow_service.POSITIONS_COLLECTION].find_one.assert_not_called()
+    flows.update_one.assert_awaited_once()
+
+    _, pipeline = flows.update_one.await_args.args
+    assert isinstance(pipeline, list) and len(pipeline) == 2
+    counters = pipeline[0]["$set"]
+    assert counters["winning_trades"] == {"$add": [{"$ifNull": ["$winning_trades", 0]}, 1]}
+    assert counters["closed_trades"] == {"$add": [{"$ifNull": ["$closed_trades", 0]}, 1]}
+    assert "total_executions" not in counters
+    assert set(pipeline[1]["$set"]) == {"win_rate", "avg_pnl_usd", "total_pnl_percent"}
+
+    rollup_filter, rollup_update = collections[flow_service.FLOW_STATS_DAILY_COLLECTION].update_one.await_args.args
+    assert rollup_filter == {"flow_id": ObjectId(flow_id), "day": "2026-01-17"}
+    assert rollup_update["$inc"]["total_pnl_usd"] == 12.5
+
+
+@pytest.mark.asyncio
+async def test_update_flow_statistics_execution_only_skips_trade_counters():
+    collections, db = _make_db()
+
+    await flow_service._update_flow_statistics(db=db, flow_id=str(ObjectId()))
+
+    _, pipeline = collections[flow_service.FLOWS_COLLECTION].update_one.await_args.args
+    counters = pipeline[0]["$set"]
+    assert "total_executions" in counters
+    assert "successful_executions" in counters
+    assert "closed_trades" not in counters
+    assert "winning_trades" not in counters
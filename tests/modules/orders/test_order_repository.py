@@ -0,0 +1,56 @@
+"""
+Order Repository Tests
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+
+from app.modules.orders.repository import OrderRecord, OrderRepository
+
+
+def test_order_record_decodes_amounts():
+    record = OrderRecord.from_doc({
+        "_id": ObjectId(),
+        "status": "partially_filled",
+        "requested_amount": 1.5,
+        "filled_amount": Decimal128("0.5"),
+        "remaining_amount": "1.0",
+        "limit_price": None,
+    })
+
+    assert record.requested_amount == Decimal("1.5")
+    assert record.filled_amount == Decimal("0.5")
+    assert record.remaining_amount == Decimal("1.0")
+    assert record.limit_price is None
+    assert record.is_open() and not record.is_complete()
+
+
+@pytest.mark.asyncio
+async def test_iter_open_streams_projected_orders():
+    user_id = ObjectId()
+    order_ids = [ObjectId(), ObjectId()]
+
+    async def _docs():
+        for oid in order_ids:
+            yield {"_id": oid, "symbol": "BTC/USDT", "status": "open"}
+
+    collection = MagicMock()
+    collection.find.return_value = _docs()
+    repository = OrderRepository({"orders": collection})
+
+    orders = [order async for order in repository.iter_open(user_id=str(user_id), batch_size=50)]
+
+    assert [order.id for order in orders] == order_ids
+    assert orders[0].symbol == "BTC/USDT" and orders[0].is_open()
+    query, fields = collection.find.call_args.args
+    assert fields == {"symbol": 1, "status": 1}
+    assert collection.find.call_args.kwargs == {"batch_size": 50}
+    assert query["user_id"] == user_id
+    assert query["status"]["$in"] == ["pending", "submitted", "open", "partially_filled"]
@@ -0,0 +1,224 @@
+"""
+Position Repository Tests
+
+Record decoding, projected reads, and the tracker's single read path.
+
+Author: Moniqo Team
+Last Updated: 2026-01-17
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+
+from app.modules.positions.repository import MONITOR_FIELDS, PositionRecord, PositionRepository
+from app.services.position_tracker import PositionTrackerService
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs.sort(key=lambda d: d.get(key) or datetime.min, reverse=direction < 0)
+        return self
+
+    def skip(self, n):
+        self.docs = self.docs[n:]
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    """Equality-only query matching; records the projections it was asked for."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.projections = []
+        self.batch_sizes = []
+        self.updates = []
+
+    def _matches(self, doc, query):
+        return all(doc.get(key) == value for key, value in query.items())
+
+    def _project(self, doc, fields):
+        if not fields:
+            return dict(doc)
+        return {k: v for k, v in doc.items() if k == "_id" or k in fields}
+
+    async def find_one(self, query, fields=None):
+        self.projections.append(fields)
+        for doc in self.docs:
+            if self._matches(doc, query):
+                return self._project(doc, fields)
+        return None
+
+    def find(self, query, fields=None, batch_size=None):
+        self.projections.append(fields)
+        self.batch_sizes.append(batch_size)
+        return FakeCursor([self._project(d, fields) for d in self.docs if self._matches(d, query)])
+
+    async def count_documents(self, query):
+        return sum(1 for d in self.docs if self._matches(d, query))
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+
+
+def _position_doc(**overrides):
+    doc = {
+        "_id": ObjectId(),
+        "user_id": ObjectId(),
+        "user_wallet_id": ObjectId(),
+        "flow_id": None,
+        "symbol": "BTC/USDT",
+        "side": "long",
+        "status": "open",
+        "entry": {"price": 100.0, "amount": "2", "value": 200, "fees": 1},
+        "current": {"price": 100.0, "high_water_mark": 105.0, "low_water_mark": 95.0},
+        "ai_monitoring": {"last_signal": {"score": 0.5}},
+        "opened_at": datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=30),
+        "deleted_at": None,
+    }
+    doc.update(overrides)
+    return doc
+
+
+def test_record_decodes_entry_numbers_once():
+    record = PositionRecord.from_doc(_position_doc())
+
+    assert record.entry_price == Decimal("100.0")
+    assert record.entry_amount == Decimal("2")
+    assert record.entry_fees == Decimal("1")
+    assert record.opened_at.tzinfo is timezone.utc
+    assert record.is_open() and record.is_monitored()
+    assert not hasattr(record, "__dict__")
+
+
+def test_record_tolerates_projected_documents():
+    record = PositionRecord.from_doc({"_id": ObjectId(), "status": "opening"})
+
+    assert record.entry_price == Decimal("0")
+    assert record.current == {}
+    assert record.is_monitored() and not record.is_open()
+
+
+@pytest.mark.asyncio
+async def test_get_applies_projection_and_skips_invalid_ids():
+    doc = _position_doc()
+    collection = FakeCollection([doc])
+    repository = PositionRepository({"positions": collection})
+
+    record = await repository.get(str(doc["_id"]), fields=MONITOR_FIELDS)
+
+    assert record.symbol == "BTC/USDT"
+    assert record.ai_monitoring == {}  # not in the projection
+    assert collection.projections[-1] == {field: 1 for field in MONITOR_FIELDS}
+    assert await repository.get("not-an-id") is None
+
+
+@pytest.mark.asyncio
+async def test_list_for_user_pages_newest_first():
+    user_id = ObjectId()
+    now = datetime.now(timezone.utc)
+    docs = [_position_doc(user_id=user_id, opened_at=now - timedelta(hours=i)) for i in range(3)]
+    docs.append(_position_doc())
+    repository = PositionRepository({"positions": FakeCollection(docs)})
+
+    records, total = await repository.list_for_user(str(user_id), skip=1, limit=1)
+
+    assert total == 3
+    assert [r.id for r in records] == [docs[1]["_id"]]
+
+
+@pytest.mark.asyncio
+async def test_monitor_position_reads_once_and_skips_beanie(monkeypatch):
+    doc = _position_doc()
+    collection = FakeCollection([doc])
+    tracker = PositionTrackerService({"positions": collection})
+    publisher = MagicMock(emit_position_update=AsyncMock())
+    monkeypatch.setattr("app.services.position_tracker.get_socket_publisher", lambda: publisher)
+    monkeypatch.setattr(tracker, "_get_live_price", lambda symbol: Decimal("110"))
+    beanie_get = AsyncMock()
+    monkeypatch.setattr("app.services.position_tracker.Position.get", beanie_get)
+
+    result = await tracker.monitor_position(str(doc["_id"]))
+
+    assert result["success"] is True
+    # (110 - 100) * 2 - 1 fee = 19 on 200 entry value
+    assert result["unrealized_pnl"] == 19.0
+    assert result["unrealized_pnl_percent"] == 9.5
+    assert len(collection.projections) == 1
+    (query, update), = collection.updates
+    current = update["$set"]["current"]
+    assert current["high_water_mark"] == 110.0 and current["low_water_mark"] == 95.0
+    assert current["time_held_minutes"] == 30
+    publisher.emit_position_update.assert_awaited_once()
+    beanie_get.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_monitor_position_missing_and_closed():
+    closed = _position_doc(status="closed")
+    tracker = PositionTrackerService({"positions": FakeCollection([closed])})
+
+    missing = await tracker.monitor_position(str(ObjectId()))
+    not_open = await tracker.monitor_position(str(closed["_id"]))
+
+    assert missing == {"success": False, "error": "Position not found"}
+    assert not_open["message"] == "Position is not open" and not_open["status"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_monitor_all_positions_streams_projected_records(monkeypatch):
+    docs = [_position_doc(), _position_doc(), _position_doc(status="closed")]
+    collection = FakeCollection(docs)
+    tracker = PositionTrackerService({"positions": collection})
+    monkeypatch.setattr("app.services.position_tracker.get_socket_publisher", lambda: MagicMock(emit_position_update=AsyncMock()))
+    monkeypatch.setattr(tracker, "_get_live_price", lambda symbol: Decimal("100"))
+    monkeypatch.setattr(collection, "find_one", AsyncMock(side_effect=AssertionError("no per-position fetch")))
+
+    results = await tracker.monitor_all_positions()
+
+    assert results["total_positions"] == 2
+    assert results["updated"] == 2
+    assert collection.projections == [{field: 1 for field in MONITOR_FIELDS}]
+    assert collection.batch_sizes == [200]
+    assert len(collection.updates) == 2
+
+
+@pytest.mark.asyncio
+async def test_monitor_all_positions_prices_each_symbol_once_per_tick(monkeypatch):
+    docs = [_position_doc(), _position_doc(side="short"), _position_doc(symbol="ETH/USDT")]
+    collection = FakeCollection(docs)
+    tracker = PositionTrackerService({"positions": collection})
+    monkeypatch.setattr("app.services.position_tracker.get_socket_publisher", lambda: MagicMock(emit_position_update=AsyncMock()))
+    monkeypatch.setattr("app.services.position_tracker.cursor_batch_size", lambda: 2)
+    resolve_price = AsyncMock(side_effect=lambda symbol, wallet_id, position_id: {"BTC/USDT": 110.0}.get(symbol))
+    monkeypatch.setattr(tracker, "_resolve_price", resolve_price)
+
+    results = await tracker.monitor_all_positions()
+
+    assert [call.args[0] for call in resolve_price.await_args_list] == ["BTC/USDT", "ETH/USDT"]
+    assert results["updated"] == 2 and results["errors"] == 1
+    long_result, short_result, eth_result = (d["result"] for d in results["details"])
+    assert long_result["unrealized_pnl"] == 19.0
+    # Short: (100 - 110) * 2 - 1
+    assert short_result["unrealized_pnl"] == -21.0 and short_result["risk_level"] == "critical"
+    assert eth_result == {"success": False, "error": "Failed to get market price"}
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from app.services.backtest import BacktestConfig, CandleArrays, indicator_signals, run_backtest
+from app.services.indicators import calculate_all_indicators
+
+
+def _candles(close):
+    close = np.asarray(close, dtype=float)
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    return CandleArrays.from_columns({
+        "time": np.arange(len(close)) * 60.0,
+        "open": open_,
+        "high": np.maximum(open_, close),
+        "low": np.minimum(open_, close),
+        "close": close,
+        "volume": np.ones(len(close)),
+    })
+
+
+def test_vectorized_signals_match_calculate_all_indicators():
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 160)))
+    signals = indicator_signals(close)
+    summaries = {"bullish": 1, "bearish": -1, "neutral": 0}
+
+    for i in range(len(close)):
+        expected = calculate_all_indicators(close[: i + 1].tolist())
+        assert signals["buy"][i] == expected["signals"]["buy"]
+        assert signals["sell"][i] == expected["signals"]["sell"]
+        assert signals["summary"][i] == summaries[expected["summary"]]
+
+
+def test_uptrend_takes_profit_with_fees():
+    close = np.concatenate([np.full(60, 100.0), np.linspace(100, 130, 120)])
+    result = run_backtest(_candles(close), BacktestConfig(take_profit_percent=3, stop_loss_percent=50))
+
+    stats = result.stats
+    assert stats["closed_trades"] > 0
+    assert stats["winning_trades"] == stats["closed_trades"]
+    assert stats["win_rate"] == 100.0
+    assert result.trades[0]["exit_reason"] == "take_profit"
+    # Fees and slippage keep each trade below the raw 3% move
+    assert 0 < result.trades[0]["pnl_percent"] < 3.0
+    assert stats["final_equity"] == pytest.approx(10000 + stats["total_pnl_usd"], abs=0.01)
+    assert len(result.equity) == len(close)
+
+
+def test_risk_limits_block_entries():
+    close = np.concatenate([np.full(60, 100.0), np.linspace(100, 130, 120)])
+    result = run_backtest(
+        _candles(close),
+        BacktestConfig(order_size_usd=500, risk_limits={"max_position_size_usd": 100}),
+    )
+
+    assert result.stats["total_executions"] > 0
+    assert result.stats["successful_executions"] == 0
+    assert result.trades == []
+
+
+def test_llm_stub_mode_is_deterministic():
+    rng = np.random.default_rng(11)
+    candles = _candles(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500))))
+    config = BacktestConfig(llm_stub=True, llm_stub_seed=3, swarm_runs=5, swarm_min_agreement=60)
+
+    assert run_backtest(candles, config).stats == run_backtest(candles, config).stats
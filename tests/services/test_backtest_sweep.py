@@ -0,0 +1,88 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.modules.flows.schemas import ParameterSweepRequest
+from app.services.backtest import (
+    BacktestConfig,
+    CandleArrays,
+    expand_grid,
+    run_backtest,
+    run_parameter_sweep,
+    sweep_worker_limit,
+    trial_config,
+)
+from app.services.backtest import sweep
+
+
+def _candles(n=400, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    return CandleArrays.from_columns({
+        "time": np.arange(n) * 60.0,
+        "open": open_,
+        "high": np.maximum(open_, close),
+        "low": np.minimum(open_, close),
+        "close": close,
+        "volume": np.ones(n),
+    })
+
+
+def test_expand_grid_splits_config_and_indicator_params():
+    trials = expand_grid({"stop_loss_percent": [1, 2], "rsi_period": [7, 14, 21]})
+
+    assert len(trials) == 6
+    config = trial_config(BacktestConfig(), trials[0])
+    assert config.stop_loss_percent == 1
+    assert config.indicator_params == {"rsi_period": 7}
+
+    with pytest.raises(ValueError):
+        expand_grid({"not_a_param": [1]})
+    with pytest.raises(ValueError):
+        expand_grid({"rsi_period": []})
+
+
+@pytest.mark.asyncio
+async def test_sweep_streams_ranked_results():
+    candles = _candles()
+    base = BacktestConfig(llm_stub=True, llm_stub_seed=1)
+    trials = expand_grid({"swarm_min_agreement": [0, 60], "take_profit_percent": [1, 3]})
+
+    jobs = MagicMock()
+    jobs.update_one = AsyncMock()
+    results = MagicMock()
+    results.insert_one = AsyncMock()
+    db = MagicMock()
+    db.__getitem__.side_effect = lambda name: jobs if name == "backtest_sweeps" else results
+
+    await run_parameter_sweep(db, "job-1", candles, base, trials, max_workers=2)
+
+    # Every trial is stored with the same stats a direct backtest gives
+    docs = [call.args[0] for call in results.insert_one.await_args_list]
+    assert len(docs) == len(trials)
+    for doc in docs:
+        expected = run_backtest(candles, trial_config(base, doc["params"])).stats
+        assert doc["stats"] == expected
+        assert doc["score"] == expected["total_pnl_usd"]
+
+    updates = [call.args[1] for call in jobs.update_one.await_args_list]
+    assert updates[-1]["$set"]["status"] == "completed"
+    pushes = [u["$push"]["top"] for u in updates if "$push" in u]
+    assert len(pushes) == len(trials)
+    assert pushes[0]["$sort"] == {"score": -1}
+
+
+def test_worker_count_is_capped_by_the_server(monkeypatch):
+    monkeypatch.setattr(sweep, "get_settings", lambda: SimpleNamespace(BACKTEST_SWEEP_MAX_WORKERS=3))
+    assert sweep_worker_limit() == 3
+    monkeypatch.setattr(sweep, "get_settings", lambda: SimpleNamespace(BACKTEST_SWEEP_MAX_WORKERS=0))
+    assert sweep_worker_limit() >= 1
+
+    grid = {"rsi_period": [7]}
+    with pytest.raises(ValidationError):
+        ParameterSweepRequest(start=datetime(2026, 1, 1), grid=grid, max_workers=1000)
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from app.services import conversation_events
+from app.services.conversation_events import ConversationEventBus, ConversationSubscriber
+
+
+@pytest.mark.asyncio
+async def test_subscriber_queue_is_bounded_and_reports_lag():
+    subscriber = ConversationSubscriber("exec-1", max_queue=2)
+
+    for idx in range(5):
+        subscriber.offer(json.dumps({"idx": idx}))
+
+    lagged = json.loads(await subscriber.get())
+    assert lagged["type"] == "lagged"
+    assert lagged["data"] == {"dropped": 3}
+    assert json.loads(await subscriber.get()) == {"idx": 3}
+    assert json.loads(await subscriber.get()) == {"idx": 4}
+
+
+@pytest.mark.asyncio
+async def test_publish_falls_back_to_local_viewers_without_redis(monkeypatch):
+    async def _no_redis():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(conversation_events, "get_redis_client", _no_redis)
+    bus = ConversationEventBus(max_queue=10)
+
+    async with bus.subscribe("exec-1") as subscriber:
+        published = await bus.publish("exec-1", "message", {"agent_name": "market_analyst_1"})
+        event = json.loads(await subscriber.get())
+
+    assert published is False
+    assert event == {
+        "type": "message",
+        "execution_id": "exec-1",
+        "data": {"agent_name": "market_analyst_1"},
+    }
+    assert "exec-1" not in bus._subscribers
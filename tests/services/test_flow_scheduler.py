@@ -0,0 +1,130 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+
+from app.modules.flows import service as flow_service
+from app.modules.flows.models import Flow, FlowStatus
+from app.services import flow_scheduler
+from app.services.flow_scheduler import FLOW_SCHEDULE_COLLECTION, FlowSchedulerDispatcher
+
+
+def _make_db():
+    schedule = MagicMock()
+    schedule.update_one = AsyncMock()
+    schedule.delete_one = AsyncMock(return_value=SimpleNamespace(deleted_count=1))
+    schedule.find_one_and_update = AsyncMock(return_value=None)
+    flows = MagicMock()
+    flows.update_one = AsyncMock()
+    collections = {
+        FLOW_SCHEDULE_COLLECTION: schedule,
+        flow_service.FLOWS_COLLECTION: flows,
+    }
+    return collections, MagicMock(__getitem__=lambda self, name: collections[name])
+
+
+@pytest.mark.asyncio
+async def test_schedule_auto_loop_persists_next_cycle():
+    collections, db = _make_db()
+    flow_id = str(ObjectId())
+    flow = Flow(
+        _id=flow_id,
+        name="loop",
+        symbol="BTC/USDT",
+        status=FlowStatus.ACTIVE,
+        config={"auto_loop_enabled": True, "auto_loop_delay_seconds": 30},
+    )
+
+    await flow_service._schedule_auto_loop(db, flow, "groq", None)
+
+    schedule = collections[FLOW_SCHEDULE_COLLECTION]
+    schedule.update_one.assert_awaited_once()
+    job_filter, update = schedule.update_one.await_args.args
+    assert job_filter == {"_id": f"flow_loop_{flow_id}"}
+    assert update["$set"]["flow_id"] == flow_id
+    assert update["$set"]["lease_until"] is None
+    assert schedule.update_one.await_args.kwargs["upsert"] is True
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_runs_due_job_and_keeps_rescheduled_slot(monkeypatch):
+    collections, db = _make_db()
+    flow_id = str(ObjectId())
+    job = {
+        "_id": f"flow_loop_{flow_id}",
+        "job_id": "job-1",
+        "flow_id": flow_id,
+        "model_provider": "groq",
+        "model_name": None,
+    }
+    schedule = collections[FLOW_SCHEDULE_COLLECTION]
+    schedule.find_one_and_update = AsyncMock(side_effect=[job, None])
+
+    flow = SimpleNamespace(id=flow_id, status=FlowStatus.ACTIVE)
+    monkeypatch.setattr(flow_service, "get_flow_by_id", AsyncMock(return_value=flow))
+    execute = AsyncMock()
+    monkeypatch.setattr(flow_service, "execute_flow", execute)
+
+    dispatcher = FlowSchedulerDispatcher(db, worker_id="worker-a", max_concurrency=5)
+    assert await dispatcher.dispatch_due_jobs() == 1
+    await dispatcher.drain()
+
+    execute.assert_awaited_once_with(db, flow, "groq", None)
+    claim_filter = schedule.find_one_and_update.await_args_list[0].args[0]
+    assert "$lte" in claim_filter["due_at"]
+    # Completion is guarded by job_id so a cycle rescheduled mid-run survives
+    schedule.delete_one.assert_awaited_once_with({"_id": job["_id"], "job_id": "job-1"})
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_skips_inactive_flow(monkeypatch):
+    collections, db = _make_db()
+    flow_id = str(ObjectId())
+    job = {"_id": f"flow_loop_{flow_id}", "job_id": "job-2", "flow_id": flow_id}
+    monkeypatch.setattr(
+        flow_service,
+        "get_flow_by_id",
+        AsyncMock(return_value=SimpleNamespace(id=flow_id, status=FlowStatus.PAUSED)),
+    )
+    execute = AsyncMock()
+    monkeypatch.setattr(flow_service, "execute_flow", execute)
+
+    await flow_scheduler.FlowSchedulerDispatcher(db, worker_id="worker-b").run_job(job)
+
+    execute.assert_not_called()
+    collections[FLOW_SCHEDULE_COLLECTION].delete_one.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_loop_drains_cycles_on_shutdown(monkeypatch):
+    collections, db = _make_db()
+    flow_id = str(ObjectId())
+    job = {"_id": f"flow_loop_{flow_id}", "job_id": "job-3", "flow_id": flow_id}
+    collections[FLOW_SCHEDULE_COLLECTION].find_one_and_update = AsyncMock(side_effect=[job, None])
+    collections[FLOW_SCHEDULE_COLLECTION].create_index = AsyncMock()
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def execute(*args):
+        started.set()
+        await release.wait()
+
+    monkeypatch.setattr(
+        flow_service,
+        "get_flow_by_id",
+        AsyncMock(return_value=SimpleNamespace(id=flow_id, status=FlowStatus.ACTIVE)),
+    )
+    monkeypatch.setattr(flow_service, "execute_flow", execute)
+
+    loop_task = asyncio.create_task(flow_scheduler.flow_scheduler_loop(db))
+    await started.wait()
+    loop_task.cancel()
+    asyncio.get_running_loop().call_later(0.01, release.set)
+    with pytest.raises(asyncio.CancelledError):
+        await loop_task
+
+    # The in-flight cycle finished and completed its job before the loop exited
+    collections[FLOW_SCHEDULE_COLLECTION].delete_one.assert_awaited_once()
@@ -0,0 +1,74 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo import ASCENDING
+
+from app.services.index_manager import (
+    INDEX_CATALOG,
+    HotQuery,
+    IndexSpec,
+    ensure_indexes,
+    hot_queries,
+    plan_stages,
+    verify_query_plans,
+)
+
+
+def test_catalog_covers_hot_collections():
+    collections = {spec.collection for spec in INDEX_CATALOG}
+    assert {
+        "positions", "orders", "executions", "execution_locks", "ai_conversations",
+        "agent_decisions", "demo_wallet_state", "user_wallets", "flow_schedule",
+        "backtest_sweep_results",
+    } <= collections
+    names = [(spec.collection, spec.name) for spec in INDEX_CATALOG]
+    assert len(names) == len(set(names))
+    # Every hot query's collection has at least one declared index
+    assert {query.collection for query in hot_queries()} <= collections
+
+
+def test_plan_stages_reads_classic_and_sbe_plans():
+    classic = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}
+    sbe = {"queryPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}
+    union = {"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]}
+
+    assert plan_stages(classic) == {"FETCH", "IXSCAN"}
+    assert plan_stages(sbe) == {"SORT", "COLLSCAN"}
+    assert plan_stages(union) == {"OR", "IXSCAN", "COLLSCAN"}
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_continues_past_failures():
+    ok = MagicMock(create_indexes=AsyncMock())
+    conflict = MagicMock(create_indexes=AsyncMock(side_effect=Exception("IndexOptionsConflict")))
+    db = {"a": ok, "b": conflict}
+    catalog = (
+        IndexSpec("b", (("x", ASCENDING),), "x"),
+        IndexSpec("a", (("y", ASCENDING),), "y"),
+    )
+
+    report = await ensure_indexes(db, catalog)
+
+    assert report == {"created": ["a.y"], "failed": ["b.x"]}
+    (models,), _ = ok.create_indexes.call_args
+    assert models[0].document["name"] == "y"
+
+
+@pytest.mark.asyncio
+async def test_verify_query_plans_flags_collscan():
+    def _collection(stage):
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.explain = AsyncMock(return_value={"queryPlanner": {"winningPlan": {"stage": stage}}})
+        return MagicMock(find=MagicMock(return_value=cursor))
+
+    db = {"indexed": _collection("IXSCAN"), "scanned": _collection("COLLSCAN")}
+    queries = [
+        HotQuery("fast", "indexed", {"status": "open"}, (("opened_at", -1),)),
+        HotQuery("slow", "scanned", {"status": "open"}),
+    ]
+
+    results = await verify_query_plans(db, queries)
+
+    assert [(r["name"], r["collscan"]) for r in results] == [("fast", False), ("slow", True)]
+    db["indexed"].find.return_value.sort.assert_called_once_with([("opened_at", -1)])
@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from bson import ObjectId
+
+from app.modules.positions.repository import PositionRecord
+from app.services.pnl_engine import RISK_LEVELS, PositionBook, risk_levels
+
+
+def _record(symbol="BTC/USDT", side="long", price=100.0, amount=2, fees=1, value=None, current=None):
+    return PositionRecord.from_doc({
+        "_id": ObjectId(),
+        "symbol": symbol,
+        "side": side,
+        "status": "open",
+        "entry": {"price": price, "amount": str(amount), "value": value if value is not None else price * amount, "fees": fees},
+        "current": current if current is not None else {},
+    })
+
+
+def _decimal_pnl(record, price):
+    """Reference: the Decimal formula the monitor used before."""
+    price = Decimal(str(price))
+    if record.side == "long":
+        pnl = (price - record.entry_price) * record.entry_amount
+    else:
+        pnl = (record.entry_price - price) * record.entry_amount
+    pnl -= record.entry_fees
+    return pnl, pnl / record.entry_value * 100
+
+
+def test_evaluate_matches_decimal_math_for_long_and_short():
+    records = [
+        _record(side="long", price=97250.5, amount=0.0123, fees=1.19),
+        _record(side="short", price=97250.5, amount=0.0123, fees=1.19),
+        _record(symbol="ETH/USDT", side="short", price=3120.25, amount=1.5, fees=0.5),
+    ]
+    prices = {"BTC/USDT": 96001.75, "ETH/USDT": 3200.0}
+
+    snapshot = PositionBook(records).evaluate(prices)
+
+    for index, record in enumerate(records):
+        row = snapshot.row(index)
+        pnl, percent = _decimal_pnl(record, prices[record.symbol])
+        assert row["price"] == prices[record.symbol]
+        assert row["unrealized_pnl"] == pytest.approx(float(pnl), rel=1e-12)
+        assert row["unrealized_pnl_percent"] == pytest.approx(float(percent), rel=1e-12)
+        assert row["value"] == pytest.approx(float(record.entry_amount) * prices[record.symbol])
+
+
+def test_water_marks_drawdown_and_unpriced_symbols():
+    records = [
+        _record(current={"high_water_mark": 105.0, "low_water_mark": 95.0}),
+        _record(current={}),
+        _record(symbol="SOL/USDT"),
+    ]
+
+    snapshot = PositionBook(records).evaluate({"BTC/USDT": 110.0})
+
+    first, second = snapshot.row(0), snapshot.row(1)
+    assert (first["high_water_mark"], first["low_water_mark"]) == (110.0, 95.0)
+    assert first["max_drawdown_percent"] == pytest.approx((110 - 95) / 110 * 100)
+    # No stored water marks: the price is both
+    assert (second["high_water_mark"], second["low_water_mark"], second["max_drawdown_percent"]) == (110.0, 110.0, 0.0)
+    assert snapshot.row(2) is None
+    assert len(snapshot) == 3
+
+
+def test_zero_entry_value_and_risk_levels():
+    snapshot = PositionBook([_record(value=0)]).evaluate({"BTC/USDT": 50.0})
+    assert snapshot.row(0)["unrealized_pnl_percent"] == 0.0
+    assert snapshot.row(0)["risk_level"] == "low"
+
+    levels = risk_levels(np.array([3.0, -1.99, -2.5, -5.0, -7.0, -10.5]))
+    assert [RISK_LEVELS[i] for i in levels] == ["low", "low", "medium", "medium", "high", "critical"]
@@ -6,6 +6,7 @@ import pytest
 
 from app.services.position_tracker import PositionTrackerService
 from app.modules.positions.models import PositionSide, PositionStatus
+from app.modules.positions.repository import PositionRecord
 
 
 class DummyPosition:
@@ -94,6 +95,37 @@ async def test_ai_auto_close_triggers(monkeypatch):
     tracker._close_position_with_order = close_mock
     monkeypatch.setattr("app.services.position_tracker.Position.get", AsyncMock(return_value=position))
 
-    await tracker.monitor_position("pos-1")
+    history = []
+
+    class DummyUpdate(SimpleNamespace):
+        async def insert(self):
+            history.append(self)
+
+    monkeypatch.setattr("app.services.position_tracker.PositionUpdate", DummyUpdate)
+
+    # The monitor tick reads a repository record; the review needs Beanie
+    tracker.positions = SimpleNamespace(
+        get=AsyncMock(return_value=PositionRecord.from_doc({
+            "_id": "pos-1",
+            "user_id": "user-1",
+            "user_wallet_id": "wallet-1",
+            "symbol": "BTC/USDT",
+            "side": "long",
+            "status": "open",
+            "entry": {"price": 100, "amount": 1, "value": 100, "fees": 0},
+            "current": {},
+        })),
+        set_current=AsyncMock(),
+    )
+    monkeypatch.setattr("app.services.position_tracker.documents_initialized", lambda document_cls: True)
+    monkeypatch.setattr(
+        "app.services.position_tracker.get_socket_publisher",
+        lambda: SimpleNamespace(emit_position_update=AsyncMock()),
+    )
+
+    result = await tracker.monitor_position("pos-1")
 
+    assert result["success"] is True
     close_mock.assert_awaited()
+    # Every reviewed tick still writes a position_updates history row
+    assert [(u.position_id, u.price, u.unrealized_pnl) for u in history] == [("pos-1", Decimal("110.0"), Decimal("10"))]
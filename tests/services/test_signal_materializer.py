@@ -0,0 +1,79 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.integrations.sentiment.base import SentimentScore
+from app.services import signal_materializer as materializer_module
+from app.services.signal_aggregator import AggregatedSignal
+from app.services.signal_materializer import SignalMaterializer
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(materializer_module, "get_redis_client", AsyncMock(return_value=fake))
+    return fake
+
+
+@pytest.fixture
+def aggregator(monkeypatch):
+    aggregator = AsyncMock()
+    aggregator.get_signal = AsyncMock(side_effect=lambda symbol: AggregatedSignal(
+        symbol=symbol, score=0.5, classification=SentimentScore.BULLISH, confidence=0.8,
+    ))
+    monkeypatch.setattr(materializer_module, "get_signal_aggregator", lambda: aggregator)
+    return aggregator
+
+
+@pytest.mark.asyncio
+async def test_request_path_reads_materialized_signal(redis, aggregator):
+    worker = SignalMaterializer(interval_seconds=60, jitter_seconds=0)
+    await worker.materialize("BTC/USDT")
+
+    # A different worker process serves it from Redis without fanning out
+    reader = SignalMaterializer(interval_seconds=60, jitter_seconds=0)
+    signal = await reader.get_signal("BTC/USDT")
+
+    assert signal.classification == SentimentScore.BULLISH
+    assert signal.age_seconds is not None and signal.age_seconds < 5
+    assert signal.to_dict()["age_seconds"] == signal.age_seconds
+    assert aggregator.get_signal.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_symbol_returns_placeholder_and_materializes_in_background(redis, aggregator):
+    materializer = SignalMaterializer(interval_seconds=60, jitter_seconds=0)
+
+    signal = await materializer.get_signal("ETH")
+    assert signal.confidence == 0.0
+    assert signal.age_seconds is None
+
+    await materializer._pending["ETH"]
+    assert (await materializer.get_signal("ETH")).score == 0.5
+
+
+@pytest.mark.asyncio
+async def test_refresh_cycle_is_claimed_once_across_workers(redis, aggregator, monkeypatch):
+    monkeypatch.setattr(materializer_module, "resolve_active_symbols", AsyncMock(return_value={"BTC/USDT", "SOL/USDT"}))
+    first = SignalMaterializer(interval_seconds=60, jitter_seconds=0)
+    second = SignalMaterializer(interval_seconds=60, jitter_seconds=0)
+
+    symbols = await first.resolve_symbols(db=None)
+    assert symbols == {"BTC", "SOL"}
+    assert await first.refresh(symbols) == 2
+    assert await second.refresh(symbols) == 0
+    assert aggregator.get_signal.await_count == 2
@@ -0,0 +1,109 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services import socket_publisher
+from app.services.socket_publisher import (
+    POSITION_UPDATE_EVENT,
+    POSITION_UPDATES_EVENT,
+    PositionUpdateCoalescer,
+    SocketPublisher,
+)
+
+
+def _publisher_with_server():
+    server = MagicMock()
+    server.emit = AsyncMock()
+    publisher = SocketPublisher()
+    publisher.register_server(server)
+    return server, publisher
+
+
+@pytest.mark.asyncio
+async def test_position_updates_are_coalesced_per_position():
+    server, publisher = _publisher_with_server()
+    coalescer = PositionUpdateCoalescer(publisher, 60, deltas_enabled=False)
+
+    for price in (100.0, 101.0, 102.0):
+        coalescer.add("positions:u1", {"position_id": "p1", "current_price": price})
+    coalescer.add("positions:u1", {"position_id": "p2", "current_price": 5.0})
+
+    assert await coalescer.flush() == 2
+    assert server.emit.await_count == 2
+    first = server.emit.await_args_list[0]
+    assert first.args == (POSITION_UPDATE_EVENT, {"position_id": "p1", "current_price": 102.0})
+    assert first.kwargs == {"room": "positions:u1"}
+
+
+@pytest.mark.asyncio
+async def test_room_receives_one_batched_delta_message():
+    server, publisher = _publisher_with_server()
+    coalescer = PositionUpdateCoalescer(
+        publisher, 60, min_price_change_percent=0.5, min_pnl_change_usd=5.0, keyframe_seconds=3600
+    )
+    base = {"side": "long", "risk_level": "low", "current_price": 100.0, "unrealized_pnl": 10.0}
+
+    coalescer.add("positions:u1", {"position_id": "p1", **base})
+    coalescer.add("positions:u1", {"position_id": "p2", **base})
+    assert await coalescer.flush() == 1
+    event, message = server.emit.await_args.args
+    assert event == POSITION_UPDATES_EVENT
+    assert message["keyframe"] is True
+    assert [p["position_id"] for p in message["positions"]] == ["p1", "p2"]
+
+    # p1 moves 1% (above threshold), p2 moves 0.1% with tiny P&L change (dropped)
+    coalescer.add("positions:u1", {"position_id": "p1", **base, "current_price": 101.0, "unrealized_pnl": 11.0})
+    coalescer.add("positions:u1", {"position_id": "p2", **base, "current_price": 100.1, "unrealized_pnl": 10.1})
+    assert await coalescer.flush() == 1
+    _, message = server.emit.await_args.args
+    assert message == {
+        "positions": [{"position_id": "p1", "current_price": 101.0, "unrealized_pnl": 11.0}],
+        "keyframe": False,
+    }
+
+    # A state change is always forwarded even when prices are flat
+    coalescer.add("positions:u1", {"position_id": "p2", **base, "risk_level": "high"})
+    await coalescer.flush()
+    _, message = server.emit.await_args.args
+    assert message["positions"] == [{"position_id": "p2", "risk_level": "high"}]
+
+    # Nothing visible changed: no message at all
+    server.emit.reset_mock()
+    coalescer.add("positions:u1", {"position_id": "p1", **base, "current_price": 101.0, "unrealized_pnl": 11.0})
+    assert await coalescer.flush() == 0
+    server.emit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_added_during_a_flush_is_sent_by_the_next_one():
+    server, publisher = _publisher_with_server()
+    coalescer = PositionUpdateCoalescer(publisher, 0.01, deltas_enabled=False)
+
+    async def emit(event, payload, room):
+        if payload["current_price"] == 100.0:
+            # Arrives while the scheduled flush is still sending
+            coalescer.add("positions:u1", {"position_id": "p1", "current_price": 101.0})
+
+    server.emit.side_effect = emit
+    coalescer.add("positions:u1", {"position_id": "p1", "current_price": 100.0})
+    await asyncio.sleep(0.1)
+
+    prices = [call.args[1]["current_price"] for call in server.emit.await_args_list]
+    assert prices == [100.0, 101.0]
+
+
+@pytest.mark.asyncio
+async def test_emit_without_server_publishes_through_redis_channel(monkeypatch):
+    manager = MagicMock()
+    manager.emit = AsyncMock()
+    build = MagicMock(return_value=manager)
+    monkeypatch.setattr(socket_publisher, "build_client_manager", build)
+    publisher = SocketPublisher()
+
+    await publisher.emit_position_update("positions:u1", {"position_id": "p1"})
+
+    build.assert_called_once_with(write_only=True)
+    manager.emit.assert_awaited_once_with(
+        POSITION_UPDATE_EVENT, {"position_id": "p1"}, namespace="/", room="positions:u1"
+    )
@@ -0,0 +1,91 @@
+"""
+Route cache decorator tests (in-memory store, no Redis).
+"""
+
+import time
+
+import pytest
+from fastapi import APIRouter, FastAPI, Query
+from fastapi.testclient import TestClient
+
+from app.utils import cache as cache_module
+from app.utils.cache import CacheManager, interval_ttl
+
+
+@pytest.fixture
+def memory_store(monkeypatch):
+    store = {}
+
+    async def _get(key, default=None):
+        return store.get(key, default)
+
+    async def _set(key, value, ttl=3600):
+        store[key] = value
+
+    monkeypatch.setattr(cache_module, "get_cache", _get)
+    monkeypatch.setattr(cache_module, "set_cache", _set)
+    return store
+
+
+def _make_client():
+    calls = {"count": 0}
+    router = APIRouter()
+    cache = CacheManager(prefix="test")
+
+    @router.get("/ohlc/{symbol}")
+    @cache.cached_route(ttl_param="interval", stale_ttl=30)
+    async def get_ohlc(symbol: str, interval: str = Query("1h")):
+        calls["count"] += 1
+        return {"symbol": symbol, "interval": interval, "n": calls["count"]}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app), calls
+
+
+def test_interval_ttl_is_clamped():
+    assert interval_ttl("1m") == 2
+    assert interval_ttl("1h") == 60
+    assert interval_ttl("1d") == 300
+
+
+def test_cached_route_hit_and_etag_304(memory_store):
+    client, calls = _make_client()
+
+    first = client.get("/ohlc/BTCUSDT", params={"interval": "1h"})
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    assert first.headers["Cache-Control"].startswith("public, max-age=")
+    etag = first.headers["ETag"]
+
+    second = client.get("/ohlc/BTCUSDT", params={"interval": "1h"})
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert calls["count"] == 1
+
+    not_modified = client.get(
+        "/ohlc/BTCUSDT", params={"interval": "1h"}, headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    # Different query parameters are cached separately
+    client.get("/ohlc/BTCUSDT", params={"interval": "4h"})
+    assert calls["count"] == 2
+
+    # The injected request parameter is not exposed as a query parameter
+    params = client.get("/openapi.json").json()["paths"]["/ohlc/{symbol}"]["get"]["parameters"]
+    assert {p["name"] for p in params} == {"symbol", "interval"}
+
+
+def test_stale_entry_is_served_then_revalidated(memory_store, monkeypatch):
+    client, calls = _make_client()
+    client.get("/ohlc/BTCUSDT", params={"interval": "1h"})
+
+    real_time = time.time
+    monkeypatch.setattr(cache_module.time, "time", lambda: real_time() + 61)
+    stale = client.get("/ohlc/BTCUSDT", params={"interval": "1h"})
+
+    assert stale.headers["X-Cache"] == "STALE"
+    assert stale.json()["n"] == 1
+    assert calls["count"] == 2  # background refresh ran
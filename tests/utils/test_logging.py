@@ -0,0 +1,123 @@
+"""
+Logging pipeline tests (JSON formatter, rate limiting, debug sampling, queue listener).
+"""
+
+import logging
+import os
+import sys
+
+import orjson
+
+from app.utils.logger import (
+    DebugSamplingFilter,
+    JSONFormatter,
+    RateLimitFilter,
+    start_queue_logging,
+    stop_queue_logging,
+)
+
+
+def _record(level=logging.WARNING, msg="price feed stale for %s", args=("BTCUSDT",), lineno=42, created=1000.0):
+    record = logging.LogRecord("moniqo.test", level, __file__, lineno, msg, args, None)
+    record.created = created
+    return record
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_json_formatter_emits_one_object_with_extras_and_exception():
+    record = _record()
+    record.user_id = "u1"
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record.exc_info = sys.exc_info()
+
+    entry = orjson.loads(JSONFormatter().format(record))
+
+    assert entry["level"] == "WARNING"
+    assert entry["logger"] == "moniqo.test"
+    assert entry["message"] == "price feed stale for BTCUSDT"
+    assert entry["line"] == 42
+    assert entry["user_id"] == "u1"
+    assert entry["ts"].startswith("1970-01-01T00:16:40.000")
+    assert "ValueError: boom" in entry["exc_info"]
+
+
+def test_rate_limit_caps_each_call_site_and_reports_suppressed():
+    rate_limit = RateLimitFilter(burst=3, window_seconds=60)
+
+    passed = [rate_limit.filter(_record(created=1000.0 + i)) for i in range(10)]
+    assert passed == [True] * 3 + [False] * 7
+
+    # Another call site, other levels and errors are not limited
+    assert rate_limit.filter(_record(lineno=43, created=1005.0))
+    assert all(rate_limit.filter(_record(level=logging.INFO, created=1005.0)) for _ in range(10))
+    assert all(rate_limit.filter(_record(level=logging.ERROR, created=1005.0)) for _ in range(10))
+
+    # Next window: passes again and carries the suppressed count
+    record = _record(created=1061.0)
+    assert rate_limit.filter(record)
+    assert record.getMessage() == "price feed stale for BTCUSDT (suppressed 7 similar in the last 60s)"
+
+
+def test_debug_sampling_keeps_one_in_n_per_call_site():
+    sampler = DebugSamplingFilter(every=4)
+
+    kept = sum(sampler.filter(_record(level=logging.DEBUG)) for _ in range(20))
+    assert kept == 5
+    assert sampler.filter(_record(level=logging.DEBUG, lineno=7))
+    assert all(sampler.filter(_record(level=logging.INFO)) for _ in range(3))
+
+
+def test_queue_logging_delivers_records_on_listener_thread():
+    target = _ListHandler()
+    queue_handler = start_queue_logging([target], [DebugSamplingFilter(every=2)])
+    logger = logging.getLogger("moniqo.test_queue_logging")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(queue_handler)
+    try:
+        positions = [{"id": i} for i in range(4)]
+        for position in positions:
+            logger.debug("tick %s", position)
+        positions[0]["id"] = "mutated"
+    finally:
+        logger.removeHandler(queue_handler)
+        stop_queue_logging(queue_handler)
+
+    # Messages are merged in the caller, so later mutation doesn't leak in
+    assert [r.getMessage() for r in target.records] == ["tick {'id': 0}", "tick {'id': 2}"]
+    stop_queue_logging(queue_handler)  # already stopped: no-op
+
+
+def test_forked_child_gets_its_own_listener(tmp_path):
+    path = tmp_path / "child.log"
+    target = logging.FileHandler(path)
+    target.setFormatter(logging.Formatter("%(message)s"))
+    queue_handler = start_queue_logging([target])
+    logger = logging.getLogger("moniqo.test_fork_logging")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(queue_handler)
+    try:
+        logger.info("parent")
+        pid = os.fork()
+        if pid == 0:
+            logger.info("child")
+            stop_queue_logging(queue_handler)
+            os._exit(0)
+        os.waitpid(pid, 0)
+    finally:
+        logger.removeHandler(queue_handler)
+        stop_queue_logging(queue_handler)
+        target.close()
+
+    assert sorted(path.read_text().split()) == ["child", "parent"]
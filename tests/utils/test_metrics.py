@@ -0,0 +1,77 @@
+"""
+In-process metrics tests (registry, exposition format, Mongo command listener).
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.config.database import MONGO_COMMAND_SECONDS, MongoCommandMetrics
+from app.utils.metrics import MetricsRegistry
+from app.utils.pool_stats import collect_pool_metrics
+
+
+def test_histogram_buckets_are_cumulative_when_rendered():
+    registry = MetricsRegistry()
+    latency = registry.histogram("op_seconds", "Op latency", ("op",), buckets=(0.1, 1.0))
+    child = latency.labels("read")
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        child.observe(value)
+
+    text = registry.render()
+    assert '# TYPE op_seconds histogram' in text
+    assert 'op_seconds_bucket{op="read",le="0.1"} 2' in text
+    assert 'op_seconds_bucket{op="read",le="1"} 3' in text
+    assert 'op_seconds_bucket{op="read",le="+Inf"} 4' in text
+    assert 'op_seconds_count{op="read"} 4' in text
+    assert 'op_seconds_sum{op="read"} 3.65' in text
+    assert child.counts == [2, 1, 1]
+
+
+def test_registry_reuses_families_and_children():
+    registry = MetricsRegistry()
+    hits = registry.counter("hits_total", "Hits", ("cache",))
+
+    assert registry.counter("hits_total", "Hits", ("cache",)) is hits
+    assert hits.labels("redis") is hits.labels("redis")
+    with pytest.raises(ValueError):
+        registry.gauge("hits_total", "Hits")
+    with pytest.raises(ValueError):
+        hits.labels("redis", "extra")
+
+
+def test_unlabelled_gauge_and_escaped_label_values():
+    registry = MetricsRegistry()
+    registry.gauge("queue_depth", "Depth").set(7)
+    registry.counter("errors_total", "Errors", ("reason",)).labels('bad "quote"').inc(2)
+
+    text = registry.render()
+    assert "queue_depth 7" in text
+    assert 'errors_total{reason="bad \\"quote\\""} 2' in text
+
+
+def test_collectors_render_at_scrape_time():
+    registry = MetricsRegistry()
+    registry.register_collector(lambda: [("up", "Up", "gauge", [({"pool": "mongodb"}, 1)])])
+
+    assert 'up{pool="mongodb"} 1' in registry.render()
+
+
+def test_pool_metrics_split_counters_and_gauges():
+    families = {name: type_name for name, _, type_name, _ in collect_pool_metrics()}
+
+    assert families["mongodb_pool_checked_out"] == "gauge"
+    assert families["mongodb_pool_checkouts_total"] == "counter"
+    assert families["mongodb_pool_wait_seconds_total"] == "counter"
+
+
+def test_mongo_command_listener_labels_by_collection():
+    listener = MongoCommandMetrics()
+    child = MONGO_COMMAND_SECONDS.labels("positions", "getMore")
+    before = child.count
+
+    listener.started(SimpleNamespace(command_name="getMore", command={"getMore": 123, "collection": "positions"}))
+    listener.succeeded(SimpleNamespace(command_name="getMore", duration_micros=2500))
+
+    assert child.count == before + 1
@@ -0,0 +1,126 @@
+"""
+Connection pool telemetry tests (no MongoDB or Redis server).
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from pymongo import monitoring
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.config import database
+from app.utils import worker_runtime
+from app.utils.pool_stats import InstrumentedConnectionPool, MongoPoolMonitor
+
+
+class FakeConnection:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    async def connect(self):
+        pass
+
+    async def can_read_destructive(self):
+        return False
+
+    async def disconnect(self):
+        pass
+
+
+def test_mongo_monitor_counts_checkouts_and_failures():
+    monitor = MongoPoolMonitor()
+    event = SimpleNamespace(address=("db", 27017), connection_id=1)
+
+    monitor.pool_created(event)
+    monitor.connection_created(event)
+    monitor.connection_check_out_started(event)
+    monitor.connection_checked_out(event)
+    monitor.connection_check_out_started(event)
+    monitor.connection_check_out_failed(
+        SimpleNamespace(address=event.address, reason=monitoring.ConnectionCheckOutFailedReason.TIMEOUT)
+    )
+    monitor.connection_closed(event)
+
+    stats = monitor.snapshot()
+    assert stats["pools"] == 1
+    assert stats["connections_created"] == 1 and stats["connections_closed"] == 1
+    assert stats["connections_open"] == 0
+    assert stats["checked_out"] == 1 and stats["checkouts"] == 1
+    assert stats["checkout_failures"] == 1 and stats["checkout_timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0
+
+    monitor.connection_checked_in(event)
+    assert monitor.snapshot()["checked_out"] == 0
+
+
+def test_mongo_client_options_come_from_settings():
+    current_settings = SimpleNamespace(
+        MONGODB_MAX_POOL_SIZE=80,
+        MONGODB_MIN_POOL_SIZE=4,
+        MONGODB_MAX_CONNECTING=3,
+        MONGODB_WAIT_QUEUE_TIMEOUT_MS=2000,
+    )
+
+    options = database.mongo_client_options(current_settings)
+
+    assert options["maxPoolSize"] == 80 and options["minPoolSize"] == 4
+    assert options["maxConnecting"] == 3 and options["waitQueueTimeoutMS"] == 2000
+    assert options["serverSelectionTimeoutMS"] == 5000  # default when unset
+    assert isinstance(options["event_listeners"][0], MongoPoolMonitor)
+
+
+@pytest.mark.asyncio
+async def test_redis_pool_waits_for_a_released_connection():
+    pool = InstrumentedConnectionPool(connection_class=FakeConnection, max_connections=1, timeout=1)
+    first = await pool.get_connection("GET")
+
+    async def release_later():
+        await asyncio.sleep(0.05)
+        await pool.release(first)
+
+    releaser = asyncio.create_task(release_later())
+    second = await pool.get_connection("GET")
+    await releaser
+
+    assert second is first
+    stats = pool.snapshot()
+    assert stats["connections_created"] == 1
+    assert stats["checkouts"] == 2 and stats["in_use"] == 1
+    assert stats["wait_seconds_max"] >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_redis_pool_times_out_when_exhausted():
+    pool = InstrumentedConnectionPool(connection_class=FakeConnection, max_connections=1, timeout=0.05)
+    await pool.get_connection("GET")
+
+    with pytest.raises(RedisConnectionError):
+        await pool.get_connection("GET")
+
+    assert pool.snapshot()["checkout_timeouts"] == 1
+
+
+def test_worker_runtime_shares_one_client_and_loop(monkeypatch):
+    client = MagicMock()
+    create = MagicMock(return_value=client)
+    monkeypatch.setattr(database, "_database", None)
+    monkeypatch.setattr(database, "create_mongo_client", create)
+    monkeypatch.setattr(worker_runtime, "_client", None)
+    monkeypatch.setattr(worker_runtime, "_loop", None)
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    try:
+        worker_runtime.get_worker_database()
+        worker_runtime.get_worker_database()
+        first_loop = worker_runtime.run_async(current_loop())
+        second_loop = worker_runtime.run_async(current_loop())
+    finally:
+        worker_runtime.close_worker_pools()
+
+    create.assert_called_once()
+    assert first_loop is second_loop
+    client.close.assert_called_once()
@@ -0,0 +1,144 @@
+"""
+Profiling hook tests (request timings, Server-Timing middleware, sampler, Celery hooks).
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.server_timing import ServerTimingMiddleware, add_server_timing
+from app.utils import profiling
+from app.utils.profiling import (
+    SamplingProfiler,
+    begin_timings,
+    end_timings,
+    profile_api,
+    record_timing,
+)
+
+
+def test_record_timing_is_scoped_to_the_current_context():
+    record_timing("mongodb", 1.0)  # no active scope: ignored
+
+    timings, token = begin_timings()
+    record_timing("mongodb", 0.002)
+    record_timing("mongodb", 0.003)
+    record_timing("redis", 0.001)
+    end_timings(token)
+    record_timing("redis", 5.0)
+
+    breakdown = timings.breakdown()
+    assert breakdown["mongodb"] == 5.0
+    assert breakdown["redis"] == 1.0
+    assert timings.counts == {"mongodb": 2, "redis": 1}
+    assert 'mongodb;dur=5.0;desc="2 calls"' in timings.server_timing()
+
+
+def test_server_timing_header_reports_io_breakdown():
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        record_timing("binance", 0.01)
+        return {"ok": True}
+
+    app.add_middleware(ServerTimingMiddleware)
+    response = TestClient(app).get("/ping")
+
+    header = response.headers["server-timing"]
+    assert header.startswith('binance;dur=10.0;desc="1 calls"')
+    assert "app;dur=" in header and "total;dur=" in header
+
+
+def _spin_until(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler_collapses_target_thread_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin_until, args=(stop,))
+    worker.start()
+    profiler = SamplingProfiler(interval=0.001, thread_ids=[worker.ident]).start()
+    time.sleep(0.05)
+    collapsed = profiler.stop()
+    stop.set()
+    worker.join()
+
+    assert profiler.sample_count > 0
+    first = collapsed.splitlines()[0]
+    stack, count = first.rsplit(" ", 1)
+    assert "_spin_until (" in stack
+    assert int(count) > 0
+
+
+async def test_profile_api_stops_after_requests():
+    async def finish_requests():
+        for _ in range(2):
+            await asyncio.sleep(0.01)
+            profiling.note_request_finished()
+
+    task = asyncio.create_task(finish_requests())
+    started = time.perf_counter()
+    collapsed, samples = await profile_api(5, requests=2, interval=0.001)
+    await task
+
+    assert time.perf_counter() - started < 1
+    assert samples > 0
+    assert not profiling.profiler_busy()
+
+
+async def test_profiler_counts_requests_without_server_timing_headers():
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    add_server_timing(app, SimpleNamespace(SERVER_TIMING_ENABLED=False, PROFILER_ENABLED=True))
+
+    async def send_requests():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            responses = []
+            for _ in range(2):
+                await asyncio.sleep(0.01)
+                responses.append(await client.get("/ping"))
+            return responses
+
+    task = asyncio.create_task(send_requests())
+    started = time.perf_counter()
+    await profile_api(5, requests=2, interval=0.001)
+    responses = await task
+
+    # Stopped by the two requests, not the 5s timeout, and no header was sent
+    assert time.perf_counter() - started < 1
+    assert all("server-timing" not in response.headers for response in responses)
+
+
+def test_celery_hooks_write_profile_for_selected_tasks(monkeypatch, tmp_path):
+    settings = SimpleNamespace(
+        CELERY_PROFILE_TASKS="run_flow",
+        CELERY_SLOW_TASK_MS=0,
+        PROFILER_SAMPLE_INTERVAL_MS=1,
+        PROFILER_OUTPUT_DIR=str(tmp_path),
+    )
+    monkeypatch.setattr(profiling, "get_settings", lambda: settings)
+
+    profiling.task_started("abcdef123456", "run_flow")
+    record_timing("mongodb", 0.004)
+    time.sleep(0.01)
+    breakdown = profiling.task_finished("abcdef123456", "run_flow")
+
+    assert breakdown["mongodb"] == 4.0
+    assert breakdown["total"] >= 10
+    files = list(tmp_path.glob("run_flow-*-abcdef12.folded"))
+    assert len(files) == 1
+
+    profiling.task_started("other", "check_balances")
+    assert profiling._task_state["other"][2] is None
+    profiling.task_finished("other", "check_balances")
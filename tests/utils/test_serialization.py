@@ -0,0 +1,79 @@
+"""
+orjson serialization tests (response class, Celery message encoding).
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import orjson
+from bson import ObjectId
+
+from app.core.responses import ORJSONResponse, model_response
+from app.modules.flows.models import Execution, ExecutionStatus
+from app.modules.flows.router import execution_to_response
+from app.modules.flows.schemas import ExecutionListResponse
+from app.utils.serialization import dumps_message, loads
+
+
+def test_response_encodes_object_id_decimal_datetime_and_enum():
+    oid = ObjectId()
+    response = ORJSONResponse({
+        "id": oid,
+        "pnl": Decimal("12.50"),
+        "at": datetime(2026, 1, 17, 10, 30, tzinfo=timezone.utc),
+        "status": ExecutionStatus.COMPLETED,
+        "buckets": {1: "a"},
+    })
+
+    assert response.media_type == "application/json"
+    assert orjson.loads(response.body) == {
+        "id": str(oid),
+        "pnl": 12.5,
+        "at": "2026-01-17T10:30:00Z",
+        "status": "completed",
+        "buckets": {"1": "a"},
+    }
+
+
+def test_model_response_matches_response_model_serialization():
+    execution = Execution(
+        _id=str(ObjectId()),
+        flow_id="f1",
+        flow_name="Flow",
+        status=ExecutionStatus.COMPLETED,
+        started_at=datetime(2026, 1, 17, 10, 30, 0, 123000),
+        steps=[{"name": "ai_analysis", "status": "completed", "data": {"votes": {"buy": 3}, "confidence": 0.4}}],
+    )
+    page = ExecutionListResponse(items=[execution_to_response(execution)], total=1, limit=10, offset=0, has_more=False)
+
+    # Same JSON FastAPI produces for a response_model (by alias, JSON mode)
+    assert orjson.loads(model_response(page).body) == page.model_dump(mode="json", by_alias=True)
+    assert model_response(page, status_code=202).status_code == 202
+
+
+def test_model_response_encodes_raw_step_data():
+    decision_id = ObjectId()
+    execution = Execution(
+        flow_id="f1",
+        flow_name="Flow",
+        steps=[{"name": "ai_analysis", "data": {"members": [{"decision_id": decision_id, "cost_usd": Decimal("0.25")}]}}],
+    )
+
+    body = orjson.loads(model_response(execution_to_response(execution)).body)
+
+    assert body["steps"][0]["data"]["members"] == [{"decision_id": str(decision_id), "cost_usd": 0.25}]
+
+
+def test_message_round_trip_keeps_decimal_digits():
+    oid = ObjectId()
+    body = ([str(oid)], {"position_id": oid, "amount": Decimal("0.00012345"), "at": datetime(2026, 1, 17)}, {})
+
+    encoded = dumps_message(body)
+
+    assert isinstance(encoded, str)
+    assert loads(encoded.encode()) == [
+        [str(oid)],
+        {"position_id": str(oid), "amount": "0.00012345", "at": "2026-01-17T00:00:00"},
+        {},
+    ]
+    assert loads(memoryview(encoded.encode())) == loads(encoded)